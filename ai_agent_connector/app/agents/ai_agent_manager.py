@@ -10,7 +10,7 @@ from ..agents.providers import (
     create_agent_provider,
     BaseAgentProvider
 )
-from ..utils.rate_limiter import RateLimiter, RateLimitConfig
+from ..utils.rate_limiter import RateLimiter, RateLimitConfig, create_rate_limiter
 from ..utils.retry_policy import RetryPolicy, RetryExecutor
 from ..utils.version_control import ConfigurationVersionControl, ConfigurationVersion
 from ..utils.webhooks import WebhookNotifier, WebhookEvent, WebhookConfig
@@ -33,14 +33,19 @@ class AIAgentManager:
     Handles provider registration, rate limiting, retries, versioning, and webhooks.
     """
     
-    def __init__(self):
-        """Initialize AI agent manager"""
+    def __init__(self, rate_limiter: Optional[RateLimiter] = None):
+        """
+        Initialize AI agent manager
+        
+        Args:
+            rate_limiter: Rate limiter to use (default: configured from the environment)
+        """
         # agent_id -> AgentConfiguration
         self._configurations: Dict[str, AgentConfiguration] = {}
         # agent_id -> BaseAgentProvider
         self._providers: Dict[str, BaseAgentProvider] = {}
         # Rate limiter
-        self._rate_limiter = RateLimiter()
+        self._rate_limiter = rate_limiter or create_rate_limiter(namespace='ai_agent:')
         # agent_id -> RetryPolicy
         self._retry_policies: Dict[str, RetryPolicy] = {}
         # Version control
@@ -7,6 +7,7 @@ import hashlib
 import secrets
 
 from ..db import DatabaseConnector
+from ..db.pool_cache import ConnectionPoolCache
 from ..db.pooling import (
     extract_pooling_config,
     extract_timeout_config,
@@ -14,7 +15,7 @@ from ..db.pooling import (
     validate_timeout_config
 )
 from ..utils.helpers import get_timestamp
-from ..utils.encryption import get_encryptor
+from ..utils.encryption import get_encryptor, DecryptedConfigCache
 
 
 class AgentRegistry:
@@ -32,6 +33,10 @@ class AgentRegistry:
         self._pending_database_configs: Dict[str, Dict[str, Any]] = {}
         # Track credential rotation status (agent_id -> rotation_info)
         self._credential_rotation_status: Dict[str, Dict[str, Any]] = {}
+        # Shared connection pools for pooled connectors (agent_id, config hash) -> pool
+        self._connection_pools = ConnectionPoolCache()
+        # Short-lived decrypted configs ((agent_id, 'active'|'pending') -> config)
+        self._decrypted_configs = DecryptedConfigCache()
     
     def register_agent(
         self,
@@ -61,6 +66,7 @@ class AgentRegistry:
             self.agent_credentials.pop(agent_id, None)
             self.agent_database_links.pop(agent_id, None)
             self._agent_database_configs.pop(agent_id, None)
+            self._invalidate_database_caches(agent_id)
         
         timestamp = get_timestamp()
         # Use provided api_key from credentials if available, otherwise generate
@@ -155,6 +161,7 @@ class AgentRegistry:
         self.agent_credentials.pop(agent_id, None)
         self.agent_database_links.pop(agent_id, None)
         self._agent_database_configs.pop(agent_id, None)
+        self._invalidate_database_caches(agent_id)
         
         return True
     
@@ -167,6 +174,13 @@ class AgentRegistry:
         self._agent_database_configs.clear()
         self._pending_database_configs.clear()
         self._credential_rotation_status.clear()
+        self._connection_pools.clear()
+        self._decrypted_configs.invalidate()
+    
+    def _invalidate_database_caches(self, agent_id: str) -> None:
+        """Drop pooled connections and wipe decrypted configs for an agent"""
+        self._connection_pools.invalidate(agent_id)
+        self._decrypted_configs.invalidate(lambda key: key[0] == agent_id)
     
     def _generate_api_key(self) -> str:
         """Generate a secure API key"""
@@ -262,29 +276,121 @@ class AgentRegistry:
         rotation_status = self._credential_rotation_status.get(agent_id)
         
         if rotation_status and rotation_status.get('status') == 'staging':
-            # During staging, try pending credentials first, fallback to active
+            # During staging, use pending credentials once they have validated,
+            # fallback to active otherwise
             pending_config = self._pending_database_configs.get(agent_id)
-            if pending_config:
-                try:
-                    decrypted_pending = self._decrypt_database_config(pending_config)
-                    connector = self._build_database_connector(decrypted_pending)
-                    # Test connection with pending credentials
-                    connector.connect()
-                    connector.disconnect()
-                    # Pending credentials work, use them
-                    return self._build_database_connector(decrypted_pending)
-                except Exception:
-                    # Pending credentials failed, fallback to active
-                    pass
+            if pending_config and self._pending_credentials_valid(agent_id, rotation_status):
+                return self._connection_pools.attach(
+                    agent_id,
+                    self._hash_stored_config(pending_config),
+                    self._build_database_connector(
+                        self._get_decrypted_config(agent_id, 'pending', pending_config)
+                    )
+                )
         
         # Use active credentials
         encrypted_config = self._agent_database_configs.get(agent_id)
         if not encrypted_config:
             return None
         
-        # Decrypt configuration before use
-        database_config = self._decrypt_database_config(encrypted_config)
-        return self._build_database_connector(database_config)
+        # Decrypt configuration before use (cached for a short time)
+        database_config = self._get_decrypted_config(agent_id, 'active', encrypted_config)
+        return self._connection_pools.attach(
+            agent_id,
+            self._hash_stored_config(encrypted_config),
+            self._build_database_connector(database_config)
+        )
+    
+    def _get_decrypted_config(
+        self,
+        agent_id: str,
+        slot: str,
+        encrypted_config: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Get a decrypted configuration, decrypting only on cache miss.
+        
+        Args:
+            agent_id: Agent identifier
+            slot: 'active' or 'pending'
+            encrypted_config: Configuration as stored in the registry
+            
+        Returns:
+            dict: Decrypted configuration
+        """
+        key = (agent_id, slot)
+        config = self._decrypted_configs.get(key)
+        if config is None:
+            config = self._decrypt_database_config(encrypted_config)
+            self._decrypted_configs.put(key, config)
+        return config
+    
+    def _pending_credentials_valid(self, agent_id: str, rotation_status: Dict[str, Any]) -> bool:
+        """
+        Check staged credentials, testing the connection at most once.
+        
+        The outcome is recorded in the rotation status as 'pending_validated'
+        so later calls do not open a test connection.
+        
+        Args:
+            agent_id: Agent identifier
+            rotation_status: Rotation status record for the agent
+            
+        Returns:
+            bool: True if the staged credentials connected successfully
+        """
+        if 'pending_validated' not in rotation_status:
+            try:
+                pending_config = self._get_decrypted_config(
+                    agent_id, 'pending', self._pending_database_configs[agent_id]
+                )
+                connector = self._build_database_connector(pending_config)
+                connector.connect()
+                connector.disconnect()
+                rotation_status['pending_validated'] = True
+            except Exception as exc:
+                rotation_status['pending_validated'] = False
+                rotation_status['pending_validation_error'] = str(exc)
+            rotation_status['pending_validated_at'] = get_timestamp()
+        return rotation_status['pending_validated']
+    
+    def get_database_scope(self, agent_id: str) -> Optional[str]:
+        """
+        Identify the database connection an agent's queries currently use.
+        
+        Agents share a scope only when they connect with an identical
+        configuration (credentials included), so they see the same rows
+        for the same query.
+        
+        Args:
+            agent_id: Agent identifier
+            
+        Returns:
+            Optional[str]: Scope hash, or None if no database is configured
+        """
+        rotation_status = self._credential_rotation_status.get(agent_id)
+        if (rotation_status and rotation_status.get('status') == 'staging'
+                and rotation_status.get('pending_validated')
+                and agent_id in self._pending_database_configs):
+            slot, encrypted_config = 'pending', self._pending_database_configs[agent_id]
+        else:
+            slot, encrypted_config = 'active', self._agent_database_configs.get(agent_id)
+            if not encrypted_config:
+                return None
+        
+        import json
+        config = self._get_decrypted_config(agent_id, slot, encrypted_config)
+        config_str = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(config_str.encode()).hexdigest()
+    
+    def get_connection_pool_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics for the shared connection pool cache.
+        
+        Returns:
+            Dict with pool count and hit/miss counters
+        """
+        return self._connection_pools.get_stats()
     
     def test_database_connection(self, database_config: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -589,6 +695,7 @@ class AgentRegistry:
         # Store new credentials in staging (encrypted)
         encrypted_new_config = self._encrypt_database_config(new_database_config.copy())
         self._pending_database_configs[agent_id] = encrypted_new_config
+        self._invalidate_database_caches(agent_id)
         
         # Update rotation status
         self._credential_rotation_status[agent_id] = {
@@ -598,6 +705,11 @@ class AgentRegistry:
             'new_config_hash': self._hash_config(new_database_config),
             'validated': validate_before_activate
         }
+        if validate_before_activate:
+            # Already tested above; connectors use the staged credentials directly
+            rotation_status = self._credential_rotation_status[agent_id]
+            rotation_status['pending_validated'] = True
+            rotation_status['pending_validated_at'] = rotation_status['staged_at']
         
         return {
             'agent_id': agent_id,
@@ -642,6 +754,7 @@ class AgentRegistry:
         old_encrypted = self._agent_database_configs.get(agent_id)
         self._agent_database_configs[agent_id] = staged_encrypted
         self._pending_database_configs.pop(agent_id, None)
+        self._invalidate_database_caches(agent_id)
         
         # Update database link
         db_link = self._link_database(agent_id, staged_config)
@@ -685,6 +798,7 @@ class AgentRegistry:
         
         # Remove staged credentials
         self._pending_database_configs.pop(agent_id, None)
+        self._invalidate_database_caches(agent_id)
         
         # Update rotation status
         rotation_info = self._credential_rotation_status.get(agent_id, {})
@@ -735,6 +849,23 @@ class AgentRegistry:
         config_str = json.dumps(config_copy, sort_keys=True)
         return hashlib.sha256(config_str.encode()).hexdigest()[:16]
     
+    def _hash_stored_config(self, encrypted_config: Dict[str, Any]) -> str:
+        """
+        Hash a stored (encrypted) configuration for connection pool keys.
+        
+        Unlike _hash_config, secrets are included (as ciphertext), so a
+        password change yields a different key.
+        
+        Args:
+            encrypted_config: Configuration as stored in the registry
+            
+        Returns:
+            str: Hash of configuration
+        """
+        import json
+        config_str = json.dumps(encrypted_config, sort_keys=True, default=str)
+        return hashlib.sha256(config_str.encode()).hexdigest()[:16]
+    
     def update_agent_database(
         self,
         agent_id: str,
@@ -765,6 +896,7 @@ class AgentRegistry:
         # Encrypt before storing
         encrypted_config = self._encrypt_database_config(database_config.copy())
         self._agent_database_configs[agent_id] = encrypted_config
+        self._invalidate_database_caches(agent_id)
         
         return {
             'agent_id': agent_id,
@@ -3,10 +3,14 @@ API routes for AI Agent Connector
 Main API endpoints for agent management, query execution, and system features
 """
 
-from flask import request, jsonify
-from typing import Dict, List, Optional, Any, Tuple
+from flask import request, jsonify, current_app, Response, stream_with_context
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import wraps
+import hashlib
+import itertools
+import json
 import os
 
 from . import api_bp
@@ -19,7 +23,11 @@ from ..security import (
     SchemaDriftDetector,
     SchemaBinding,
     DriftApproval,
+    SchemaDriftWatcher,
+    get_drift_status_table,
 )
+from ..security.schema_drift import get_schema_drift_detector as get_shared_schema_drift_detector
+from ..security.drift_watcher import DEFAULT_CHANNEL as SCHEMA_CHANGE_CHANNEL
 
 # Core components
 from ..agents.registry import AgentRegistry
@@ -31,7 +39,8 @@ from ..config.tenant_manager import get_tenant_manager
 from ..agents.ai_agent_manager import AIAgentManager, set_cost_tracker as set_ai_cost_tracker
 from ..permissions.access_control import AccessControl, Permission
 from ..db import DatabaseConnector
-from ..utils.sql_parser import extract_tables_from_query, get_query_type, QueryType
+from ..db.schema_catalog import get_schema_catalog
+from ..utils.sql_parser import parse_query, ParsedQuery, QueryType
 from ..utils.audit_logger import AuditLogger, ActionType, get_audit_logger, init_audit_logger
 from ..utils.cost_tracker import CostTracker
 from ..utils.nl_to_sql import NLToSQLConverter, set_cost_tracker as set_nl_cost_tracker
@@ -44,7 +53,12 @@ from ..utils.chargeback import chargeback_manager, CostAllocationRule, Allocatio
 from ..utils.adoption_analytics import adoption_analytics, FeatureType, QueryPatternType
 from ..utils.training_data_export import training_data_exporter, QuerySQLPair, ExportFormat
 from ..utils.security_monitor import SecurityMonitor
-from ..utils.rate_limiter import RateLimiter, RateLimitConfig
+from ..utils.rate_limiter import RateLimitConfig, create_rate_limiter
+from ..utils.single_flight import SingleFlight
+from ..utils.arrow_format import (
+    ARROW_AVAILABLE, COLUMNAR_FORMATS, negotiate_columnar_format,
+    rows_to_record_batches, iter_arrow_stream, to_parquet_bytes
+)
 from ..utils.alerting import (
     get_notification_manager,
     init_notification_manager,
@@ -67,49 +81,28 @@ from ..security.jwt_auth import (
     JWTConfig,
 )
 
-# Table name → OWL entity type mappings per domain
-TABLE_ENTITY_MAPS = {
-    'hospital': {
-        'patients': 'PatientRecord',
-        'medical_records': 'MedicalRecord',
-        'lab_results': 'LabResult',
-        'prescriptions': 'Prescription',
-        'medications': 'Medication',
-        'billing': 'Billing',
-        'appointments': 'Appointment',
-        'staff': 'Staff',
-        'departments': 'Department',
-        'rooms': 'Room',
-        'insurance': 'Insurance',
-        'surgeries': 'Surgery',
-        'emergency_cases': 'EmergencyCase',
-        'equipment': 'Equipment',
-        'audit_log': 'AuditLog',
-    },
-    'finance': {
-        'accounts': 'Account',
-        'transactions': 'Transaction',
-        'loans': 'Loan',
-        'cards': 'Card',
-        'customer_profiles': 'CustomerProfile',
-        'reports': 'Report',
-        'audit_log': 'AuditLog',
-    },
+# SQL operation → OntoGuard semantic action
+QUERY_TYPE_ACTIONS = {
+    QueryType.SELECT: 'read',
+    QueryType.INSERT: 'create',
+    QueryType.UPDATE: 'update',
+    QueryType.DELETE: 'delete'
 }
 
-def get_table_entity_map() -> dict:
-    """Get active table_entity_map based on loaded ontology."""
-    adapter = get_ontoguard_adapter()
-    if adapter and adapter.ontology_paths:
-        path = adapter.ontology_paths[0].lower()
-        for domain, mapping in TABLE_ENTITY_MAPS.items():
-            if domain in path:
-                return mapping
-    # Merge all maps as fallback
-    merged = {}
-    for m in TABLE_ENTITY_MAPS.values():
-        merged.update(m)
-    return merged
+
+def _first_ontoguard_denial(adapter, checks, context):
+    """
+    Validate (action, table) pairs with a single OntoGuard batch call.
+
+    Returns:
+        (index, entity_type, result) of the first denied pair, or None
+    """
+    results = adapter.validate_actions([{'action': action, 'table': table} for action, table in checks], context)
+    for index, result in enumerate(results):
+        if not result.allowed:
+            return index, adapter.resolve_entity_type(checks[index][1], context.get('domain')), result
+    return None
+
 
 # Initialize global instances
 agent_registry = AgentRegistry()  # Legacy single-tenant
@@ -131,8 +124,11 @@ set_ai_cost_tracker(cost_tracker)
 # Initialize security monitor
 security_monitor = SecurityMonitor()
 
-# Initialize rate limiter
-rate_limiter = RateLimiter()
+# Initialize rate limiter (shared across workers when RATE_LIMIT_STORE is set)
+rate_limiter = create_rate_limiter()
+
+# Coalescing of identical concurrent reads
+query_flight = SingleFlight()
 
 # Default rate limit for new agents (can be overridden per agent)
 DEFAULT_RATE_LIMIT = RateLimitConfig(
@@ -141,6 +137,16 @@ DEFAULT_RATE_LIMIT = RateLimitConfig(
     queries_per_day=10000
 )
 
+# Batch query limits
+MAX_BATCH_STATEMENTS = 50
+# Statement executions per batch, counting each params_list entry
+MAX_BATCH_EXECUTIONS = 1000
+MAX_BATCH_WORKERS = 4
+
+# Rows fetched per round trip (and written per chunk) when streaming results
+STREAM_BATCH_SIZE = 1000
+STREAM_FORMATS = {'ndjson': 'application/x-ndjson', 'json': 'application/json'}
+
 
 # ============================================================================
 # Helper Functions
@@ -210,14 +216,18 @@ def require_auth_with_tenant() -> Optional[Tuple[str, str]]:
     return authenticate_agent_multi_tenant()
 
 
-def check_rate_limit(agent_id: str) -> Tuple[bool, Optional[str]]:
+def check_rate_limit(agent_id: str, cost: int = 1) -> Tuple[bool, Optional[str]]:
     """
     Check if agent is within rate limits.
 
+    Args:
+        agent_id: Agent identifier
+        cost: Queries the request will run
+
     Returns:
         (allowed, error_message)
     """
-    return rate_limiter.check_rate_limit(agent_id)
+    return rate_limiter.check_rate_limit(agent_id, cost=cost)
 
 
 def rate_limit_required(f):
@@ -245,27 +255,58 @@ def rate_limit_required(f):
     return decorated_function
 
 
-def check_permissions(agent_id: str, query: str) -> tuple[bool, List[Dict[str, Any]]]:
+def has_table_permission(agent_id: str, table: str, permission: Permission) -> bool:
+    """
+    Check a permission on one table (resource-level first, then general)
+    
+    Args:
+        agent_id: Agent identifier
+        table: Table name
+        permission: Required permission
+    
+    Returns:
+        bool: True if the agent holds the permission
+    """
+    return (access_control.has_resource_permission(agent_id, table, permission)
+            or access_control.has_permission(agent_id, permission))
+
+
+def check_permissions(
+    agent_id: str,
+    query: Union[str, ParsedQuery],
+    checked: Optional[Dict[Tuple[str, Permission], bool]] = None
+) -> tuple[bool, List[Dict[str, Any]]]:
     """
     Check if agent has required permissions for query
     
+    Args:
+        agent_id: Agent identifier
+        query: SQL query string or an already parsed query
+        checked: (table, permission) -> result memo shared across the
+            statements of a batch, so each is looked up once
+    
     Returns:
         (has_permission, denied_resources)
     """
-    tables = extract_tables_from_query(query)
-    query_type = get_query_type(query)
+    parsed = parse_query(query)
     
-    required_permission = Permission.READ if query_type == QueryType.SELECT else Permission.WRITE
+    required_permission = Permission.READ if parsed.query_type == QueryType.SELECT else Permission.WRITE
     
     denied_resources = []
-    for table in tables:
-        # Check resource-level permissions first
-        has_perm = access_control.has_resource_permission(agent_id, table, required_permission)
-        if not has_perm:
-            # Check general permissions
-            has_perm = access_control.has_permission(agent_id, required_permission)
-        
-        if not has_perm:
+    if parsed.requires_write and not parsed.tables:
+        # A write whose target could not be resolved is never allowed
+        denied_resources.append({
+            'resource': '*',
+            'required_permission': required_permission.value,
+            'message': 'Could not determine the tables modified by the query'
+        })
+    if checked is None:
+        checked = {}
+    for table in parsed.tables:
+        key = (table, required_permission)
+        if key not in checked:
+            checked[key] = has_table_permission(agent_id, table, required_permission)
+        if not checked[key]:
             denied_resources.append({
                 'resource': table,
                 'required_permission': required_permission.value,
@@ -275,6 +316,48 @@ def check_permissions(agent_id: str, query: str) -> tuple[bool, List[Dict[str, A
     return len(denied_resources) == 0, denied_resources
 
 
+def get_coalescing_key(
+    agent_id: str,
+    parsed: ParsedQuery,
+    params: Optional[Any] = None,
+    as_dict: bool = False
+) -> Optional[str]:
+    """
+    Build the single-flight key for a read query.
+    
+    Identical reads share an execution only when they run against the same
+    database connection with the same effective permissions.
+    
+    Args:
+        agent_id: Agent identifier
+        parsed: Parsed query
+        params: Query parameters
+        as_dict: Whether rows are returned as dictionaries
+    
+    Returns:
+        Optional[str]: Coalescing key, or None if the query must run on its own
+    """
+    if parsed.query_type != QueryType.SELECT:
+        return None
+    
+    database_scope = agent_registry.get_database_scope(agent_id)
+    if database_scope is None:
+        return None
+    
+    resource_permissions = access_control.get_resource_permissions(agent_id)
+    permission_scope = [sorted(p.value for p in access_control.get_permissions(agent_id))]
+    for table in parsed.tables:
+        entry = resource_permissions.get(table) or {}
+        permission_scope.append([table, sorted(p.value for p in entry.get('permissions', []))])
+    
+    scope_hash = hashlib.sha256(json.dumps(permission_scope).encode()).hexdigest()[:16]
+    # Exact text, not the cache fingerprint: only byte-identical reads share rows
+    query_hash = hashlib.sha256(
+        json.dumps([parsed.text, params], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{database_scope}:{scope_hash}:{int(bool(as_dict))}:{query_hash}"
+
+
 # ============================================================================
 # OntoGuard Validation Decorator
 # ============================================================================
@@ -388,7 +471,8 @@ def api_docs():
         'paths': {
             '/agents/register': {},
             '/databases/test': {},
-            '/agents/{agent_id}/query': {}
+            '/agents/{agent_id}/query': {},
+            '/agents/{agent_id}/query/batch': {}
         }
     }), 200
 
@@ -412,7 +496,10 @@ def ontoguard_status():
         'active': adapter.is_active,
         'pass_through_mode': adapter._pass_through_mode,
         'ontology_paths': adapter.ontology_paths,
-        'config_path': adapter.config_path
+        'config_path': adapter.config_path,
+        'default_domain': adapter.default_domain,
+        'loaded_domains': adapter.get_loaded_domains(),
+        'compiled_permissions': adapter.get_permission_stats()
     }), 200
 
 
@@ -423,16 +510,24 @@ def reload_ontology():
 
     Request body:
         ontology_path: Path to OWL ontology file
+        domain: Reload only this domain's validator (ontology_path then
+            defaults to the domain's configured ontology)
     """
-    data = request.get_json()
+    data = request.get_json() or {}
     ontology_path = data.get('ontology_path')
-    if not ontology_path:
+    domain = data.get('domain')
+    if not ontology_path and not domain:
         return jsonify({'error': 'ontology_path required'}), 400
 
-    if not os.path.exists(ontology_path):
+    if ontology_path and not os.path.exists(ontology_path):
         return jsonify({'error': f'File not found: {ontology_path}'}), 404
 
     try:
+        if domain:
+            if get_ontoguard_adapter().reload_domain(domain, ontology_path):
+                return jsonify({'status': 'ok', 'domain': domain, 'ontology': ontology_path}), 200
+            return jsonify({'error': f"Failed to reload domain '{domain}'"}), 500
+
         from ..security import initialize_ontoguard
         config = {'ontology_paths': [ontology_path]}
         if initialize_ontoguard(config):
@@ -1018,23 +1113,16 @@ def list_tables(agent_id: str):
         return jsonify({'error': 'Agent does not have a database connection'}), 400
     
     try:
-        # Get tables (database-specific query)
-        tables_query = """
-            SELECT table_schema, table_name, table_name as resource_id
-            FROM information_schema.tables
-            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
-            ORDER BY table_schema, table_name
-        """
-        tables_data = connector.execute_query(tables_query, as_dict=True)
+        # Tables come from the shared schema catalog (re-read only when changed)
+        catalog = get_schema_catalog().get(connector)
         
         # Get resource permissions
         resource_perms = access_control.get_resource_permissions(agent_id)
         
         tables = []
-        for row in tables_data or []:
-            schema = row.get('table_schema', 'public')
-            table_name = row.get('table_name')
-            resource_id = f"{schema}.{table_name}" if schema != 'public' else table_name
+        for resource_id, entry in catalog.tables.items():
+            schema = entry['schema']
+            table_name = entry['table']
             
             # Get permissions for this resource
             resource_info = resource_perms.get(resource_id, {})
@@ -1074,39 +1162,8 @@ def access_preview(agent_id: str):
         return jsonify({'error': 'Agent does not have a database connection'}), 400
     
     try:
-        # Get all tables
-        tables_query = """
-            SELECT table_schema, table_name
-            FROM information_schema.tables
-            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
-            ORDER BY table_schema, table_name
-        """
-        tables_data = connector.execute_query(tables_query, as_dict=True)
-        
-        # Get columns for all tables
-        columns_query = """
-            SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default, ordinal_position
-            FROM information_schema.columns
-            WHERE table_schema NOT IN ('pg_catalog', 'information_schema')
-            ORDER BY table_schema, table_name, ordinal_position
-        """
-        columns_data = connector.execute_query(columns_query, as_dict=True)
-        
-        # Organize columns by table
-        columns_by_table = {}
-        for col in columns_data or []:
-            schema = col.get('table_schema', 'public')
-            table_name = col.get('table_name')
-            key = f"{schema}.{table_name}" if schema != 'public' else table_name
-            if key not in columns_by_table:
-                columns_by_table[key] = []
-            columns_by_table[key].append({
-                'name': col.get('column_name'),
-                'type': col.get('data_type'),
-                'nullable': col.get('is_nullable') == 'YES',
-                'default': col.get('column_default'),
-                'position': col.get('ordinal_position')
-            })
+        # Tables and columns come from the shared schema catalog
+        catalog = get_schema_catalog().get(connector)
         
         # Get resource permissions
         resource_perms = access_control.get_resource_permissions(agent_id)
@@ -1114,16 +1171,15 @@ def access_preview(agent_id: str):
         accessible_tables = []
         inaccessible_tables = []
         
-        for row in tables_data or []:
-            schema = row.get('table_schema', 'public')
-            table_name = row.get('table_name')
-            resource_id = f"{schema}.{table_name}" if schema != 'public' else table_name
+        for resource_id, entry in catalog.tables.items():
+            schema = entry['schema']
+            table_name = entry['table']
             
             resource_info = resource_perms.get(resource_id, {})
             perms = resource_info.get('permissions', [])
             perm_values = [p.value for p in perms]
             
-            columns = columns_by_table.get(resource_id, [])
+            columns = entry['columns']
             
             table_info = {
                 'schema': schema,
@@ -1151,7 +1207,7 @@ def access_preview(agent_id: str):
             'agent_id': agent_id,
             'database': agent_registry.get_agent(agent_id).get('database', {}).get('connection_name', 'default'),
             'summary': {
-                'total_tables': len(tables_data or []),
+                'total_tables': len(catalog.tables),
                 'accessible_tables': len(accessible_tables),
                 'inaccessible_tables': len(inaccessible_tables),
                 'read_only_tables': read_only,
@@ -1271,51 +1327,45 @@ def execute_query(agent_id: str):
     query = data.get('query')
     params = data.get('params')
     as_dict = data.get('as_dict', False)
+    stream_format = data.get('stream')
+    if stream_format is True:
+        stream_format = 'ndjson'
 
     if not query:
         return jsonify({'error': 'query is required'}), 400
+    if stream_format and stream_format not in STREAM_FORMATS:
+        return jsonify({'error': f"stream must be one of: {', '.join(STREAM_FORMATS)}"}), 400
+    columnar_format = negotiate_columnar_format(request.headers.get('Accept'))
+    if columnar_format and not ARROW_AVAILABLE:
+        return jsonify({'error': 'Arrow/Parquet results require pyarrow on the server'}), 406
+
+    # Parse once; the result is shared by OntoGuard, permission checks and execution
+    parsed = parse_query(query)
 
     # OntoGuard semantic validation
     adapter = get_ontoguard_adapter()
     if adapter.is_active:
-        # Map SQL operation to semantic action
-        query_type = get_query_type(query)
-        action_map = {
-            QueryType.SELECT: 'read',
-            QueryType.INSERT: 'create',
-            QueryType.UPDATE: 'update',
-            QueryType.DELETE: 'delete'
-        }
-        action = action_map.get(query_type, 'query')
-
-        table_entity_map = get_table_entity_map()
-
-        # Get tables from query and validate each
-        tables = extract_tables_from_query(query)
+        action = QUERY_TYPE_ACTIONS.get(parsed.query_type, 'query')
+        tables = parsed.tables
         context = get_ontoguard_context()
 
-        for table in tables:
-            # Use mapping if available, otherwise convert automatically
-            table_lower = table.lower()
-            entity_type = table_entity_map.get(table_lower,
-                ''.join(word.capitalize() for word in table.replace('_', ' ').split()))
-
-            result = adapter.validate_action(action, entity_type, context)
-            if not result.allowed:
-                audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='denied',
-                                details={'query_preview': query[:100], 'ontoguard_denial': result.reason})
-                return jsonify({
-                    'error': 'Action denied by OntoGuard',
-                    'reason': result.reason,
-                    'table': table,
-                    'entity_type': entity_type,
-                    'action': action,
-                    'constraints': result.constraints,
-                    'suggestions': result.suggestions
-                }), 403
+        denial = _first_ontoguard_denial(adapter, [(action, table) for table in tables], context)
+        if denial:
+            index, entity_type, result = denial
+            audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='denied',
+                            details={'query_preview': query[:100], 'ontoguard_denial': result.reason})
+            return jsonify({
+                'error': 'Action denied by OntoGuard',
+                'reason': result.reason,
+                'table': tables[index],
+                'entity_type': entity_type,
+                'action': action,
+                'constraints': result.constraints,
+                'suggestions': result.suggestions
+            }), 403
 
     # Check permissions
-    has_permission, denied_resources = check_permissions(agent_id, query)
+    has_permission, denied_resources = check_permissions(agent_id, parsed)
     if not has_permission:
         audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='denied',
                         details={'query_preview': query[:100], 'denied_resources': denied_resources})
@@ -1330,18 +1380,30 @@ def execute_query(agent_id: str):
     if not connector:
         return jsonify({'error': 'Agent does not have a database connection'}), 400
 
-    try:
-        # Connect to database
-        connector.connect()
+    if columnar_format and parsed.query_type == QueryType.SELECT:
+        return columnar_query_response(agent_id, connector, parsed, params, columnar_format)
+    if stream_format and parsed.query_type == QueryType.SELECT:
+        return stream_query_response(agent_id, connector, parsed, params, as_dict, stream_format)
 
-        query_type = get_query_type(query)
+    try:
+        query_type = parsed.query_type
 
         # For non-SELECT queries (INSERT, UPDATE, DELETE), don't try to fetch results
         fetch_results = query_type == QueryType.SELECT
-        result = connector.execute_query(query, params=params, as_dict=as_dict, fetch=fetch_results)
+
+        def run_query():
+            connector.connect()
+            return connector.execute_query(query, params=params, as_dict=as_dict, fetch=fetch_results)
+
+        # Identical concurrent reads share one database round trip
+        flight_key = get_coalescing_key(agent_id, parsed, params, as_dict)
+        if flight_key:
+            result, _ = query_flight.do(flight_key, run_query)
+        else:
+            result = run_query()
         row_count = len(result) if result else 0
         
-        tables_accessed = list(extract_tables_from_query(query))
+        tables_accessed = list(parsed.tables)
         
         audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='success',
                         details={
@@ -1375,6 +1437,473 @@ def execute_query(agent_id: str):
             pass
 
 
+def stream_query_response(
+    agent_id: str,
+    connector: DatabaseConnector,
+    parsed: ParsedQuery,
+    params: Optional[Any],
+    as_dict: bool,
+    stream_format: str
+):
+    """
+    Stream a SELECT result as NDJSON lines or as a chunked JSON document.
+    
+    Rows are read through the connector's server-side cursor and written
+    STREAM_BATCH_SIZE rows at a time, so memory use does not grow with the
+    result size. The query runs (and its errors are reported as a 500)
+    before the response starts; a failure mid-stream ends the output with
+    an error object.
+    
+    Args:
+        agent_id: Agent identifier
+        connector: Database connector for the agent
+        parsed: Parsed SELECT query
+        params: Query parameters
+        as_dict: Whether rows are emitted as objects
+        stream_format: 'ndjson' or 'json'
+    
+    Returns:
+        Flask streaming response
+    """
+    query = parsed.text
+    tables_accessed = list(parsed.tables)
+    end = object()
+
+    try:
+        connector.connect()
+        rows = connector.stream_query(query, params=params, as_dict=as_dict, batch_size=STREAM_BATCH_SIZE)
+        first_row = next(rows, end)
+    except Exception as e:
+        audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='error',
+                        error_message=str(e), details={'query_preview': query[:100]})
+        try:
+            connector.disconnect()
+        except Exception:
+            pass
+        return jsonify({
+            'error': 'Query execution failed',
+            'message': str(e)
+        }), 500
+
+    dumps = current_app.json.dumps
+
+    def format_chunk(chunk: List[str], first: bool) -> str:
+        if stream_format == 'ndjson':
+            return '\n'.join(chunk) + '\n'
+        return ('' if first else ', ') + ', '.join(chunk)
+
+    def generate():
+        row_count = 0
+        error = None
+        chunk = []
+        first_chunk = True
+        try:
+            if stream_format == 'json':
+                header = dumps({
+                    'agent_id': agent_id,
+                    'query_type': parsed.query_type.value,
+                    'tables_accessed': tables_accessed
+                })
+                yield header[:-1] + ', "result": ['
+
+            all_rows = rows if first_row is end else itertools.chain([first_row], rows)
+            for row in all_rows:
+                chunk.append(dumps(row))
+                row_count += 1
+                if len(chunk) >= STREAM_BATCH_SIZE:
+                    yield format_chunk(chunk, first_chunk)
+                    first_chunk = False
+                    chunk = []
+        except Exception as e:
+            error = e
+        finally:
+            try:
+                connector.disconnect()
+            except Exception:
+                pass
+            audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id,
+                            status='error' if error else 'success',
+                            error_message=str(error) if error else None,
+                            details={
+                                'query_type': parsed.query_type.value,
+                                'tables_accessed': tables_accessed,
+                                'row_count': row_count,
+                                'query_preview': query[:100],
+                                'stream': stream_format
+                            })
+
+        # Rows fetched since the last full chunk (also before a failure)
+        if chunk:
+            yield format_chunk(chunk, first_chunk)
+
+        outcome = {'row_count': row_count, 'success': error is None}
+        if error:
+            outcome.update({'error': 'Query execution failed', 'message': str(error)})
+        if stream_format == 'json':
+            yield '], ' + dumps(outcome)[1:]
+        elif error:
+            yield dumps(outcome) + '\n'
+
+    response = Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[stream_format])
+    response.headers['X-Query-Type'] = parsed.query_type.value
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response, 200
+
+
+def columnar_query_response(
+    agent_id: str,
+    connector: DatabaseConnector,
+    parsed: ParsedQuery,
+    params: Optional[Any],
+    columnar_format: str,
+    action_type: ActionType = ActionType.QUERY_EXECUTION,
+    audit_details: Optional[Dict[str, Any]] = None
+):
+    """
+    Return a SELECT result as an Arrow IPC stream or a Parquet file.
+    
+    Connectors with a native Arrow fetch path (BigQuery, Snowflake) return
+    an Arrow table directly; for the others rows are read through the
+    server-side cursor and converted STREAM_BATCH_SIZE rows at a time.
+    Arrow output is streamed batch by batch; Parquet needs its footer
+    written last, so it is sent once encoded.
+    
+    Args:
+        agent_id: Agent identifier
+        connector: Database connector for the agent
+        parsed: Parsed SELECT query
+        params: Query parameters
+        columnar_format: 'arrow' or 'parquet'
+        action_type: Audit action to record
+        audit_details: Extra details for the audit entry
+    
+    Returns:
+        Flask response
+    """
+    query = parsed.text
+    tables_accessed = list(parsed.tables)
+    row_count = 0
+
+    def count_rows(batches):
+        nonlocal row_count
+        for batch in batches:
+            row_count += batch.num_rows
+            yield batch
+
+    def disconnect():
+        try:
+            connector.disconnect()
+        except Exception:
+            pass
+
+    def audit(error: Optional[Exception] = None):
+        details = {
+            'query_type': parsed.query_type.value,
+            'tables_accessed': tables_accessed,
+            'row_count': row_count,
+            'query_preview': query[:100],
+            'format': columnar_format
+        }
+        details.update(audit_details or {})
+        audit_logger.log(action_type, agent_id=agent_id,
+                        status='error' if error else 'success',
+                        error_message=str(error) if error else None,
+                        details=details)
+
+    try:
+        connector.connect()
+        table = connector.fetch_arrow(query, params)
+        if table is not None:
+            batches = count_rows(table.to_batches(max_chunksize=STREAM_BATCH_SIZE))
+            schema = table.schema
+        else:
+            rows = connector.stream_query(query, params=params, as_dict=True, batch_size=STREAM_BATCH_SIZE)
+            batches = count_rows(rows_to_record_batches(rows, STREAM_BATCH_SIZE))
+            schema = None
+
+        if columnar_format == 'parquet':
+            body = to_parquet_bytes(batches)
+        else:
+            chunks = iter_arrow_stream(batches, empty_schema=schema)
+            # Run the query up to the first batches so failures are still a 500
+            first_chunk = next(chunks)
+    except Exception as e:
+        disconnect()
+        audit(e)
+        return jsonify({
+            'error': 'Query execution failed',
+            'message': str(e)
+        }), 500
+
+    if columnar_format == 'parquet':
+        disconnect()
+        audit()
+        response = Response(body, mimetype=COLUMNAR_FORMATS['parquet'])
+    else:
+        def generate():
+            error = None
+            try:
+                yield first_chunk
+                yield from chunks
+            except Exception as e:
+                # The stream is left without its end marker, which readers report
+                error = e
+            finally:
+                disconnect()
+                audit(error)
+
+        response = Response(stream_with_context(generate()), mimetype=COLUMNAR_FORMATS['arrow'])
+        response.headers['X-Accel-Buffering'] = 'no'
+    response.headers['X-Query-Type'] = parsed.query_type.value
+    return response, 200
+
+
+@api_bp.route('/agents/<agent_id>/query/batch', methods=['POST'])
+def execute_query_batch(agent_id: str):
+    """
+    Execute several SQL statements in one request.
+
+    All statements are validated (OntoGuard and permissions, each distinct
+    table checked once) before any is executed. Statements then run in order
+    on one connection, or concurrently on separate pooled connections when
+    "parallel" is set and every statement is a read. The rate limit is
+    charged once per execution (each params_list entry counts) up front;
+    params_list is only accepted on write statements. With stop_on_error,
+    a sequential batch stops at the first failure; a parallel one cancels
+    the statements that have not started yet and reports them as skipped.
+
+    Body JSON:
+        {
+            "queries": ["SELECT ...", {"query": "...", "params": [...]},
+                        {"query": "INSERT ...", "params_list": [[...], [...]]}],
+            "as_dict": false,
+            "parallel": false,
+            "stop_on_error": false
+        }
+    """
+    agent_id_from_auth = authenticate_agent()
+    if not agent_id_from_auth or agent_id_from_auth != agent_id:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    if not agent_registry.get_agent(agent_id):
+        return jsonify({'error': f'Agent {agent_id} not found'}), 404
+
+    data = request.get_json() or {}
+    items = data.get('queries')
+    as_dict = data.get('as_dict', False)
+    parallel = bool(data.get('parallel', False))
+    stop_on_error = bool(data.get('stop_on_error', False))
+
+    if not items or not isinstance(items, list):
+        return jsonify({'error': 'queries must be a non-empty list'}), 400
+    if len(items) > MAX_BATCH_STATEMENTS:
+        return jsonify({'error': f'A batch may contain at most {MAX_BATCH_STATEMENTS} statements'}), 400
+
+    statements = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'query': item}
+        if not isinstance(item, dict) or not item.get('query'):
+            return jsonify({'error': f'Statement {index}: query is required'}), 400
+        params_list = item.get('params_list')
+        if params_list is not None and not isinstance(params_list, list):
+            return jsonify({'error': f'Statement {index}: params_list must be a list'}), 400
+        parsed = parse_query(item['query'])
+        if params_list is not None and not parsed.requires_write:
+            return jsonify({'error': f'Statement {index}: params_list is only supported for write statements'}), 400
+        statements.append({
+            'index': index,
+            'query': item['query'],
+            'params': item.get('params'),
+            'params_list': params_list,
+            'parsed': parsed,
+            # execute_many runs a write once per parameter set
+            'executions': len(params_list) if params_list is not None else 1
+        })
+
+    executions = sum(statement['executions'] for statement in statements)
+    if executions > MAX_BATCH_EXECUTIONS:
+        return jsonify({'error': f'A batch may run at most {MAX_BATCH_EXECUTIONS} statement executions'}), 400
+
+    # Rate limit check, charged per execution before anything runs
+    allowed, error_msg = check_rate_limit(agent_id, cost=executions)
+    if not allowed:
+        audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='rate_limited',
+                        details={'error': error_msg, 'query_type': 'batch', 'executions': executions})
+        return jsonify({
+            'error': 'Rate limit exceeded',
+            'message': error_msg,
+            'retry_after': 60
+        }), 429
+
+    # OntoGuard semantic validation, once per distinct (action, table)
+    adapter = get_ontoguard_adapter()
+    if adapter.is_active:
+        context = get_ontoguard_context()
+        # (action, table) -> first statement that needs it
+        owners = {}
+        for statement in statements:
+            action = QUERY_TYPE_ACTIONS.get(statement['parsed'].query_type, 'query')
+            for table in statement['parsed'].tables:
+                owners.setdefault((action, table), statement)
+        checks = list(owners)
+
+        denial = _first_ontoguard_denial(adapter, checks, context)
+        if denial:
+            index, entity_type, result = denial
+            statement = owners[checks[index]]
+            audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='denied',
+                            details={'query_preview': statement['query'][:100],
+                                     'statement_index': statement['index'],
+                                     'ontoguard_denial': result.reason})
+            return jsonify({
+                'error': 'Action denied by OntoGuard',
+                'statement_index': statement['index'],
+                'reason': result.reason,
+                'table': checks[index][1],
+                'entity_type': entity_type,
+                'action': checks[index][0],
+                'constraints': result.constraints,
+                'suggestions': result.suggestions
+            }), 403
+
+    # Check permissions, once per distinct (table, permission)
+    checked = {}
+    for statement in statements:
+        has_permission, denied_resources = check_permissions(agent_id, statement['parsed'], checked)
+        if not has_permission:
+            audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='denied',
+                            details={'query_preview': statement['query'][:100],
+                                     'statement_index': statement['index'],
+                                     'denied_resources': denied_resources})
+            return jsonify({
+                'error': 'Permission denied',
+                'statement_index': statement['index'],
+                'denied_resources': denied_resources,
+                'message': 'Agent lacks required permissions on one or more resources'
+            }), 403
+
+    # Only pure-read batches run concurrently; writes keep statement order
+    parallel = parallel and len(statements) > 1 and all(
+        s['parsed'].query_type == QueryType.SELECT for s in statements
+    )
+
+    if parallel:
+        # Each statement borrows its own connector when it runs
+        if agent_registry.get_database_scope(agent_id) is None:
+            return jsonify({'error': 'Agent does not have a database connection'}), 400
+    else:
+        connector = agent_registry.get_database_connector(agent_id)
+        if not connector:
+            return jsonify({'error': 'Agent does not have a database connection'}), 400
+
+    def run_statement(statement: Dict[str, Any], statement_connector: DatabaseConnector) -> Dict[str, Any]:
+        parsed = statement['parsed']
+        query = statement['query']
+        try:
+            if statement['params_list'] is not None and parsed.requires_write:
+                statement_connector.execute_many(query, statement['params_list'])
+                result = None
+                row_count = len(statement['params_list'])
+            else:
+                def run_query():
+                    return statement_connector.execute_query(
+                        query, params=statement['params'], as_dict=as_dict,
+                        fetch=parsed.query_type == QueryType.SELECT
+                    )
+
+                flight_key = get_coalescing_key(agent_id, parsed, statement['params'], as_dict)
+                if flight_key:
+                    result, _ = query_flight.do(flight_key, run_query)
+                else:
+                    result = run_query()
+                row_count = len(result) if result else 0
+        except Exception as e:
+            audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='error',
+                            error_message=str(e),
+                            details={'query_preview': query[:100], 'statement_index': statement['index']})
+            return {'index': statement['index'], 'success': False,
+                    'error': 'Query execution failed', 'message': str(e)}
+
+        tables_accessed = list(parsed.tables)
+        audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='success',
+                        details={
+                            'query_type': parsed.query_type.value,
+                            'tables_accessed': tables_accessed,
+                            'row_count': row_count,
+                            'query_preview': query[:100],
+                            'statement_index': statement['index']
+                        })
+        return {
+            'index': statement['index'],
+            'success': True,
+            'query_type': parsed.query_type.value,
+            'tables_accessed': tables_accessed,
+            'result': result,
+            'row_count': row_count
+        }
+
+    def run_on_own_connection(statement: Dict[str, Any]) -> Dict[str, Any]:
+        statement_connector = agent_registry.get_database_connector(agent_id)
+        try:
+            statement_connector.connect()
+            return run_statement(statement, statement_connector)
+        except Exception as e:
+            return {'index': statement['index'], 'success': False,
+                    'error': 'Query execution failed', 'message': str(e)}
+        finally:
+            try:
+                statement_connector.disconnect()
+            except Exception:
+                pass
+
+    results = []
+    if parallel:
+        with ThreadPoolExecutor(max_workers=min(MAX_BATCH_WORKERS, len(statements))) as executor:
+            futures = [executor.submit(run_on_own_connection, statement) for statement in statements]
+            if stop_on_error:
+                for future in as_completed(futures):
+                    if not future.result()['success']:
+                        for pending in futures:
+                            pending.cancel()
+                        break
+        results = [
+            {'index': statement['index'], 'success': False, 'skipped': True,
+             'error': 'Skipped after an earlier statement failed'}
+            if future.cancelled() else future.result()
+            for statement, future in zip(statements, futures)
+        ]
+    else:
+        try:
+            connector.connect()
+            for statement in statements:
+                outcome = run_statement(statement, connector)
+                results.append(outcome)
+                if stop_on_error and not outcome['success']:
+                    break
+        except Exception as e:
+            audit_logger.log(ActionType.QUERY_EXECUTION, agent_id=agent_id, status='error',
+                            error_message=str(e), details={'query_type': 'batch'})
+            return jsonify({
+                'error': 'Query execution failed',
+                'message': str(e)
+            }), 500
+        finally:
+            try:
+                connector.disconnect()
+            except Exception:
+                pass
+
+    return jsonify({
+        'agent_id': agent_id,
+        'success': len(results) == len(statements) and all(r['success'] for r in results),
+        'parallel': parallel,
+        'statement_count': len(statements),
+        'executed_count': sum(1 for r in results if not r.get('skipped')),
+        'results': results
+    }), 200
+
+
 @api_bp.route('/agents/<agent_id>/query/natural', methods=['POST'])
 def natural_language_query(agent_id: str):
     """Execute a natural language query with rate limiting and OntoGuard validation"""
@@ -1408,8 +1937,11 @@ def natural_language_query(agent_id: str):
         return jsonify({'error': 'Agent does not have a database connection'}), 400
     
     try:
-        # Convert natural language to SQL
-        conversion_result = nl_converter.convert_with_schema(query, connector)
+        # Convert natural language to SQL (prompt limited to the relevant tables)
+        adapter = get_ontoguard_adapter()
+        context = get_ontoguard_context()
+        concepts = adapter.get_table_entity_map(context.get('domain')) if adapter.is_active else None
+        conversion_result = nl_converter.convert_with_schema(query, connector, concepts=concepts)
         
         if conversion_result.get('error') or not conversion_result.get('sql'):
             return jsonify({
@@ -1418,46 +1950,32 @@ def natural_language_query(agent_id: str):
             }), 400
         
         generated_sql = conversion_result['sql']
+        parsed = parse_query(generated_sql)
 
         # OntoGuard semantic validation on generated SQL
-        adapter = get_ontoguard_adapter()
         if adapter.is_active:
-            query_type = get_query_type(generated_sql)
-            action_map = {
-                QueryType.SELECT: 'read',
-                QueryType.INSERT: 'create',
-                QueryType.UPDATE: 'update',
-                QueryType.DELETE: 'delete'
-            }
-            action = action_map.get(query_type, 'query')
-
-            table_entity_map = get_table_entity_map()
-
-            tables = extract_tables_from_query(generated_sql)
-            context = get_ontoguard_context()
-
-            for table in tables:
-                table_lower = table.lower()
-                entity_type = table_entity_map.get(table_lower,
-                    ''.join(word.capitalize() for word in table.replace('_', ' ').split()))
-                result = adapter.validate_action(action, entity_type, context)
-                if not result.allowed:
-                    audit_logger.log(ActionType.NATURAL_LANGUAGE_QUERY, agent_id=agent_id, status='denied',
-                                    details={'query': query, 'generated_sql': generated_sql, 'ontoguard_denial': result.reason})
-                    return jsonify({
-                        'error': 'Action denied by OntoGuard',
-                        'reason': result.reason,
-                        'table': table,
-                        'entity_type': entity_type,
-                        'action': action,
-                        'natural_language_query': query,
-                        'generated_sql': generated_sql,
-                        'constraints': result.constraints,
-                        'suggestions': result.suggestions
-                    }), 403
+            action = QUERY_TYPE_ACTIONS.get(parsed.query_type, 'query')
+            tables = parsed.tables
+
+            denial = _first_ontoguard_denial(adapter, [(action, table) for table in tables], context)
+            if denial:
+                index, entity_type, result = denial
+                audit_logger.log(ActionType.NATURAL_LANGUAGE_QUERY, agent_id=agent_id, status='denied',
+                                details={'query': query, 'generated_sql': generated_sql, 'ontoguard_denial': result.reason})
+                return jsonify({
+                    'error': 'Action denied by OntoGuard',
+                    'reason': result.reason,
+                    'table': tables[index],
+                    'entity_type': entity_type,
+                    'action': action,
+                    'natural_language_query': query,
+                    'generated_sql': generated_sql,
+                    'constraints': result.constraints,
+                    'suggestions': result.suggestions
+                }), 403
 
         # Check permissions on generated SQL
-        has_permission, denied_resources = check_permissions(agent_id, generated_sql)
+        has_permission, denied_resources = check_permissions(agent_id, parsed)
         if not has_permission:
             audit_logger.log(ActionType.NATURAL_LANGUAGE_QUERY, agent_id=agent_id, status='denied',
                             details={'query': query, 'generated_sql': generated_sql, 'denied_resources': denied_resources})
@@ -1468,13 +1986,21 @@ def natural_language_query(agent_id: str):
                 'natural_language_query': query
             }), 403
         
-        # Execute query
-        connector.connect()
-        query_type = get_query_type(generated_sql)
-        result = connector.execute_query(generated_sql, as_dict=as_dict)
+        # Execute query (identical concurrent reads share one round trip)
+        query_type = parsed.query_type
+
+        def run_query():
+            connector.connect()
+            return connector.execute_query(generated_sql, as_dict=as_dict)
+
+        flight_key = get_coalescing_key(agent_id, parsed, as_dict=as_dict)
+        if flight_key:
+            result, _ = query_flight.do(flight_key, run_query)
+        else:
+            result = run_query()
         row_count = len(result) if result else 0
         
-        tables_accessed = list(extract_tables_from_query(generated_sql))
+        tables_accessed = list(parsed.tables)
         
         audit_logger.log(ActionType.NATURAL_LANGUAGE_QUERY, agent_id=agent_id, status='success',
                         details={
@@ -1514,6 +2040,12 @@ def natural_language_query(agent_id: str):
             'message': str(e),
             'natural_language_query': query
         }), 500
+    finally:
+        # Return the connection (to the shared pool when pooling is enabled)
+        try:
+            connector.disconnect()
+        except Exception:
+            pass
 
 
 # ============================================================================
@@ -1533,6 +2065,8 @@ def get_audit_logs():
     - end_date: Filter by end date (ISO format)
     - limit: Max logs to return (default: 100)
     - offset: Pagination offset (default: 0)
+    - cursor: Keyset cursor (next_cursor of the previous page); replaces offset
+    - include_total: Count all matching logs (default: true, false with cursor)
     """
     agent_id = request.args.get('agent_id')
     action_type = request.args.get('action_type')
@@ -1541,6 +2075,8 @@ def get_audit_logs():
     end_date_str = request.args.get('end_date')
     limit = int(request.args.get('limit', 100))
     offset = int(request.args.get('offset', 0))
+    cursor = request.args.get('cursor')
+    include_total = request.args.get('include_total', 'false' if cursor else 'true').lower() == 'true'
 
     # Parse dates
     start_date = None
@@ -1556,15 +2092,20 @@ def get_audit_logs():
         except ValueError:
             return jsonify({'error': 'Invalid end_date format (use ISO format)'}), 400
 
-    result = audit_logger.get_logs(
-        agent_id=agent_id,
-        action_type=action_type,
-        status=status,
-        start_date=start_date,
-        end_date=end_date,
-        limit=limit,
-        offset=offset
-    )
+    try:
+        result = audit_logger.get_logs(
+            agent_id=agent_id,
+            action_type=action_type,
+            status=status,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     return jsonify({
         'status': 'ok',
@@ -1572,6 +2113,7 @@ def get_audit_logs():
         'total': result['total'],
         'limit': result['limit'],
         'offset': result['offset'],
+        'next_cursor': result['next_cursor'],
         'has_more': result['has_more'],
         'backend': audit_logger.backend_type
     }), 200
@@ -1662,7 +2204,8 @@ def get_audit_config():
         'status': 'ok',
         'backend': audit_logger.backend_type,
         'max_logs': audit_logger.max_logs,
-        'action_types': [at.value for at in ActionType]
+        'action_types': [at.value for at in ActionType],
+        'writer': audit_logger.get_writer_stats()
     }), 200
 
 
@@ -2842,22 +3385,26 @@ def execute_ai_agent_query(agent_id: str):
 # Schema Drift Detection Endpoints
 # ============================================================
 
-# Module-level detector instance
-_schema_drift_detector: Optional[SchemaDriftDetector] = None
+# Whether config/schema_bindings.yaml has been loaded into the shared detector
+_schema_bindings_loaded = False
 
 
 def get_schema_drift_detector() -> SchemaDriftDetector:
-    """Get or create the schema drift detector singleton."""
-    global _schema_drift_detector
-    if _schema_drift_detector is None:
-        _schema_drift_detector = SchemaDriftDetector()
+    """
+    Get the shared schema drift detector (also used by the policy engine),
+    loading the configured bindings on first use.
+    """
+    global _schema_bindings_loaded
+    detector = get_shared_schema_drift_detector()
+    if not _schema_bindings_loaded:
+        _schema_bindings_loaded = True
         config_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))),
             'config', 'schema_bindings.yaml'
         )
         if os.path.exists(config_path):
-            _schema_drift_detector.load_bindings(config_path)
-    return _schema_drift_detector
+            detector.load_bindings(config_path)
+    return detector
 
 
 @api_bp.route('/schema/drift-check', methods=['GET'])
@@ -2988,8 +3535,10 @@ def schema_drift_check_live():
         drift_reports = detector.check_live(connector, entities)
 
         reports = []
+        status_table = get_drift_status_table()
         for report in drift_reports:
             fixes = detector.suggest_fixes(report) if report.has_drift else []
+            status_table.update(agent_id, report, fixes)
             reports.append({
                 **report.to_dict(),
                 'fixes': [f.to_dict() for f in fixes],
@@ -3011,6 +3560,100 @@ def schema_drift_check_live():
             pass
 
 
+# Background drift watchers, one per agent database
+_drift_watchers: Dict[str, SchemaDriftWatcher] = {}
+
+
+@api_bp.route('/schema/drift-watch', methods=['POST'])
+def start_schema_drift_watch():
+    """
+    Watch an agent's database for schema drift in the background.
+
+    The watcher polls the schema catalog's version markers, backing off
+    while nothing changes, and pushes schema_drift_detected WebSocket
+    events as soon as drift appears.
+
+    Body JSON:
+        {
+            "agent_id": "doctor-1",
+            "min_interval": 5,    // optional, seconds
+            "max_interval": 300,  // optional, seconds
+            "listen": true        // optional, wake on PostgreSQL NOTIFY
+                                  // (requires the DDL event trigger)
+        }
+
+    Requires X-API-Key header for agent authentication.
+    """
+    agent_id_from_auth = authenticate_agent()
+    if not agent_id_from_auth:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    data = request.get_json() or {}
+    agent_id = data.get('agent_id', agent_id_from_auth)
+
+    if not agent_registry.get_agent(agent_id):
+        return jsonify({'error': f'Agent {agent_id} not found'}), 404
+    if not agent_registry.get_database_connector(agent_id):
+        return jsonify({'error': 'Agent does not have a database connection'}), 400
+
+    try:
+        min_interval = float(data.get('min_interval', 5.0))
+        max_interval = float(data.get('max_interval', 300.0))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'min_interval and max_interval must be numbers'}), 400
+    if min_interval <= 0 or max_interval < min_interval:
+        return jsonify({'error': 'Require 0 < min_interval <= max_interval'}), 400
+
+    previous = _drift_watchers.pop(agent_id, None)
+    if previous:
+        previous.stop()
+
+    watcher = SchemaDriftWatcher(
+        get_schema_drift_detector(),
+        lambda: agent_registry.get_database_connector(agent_id),
+        agent_id,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        listen_channel=SCHEMA_CHANGE_CHANNEL if data.get('listen') else None,
+    )
+    _drift_watchers[agent_id] = watcher
+    watcher.start()
+
+    return jsonify({
+        'status': 'watching',
+        'agent_id': agent_id,
+        'watcher': watcher.get_stats(),
+    }), 200
+
+
+@api_bp.route('/schema/drift-watch', methods=['GET'])
+def get_schema_drift_watch():
+    """Drift status of every watched entity and the running watchers."""
+    statuses = get_drift_status_table().all()
+    return jsonify({
+        'watchers': {agent_id: w.get_stats() for agent_id, w in _drift_watchers.items()},
+        'statuses': [s.to_dict() for s in statuses],
+        'critical': [
+            {'agent_id': s.scope, 'entity': s.entity}
+            for s in statuses if s.severity == 'CRITICAL'
+        ],
+    }), 200
+
+
+@api_bp.route('/schema/drift-watch/<agent_id>', methods=['DELETE'])
+def stop_schema_drift_watch(agent_id: str):
+    """Stop watching an agent's database."""
+    agent_id_from_auth = authenticate_agent()
+    if not agent_id_from_auth:
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    watcher = _drift_watchers.pop(agent_id, None)
+    if not watcher:
+        return jsonify({'error': f'No drift watcher for agent {agent_id}'}), 404
+    watcher.stop()
+    return jsonify({'status': 'stopped', 'agent_id': agent_id}), 200
+
+
 @api_bp.route('/schema/bindings', methods=['GET'])
 def list_schema_bindings():
     """List all schema bindings."""
@@ -3144,7 +3787,8 @@ def revoke_drift_approval(entity: str):
 @api_bp.route('/cache/stats', methods=['GET'])
 def get_cache_stats():
     """
-    Get validation cache statistics.
+    Get validation cache, connection pool cache, query coalescing, schema
+    catalog and NL-to-SQL translation cache statistics.
 
     Returns:
         JSON with cache statistics (hits, misses, hit_rate, size, etc.)
@@ -3155,6 +3799,10 @@ def get_cache_stats():
         return jsonify({
             'status': 'ok',
             'cache': stats,
+            'connection_pools': agent_registry.get_connection_pool_stats(),
+            'query_coalescing': query_flight.get_stats(),
+            'schema_catalog': get_schema_catalog().get_stats(),
+            'nl_to_sql': nl_converter.translation_cache.get_stats(),
         })
     except ImportError:
         return jsonify({
@@ -3282,7 +3930,8 @@ def list_rate_limits():
         'status': 'ok',
         'default_limits': DEFAULT_RATE_LIMIT.to_dict(),
         'agent_limits': limits,
-        'total_agents': len(limits)
+        'total_agents': len(limits),
+        'store': rate_limiter.get_store_stats()
     })
 
 
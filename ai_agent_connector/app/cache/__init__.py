@@ -11,7 +11,9 @@ from .validation_cache import (
     get_validation_cache,
     init_validation_cache,
     cache_validation_result,
+    cache_validation_results,
     get_cached_validation,
+    get_cached_validations,
     invalidate_cache,
     get_cache_stats,
     cached_validation,
@@ -24,7 +26,9 @@ __all__ = [
     'get_validation_cache',
     'init_validation_cache',
     'cache_validation_result',
+    'cache_validation_results',
     'get_cached_validation',
+    'get_cached_validations',
     'invalidate_cache',
     'get_cache_stats',
     'cached_validation',
@@ -5,14 +5,14 @@ Provides LRU in-memory cache with optional Redis backend for distributed caching
 Reduces latency for repeated validation requests.
 """
 
-import hashlib
 import json
 import logging
 import time
 from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Any, Dict, Optional, Tuple
-from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+from threading import Event, Lock, Thread
+from urllib.parse import quote, unquote
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -52,6 +52,7 @@ class CacheStats:
     max_size: int = 0
     evictions: int = 0
     expired: int = 0
+    redis_hits: int = 0
 
     @property
     def hit_rate(self) -> float:
@@ -69,9 +70,18 @@ class CacheStats:
             'max_size': self.max_size,
             'evictions': self.evictions,
             'expired': self.expired,
+            'redis_hits': self.redis_hits,
         }
 
 
+MemoryKey = Tuple[str, str, str, str]
+
+
+def _quote(part: str) -> str:
+    """Escape a key part so ':' and '.' can separate Redis key fields."""
+    return quote(part, safe='')
+
+
 class ValidationCache:
     """
     LRU cache for OntoGuard validation results.
@@ -83,7 +93,15 @@ class ValidationCache:
     - Optional Redis backend for distributed caching
     - Cache statistics tracking
 
-    Cache key format: hash(action:entity_type:role:domain)
+    Memory key format: (action, entity_type, role, domain), lowercased.
+
+    Redis key format: {prefix}v{global}.{domain_gen}.{role_gen}:domain:role:action:entity_type.
+    Invalidating a domain or role increments its generation counter, so
+    entries written under the old generation are never read again; they are
+    deleted by a background SCAN sweep or expire on their own. With Redis
+    configured, the memory tier acts as a read-through L1 whose entries (and
+    generation lookups) live for at most l1_ttl seconds, which bounds how long
+    another worker's invalidation takes to be seen here.
     """
 
     def __init__(
@@ -93,6 +111,10 @@ class ValidationCache:
         redis_url: Optional[str] = None,
         redis_prefix: str = "uac:validation:",
         enabled: bool = True,
+        l1_ttl: float = 5.0,
+        redis_client: Optional[Any] = None,
+        background_sweep: bool = True,
+        sweep_batch: int = 500,
     ):
         """
         Initialize validation cache.
@@ -103,20 +125,35 @@ class ValidationCache:
             redis_url: Optional Redis URL for distributed caching
             redis_prefix: Prefix for Redis keys
             enabled: Whether caching is enabled
+            l1_ttl: Maximum lifetime in seconds of memory entries and
+                generation lookups when Redis is configured
+            redis_client: Existing Redis client (takes precedence over redis_url)
+            background_sweep: Delete superseded Redis keys in a background
+                thread after each generation bump
+            sweep_batch: SCAN count hint and delete batch size for sweeps
         """
         self.max_size = max_size
         self.default_ttl = default_ttl
         self.redis_prefix = redis_prefix
         self.enabled = enabled
+        self.l1_ttl = l1_ttl
+        self.background_sweep = background_sweep
+        self.sweep_batch = sweep_batch
 
         # In-memory LRU cache (OrderedDict maintains insertion order)
-        self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._cache: OrderedDict[MemoryKey, CacheEntry] = OrderedDict()
         self._lock = Lock()
         self._stats = CacheStats(max_size=max_size)
 
+        # Generation counters read from Redis: (domain, role) -> (expires_at, generations)
+        self._generations: Dict[Tuple[str, str], Tuple[float, Tuple[int, int, int]]] = {}
+        self._sweep_event = Event()
+        self._sweep_thread: Optional[Thread] = None
+        self._closed = False
+
         # Optional Redis backend
-        self._redis: Optional[Any] = None
-        if redis_url and REDIS_AVAILABLE:
+        self._redis: Optional[Any] = redis_client
+        if self._redis is None and redis_url and REDIS_AVAILABLE:
             try:
                 self._redis = redis.from_url(redis_url)
                 self._redis.ping()
@@ -131,7 +168,7 @@ class ValidationCache:
         entity_type: str,
         role: Optional[str] = None,
         domain: Optional[str] = None,
-    ) -> str:
+    ) -> MemoryKey:
         """
         Generate cache key from validation parameters.
 
@@ -142,16 +179,52 @@ class ValidationCache:
             domain: Domain name (optional)
 
         Returns:
-            Hashed cache key
+            Tuple of (action, entity_type, role, domain), lowercased
         """
-        key_parts = [
+        return (
             action.lower(),
             entity_type.lower(),
             (role or '').lower(),
             (domain or 'default').lower(),
-        ]
-        key_str = ':'.join(key_parts)
-        return hashlib.sha256(key_str.encode()).hexdigest()[:32]
+        )
+
+    def _generation_keys(self, domain: str, role: str) -> Tuple[str, str, str]:
+        """Redis keys of the global, domain and role generation counters."""
+        return (
+            f"{self.redis_prefix}gen",
+            f"{self.redis_prefix}gen:domain:{_quote(domain)}",
+            f"{self.redis_prefix}gen:role:{_quote(role)}",
+        )
+
+    def _read_generations(self, domain: str, role: str) -> Tuple[int, int, int]:
+        """Read current generation counters from Redis."""
+        values = self._redis.mget(self._generation_keys(domain, role))
+        return tuple(int(value or 0) for value in values)
+
+    def _current_generations(self, domain: str, role: str) -> Tuple[int, int, int]:
+        """Generation counters for a domain and role, cached for l1_ttl seconds."""
+        now = time.time()
+        cached = self._generations.get((domain, role))
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        generations = self._read_generations(domain, role)
+        if len(self._generations) >= self.max_size:
+            self._generations.clear()
+        self._generations[(domain, role)] = (now + self.l1_ttl, generations)
+        return generations
+
+    def _redis_key(self, key: MemoryKey) -> str:
+        """Versioned Redis key for a memory key."""
+        action, entity_type, role, domain = key
+        version = '.'.join(str(g) for g in self._current_generations(domain, role))
+        return (
+            f"{self.redis_prefix}v{version}:{_quote(domain)}:{_quote(role)}:"
+            f"{_quote(action)}:{_quote(entity_type)}"
+        )
+
+    def _memory_ttl(self, ttl: float) -> float:
+        """TTL for a memory entry; capped at l1_ttl when Redis is the shared tier."""
+        return min(ttl, self.l1_ttl) if self._redis else ttl
 
     def get(
         self,
@@ -178,41 +251,83 @@ class ValidationCache:
         key = self._make_key(action, entity_type, role, domain)
 
         # Try memory cache first
-        with self._lock:
-            if key in self._cache:
-                entry = self._cache[key]
-                if entry.is_expired:
-                    del self._cache[key]
-                    self._stats.expired += 1
-                    self._stats.misses += 1
-                    self._stats.size = len(self._cache)
-                else:
-                    # Move to end (most recently used)
-                    self._cache.move_to_end(key)
-                    entry.touch()
-                    self._stats.hits += 1
-                    logger.debug(f"Cache HIT: {key[:8]}... (hits: {entry.hits})")
-                    return entry.value
-            else:
-                self._stats.misses += 1
+        value = self._get_memory(key)
+        if value is not None:
+            return value
 
         # Try Redis if available
         if self._redis:
             try:
-                redis_key = f"{self.redis_prefix}{key}"
-                data = self._redis.get(redis_key)
+                data = self._redis.get(self._redis_key(key))
                 if data:
-                    value = json.loads(data)
-                    # Populate memory cache
-                    self._set_memory(key, value, self.default_ttl)
-                    self._stats.hits += 1
-                    logger.debug(f"Redis cache HIT: {key[:8]}...")
-                    return value
+                    return self._promote(key, data)
             except Exception as e:
                 logger.warning(f"Redis get error: {e}")
 
+        with self._lock:
+            self._stats.misses += 1
         return None
 
+    def get_many(
+        self,
+        keys: List[Tuple[str, str, Optional[str], Optional[str]]],
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get several cached validation results with one Redis round trip.
+
+        Args:
+            keys: (action, entity_type, role, domain) tuples
+
+        Returns:
+            Cached result or None for each key, in order
+        """
+        if not self.enabled:
+            return [None] * len(keys)
+
+        memory_keys = [self._make_key(*key) for key in keys]
+        results: List[Optional[Dict[str, Any]]] = [self._get_memory(key) for key in memory_keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+
+        if missing and self._redis:
+            try:
+                values = self._redis.mget([self._redis_key(memory_keys[i]) for i in missing])
+                for i, data in zip(missing, values):
+                    if data:
+                        results[i] = self._promote(memory_keys[i], data)
+                missing = [i for i in missing if results[i] is None]
+            except Exception as e:
+                logger.warning(f"Redis mget error: {e}")
+
+        with self._lock:
+            self._stats.misses += len(missing)
+        return results
+
+    def _get_memory(self, key: MemoryKey) -> Optional[Dict[str, Any]]:
+        """Look up the memory tier, counting a hit when found."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry.is_expired:
+                del self._cache[key]
+                self._stats.expired += 1
+                self._stats.size = len(self._cache)
+                return None
+            # Move to end (most recently used)
+            self._cache.move_to_end(key)
+            entry.touch()
+            self._stats.hits += 1
+            return entry.value
+
+    def _promote(self, key: MemoryKey, data: Any) -> Dict[str, Any]:
+        """Decode a Redis hit and copy it into the memory tier."""
+        value = json.loads(data)
+        self._set_memory(key, value, self._memory_ttl(self.default_ttl))
+        with self._lock:
+            self._stats.hits += 1
+            self._stats.redis_hits += 1
+        return value
+
     def set(
         self,
         action: str,
@@ -240,18 +355,46 @@ class ValidationCache:
         ttl = ttl or self.default_ttl
 
         # Set in memory cache
-        self._set_memory(key, value, ttl)
+        self._set_memory(key, value, self._memory_ttl(ttl))
 
         # Set in Redis if available
         if self._redis:
             try:
-                redis_key = f"{self.redis_prefix}{key}"
-                self._redis.setex(redis_key, int(ttl), json.dumps(value))
-                logger.debug(f"Redis cache SET: {key[:8]}...")
+                self._redis.setex(self._redis_key(key), max(1, int(ttl)), json.dumps(value))
+            except Exception as e:
+                logger.warning(f"Redis set error: {e}")
+
+    def set_many(
+        self,
+        items: List[Tuple[str, str, Dict[str, Any], Optional[str], Optional[str]]],
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Cache several validation results, writing to Redis in one pipeline.
+
+        Args:
+            items: (action, entity_type, value, role, domain) tuples
+            ttl: TTL in seconds (uses default if not specified)
+        """
+        if not self.enabled or not items:
+            return
+
+        ttl = ttl or self.default_ttl
+        keys = [self._make_key(action, entity_type, role, domain)
+                for action, entity_type, _, role, domain in items]
+        for key, item in zip(keys, items):
+            self._set_memory(key, item[2], self._memory_ttl(ttl))
+
+        if self._redis:
+            try:
+                pipe = self._redis.pipeline(transaction=False)
+                for key, item in zip(keys, items):
+                    pipe.setex(self._redis_key(key), max(1, int(ttl)), json.dumps(item[2]))
+                pipe.execute()
             except Exception as e:
                 logger.warning(f"Redis set error: {e}")
 
-    def _set_memory(self, key: str, value: Dict[str, Any], ttl: float) -> None:
+    def _set_memory(self, key: MemoryKey, value: Dict[str, Any], ttl: float) -> None:
         """Set value in memory cache with LRU eviction."""
         with self._lock:
             # Remove if exists (to update position)
@@ -260,10 +403,8 @@ class ValidationCache:
 
             # Evict oldest entries if at capacity
             while len(self._cache) >= self.max_size:
-                oldest_key = next(iter(self._cache))
-                del self._cache[oldest_key]
+                self._cache.popitem(last=False)
                 self._stats.evictions += 1
-                logger.debug(f"Cache eviction: {oldest_key[:8]}...")
 
             # Add new entry
             self._cache[key] = CacheEntry(
@@ -272,7 +413,6 @@ class ValidationCache:
                 ttl=ttl,
             )
             self._stats.size = len(self._cache)
-            logger.debug(f"Cache SET: {key[:8]}... (size: {self._stats.size})")
 
     def invalidate(
         self,
@@ -284,53 +424,139 @@ class ValidationCache:
         """
         Invalidate cache entries matching criteria.
 
-        If all params are None, clears entire cache.
-        If specific params provided, only matching entries are removed.
+        If all params are None, clears entire cache. Otherwise memory entries
+        matching every given param are removed. In Redis a fully specified
+        entry is deleted directly; anything broader bumps the narrowest
+        generation counter that covers it (role, then domain, then global).
 
         Returns:
-            Number of entries invalidated
+            Number of memory entries invalidated
         """
-        if all(p is None for p in [action, entity_type, role, domain]):
+        filters = (action, entity_type, role, domain)
+        if all(p is None for p in filters):
             # Clear all
-            count = len(self._cache)
             with self._lock:
+                count = len(self._cache)
                 self._cache.clear()
                 self._stats.size = 0
 
             if self._redis:
-                try:
-                    keys = self._redis.keys(f"{self.redis_prefix}*")
-                    if keys:
-                        self._redis.delete(*keys)
-                except Exception as e:
-                    logger.warning(f"Redis invalidate error: {e}")
+                self._bump_generation(f"{self.redis_prefix}gen")
 
             logger.info(f"Cache cleared: {count} entries")
             return count
 
-        # Selective invalidation - generate key and remove
-        key = self._make_key(
-            action or '*',
-            entity_type or '*',
-            role,
-            domain,
-        )
-
-        count = 0
+        match = tuple(None if p is None else p.lower() for p in filters)
         with self._lock:
-            if key in self._cache:
+            stale = [
+                key for key in self._cache
+                if all(m is None or m == part for m, part in zip(match, key))
+            ]
+            for key in stale:
                 del self._cache[key]
-                count = 1
-                self._stats.size = len(self._cache)
+            self._stats.size = len(self._cache)
+
+        if self._redis:
+            if all(p is not None for p in filters):
+                try:
+                    self._redis.delete(self._redis_key(self._make_key(action, entity_type, role, domain)))
+                except Exception as e:
+                    logger.warning(f"Redis delete error: {e}")
+            else:
+                global_key, domain_key, role_key = self._generation_keys(match[3] or '', match[2] or '')
+                if role is not None:
+                    self._bump_generation(role_key)
+                elif domain is not None:
+                    self._bump_generation(domain_key)
+                else:
+                    self._bump_generation(global_key)
+
+        return len(stale)
+
+    def _bump_generation(self, generation_key: str) -> None:
+        """Increment a generation counter and schedule a sweep of orphaned keys."""
+        try:
+            self._redis.incr(generation_key)
+        except Exception as e:
+            logger.warning(f"Redis invalidate error: {e}")
+            return
+        self._generations.clear()
+        if self.background_sweep:
+            self._schedule_sweep()
 
-        if self._redis and count > 0:
+    def _schedule_sweep(self) -> None:
+        """Wake the sweep thread, starting it on first use."""
+        with self._lock:
+            if self._closed:
+                return
+            if self._sweep_thread is None or not self._sweep_thread.is_alive():
+                self._sweep_thread = Thread(
+                    target=self._sweep_loop,
+                    name="validation-cache-sweep",
+                    daemon=True,
+                )
+                self._sweep_thread.start()
+        self._sweep_event.set()
+
+    def _sweep_loop(self) -> None:
+        """Run sweeps until the cache is closed; bumps during a sweep queue one more."""
+        while True:
+            self._sweep_event.wait()
+            if self._closed:
+                return
+            self._sweep_event.clear()
             try:
-                redis_key = f"{self.redis_prefix}{key}"
-                self._redis.delete(redis_key)
+                self.sweep_stale_keys()
             except Exception as e:
-                logger.warning(f"Redis delete error: {e}")
+                logger.warning(f"Redis sweep error: {e}")
 
-        return count
+    def sweep_stale_keys(self) -> int:
+        """
+        Delete Redis entries written under superseded generations.
+
+        Walks the cache's keys with SCAN rather than KEYS, so Redis keeps
+        serving other clients between batches.
+
+        Returns:
+            Number of Redis keys deleted
+        """
+        if not self._redis:
+            return 0
+
+        current: Dict[Tuple[str, str], str] = {}
+        batch = []
+        removed = 0
+        version_start = len(self.redis_prefix) + 1
+        for raw in self._redis.scan_iter(match=f"{self.redis_prefix}v*", count=self.sweep_batch):
+            key = raw.decode() if isinstance(raw, bytes) else raw
+            parts = key[version_start:].split(':', 3)
+            if len(parts) != 4:
+                continue
+            version, domain, role = parts[0], unquote(parts[1]), unquote(parts[2])
+            if (domain, role) not in current:
+                current[(domain, role)] = '.'.join(str(g) for g in self._read_generations(domain, role))
+            if version != current[(domain, role)]:
+                batch.append(raw)
+                if len(batch) >= self.sweep_batch:
+                    self._redis.delete(*batch)
+                    removed += len(batch)
+                    batch = []
+        if batch:
+            self._redis.delete(*batch)
+            removed += len(batch)
+
+        if removed:
+            logger.debug(f"Sweep: {removed} superseded Redis entries removed")
+        return removed
+
+    def close(self) -> None:
+        """Stop the background sweep thread."""
+        with self._lock:
+            self._closed = True
+            thread = self._sweep_thread
+        self._sweep_event.set()
+        if thread is not None:
+            thread.join(timeout=1.0)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
@@ -374,14 +600,18 @@ def init_validation_cache(
     default_ttl: float = 300.0,
     redis_url: Optional[str] = None,
     enabled: bool = True,
+    l1_ttl: float = 5.0,
 ) -> ValidationCache:
     """Initialize global validation cache with custom settings."""
     global _validation_cache
+    if _validation_cache is not None:
+        _validation_cache.close()
     _validation_cache = ValidationCache(
         max_size=max_size,
         default_ttl=default_ttl,
         redis_url=redis_url,
         enabled=enabled,
+        l1_ttl=l1_ttl,
     )
     return _validation_cache
 
@@ -410,6 +640,23 @@ def get_cached_validation(
     return cache.get(action, entity_type, role, domain)
 
 
+def cache_validation_results(
+    items: List[Tuple[str, str, Dict[str, Any], Optional[str], Optional[str]]],
+    ttl: Optional[float] = None,
+) -> None:
+    """Cache several validation results."""
+    cache = get_validation_cache()
+    cache.set_many(items, ttl)
+
+
+def get_cached_validations(
+    keys: List[Tuple[str, str, Optional[str], Optional[str]]],
+) -> List[Optional[Dict[str, Any]]]:
+    """Get several cached validation results."""
+    cache = get_validation_cache()
+    return cache.get_many(keys)
+
+
 def invalidate_cache(
     action: Optional[str] = None,
     entity_type: Optional[str] = None,
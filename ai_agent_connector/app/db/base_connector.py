@@ -4,7 +4,7 @@ Defines the common interface for all database connectors
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any, List, Tuple, Union
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
 
 
 class BaseDatabaseConnector(ABC):
@@ -71,6 +71,66 @@ class BaseDatabaseConnector(ABC):
         """
         pass
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None,
+        as_dict: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Union[Tuple, Dict[str, Any]]]:
+        """
+        Execute a read query and yield rows as they are fetched.
+        
+        Connectors that support server-side cursors override this so memory
+        use stays bounded by batch_size. The default implementation fetches
+        the full result with execute_query().
+        
+        Args:
+            query: Query string (SQL, MongoDB query, etc.)
+            params: Query parameters
+            as_dict: Yield rows as dicts instead of tuples
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Result rows
+            
+        Raises:
+            ConnectionError: If not connected
+            Exception: If query execution fails
+        """
+        yield from self.execute_query(query, params, True, as_dict) or []
+    
+    def fetch_arrow(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None
+    ) -> Optional[Any]:
+        """
+        Execute a read query through the driver's native Arrow fetch path.
+        
+        Args:
+            query: Query string
+            params: Query parameters
+            
+        Returns:
+            pyarrow.Table, or None if the connector has no native Arrow path
+            (the query is not executed in that case)
+        """
+        return None
+    
+    def open_listen_connection(self, channel: str) -> Optional[Any]:
+        """
+        Open a dedicated connection subscribed to change notifications.
+        
+        Args:
+            channel: Notification channel name
+            
+        Returns:
+            Driver connection owned (and closed) by the caller, or None if
+            the database has no notification mechanism
+        """
+        return None
+    
     @property
     @abstractmethod
     def is_connected(self) -> bool:
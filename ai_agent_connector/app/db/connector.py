@@ -7,7 +7,7 @@ PostgreSQL, MySQL, MongoDB, BigQuery, Snowflake, etc.
 """
 
 import os
-from typing import Optional, Dict, Any, List, Tuple, Union
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
 
 from .factory import DatabaseConnectorFactory
 from .base_connector import BaseDatabaseConnector
@@ -151,6 +151,74 @@ class DatabaseConnector:
         for params in params_list:
             self._connector.execute_query(query, params, fetch=False)
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None,
+        as_dict: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Union[Tuple, Dict[str, Any]]]:
+        """
+        Execute a read query and yield rows in batches.
+        
+        PostgreSQL and MySQL use server-side cursors and MongoDB iterates its
+        cursor, so at most batch_size rows are held in memory at a time.
+        Other databases fall back to fetching the full result.
+        
+        Args:
+            query: Query string (SQL for SQL databases, JSON for MongoDB, etc.)
+            params: Query parameters (dict, tuple, or list)
+            as_dict: Yield rows as dicts instead of tuples
+            batch_size: Number of rows fetched per round trip
+            
+        Returns:
+            Iterator over result rows
+            
+        Raises:
+            ConnectionError: If not connected to database
+            Exception: If query execution fails
+        """
+        return self._connector.stream_query(query, params, as_dict, batch_size)
+    
+    def fetch_arrow(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None
+    ) -> Optional[Any]:
+        """
+        Execute a read query and return a pyarrow.Table without building rows.
+        
+        Supported by BigQuery and Snowflake. Other databases return None
+        without running the query; use stream_query() for those.
+        
+        Args:
+            query: Query string
+            params: Query parameters
+            
+        Returns:
+            pyarrow.Table, or None if there is no native Arrow path
+            
+        Raises:
+            ConnectionError: If not connected to database
+            Exception: If query execution fails
+        """
+        return self._connector.fetch_arrow(query, params)
+    
+    def open_listen_connection(self, channel: str) -> Optional[Any]:
+        """
+        Open a dedicated connection subscribed to change notifications.
+        
+        Supported by PostgreSQL (LISTEN/NOTIFY). The connection is separate
+        from this connector's own and must be closed by the caller.
+        
+        Args:
+            channel: Notification channel name
+            
+        Returns:
+            Driver connection, or None if the database has no notification mechanism
+        """
+        return self._connector.open_listen_connection(channel)
+    
     @property
     def is_connected(self) -> bool:
         """Check if currently connected to database."""
@@ -3,9 +3,14 @@ Database connectors for multiple database types
 Supports PostgreSQL, MySQL, MongoDB, BigQuery, and Snowflake
 """
 
+import logging
 import os
+import re
 import signal
-from typing import Optional, Dict, Any, List, Tuple, Union
+import threading
+import uuid
+import weakref
+from typing import Optional, Dict, Any, Iterator, List, Tuple, Union
 from contextlib import contextmanager
 
 from .base_connector import BaseDatabaseConnector
@@ -16,6 +21,26 @@ from .pooling import (
     TimeoutConfig
 )
 
+logger = logging.getLogger(__name__)
+
+# Session statement timeout (ms) currently in effect on each open connection.
+# Pooled connections outlive the connectors that borrow them, so the value is
+# tracked per connection and only re-issued when a connector asks for another.
+_session_timeouts: 'weakref.WeakKeyDictionary[Any, int]' = weakref.WeakKeyDictionary()
+_session_timeouts_lock = threading.Lock()
+
+
+def _get_session_timeout(conn: Any) -> Optional[int]:
+    """Get the statement timeout last applied to a connection, if known"""
+    with _session_timeouts_lock:
+        return _session_timeouts.get(conn)
+
+
+def _set_session_timeout(conn: Any, timeout_ms: int) -> None:
+    """Record the statement timeout in effect on a connection"""
+    with _session_timeouts_lock:
+        _session_timeouts[conn] = timeout_ms
+
 
 class PostgreSQLConnector(BaseDatabaseConnector):
     """PostgreSQL database connector with pooling and timeout support"""
@@ -74,9 +99,37 @@ class PostgreSQLConnector(BaseDatabaseConnector):
             'dbname': self.database,
             'connect_timeout': self.timeout_config.connect_timeout
         }
+        params.update(self._startup_options())
         
         return params
     
+    def _statement_timeout_ms(self) -> int:
+        """Requested statement timeout in milliseconds (0 disables it)"""
+        return max(self.timeout_config.query_timeout, 0) * 1000
+    
+    def _startup_options(self) -> Dict[str, str]:
+        """libpq startup options that set the statement timeout as a connection opens"""
+        timeout_ms = self._statement_timeout_ms()
+        # Leave options already given in a connection string alone
+        if not timeout_ms or (self.connection_string and 'options' in self.connection_string):
+            return {}
+        return {'options': f'-c statement_timeout={timeout_ms}'}
+    
+    def _apply_statement_timeout(self) -> None:
+        """Set the session statement timeout unless the connection already has it"""
+        timeout_ms = self._statement_timeout_ms()
+        current = _get_session_timeout(self.conn)
+        if current is None and self._startup_options():
+            # Opened (directly or by the pool) with the timeout as a startup option
+            current = timeout_ms
+        
+        if current != timeout_ms and (timeout_ms or current is not None):
+            with self.conn.cursor() as cur:
+                cur.execute(f"SET statement_timeout = {int(timeout_ms)}")
+            # SET is transactional in PostgreSQL; commit so a later rollback keeps it
+            self.conn.commit()
+        _set_session_timeout(self.conn, timeout_ms)
+    
     def connect(self) -> bool:
         """Establish connection to PostgreSQL database"""
         if self._is_connected and self.conn and not self.conn.closed:
@@ -87,7 +140,7 @@ class PostgreSQLConnector(BaseDatabaseConnector):
             if self.pooling_config.enabled:
                 if self.pool is None:
                     self._create_pool()
-                self.conn = self.pool.getconn(timeout=self.pooling_config.pool_timeout)
+                self.conn = self.pool.getconn()
             else:
                 # Direct connection
                 if self.connection_string:
@@ -96,7 +149,7 @@ class PostgreSQLConnector(BaseDatabaseConnector):
                     if 'connect_timeout' not in conn_str:
                         separator = '&' if '?' in conn_str else '?'
                         conn_str = f"{conn_str}{separator}connect_timeout={self.timeout_config.connect_timeout}"
-                    self.conn = self.psycopg2.connect(conn_str)
+                    self.conn = self.psycopg2.connect(conn_str, **self._startup_options())
                 else:
                     params = self._build_connection_params()
                     if not params:
@@ -106,6 +159,12 @@ class PostgreSQLConnector(BaseDatabaseConnector):
                         )
                     self.conn = self.psycopg2.connect(**params)
             
+            try:
+                self._apply_statement_timeout()
+            except Exception:
+                self.disconnect()
+                raise
+            
             self._is_connected = True
             return True
             
@@ -113,6 +172,25 @@ class PostgreSQLConnector(BaseDatabaseConnector):
             self._is_connected = False
             raise ConnectionError(f"Failed to connect to PostgreSQL: {e}") from e
     
+    def open_listen_connection(self, channel: str) -> Any:
+        """Open an autocommit connection that LISTENs on a channel"""
+        if not re.match(r'^[A-Za-z_][A-Za-z0-9_]*$', channel):
+            raise ValueError(f"Invalid notification channel: {channel!r}")
+        if self.connection_string:
+            conn = self.psycopg2.connect(self.connection_string)
+        else:
+            params = self._build_connection_params()
+            if not params:
+                raise ValueError(
+                    "Missing required connection parameters. "
+                    "Provide host, user, and database, or use connection_string."
+                )
+            conn = self.psycopg2.connect(**params)
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            cur.execute(f"LISTEN {channel}")
+        return conn
+    
     def _create_pool(self) -> None:
         """Create connection pool"""
         if self.pool is not None:
@@ -124,7 +202,8 @@ class PostgreSQLConnector(BaseDatabaseConnector):
                 self.pool = self.pool_module.ThreadedConnectionPool(
                     minconn=self.pooling_config.min_size,
                     maxconn=self.pooling_config.max_size + self.pooling_config.max_overflow,
-                    dsn=self.connection_string
+                    dsn=self.connection_string,
+                    **self._startup_options()
                 )
             else:
                 params = self._build_connection_params()
@@ -139,7 +218,8 @@ class PostgreSQLConnector(BaseDatabaseConnector):
                     user=params['user'],
                     password=params['password'],
                     dbname=params['dbname'],
-                    connect_timeout=params.get('connect_timeout', 10)
+                    connect_timeout=params.get('connect_timeout', 10),
+                    **self._startup_options()
                 )
         except Exception as e:
             raise ConnectionError(f"Failed to create connection pool: {e}") from e
@@ -180,24 +260,14 @@ class PostgreSQLConnector(BaseDatabaseConnector):
         fetch: bool = True,
         as_dict: bool = False
     ) -> Optional[Union[List[Tuple], List[Dict[str, Any]]]]:
-        """Execute a SQL query with timeout support"""
+        """Execute a SQL query (the statement timeout is set once per connection)"""
         if not self._is_connected or not self.conn or self.conn.closed:
             raise ConnectionError("Database not connected. Call connect() first.")
         
         cursor_factory = self.RealDictCursor if as_dict else None
         
-        # Set query timeout if supported
-        timeout = self.timeout_config.query_timeout
-        
         try:
             with self.conn.cursor(cursor_factory=cursor_factory) as cur:
-                # Set statement timeout (PostgreSQL specific)
-                if timeout > 0:
-                    try:
-                        cur.execute(f"SET statement_timeout = {timeout * 1000}")  # Convert to milliseconds
-                    except Exception:
-                        pass  # If setting timeout fails, continue without it
-                
                 cur.execute(query, params)
                 
                 if fetch:
@@ -211,6 +281,38 @@ class PostgreSQLConnector(BaseDatabaseConnector):
                 self.conn.rollback()
             raise Exception(f"Query execution failed: {e}") from e
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None,
+        as_dict: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Union[Tuple, Dict[str, Any]]]:
+        """Execute a read query through a named (server-side) cursor"""
+        if not self._is_connected or not self.conn or self.conn.closed:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        cursor_factory = self.RealDictCursor if as_dict else None
+        
+        try:
+            # Named cursors keep the result set on the server; rows arrive
+            # batch_size at a time
+            with self.conn.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=cursor_factory) as cur:
+                cur.itersize = batch_size
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+        except Exception as e:
+            if self.conn:
+                self.conn.rollback()
+            raise Exception(f"Query execution failed: {e}") from e
+        else:
+            # Close the read transaction the named cursor ran in
+            self.conn.rollback()
+    
     @property
     def is_connected(self) -> bool:
         return self._is_connected and self.conn is not None and not self.conn.closed
@@ -294,6 +396,8 @@ class MySQLConnector(BaseDatabaseConnector):
                     write_timeout=self.timeout_config.write_timeout
                 )
             
+            self._apply_statement_timeout()
+            
             self._is_connected = True
             return True
             
@@ -301,6 +405,22 @@ class MySQLConnector(BaseDatabaseConnector):
             self._is_connected = False
             raise ConnectionError(f"Failed to connect to MySQL: {e}") from e
     
+    def _apply_statement_timeout(self) -> None:
+        """Set max_execution_time for the session unless the connection already has it"""
+        timeout_ms = max(self.timeout_config.query_timeout, 0) * 1000
+        current = _get_session_timeout(self.conn)
+        if current == timeout_ms or (current is None and not timeout_ms):
+            return
+        
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute(f"SET SESSION max_execution_time = {int(timeout_ms)}")
+        except Exception as e:
+            # Servers without max_execution_time (MySQL < 5.7.8, MariaDB) run
+            # without a statement timeout; recorded so it is not retried
+            logger.warning("Could not set MySQL max_execution_time: %s", e)
+        _set_session_timeout(self.conn, timeout_ms)
+    
     def _create_pool(self) -> None:
         """Create MySQL connection pool"""
         if self.pool is not None:
@@ -335,8 +455,13 @@ class MySQLConnector(BaseDatabaseConnector):
         from queue import Queue
         import threading
         
+        pymysql = self.pymysql
+        pool_timeout = self.pooling_config.pool_timeout
+        
         class SimpleConnectionPool:
             def __init__(self, config: Dict[str, Any], min_size: int, max_size: int):
+                self.pymysql = pymysql
+                self.pool_timeout = pool_timeout
                 self.config = config
                 self.min_size = min_size
                 self.max_size = max_size
@@ -364,7 +489,7 @@ class MySQLConnector(BaseDatabaseConnector):
                             return conn
                         else:
                             # Wait for connection from pool
-                            return self.pool.get(timeout=self.pooling_config.pool_timeout)
+                            return self.pool.get(timeout=self.pool_timeout)
             
             def put_connection(self, conn):
                 try:
@@ -419,22 +544,12 @@ class MySQLConnector(BaseDatabaseConnector):
         fetch: bool = True,
         as_dict: bool = False
     ) -> Optional[Union[List[Tuple], List[Dict[str, Any]]]]:
-        """Execute a SQL query with timeout support"""
+        """Execute a SQL query (the statement timeout is set once per connection)"""
         if not self._is_connected or not self.conn:
             raise ConnectionError("Database not connected. Call connect() first.")
         
-        # MySQL timeouts are set at connection level, but we can set query timeout
-        timeout = self.timeout_config.query_timeout
-        
         try:
             with self.conn.cursor() as cur:
-                # Set query timeout if supported (MySQL 5.7.8+)
-                if timeout > 0:
-                    try:
-                        cur.execute(f"SET SESSION max_execution_time = {timeout * 1000}")  # Convert to milliseconds
-                    except Exception:
-                        pass  # If setting timeout fails, continue without it
-                
                 cur.execute(query, params)
                 
                 if fetch:
@@ -453,6 +568,36 @@ class MySQLConnector(BaseDatabaseConnector):
                 self.conn.rollback()
             raise Exception(f"Query execution failed: {e}") from e
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None,
+        as_dict: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Union[Tuple, Dict[str, Any]]]:
+        """Execute a read query through an unbuffered (server-side) cursor"""
+        if not self._is_connected or not self.conn:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        try:
+            # SSDictCursor reads rows from the socket as they are fetched
+            # instead of buffering the whole result set client-side
+            with self.conn.cursor(self.pymysql.cursors.SSDictCursor) as cur:
+                cur.execute(query, params)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    if as_dict:
+                        yield from rows
+                    else:
+                        for row in rows:
+                            yield tuple(row.values())
+        except Exception as e:
+            if self.conn:
+                self.conn.rollback()
+            raise Exception(f"Query execution failed: {e}") from e
+    
     @property
     def is_connected(self) -> bool:
         return self._is_connected and self.conn is not None
@@ -601,6 +746,38 @@ class MongoDBConnector(BaseDatabaseConnector):
         except Exception as e:
             raise Exception(f"Query execution failed: {e}") from e
     
+    def stream_query(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None,
+        as_dict: bool = False,
+        batch_size: int = 1000
+    ) -> Iterator[Union[Tuple, Dict[str, Any]]]:
+        """Execute a MongoDB find and iterate the cursor batch by batch"""
+        if not self._is_connected or self.db is None:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        try:
+            import json
+            query_dict = json.loads(query) if isinstance(query, str) else query
+            
+            collection_name = query_dict.get('collection')
+            if not collection_name:
+                raise ValueError("Query must specify 'collection'")
+            
+            cursor = self.db[collection_name].find(
+                query_dict.get('filter', {}),
+                query_dict.get('projection'),
+                batch_size=batch_size
+            )
+            try:
+                for doc in cursor:
+                    yield doc if as_dict else tuple(doc.values())
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise Exception(f"Query execution failed: {e}") from e
+    
     @property
     def is_connected(self) -> bool:
         return self._is_connected and self.client is not None
@@ -701,6 +878,20 @@ class BigQueryConnector(BaseDatabaseConnector):
         except Exception as e:
             raise Exception(f"Query execution failed: {e}") from e
     
+    def fetch_arrow(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None
+    ) -> Optional[Any]:
+        """Execute a query and download the result as a pyarrow.Table"""
+        if not self._is_connected or not self.client:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        try:
+            return self.client.query(query).to_arrow()
+        except Exception as e:
+            raise Exception(f"Query execution failed: {e}") from e
+    
     @property
     def is_connected(self) -> bool:
         return self._is_connected and self.client is not None
@@ -825,6 +1016,27 @@ class SnowflakeConnector(BaseDatabaseConnector):
             if cursor:
                 cursor.close()
     
+    def fetch_arrow(
+        self,
+        query: str,
+        params: Optional[Union[Dict[str, Any], Tuple, List]] = None
+    ) -> Optional[Any]:
+        """Execute a query and fetch the result as a pyarrow.Table"""
+        if not self._is_connected or not self.conn:
+            raise ConnectionError("Database not connected. Call connect() first.")
+        
+        cursor = None
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            # Without force_return_table an empty result comes back as None
+            return cursor.fetch_arrow_all(force_return_table=True)
+        except Exception as e:
+            raise Exception(f"Query execution failed: {e}") from e
+        finally:
+            if cursor:
+                cursor.close()
+    
     @property
     def is_connected(self) -> bool:
         return self._is_connected and self.conn is not None
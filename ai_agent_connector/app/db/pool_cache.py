@@ -0,0 +1,194 @@
+"""
+Process-wide connection pool cache
+Shares connection pools between the short-lived connectors built per request,
+so connect()/disconnect() borrow and return pooled connections instead of
+opening a new pool (and new TCP/TLS sessions) every time.
+"""
+
+import threading
+from typing import Any, Dict, Tuple
+
+from .connector import DatabaseConnector
+
+
+class _SharedPool:
+    """
+    Wraps a cached pool and counts the connections borrowed from it.
+
+    Retiring the pool closes it right away when nothing is borrowed;
+    otherwise it is closed when the last borrowed connection is returned,
+    so in-flight queries are never cut off. Other attributes are delegated
+    to the wrapped pool.
+    """
+
+    def __init__(self, pool: Any):
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._borrowed = 0
+        self._retired = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    def getconn(self, *args, **kwargs) -> Any:
+        """Borrow a connection (psycopg2 pool interface)"""
+        return self._borrow(self._pool.getconn, *args, **kwargs)
+
+    def connection(self, *args, **kwargs) -> Any:
+        """Borrow a connection (connector-built pool interface)"""
+        return self._borrow(self._pool.connection, *args, **kwargs)
+
+    def putconn(self, conn: Any, *args, **kwargs) -> None:
+        """Return a connection (psycopg2 pool interface)"""
+        self._return(self._pool.putconn, conn, *args, **kwargs)
+
+    def put_connection(self, conn: Any, *args, **kwargs) -> None:
+        """Return a connection (connector-built pool interface)"""
+        self._return(self._pool.put_connection, conn, *args, **kwargs)
+
+    @property
+    def borrowed(self) -> int:
+        """Number of connections currently borrowed"""
+        return self._borrowed
+
+    def retire(self) -> None:
+        """Close the pool now if idle, else once every borrowed connection is back"""
+        with self._lock:
+            self._retired = True
+            close = self._borrowed == 0
+        if close:
+            self._close()
+
+    def _borrow(self, getter, *args, **kwargs) -> Any:
+        conn = getter(*args, **kwargs)
+        with self._lock:
+            self._borrowed += 1
+        return conn
+
+    def _return(self, putter, conn: Any, *args, **kwargs) -> None:
+        try:
+            putter(conn, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._borrowed = max(self._borrowed - 1, 0)
+                close = self._retired and self._borrowed == 0
+            if close:
+                self._close()
+
+    def _close(self) -> None:
+        """Close the wrapped pool, ignoring errors from already-closed pools"""
+        try:
+            self._pool.closeall()
+        except Exception:
+            pass
+
+
+class ConnectionPoolCache:
+    """
+    Caches connection pools keyed by (owner_id, config_hash).
+
+    Only connectors with pooling enabled (``pooling.enabled``) and a pool
+    implementation (``_create_pool``) are shared; other connectors are returned
+    untouched. A new config hash for the same owner retires the old pool.
+    Retired pools are dropped from the cache at once but closed only after
+    the connections borrowed by in-flight requests are returned.
+    """
+
+    def __init__(self):
+        """Initialize an empty pool cache"""
+        self._pools: Dict[Tuple[str, str], _SharedPool] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def attach(
+        self,
+        owner_id: str,
+        config_hash: str,
+        connector: DatabaseConnector
+    ) -> DatabaseConnector:
+        """
+        Bind a connector to the shared pool for an owner/config pair.
+
+        The pool is created on first use and reused by every later connector
+        with the same key.
+
+        Args:
+            owner_id: Pool owner (agent identifier)
+            config_hash: Hash of the configuration the connector was built from
+            connector: Freshly built connector
+
+        Returns:
+            DatabaseConnector: The same connector, bound to the shared pool
+
+        Raises:
+            ConnectionError: If the pool cannot be created
+        """
+        inner = connector._connector
+        pooling_config = getattr(inner, 'pooling_config', None)
+        if not pooling_config or not pooling_config.enabled or not hasattr(inner, '_create_pool'):
+            return connector
+
+        key = (owner_id, config_hash)
+        with self._lock:
+            pool = self._pools.get(key)
+            if pool is not None:
+                self._hits += 1
+                inner.pool = pool
+                return connector
+
+            self._misses += 1
+            # Config changed for this owner: retire pools built from the old one
+            for stale_key in [k for k in self._pools if k[0] == owner_id]:
+                self._pools.pop(stale_key).retire()
+
+            inner._create_pool()
+            inner.pool = _SharedPool(inner.pool)
+            self._pools[key] = inner.pool
+        return connector
+
+    def invalidate(self, owner_id: str) -> int:
+        """
+        Drop and retire every pool held for an owner.
+
+        Pools are closed once their borrowed connections are returned, so a
+        credential rotation does not break queries already running.
+
+        Args:
+            owner_id: Pool owner (agent identifier)
+
+        Returns:
+            int: Number of pools retired
+        """
+        with self._lock:
+            keys = [k for k in self._pools if k[0] == owner_id]
+            pools = [self._pools.pop(k) for k in keys]
+        for pool in pools:
+            pool.retire()
+        return len(pools)
+
+    def clear(self) -> None:
+        """Drop and retire all cached pools"""
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+            self._hits = 0
+            self._misses = 0
+        for pool in pools:
+            pool.retire()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool cache statistics.
+
+        Returns:
+            Dict with pool count and hit/miss counters
+        """
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                'pools': len(self._pools),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / total * 100, 2) if total else 0.0
+            }
@@ -0,0 +1,377 @@
+"""
+Versioned schema catalog cache
+Keeps each database connection's table/column catalog in memory, so schema
+consumers (NL-to-SQL prompts, table listings, access previews, autocomplete,
+drift checks) stop re-reading information_schema on every request. A cheap
+per-table version probe (pg_class relfilenode/xmin, MySQL CREATE/UPDATE_TIME
+and view definition hash, Snowflake LAST_ALTERED) tells which tables changed,
+and only those tables' columns are re-read.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .connector import DatabaseConnector
+
+logger = logging.getLogger(__name__)
+
+
+SYSTEM_SCHEMAS = ('information_schema', 'pg_catalog')
+
+# (schema, table, version token) for every table, view, materialized view
+# and foreign table (everything table listings and access previews show),
+# per database type
+VERSION_PROBES = {
+    'postgresql': """
+        SELECT n.nspname, c.relname,
+               c.relfilenode::text || ':' || c.xmin::text || ':' ||
+               max(a.xmin::text::bigint)::text || ':' || count(a.attnum)::text
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0
+        WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f')
+            AND n.nspname NOT IN ('information_schema', 'pg_catalog')
+            AND n.nspname NOT LIKE 'pg_toast%%'
+        GROUP BY n.nspname, c.relname, c.relfilenode, c.xmin
+    """,
+    # Views have no CREATE/UPDATE_TIME in MySQL; their definition hash
+    # changes when they are redefined
+    'mysql': """
+        SELECT t.TABLE_SCHEMA, t.TABLE_NAME,
+               CONCAT(COALESCE(t.CREATE_TIME, ''), '|', COALESCE(t.UPDATE_TIME, ''), '|',
+                      COALESCE(MD5(v.VIEW_DEFINITION), ''))
+        FROM information_schema.TABLES t
+        LEFT JOIN information_schema.VIEWS v
+            ON v.TABLE_SCHEMA = t.TABLE_SCHEMA AND v.TABLE_NAME = t.TABLE_NAME
+        WHERE t.TABLE_TYPE IN ('BASE TABLE', 'VIEW')
+            AND t.TABLE_SCHEMA NOT IN ('information_schema', 'mysql', 'performance_schema', 'sys')
+    """,
+    'snowflake': """
+        SELECT table_schema, table_name, TO_VARCHAR(last_altered)
+        FROM information_schema.tables
+        WHERE table_type IN ('BASE TABLE', 'VIEW', 'MATERIALIZED VIEW', 'EXTERNAL TABLE')
+            AND table_schema <> 'INFORMATION_SCHEMA'
+    """,
+}
+
+# Tables and views when no version probe exists for the database type
+TABLES_QUERY = """
+    SELECT table_schema, table_name
+    FROM information_schema.tables
+    WHERE table_schema NOT IN ('information_schema', 'pg_catalog')
+"""
+
+COLUMNS_QUERY = """
+    SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default, ordinal_position
+    FROM information_schema.columns
+    WHERE {where}
+    ORDER BY table_schema, table_name, ordinal_position
+"""
+
+# Changed tables whose columns are re-read per query
+COLUMN_BATCH_SIZE = 100
+
+
+def table_key(schema: str, table: str) -> str:
+    """Resource id of a table: bare name in the public schema, schema.table elsewhere."""
+    return f"{schema}.{table}" if schema and schema != 'public' else table
+
+
+def connection_key(connector: DatabaseConnector) -> str:
+    """
+    Identify the database a connector points at.
+
+    Args:
+        connector: Database connector
+
+    Returns:
+        Hash of the database type and connection settings
+    """
+    config = getattr(connector, 'config', None)
+    config = json.dumps(
+        {'type': str(connector.database_type), **(config if isinstance(config, dict) else {'id': id(connector)})},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(config.encode()).hexdigest()[:32]
+
+
+class SchemaSnapshot:
+    """
+    Immutable view of a connection's catalog at one version.
+
+    Attributes:
+        tables: resource id -> {'schema', 'table', 'columns': [{'name', 'type',
+            'nullable', 'default', 'position'}]}
+        version: Fingerprint of every table's version token
+        refreshed_at: time.time() of the refresh that produced it
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, Any]], versions: Dict[str, str], refreshed_at: float):
+        self.tables = tables
+        self.versions = versions
+        self.refreshed_at = refreshed_at
+        digest = hashlib.sha256()
+        for key in sorted(versions):
+            digest.update(f"{key}\0{versions[key]}\n".encode())
+        self.version = digest.hexdigest()[:16]
+
+    def get_table(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a table by resource id or bare name.
+
+        Args:
+            name: 'table' or 'schema.table'
+
+        Returns:
+            Table entry or None
+        """
+        entry = self.tables.get(name)
+        if entry is not None:
+            return entry
+        name = name.lower()
+        for key, entry in self.tables.items():
+            if key.lower() == name or entry['table'].lower() == name:
+                return entry
+        return None
+
+    def to_schema_info(self) -> Dict[str, Any]:
+        """Schema info in the format NLToSQLConverter.get_schema_info returns."""
+        return {
+            'tables': list(self.tables),
+            'schema': self.tables,
+            'version': self.version
+        }
+
+
+class _Entry:
+    """Catalog state and refresh lock for one connection"""
+
+    __slots__ = ('snapshot', 'checked_at', 'lock')
+
+    def __init__(self):
+        self.snapshot: Optional[SchemaSnapshot] = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+class SchemaCatalogCache:
+    """
+    Caches SchemaSnapshots per connection.
+
+    get() serves the cached snapshot for check_interval seconds. After that
+    it runs the version probe and re-reads columns only for tables whose
+    version token changed, dropping tables that disappeared. Database types
+    without a probe are fully re-read every check_interval seconds. One
+    caller per connection refreshes at a time; others keep using the
+    previous snapshot while it does.
+    """
+
+    def __init__(self, check_interval: float = 30.0, max_connections: int = 256):
+        """
+        Initialize an empty catalog cache.
+
+        Args:
+            check_interval: Seconds a snapshot is served before the version probe runs again
+            max_connections: Connections kept; the least recently checked is dropped beyond it
+        """
+        self.check_interval = check_interval
+        self.max_connections = max_connections
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._probes = 0
+        self._tables_refreshed = 0
+
+    def _entry(self, key: str) -> _Entry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                if len(self._entries) >= self.max_connections:
+                    oldest = min(self._entries, key=lambda k: self._entries[k].checked_at)
+                    del self._entries[oldest]
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    def get(self, connector: DatabaseConnector, force: bool = False) -> SchemaSnapshot:
+        """
+        Get the current catalog for a connector's database.
+
+        The connector is connected (and disconnected again) only when the
+        catalog has to be checked.
+
+        Args:
+            connector: Database connector
+            force: Check for changes even within check_interval
+
+        Returns:
+            SchemaSnapshot
+
+        Raises:
+            Exception: If the catalog cannot be read and nothing is cached
+        """
+        entry = self._entry(connection_key(connector))
+        snapshot = entry.snapshot
+        if snapshot is not None and not force and time.time() - entry.checked_at < self.check_interval:
+            with self._lock:
+                self._hits += 1
+            return snapshot
+
+        with entry.lock:
+            # Another caller may have refreshed while we waited
+            if entry.snapshot is not None and not force and time.time() - entry.checked_at < self.check_interval:
+                return entry.snapshot
+            try:
+                entry.snapshot = self._refresh(connector, entry.snapshot)
+            except Exception as e:
+                if entry.snapshot is None:
+                    raise
+                logger.warning(f"Schema catalog refresh failed, serving cached version: {e}")
+            entry.checked_at = time.time()
+            return entry.snapshot
+
+    def peek(self, connector: DatabaseConnector) -> Optional[SchemaSnapshot]:
+        """
+        Get the cached catalog without touching the database.
+
+        Args:
+            connector: Database connector
+
+        Returns:
+            SchemaSnapshot checked within check_interval, or None
+        """
+        entry = self._entries.get(connection_key(connector))
+        if entry is None or entry.snapshot is None or time.time() - entry.checked_at >= self.check_interval:
+            return None
+        return entry.snapshot
+
+    def invalidate(self, connector: Optional[DatabaseConnector] = None) -> None:
+        """
+        Drop the cached catalog of one connector's database, or of all.
+
+        Args:
+            connector: Connector whose database changed (None clears everything)
+        """
+        with self._lock:
+            if connector is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(connection_key(connector), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get catalog cache statistics.
+
+        Returns:
+            Dict with cached connection count, hits, probes and tables re-read
+        """
+        with self._lock:
+            return {
+                'connections': len(self._entries),
+                'hits': self._hits,
+                'probes': self._probes,
+                'tables_refreshed': self._tables_refreshed
+            }
+
+    def _refresh(self, connector: DatabaseConnector, previous: Optional[SchemaSnapshot]) -> SchemaSnapshot:
+        """Probe table versions and re-read the tables that changed."""
+        opened = not connector.is_connected
+        if opened:
+            connector.connect()
+        try:
+            probe = VERSION_PROBES.get(connector.database_type)
+            if probe is None:
+                rows = connector.execute_query(TABLES_QUERY, fetch=True, as_dict=False) or []
+                # No version marker: every check re-reads everything
+                stamp = str(time.time())
+                versions = {(schema, table): stamp for schema, table in rows}
+            else:
+                rows = connector.execute_query(probe, fetch=True, as_dict=False) or []
+                versions = {(schema, table): str(version) for schema, table, version in rows}
+
+            old_versions = previous.versions if previous else {}
+            old_tables = previous.tables if previous else {}
+            changed = [
+                (schema, table) for (schema, table), version in versions.items()
+                if old_versions.get(table_key(schema, table)) != version
+            ]
+
+            tables = {}
+            for schema, table in versions:
+                key = table_key(schema, table)
+                if key in old_tables and (schema, table) not in changed:
+                    tables[key] = old_tables[key]
+            tables.update(self._read_columns(connector, changed, full=previous is None))
+
+            with self._lock:
+                self._probes += 1
+                self._tables_refreshed += len(changed)
+            if changed:
+                logger.debug(f"Schema catalog: {len(changed)} of {len(versions)} tables re-read")
+
+            return SchemaSnapshot(
+                tables=dict(sorted(tables.items())),
+                versions={table_key(schema, table): version for (schema, table), version in versions.items()},
+                refreshed_at=time.time()
+            )
+        finally:
+            if opened:
+                try:
+                    connector.disconnect()
+                except Exception:
+                    pass
+
+    @staticmethod
+    def _read_columns(
+        connector: DatabaseConnector,
+        tables: List[Tuple[str, str]],
+        full: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """Read columns of the given tables (all non-system schemas when full)."""
+        if not tables:
+            return {}
+        if full:
+            batches = [(
+                "table_schema NOT IN ('information_schema', 'pg_catalog')",
+                None
+            )]
+        else:
+            batches = []
+            for start in range(0, len(tables), COLUMN_BATCH_SIZE):
+                chunk = tables[start:start + COLUMN_BATCH_SIZE]
+                where = ' OR '.join(['(table_schema = %s AND table_name = %s)'] * len(chunk))
+                batches.append((where, tuple(part for pair in chunk for part in pair)))
+
+        wanted = {table_key(schema, table): {'schema': schema, 'table': table, 'columns': []}
+                  for schema, table in tables}
+        for where, params in batches:
+            rows = connector.execute_query(COLUMNS_QUERY.format(where=where), params=params,
+                                           fetch=True, as_dict=False) or []
+            for schema, table, column, data_type, nullable, default, position in rows:
+                entry = wanted.get(table_key(schema, table))
+                if entry is None:
+                    continue
+                entry['columns'].append({
+                    'name': column,
+                    'type': data_type,
+                    'nullable': nullable == 'YES',
+                    'default': default,
+                    'position': position
+                })
+        return wanted
+
+
+# Global catalog cache instance
+_schema_catalog: Optional[SchemaCatalogCache] = None
+
+
+def get_schema_catalog() -> SchemaCatalogCache:
+    """Get or create the global schema catalog cache."""
+    global _schema_catalog
+    if _schema_catalog is None:
+        _schema_catalog = SchemaCatalogCache()
+    return _schema_catalog
@@ -11,7 +11,7 @@ from datetime import datetime
 from ..agents.registry import AgentRegistry
 from ..agents.ai_agent_manager import AIAgentManager
 from ..utils.cost_tracker import CostTracker
-from ..utils.audit_logger import AuditLogger
+from ..utils.audit_logger import AuditLogger, encode_cursor
 from ..utils.provider_failover import ProviderFailoverManager
 
 
@@ -115,6 +115,7 @@ class AuditLogType(ObjectType):
     details = JSONString()
     user_id = String()
     ip_address = String()
+    cursor = String()
 
 
 class NotificationType(ObjectType):
@@ -242,6 +243,7 @@ class ValidateActionInput(graphene.InputObjectType):
     role = String(required=True)
     user_id = String()
     resource_id = String()
+    domain = String()
 
 
 class CheckPermissionsInput(graphene.InputObjectType):
@@ -315,7 +317,8 @@ class Query(ObjectType):
         agent_id=ID(),
         action_type=String(),
         limit=Int(default_value=100),
-        offset=Int()
+        offset=Int(),
+        cursor=String()
     )
     
     audit_log = Field(AuditLogType, log_id=ID(required=True))
@@ -358,6 +361,11 @@ class Query(ObjectType):
         input=ValidateActionInput(required=True)
     )
 
+    ontoguard_validate_batch = List(
+        OntoGuardValidationResultType,
+        inputs=List(ValidateActionInput, required=True)
+    )
+
     ontoguard_allowed_actions = List(
         AllowedActionType,
         role=String(required=True),
@@ -425,7 +433,7 @@ class Query(ObjectType):
             # Call the actual query execution via AIAgentManager
             # This integrates with the existing REST API logic
             from ..permissions import AccessControl
-            from ..utils.sql_parser import extract_tables_from_query, get_query_type, QueryType
+            from ..utils.sql_parser import parse_query, QueryType
             from ..permissions import Permission
             
             access_control = AccessControl()
@@ -444,12 +452,13 @@ class Query(ObjectType):
             if not connector:
                 return None
             
-            # Extract tables and check permissions
-            tables = extract_tables_from_query(query)
-            query_type = get_query_type(query)
-            required_permission = Permission.READ if query_type == QueryType.SELECT else Permission.WRITE
+            # Extract tables and check permissions (single memoized parse)
+            parsed = parse_query(query)
+            required_permission = Permission.READ if parsed.query_type == QueryType.SELECT else Permission.WRITE
+            if parsed.requires_write and not parsed.tables:
+                return None
             
-            for table in tables:
+            for table in parsed.tables:
                 if not access_control.has_resource_permission(agent_id, table, required_permission):
                     return None
             
@@ -652,8 +661,8 @@ class Query(ObjectType):
         except Exception:
             return None
     
-    def resolve_audit_logs(self, info, agent_id=None, action_type=None, limit=100, offset=None):
-        """Resolve audit logs"""
+    def resolve_audit_logs(self, info, agent_id=None, action_type=None, limit=100, offset=None, cursor=None):
+        """Resolve audit logs (pass the last log's cursor to fetch the next page)"""
         if not _audit_logger:
             return []
         try:
@@ -661,8 +670,10 @@ class Query(ObjectType):
                 agent_id=agent_id,
                 action_type=action_type,
                 limit=limit,
-                offset=offset
-            )
+                offset=offset or 0,
+                cursor=cursor,
+                include_total=False
+            )['logs']
             return [
                 {
                     'log_id': log.get('id', 0),
@@ -671,7 +682,8 @@ class Query(ObjectType):
                     'timestamp': log.get('timestamp'),
                     'details': log.get('details'),
                     'user_id': log.get('user_id'),
-                    'ip_address': log.get('ip_address')
+                    'ip_address': log.get('ip_address'),
+                    'cursor': encode_cursor(log)
                 }
                 for log in logs
             ]
@@ -780,6 +792,45 @@ class Query(ObjectType):
                 'suggestions': [],
             }
 
+    def resolve_ontoguard_validate_batch(self, info, inputs):
+        """Resolve several OntoGuard validations with one adapter call"""
+        batch = []
+        for item in inputs:
+            context = {'role': item.get('role')}
+            for key in ('user_id', 'resource_id', 'domain'):
+                if item.get(key):
+                    context[key] = item[key]
+            batch.append({'action': item['action'], 'entity_type': item['entity_type'], 'context': context})
+
+        try:
+            from ..security import get_ontoguard_adapter
+            results = get_ontoguard_adapter().validate_actions(batch)
+            return [
+                {
+                    'allowed': result.allowed,
+                    'action': item['action'],
+                    'entity_type': item['entity_type'],
+                    'role': item.get('role'),
+                    'reason': result.reason,
+                    'constraints': result.constraints,
+                    'suggestions': result.suggestions,
+                }
+                for item, result in zip(inputs, results)
+            ]
+        except Exception as e:
+            return [
+                {
+                    'allowed': False,
+                    'action': item['action'],
+                    'entity_type': item['entity_type'],
+                    'role': item.get('role'),
+                    'reason': str(e),
+                    'constraints': [],
+                    'suggestions': [],
+                }
+                for item in inputs
+            ]
+
     def resolve_ontoguard_allowed_actions(self, info, role, entity_type=None):
         """Resolve OntoGuard allowed actions"""
         try:
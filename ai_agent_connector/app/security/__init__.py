@@ -21,6 +21,14 @@ from .schema_drift import (
     DriftApproval,
     Fix,
     SchemaDriftDetector,
+    get_schema_drift_detector,
+)
+
+from .drift_watcher import (
+    DriftStatus,
+    DriftStatusTable,
+    SchemaDriftWatcher,
+    get_drift_status_table,
 )
 
 from .exceptions import (
@@ -49,6 +57,11 @@ __all__ = [
     'DriftApproval',
     'Fix',
     'SchemaDriftDetector',
+    'get_schema_drift_detector',
+    'DriftStatus',
+    'DriftStatusTable',
+    'SchemaDriftWatcher',
+    'get_drift_status_table',
 
     # Exceptions
     'OntoGuardError',
@@ -0,0 +1,379 @@
+"""
+Background Schema Drift Watcher.
+
+Moves live drift detection off the request path. A watcher thread polls the
+schema catalog's per-table version markers (a single cheap query) on an
+adaptive interval, re-checks only the bindings whose tables changed, and
+keeps the result in an in-memory drift status table keyed by the watched
+database's scope (the agent ID) and entity. Policy checks read that table
+with a dict lookup, and drift is pushed to WebSocket clients
+(emit_schema_drift_event) the moment it is detected.
+
+On PostgreSQL the watcher can also LISTEN for DDL notifications from an
+event trigger (see PG_EVENT_TRIGGER_SQL), waking up as soon as a schema
+changes instead of at the next poll.
+"""
+
+import logging
+import select
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ai_agent_connector.app.db.schema_catalog import SchemaCatalogCache, get_schema_catalog
+from ai_agent_connector.app.security.schema_drift import DriftReport, Fix, SchemaDriftDetector
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CHANNEL = "schema_change"
+
+# Installed once by a superuser; every DDL statement then NOTIFYs the channel
+PG_EVENT_TRIGGER_SQL = f"""
+CREATE OR REPLACE FUNCTION notify_schema_change() RETURNS event_trigger AS $$
+BEGIN
+    PERFORM pg_notify('{DEFAULT_CHANNEL}', tg_tag);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE EVENT TRIGGER {DEFAULT_CHANNEL}_notify ON ddl_command_end
+    EXECUTE FUNCTION notify_schema_change();
+"""
+
+
+@dataclass
+class DriftStatus:
+    """Latest drift state of one entity in one database."""
+    scope: str
+    entity: str
+    table: str
+    severity: str
+    report: DriftReport
+    fixes: List[Fix] = field(default_factory=list)
+    checked_at: float = 0.0  # time.time() of the last check
+    changed_at: float = 0.0  # time.time() the drift state last changed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scope": self.scope,
+            **self.report.to_dict(),
+            "fixes": [f.to_dict() for f in self.fixes],
+            "checked_at": self.checked_at,
+            "changed_at": self.changed_at,
+        }
+
+
+def _drift_state(report: DriftReport) -> tuple:
+    return (
+        report.severity,
+        tuple(sorted(report.missing_columns)),
+        tuple(sorted(report.type_changes.items())),
+        tuple(sorted(report.renamed_columns.items())),
+    )
+
+
+class DriftStatusTable:
+    """
+    In-memory drift status per (scope, entity).
+
+    The scope identifies the checked database (the agent ID), so drift in
+    one agent's database never blocks or hides drift in another's. Reads
+    are plain dict lookups so the policy engine can consult it on every
+    request; writers replace whole entries under a lock.
+    """
+
+    def __init__(self):
+        self._statuses: Dict[Tuple[str, str], DriftStatus] = {}
+        self._lock = threading.Lock()
+
+    def get(self, scope: str, entity: str) -> Optional[DriftStatus]:
+        """Get the latest status of an entity in a database (None if never checked)."""
+        return self._statuses.get((scope, entity))
+
+    def update(self, scope: str, report: DriftReport, fixes: Optional[List[Fix]] = None) -> bool:
+        """
+        Record a check result.
+
+        Args:
+            scope: Database the report was checked against (the agent ID).
+            report: Drift report of the entity.
+            fixes: Suggested fixes for the report.
+
+        Returns:
+            True if the entity now has drift it did not have before (new
+            drift, or drift whose details changed).
+        """
+        now = time.time()
+        key = (scope, report.entity)
+        with self._lock:
+            previous = self._statuses.get(key)
+            changed = previous is None or _drift_state(previous.report) != _drift_state(report)
+            self._statuses[key] = DriftStatus(
+                scope=scope,
+                entity=report.entity,
+                table=report.table,
+                severity=report.severity,
+                report=report,
+                fixes=list(fixes or []),
+                checked_at=now,
+                changed_at=now if changed else previous.changed_at,
+            )
+        return changed and report.has_drift
+
+    def remove(self, scope: str, entity: str) -> None:
+        """Forget an entity's status in a database."""
+        with self._lock:
+            self._statuses.pop((scope, entity), None)
+
+    def all(self, scope: Optional[str] = None) -> List[DriftStatus]:
+        """
+        All statuses, ordered by scope and entity.
+
+        Args:
+            scope: Only return statuses of this database (default: all).
+        """
+        with self._lock:
+            return [
+                self._statuses[key] for key in sorted(self._statuses)
+                if scope is None or key[0] == scope
+            ]
+
+    def clear(self) -> None:
+        """Forget every status."""
+        with self._lock:
+            self._statuses.clear()
+
+
+def _push_drift_event(report: DriftReport, fixes: List[Fix]) -> None:
+    """Push drift to WebSocket clients."""
+    try:
+        from ai_agent_connector.app.websocket.ontoguard_ws import emit_schema_drift_event
+        emit_schema_drift_event(report.to_dict(), [f.to_dict() for f in fixes])
+    except ImportError:
+        logger.debug("WebSocket module not available, skipping real-time event")
+    except Exception as e:
+        logger.debug("Failed to emit WebSocket schema drift event: %s", e)
+
+
+class SchemaDriftWatcher:
+    """
+    Watches one database for schema changes that affect drift bindings.
+
+    Each poll runs the schema catalog's version probe. When no table
+    version and no binding changed, nothing else happens and the interval
+    doubles (up to max_interval); otherwise the affected bindings are
+    re-checked from the refreshed catalog, the status table is updated,
+    newly drifted entities are pushed, and the interval drops back to
+    min_interval.
+
+    Usage:
+        watcher = SchemaDriftWatcher(detector, lambda: registry.get_database_connector(agent_id), agent_id)
+        watcher.start()
+        status = watcher.status_table.get(agent_id, "PatientRecord")
+    """
+
+    def __init__(
+        self,
+        detector: SchemaDriftDetector,
+        connector_factory: Callable[[], Any],
+        scope: str,
+        status_table: Optional["DriftStatusTable"] = None,
+        catalog: Optional[SchemaCatalogCache] = None,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        listen_channel: Optional[str] = None,
+        on_drift: Optional[Callable[[DriftReport, List[Fix]], None]] = None,
+    ):
+        """
+        Args:
+            detector: Detector holding the bindings to watch.
+            connector_factory: Returns a (disconnected) connector to the watched
+                database; called once per poll.
+            scope: Key of the watched database in the status table (the agent ID).
+            status_table: Table receiving results (default: the shared table).
+            catalog: Schema catalog (default: the shared catalog).
+            min_interval: Seconds between polls right after a change.
+            max_interval: Upper bound the interval backs off to while nothing changes.
+            listen_channel: PostgreSQL NOTIFY channel to wake up on
+                (e.g. DEFAULT_CHANNEL with PG_EVENT_TRIGGER_SQL installed).
+            on_drift: Called for newly drifted entities (default: WebSocket push).
+        """
+        self.detector = detector
+        self.connector_factory = connector_factory
+        self.scope = scope
+        self.status_table = status_table if status_table is not None else get_drift_status_table()
+        self.catalog = catalog or get_schema_catalog()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.listen_channel = listen_channel
+        self.on_drift = on_drift or _push_drift_event
+        self.interval = min_interval
+
+        self._versions: Optional[Dict[str, str]] = None
+        self._catalog_version: Optional[str] = None
+        self._bindings_version: Optional[int] = None
+        self._listener = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.polls = 0
+        self.checks = 0
+
+    def poll_once(self) -> List[DriftReport]:
+        """
+        Check for schema changes once.
+
+        Returns:
+            Reports of entities that newly drifted during this poll.
+        """
+        connector = self.connector_factory()
+        if connector is None:
+            raise ValueError("Watched database has no connector")
+
+        snapshot = self.catalog.get(connector, force=True)
+        bindings = self.detector.bindings
+        bindings_version = self.detector.bindings_version
+        self.polls += 1
+
+        if snapshot.version == self._catalog_version and bindings_version == self._bindings_version:
+            return []
+
+        entities = list(bindings)
+        if self._versions is not None and bindings_version == self._bindings_version:
+            changed = {
+                key.rsplit(".", 1)[-1]
+                for key in set(snapshot.versions) | set(self._versions)
+                if snapshot.versions.get(key) != self._versions.get(key)
+            }
+            entities = [
+                entity for entity, binding in bindings.items()
+                if binding.table in changed or binding.table.rsplit(".", 1)[-1] in changed
+            ]
+
+        reports = self.detector.check_live(connector, entities) if entities else []
+        self.checks += len(reports)
+        self._versions = dict(snapshot.versions)
+        self._catalog_version = snapshot.version
+        self._bindings_version = bindings_version
+
+        for status in self.status_table.all(self.scope):
+            if status.entity not in bindings:
+                self.status_table.remove(self.scope, status.entity)
+
+        drifted = []
+        for report in reports:
+            fixes = self.detector.suggest_fixes(report) if report.has_drift else []
+            if self.status_table.update(self.scope, report, fixes):
+                drifted.append(report)
+                logger.warning("Schema drift detected for %s: %s", report.entity, report.message)
+                try:
+                    self.on_drift(report, fixes)
+                except Exception as e:
+                    logger.warning("Schema drift notification failed: %s", e)
+        # Any change (schema or bindings) resets the adaptive interval
+        self.interval = self.min_interval
+        return drifted
+
+    def start(self) -> None:
+        """Start polling in a daemon thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="schema-drift-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Stop the polling thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._close_listener()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Polling statistics."""
+        return {
+            "running": self.is_running,
+            "interval": self.interval,
+            "polls": self.polls,
+            "checks": self.checks,
+            "catalog_version": self._catalog_version,
+            "listening": self._listener is not None,
+        }
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            previous = self._catalog_version, self._bindings_version
+            try:
+                self.poll_once()
+                if (self._catalog_version, self._bindings_version) == previous:
+                    self.interval = min(self.interval * 2, self.max_interval)
+            except Exception as e:
+                logger.warning("Schema drift watcher poll failed: %s", e)
+                self.interval = min(self.interval * 2, self.max_interval)
+            self._wait(self.interval)
+
+    def _wait(self, timeout: float) -> None:
+        """Sleep until the next poll, a NOTIFY on the listen channel, or stop()."""
+        listener = self._open_listener()
+        if listener is None:
+            self._stop.wait(timeout)
+            return
+        deadline = time.monotonic() + timeout
+        while not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            try:
+                # Wake periodically so stop() is honoured promptly
+                readable, _, _ = select.select([listener], [], [], min(remaining, 1.0))
+                if readable:
+                    listener.poll()
+                    if listener.notifies:
+                        listener.notifies.clear()
+                        self.interval = self.min_interval
+                        return
+            except Exception as e:
+                logger.warning("Schema change listener failed, falling back to polling: %s", e)
+                self._close_listener()
+                self.listen_channel = None
+                self._stop.wait(max(remaining, 0))
+                return
+
+    def _open_listener(self):
+        if self._listener is not None or not self.listen_channel:
+            return self._listener
+        try:
+            connector = self.connector_factory()
+            opener = getattr(connector, "open_listen_connection", None)
+            self._listener = opener(self.listen_channel) if opener else None
+        except Exception as e:
+            logger.warning("Cannot LISTEN on %s, polling only: %s", self.listen_channel, e)
+            self._listener = None
+        if self._listener is None:
+            self.listen_channel = None
+        return self._listener
+
+    def _close_listener(self) -> None:
+        if self._listener is not None:
+            try:
+                self._listener.close()
+            except Exception:
+                pass
+            self._listener = None
+
+
+# Shared status table read by the policy engine
+_drift_status_table: Optional[DriftStatusTable] = None
+
+
+def get_drift_status_table() -> DriftStatusTable:
+    """Get or create the shared drift status table."""
+    global _drift_status_table
+    if _drift_status_table is None:
+        _drift_status_table = DriftStatusTable()
+    return _drift_status_table
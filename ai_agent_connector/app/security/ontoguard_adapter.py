@@ -7,13 +7,17 @@ and the UAC infrastructure, enabling OWL ontology-based validation for AI agent
 Features:
 - OWL ontology-based RBAC validation
 - LRU caching with TTL for performance
+- One warm validator per domain, loaded once and swapped on reload
+- Role/action/entity decisions precompiled into a lookup table per domain
 - Pass-through mode when OntoGuard not available
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
+from xml.etree import ElementTree
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +25,19 @@ logger = logging.getLogger(__name__)
 try:
     from ai_agent_connector.app.cache import (
         cache_validation_result,
+        cache_validation_results,
         get_cached_validation,
+        get_cached_validations,
+        invalidate_cache,
     )
     CACHE_AVAILABLE = True
 except ImportError:
     CACHE_AVAILABLE = False
     cache_validation_result = None  # type: ignore
+    cache_validation_results = None  # type: ignore
     get_cached_validation = None  # type: ignore
+    get_cached_validations = None  # type: ignore
+    invalidate_cache = None  # type: ignore
     logger.warning("Cache module not available, caching disabled")
 
 
@@ -60,6 +70,193 @@ class ValidationResult:
         }
 
 
+class PermissionTable:
+    """
+    Decision matrix compiled from an ontology for one domain.
+
+    Every (action, entity type, role) combination of the domain is evaluated
+    once when the ontology loads. Names are interned to small integer ids
+    and decisions are kept in a dense bytearray, so a lookup is three dict
+    lookups and an index. Decisions that depend on more than the role (the
+    validator reports a non-role constraint, or the request carries extra
+    context such as an approver) are left to the live validator.
+    """
+
+    # Compiled when the ontology's own action set is unknown
+    ACTIONS = ('create', 'read', 'update', 'delete')
+
+    # Context keys that never change a role-based decision
+    STATIC_CONTEXT_KEYS = frozenset({
+        'role', 'domain', 'user_id', 'agent_id', 'entity_id', 'tenant_id',
+        'ip', 'timestamp', 'method', 'path', 'query_params', 'request_id',
+    })
+
+    # constraint_type values that only depend on the role
+    STATIC_CONSTRAINT_TYPES = frozenset({None, 'role', 'role_based', 'rbac'})
+
+    UNKNOWN, ALLOW, DENY = 0, 1, 2
+
+    def __init__(
+        self,
+        validator,
+        actions: List[str],
+        entity_types: List[str],
+        roles: List[str],
+        all_actions: bool = False
+    ):
+        """
+        Create an empty table.
+
+        Args:
+            validator: Validator the decisions come from
+            actions: Actions to compile
+            entity_types: Entity types to compile
+            roles: Roles to compile
+            all_actions: Whether actions is every action of the domain
+        """
+        self.validator = validator
+        self.all_actions = all_actions
+        self._actions = {name: i for i, name in enumerate(actions)}
+        self._entities = {name: i for i, name in enumerate(entity_types)}
+        self._roles = {name: i for i, name in enumerate(roles)}
+        self._action_names = list(actions)
+        size = len(actions) * len(entity_types) * len(roles)
+        self._cells = bytearray(size)
+        self._results: List[Optional[ValidationResult]] = [None] * size
+
+    @classmethod
+    def compile(
+        cls,
+        validator,
+        entity_types: List[str],
+        roles: List[str],
+        actions: Optional[List[str]] = None
+    ) -> 'PermissionTable':
+        """
+        Evaluate the full decision matrix against a validator.
+
+        Args:
+            validator: OntoGuard validator
+            entity_types: Entity types of the domain
+            roles: Roles of the domain
+            actions: Every action the ontology defines (default: CRUD only,
+                and allowed_actions() then defers to the validator)
+
+        Returns:
+            Compiled PermissionTable
+        """
+        table = cls(validator, list(actions or cls.ACTIONS), list(entity_types), list(roles),
+                    all_actions=bool(actions))
+        for action, a in table._actions.items():
+            for entity_type, e in table._entities.items():
+                for role, r in table._roles.items():
+                    try:
+                        result = validator.validate(
+                            action=action,
+                            entity=entity_type,
+                            entity_id='compiled',
+                            context={'role': role}
+                        )
+                    except Exception as e:
+                        logger.debug(f"Not compiling {action}:{entity_type}:{role}: {e}")
+                        continue
+                    metadata = result.metadata if isinstance(result.metadata, dict) else None
+                    if metadata is None or not isinstance(result.allowed, bool):
+                        continue
+                    if metadata.get('constraint_type') not in cls.STATIC_CONSTRAINT_TYPES:
+                        continue
+                    index = table._index(a, e, r)
+                    table._cells[index] = cls.ALLOW if result.allowed else cls.DENY
+                    table._results[index] = ValidationResult(
+                        allowed=result.allowed,
+                        reason=result.reason,
+                        constraints=OntoGuardAdapter._extract_constraints(result),
+                        suggestions=list(result.suggested_actions or []),
+                        metadata=dict(metadata)
+                    )
+        return table
+
+    def _index(self, a: int, e: int, r: int) -> int:
+        return (a * len(self._entities) + e) * len(self._roles) + r
+
+    def lookup(
+        self,
+        action: str,
+        entity_type: str,
+        role: Optional[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> Optional[ValidationResult]:
+        """
+        Look up a precompiled decision.
+
+        Args:
+            action: Action name
+            entity_type: Entity type
+            role: Role name
+            context: Request context; any key outside STATIC_CONTEXT_KEYS
+                sends the request to the live validator
+
+        Returns:
+            ValidationResult, or None if the decision has to be evaluated live
+        """
+        if context and not self.STATIC_CONTEXT_KEYS.issuperset(context):
+            return None
+        a = self._actions.get(action)
+        e = self._entities.get(entity_type)
+        r = self._roles.get(role)
+        if a is None or e is None or r is None:
+            return None
+        index = self._index(a, e, r)
+        if not self._cells[index]:
+            return None
+        result = self._results[index]
+        return ValidationResult(
+            allowed=result.allowed,
+            reason=result.reason,
+            constraints=list(result.constraints),
+            suggestions=list(result.suggestions),
+            metadata={**result.metadata, 'compiled': True}
+        )
+
+    def allowed_actions(self, role: str, entity_type: str) -> Optional[List[str]]:
+        """
+        Get the allowed actions for a role on an entity type.
+
+        Args:
+            role: Role name
+            entity_type: Entity type
+
+        Returns:
+            Allowed action names in ontology order, or None if the table
+            does not hold every action of the domain or any of them is not
+            compiled
+        """
+        e = self._entities.get(entity_type)
+        r = self._roles.get(role)
+        if not self.all_actions or e is None or r is None:
+            return None
+        allowed = []
+        for a, action in enumerate(self._action_names):
+            cell = self._cells[self._index(a, e, r)]
+            if not cell:
+                return None
+            if cell == self.ALLOW:
+                allowed.append(action)
+        return allowed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get table size and how many decisions were compiled."""
+        compiled = len(self._cells) - self._cells.count(self.UNKNOWN)
+        return {
+            'actions': len(self._actions),
+            'entity_types': len(self._entities),
+            'roles': len(self._roles),
+            'cells': len(self._cells),
+            'compiled': compiled,
+            'allowed': self._cells.count(self.ALLOW),
+        }
+
+
 class OntoGuardAdapter:
     """
     Adapter for integrating OntoGuard semantic validation into UAC.
@@ -68,24 +265,41 @@ class OntoGuardAdapter:
     against OWL ontologies using the OntoGuard library. It supports graceful
     degradation when OntoGuard is not available.
 
+    Requests that name a domain other than the default ontology's are
+    validated by that domain's own validator. Validators are parsed once,
+    kept in a pool that is replaced as a whole (never mutated in place), and
+    swapped atomically on reload, so concurrent requests for different
+    domains never re-initialize or race on shared state.
+
     Attributes:
         validator: The OntoGuard OntologyValidator instance (if loaded)
         config_path: Path to the configuration file (optional)
         ontology_paths: List of loaded ontology file paths
+        default_domain: Domain of the default ontology, if recognised
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, compile_permissions: bool = True):
         """
         Initialize the OntoGuard adapter.
 
         Args:
             config_path: Optional path to a YAML configuration file
+            compile_permissions: Precompile each domain's decision matrix on load
         """
         self.validator = None
         self.config_path = config_path
+        self.compile_permissions = compile_permissions
         self.ontology_paths: List[str] = []
+        self.default_domain: Optional[str] = None
         self._initialized = False
         self._pass_through_mode = False
+        # domain -> validator (None if the domain failed to load); replaced, never mutated
+        self._validators: Dict[str, Any] = {}
+        # domain -> compiled decisions of that domain's validator; replaced, never mutated
+        self._tables: Dict[str, PermissionTable] = {}
+        # domain -> table-to-entity map (None key: all domains merged); replaced, never mutated
+        self._entity_maps: Dict[Optional[str], Dict[str, str]] = {}
+        self._load_lock = threading.Lock()
 
         logger.info("OntoGuard adapter initialized")
 
@@ -124,10 +338,26 @@ class OntoGuardAdapter:
                 self._initialized = True
                 return False
 
-            self.validator = OntologyValidator(primary_ontology)
-            self.ontology_paths = ontology_paths
-            self._initialized = True
-            self._pass_through_mode = False
+            validator = OntologyValidator(primary_ontology)
+            domain = _detect_domain(primary_ontology)
+            table = self._compile(domain, validator, primary_ontology)
+            replaced = self.validator is not None
+
+            with self._load_lock:
+                # Keep other domains warm; retry the ones that failed to load
+                pool = {d: v for d, v in self._validators.items() if v is not None}
+                if domain:
+                    pool[domain] = validator
+                    self._tables = self._with_table(domain, table)
+                self._validators = pool
+                self.validator = validator
+                self.default_domain = domain
+                self.ontology_paths = ontology_paths
+                self._initialized = True
+                self._pass_through_mode = False
+
+            if replaced and CACHE_AVAILABLE:
+                invalidate_cache()
 
             logger.info(f"OntoGuard initialized with {len(ontology_paths)} ontology(ies)")
             return True
@@ -186,6 +416,174 @@ class OntoGuardAdapter:
             logger.error(f"Error loading config: {e}")
             return []
 
+    def get_validator(self, domain: Optional[str] = None):
+        """
+        Get the validator for a domain, loading it on first use.
+
+        Args:
+            domain: Domain name or alias (None for the default ontology)
+
+        Returns:
+            The domain's validator, or the default validator if the domain
+            is the default one, unknown, or failed to load
+        """
+        return self._resolve(domain)[1]
+
+    def _resolve(self, domain: Optional[str]):
+        """Domain whose validator serves a request, and that validator."""
+        validator = self.validator
+        if not domain or self.default_domain is None:
+            return self.default_domain, validator
+        domain = _canonical_domain(domain)
+        if domain == self.default_domain:
+            return domain, validator
+
+        pool = self._validators
+        if domain not in pool:
+            pool = self._load_domain(domain)
+        if pool.get(domain) is None:
+            return self.default_domain, validator
+        return domain, pool[domain]
+
+    def get_permission_table(self, domain: Optional[str] = None) -> Optional[PermissionTable]:
+        """
+        Get the compiled decisions for the validator serving a domain.
+
+        Args:
+            domain: Domain name or alias (None for the default ontology)
+
+        Returns:
+            PermissionTable, or None if that validator has none
+        """
+        domain, validator = self._resolve(domain)
+        table = self._tables.get(domain) if domain else None
+        # A validator swapped in by hand has no table of its own
+        if table is None or table.validator is not validator:
+            return None
+        return table
+
+    def _compile(
+        self,
+        domain: Optional[str],
+        validator,
+        ontology_path: Optional[str] = None
+    ) -> Optional[PermissionTable]:
+        """Compile a domain's decision matrix, or None if it is not configured."""
+        if not self.compile_permissions or not domain or validator is None:
+            return None
+        from ai_agent_connector.app.config.domains import get_domain_config
+
+        config = get_domain_config(domain)
+        if config is None:
+            return None
+        entity_types = list(dict.fromkeys(list(config.entity_types) + list(config.table_entity_map.values())))
+        actions = _ontology_actions(ontology_path or _domain_ontology_path(domain))
+        try:
+            table = PermissionTable.compile(validator, entity_types, config.roles, actions)
+        except Exception as e:
+            logger.error(f"Failed to compile permissions for domain '{domain}': {e}")
+            return None
+        stats = table.get_stats()
+        logger.info(f"Compiled {stats['compiled']}/{stats['cells']} permission decisions for domain '{domain}'")
+        return table
+
+    def _with_table(self, domain: str, table: Optional[PermissionTable]) -> Dict[str, PermissionTable]:
+        """Copy of the table map with a domain's table replaced."""
+        tables = {d: t for d, t in self._tables.items() if d != domain}
+        if table is not None:
+            tables[domain] = table
+        return tables
+
+    def load_domain(self, domain: str) -> bool:
+        """
+        Make sure a domain's validator is loaded.
+
+        Args:
+            domain: Domain name or alias
+
+        Returns:
+            True if requests for the domain can be validated (or OntoGuard
+            is in pass-through mode and the domain is known)
+        """
+        domain = _canonical_domain(domain)
+        if not self.is_active:
+            return _domain_ontology_path(domain) is not None
+        if domain == self.default_domain:
+            return True
+        pool = self._validators
+        if domain not in pool:
+            pool = self._load_domain(domain)
+        return pool.get(domain) is not None
+
+    def _load_domain(self, domain: str) -> Dict[str, Any]:
+        """Parse a domain's ontology once and publish a new pool containing it."""
+        with self._load_lock:
+            pool = self._validators
+            if domain in pool:
+                return pool
+            ontology_path = _domain_ontology_path(domain)
+            validator = self._build_validator(domain, ontology_path)
+            self._tables = self._with_table(domain, self._compile(domain, validator, ontology_path))
+            pool = {**pool, domain: validator}
+            self._validators = pool
+            return pool
+
+    def _build_validator(self, domain: str, ontology_path: Optional[str]):
+        """Create a validator for an ontology file, or None if it cannot be loaded."""
+        if not ontology_path or not Path(ontology_path).exists():
+            logger.warning(f"No ontology found for domain '{domain}': {ontology_path}")
+            return None
+        try:
+            from ontoguard.validator import OntologyValidator
+
+            validator = OntologyValidator(ontology_path)
+            logger.info(f"Loaded OntoGuard validator for domain '{domain}': {ontology_path}")
+            return validator
+        except Exception as e:
+            logger.error(f"Failed to load ontology for domain '{domain}': {e}")
+            return None
+
+    def reload_domain(self, domain: str, ontology_path: Optional[str] = None) -> bool:
+        """
+        Reload one domain's ontology and swap it in atomically.
+
+        The new validator is built before anything is replaced, so requests
+        keep using the old one until the swap and a failed reload changes
+        nothing.
+
+        Args:
+            domain: Domain name or alias
+            ontology_path: Ontology file (default: the domain's configured ontology)
+
+        Returns:
+            True if the domain was reloaded
+        """
+        domain = _canonical_domain(domain)
+        ontology_path = ontology_path or _domain_ontology_path(domain)
+        validator = self._build_validator(domain, ontology_path)
+        if validator is None:
+            return False
+        table = self._compile(domain, validator, ontology_path)
+
+        with self._load_lock:
+            self._tables = self._with_table(domain, table)
+            self._validators = {**self._validators, domain: validator}
+            if domain == self.default_domain:
+                self.validator = validator
+                self.ontology_paths = [ontology_path]
+
+        if CACHE_AVAILABLE:
+            invalidate_cache(domain=domain)
+        return True
+
+    def get_loaded_domains(self) -> List[str]:
+        """Get the domains with a warm validator."""
+        return sorted(d for d, v in self._validators.items() if v is not None)
+
+    def get_permission_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get compiled permission table statistics per domain."""
+        return {domain: table.get_stats() for domain, table in sorted(self._tables.items())}
+
     def validate_action(
         self,
         action: str,
@@ -211,86 +609,233 @@ class OntoGuardAdapter:
         Returns:
             ValidationResult indicating whether the action is allowed
         """
-        if not self._initialized:
-            return ValidationResult(
-                allowed=True,
-                reason="OntoGuard not initialized (pass-through)",
-                constraints=[],
-                suggestions=[],
-                metadata={"mode": "uninitialized"}
-            )
-
-        if self._pass_through_mode or self.validator is None:
-            return ValidationResult(
-                allowed=True,
-                reason="OntoGuard in pass-through mode",
-                constraints=[],
-                suggestions=[],
-                metadata={"mode": "pass_through"}
-            )
+        inactive = self._inactive_result()
+        if inactive is not None:
+            return inactive
 
-        # Extract cache key parameters
+        # Extract cache key parameters; the domain is the one whose validator
+        # answers (aliases and a missing domain resolve to their configured
+        # name), so reload_domain() invalidates every entry it made stale
         role = context.get('role')
-        domain = context.get('domain')
+        domain, validator = self._resolve(context.get('domain'))
+
+        # Precompiled role-based decisions need neither the validator nor the cache
+        if use_cache:
+            table = self.get_permission_table(domain)
+            if table is not None:
+                compiled = table.lookup(action, entity_type, role, context)
+                if compiled is not None:
+                    return compiled
 
         # Check cache first
         if use_cache and CACHE_AVAILABLE:
             cached = get_cached_validation(action, entity_type, role, domain)
             if cached is not None:
                 logger.debug(f"Cache HIT: {action}:{entity_type}:{role}:{domain}")
-                return ValidationResult(
-                    allowed=cached['allowed'],
-                    reason=cached.get('reason', 'Cached result'),
-                    constraints=cached.get('constraints', []),
-                    suggestions=cached.get('suggestions', []),
-                    metadata={**cached.get('metadata', {}), 'cached': True}
-                )
+                return self._from_cached(cached)
 
         try:
-            # Extract entity_id from context or generate a placeholder
-            entity_id = context.get('entity_id', context.get('user_id', 'unknown'))
+            validation_result = self._run_validator(validator, action, entity_type, context)
+        except Exception as e:
+            logger.error(f"Validation error: {e}")
+            return self._validation_error(e)
 
-            # Call OntoGuard validator
-            result = self.validator.validate(
+        # Cache the result
+        if use_cache and CACHE_AVAILABLE:
+            cache_validation_result(
                 action=action,
-                entity=entity_type,
-                entity_id=str(entity_id),
-                context=context
+                entity_type=entity_type,
+                result=validation_result.to_dict(),
+                role=role,
+                domain=domain
             )
+            logger.debug(f"Cache SET: {action}:{entity_type}:{role}:{domain}")
 
-            # Convert OntoGuard result to our ValidationResult
-            validation_result = ValidationResult(
-                allowed=result.allowed,
-                reason=result.reason,
-                constraints=self._extract_constraints(result),
-                suggestions=result.suggested_actions,
-                metadata=result.metadata
-            )
+        return validation_result
 
-            # Cache the result
-            if use_cache:
-                cache_validation_result(
-                    action=action,
-                    entity_type=entity_type,
-                    result=validation_result.to_dict(),
-                    role=role,
-                    domain=domain
-                )
-                logger.debug(f"Cache SET: {action}:{entity_type}:{role}:{domain}")
+    def validate_actions(
+        self,
+        batch: List[Dict[str, Any]],
+        context: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True
+    ) -> List[ValidationResult]:
+        """
+        Validate several actions in one call, e.g. every table of a query.
 
-            return validation_result
+        Compiled decisions are answered first, the rest are looked up in the
+        cache together (a single MGET when Redis backs it), and only the
+        remaining distinct (action, entity, role, domain) combinations reach
+        the validator.
 
-        except Exception as e:
-            logger.error(f"Validation error: {e}")
+        Args:
+            batch: Items with 'action' and either 'entity_type' or 'table'
+                (mapped with get_table_entity_map), plus an optional 'context'
+                merged over the shared one
+            context: Context shared by all items (see validate_action)
+            use_cache: Whether to use caching (default True)
+
+        Returns:
+            ValidationResult for each item, in batch order
+        """
+        context = context or {}
+        inactive = self._inactive_result()
+        if inactive is not None:
+            return [inactive] * len(batch)
+
+        items = []
+        for item in batch:
+            item_context = {**context, **item['context']} if item.get('context') else context
+            entity_type = item.get('entity_type') or self.resolve_entity_type(item['table'], item_context.get('domain'))
+            items.append((item['action'], entity_type, item_context))
+
+        if not use_cache:
+            return [self.validate_action(action, entity_type, item_context, use_cache=False)
+                    for action, entity_type, item_context in items]
+
+        results: List[Optional[ValidationResult]] = [None] * len(items)
+        # Requested domain -> domain whose validator answers (see validate_action)
+        domains: Dict[Optional[str], Optional[str]] = {}
+        tables: Dict[Optional[str], Optional[PermissionTable]] = {}
+        # (action, entity_type, role, domain) -> indexes still to answer
+        pending: Dict[Tuple[str, str, Optional[str], Optional[str]], List[int]] = {}
+        for i, (action, entity_type, item_context) in enumerate(items):
+            role, requested = item_context.get('role'), item_context.get('domain')
+            if requested not in domains:
+                domains[requested] = self._resolve(requested)[0]
+            domain = domains[requested]
+            if domain not in tables:
+                tables[domain] = self.get_permission_table(domain)
+            if tables[domain] is not None:
+                results[i] = tables[domain].lookup(action, entity_type, role, item_context)
+            if results[i] is None:
+                pending.setdefault((action, entity_type, role, domain), []).append(i)
+
+        keys = list(pending)
+        if keys and CACHE_AVAILABLE:
+            for key, cached in zip(keys, get_cached_validations(keys)):
+                if cached is not None:
+                    result = self._from_cached(cached)
+                    for i in pending.pop(key):
+                        results[i] = result
+
+        fresh = []
+        for (action, entity_type, role, domain), indexes in pending.items():
+            try:
+                result = self._run_validator(self.get_validator(domain), action, entity_type, items[indexes[0]][2])
+                fresh.append((action, entity_type, result.to_dict(), role, domain))
+            except Exception as e:
+                logger.error(f"Validation error: {e}")
+                result = self._validation_error(e)
+            for i in indexes:
+                results[i] = result
+        if fresh and CACHE_AVAILABLE:
+            cache_validation_results(fresh)
+
+        return results
+
+    def get_table_entity_map(self, domain: Optional[str] = None) -> Dict[str, str]:
+        """
+        Get the table-to-entity map for a domain, built once per domain.
+
+        Args:
+            domain: Domain name or alias (None for the default ontology's
+                domain; every domain's map merged if that is unknown too)
+
+        Returns:
+            Dictionary mapping lowercase table names to OWL entity types
+        """
+        key = _canonical_domain(domain) if domain else self.default_domain
+        entity_maps = self._entity_maps
+        mapping = entity_maps.get(key)
+        if mapping is None:
+            from ai_agent_connector.app.config.domains import get_table_entity_map
+
+            mapping = dict(get_table_entity_map(key))
+            self._entity_maps = {**entity_maps, key: mapping}
+        return mapping
+
+    def resolve_entity_type(self, table: str, domain: Optional[str] = None) -> str:
+        """
+        Map a table name to its OWL entity type.
+
+        Args:
+            table: SQL table name
+            domain: Domain name or alias (None for the default ontology)
+
+        Returns:
+            Mapped entity type, or the table name in CamelCase if unmapped
+        """
+        entity_type = self.get_table_entity_map(domain).get(table.lower())
+        if entity_type:
+            return entity_type
+        return ''.join(word.capitalize() for word in table.replace('_', ' ').split())
+
+    def _inactive_result(self) -> Optional[ValidationResult]:
+        """Pass-through result when nothing is validated, else None."""
+        if not self._initialized:
             return ValidationResult(
-                allowed=False,
-                reason=f"Validation error: {str(e)}",
+                allowed=True,
+                reason="OntoGuard not initialized (pass-through)",
                 constraints=[],
-                suggestions=["Check OntoGuard configuration", "Verify ontology file"],
-                metadata={"error": str(e)}
+                suggestions=[],
+                metadata={"mode": "uninitialized"}
             )
 
-    def _extract_constraints(self, result) -> List[str]:
+        if self._pass_through_mode or self.validator is None:
+            return ValidationResult(
+                allowed=True,
+                reason="OntoGuard in pass-through mode",
+                constraints=[],
+                suggestions=[],
+                metadata={"mode": "pass_through"}
+            )
+        return None
+
+    def _run_validator(self, validator, action: str, entity_type: str, context: Dict[str, Any]) -> ValidationResult:
+        """Ask a validator for a decision and convert it to a ValidationResult."""
+        # Extract entity_id from context or generate a placeholder
+        entity_id = context.get('entity_id', context.get('user_id', 'unknown'))
+
+        # Call OntoGuard validator
+        result = validator.validate(
+            action=action,
+            entity=entity_type,
+            entity_id=str(entity_id),
+            context=context
+        )
+
+        return ValidationResult(
+            allowed=result.allowed,
+            reason=result.reason,
+            constraints=self._extract_constraints(result),
+            suggestions=result.suggested_actions,
+            metadata=result.metadata
+        )
+
+    @staticmethod
+    def _from_cached(cached: Dict[str, Any]) -> ValidationResult:
+        """Rebuild a ValidationResult from its cached dict."""
+        return ValidationResult(
+            allowed=cached['allowed'],
+            reason=cached.get('reason', 'Cached result'),
+            constraints=cached.get('constraints', []),
+            suggestions=cached.get('suggestions', []),
+            metadata={**cached.get('metadata', {}), 'cached': True}
+        )
+
+    @staticmethod
+    def _validation_error(error: Exception) -> ValidationResult:
+        """Deny result for a validator that raised."""
+        return ValidationResult(
+            allowed=False,
+            reason=f"Validation error: {str(error)}",
+            constraints=[],
+            suggestions=["Check OntoGuard configuration", "Verify ontology file"],
+            metadata={"error": str(error)}
+        )
+
+    @staticmethod
+    def _extract_constraints(result) -> List[str]:
         """Extract constraint information from validation result."""
         constraints = []
         metadata = result.metadata or {}
@@ -311,7 +856,8 @@ class OntoGuardAdapter:
         self,
         role: str,
         action: str,
-        entity_type: str
+        entity_type: str,
+        domain: Optional[str] = None
     ) -> bool:
         """
         Check if a role has permission for a specific action on an entity type.
@@ -320,6 +866,7 @@ class OntoGuardAdapter:
             role: User role (e.g., "Admin", "Manager", "Customer")
             action: The action to check
             entity_type: The entity type
+            domain: Domain whose ontology to check (default: the default ontology)
 
         Returns:
             True if the action is permitted, False otherwise
@@ -330,6 +877,8 @@ class OntoGuardAdapter:
         try:
             # Create a minimal context with the role
             context = {"role": role}
+            if domain:
+                context["domain"] = domain
 
             # Use validation to check permissions
             result = self.validate_action(action, entity_type, context)
@@ -342,7 +891,8 @@ class OntoGuardAdapter:
     def get_allowed_actions(
         self,
         role: str,
-        entity_type: str
+        entity_type: str,
+        domain: Optional[str] = None
     ) -> List[str]:
         """
         Get list of allowed actions for a role on a specific entity type.
@@ -350,6 +900,7 @@ class OntoGuardAdapter:
         Args:
             role: User role
             entity_type: The entity type to query
+            domain: Domain whose ontology to query (default: the default ontology)
 
         Returns:
             List of allowed action names
@@ -361,8 +912,14 @@ class OntoGuardAdapter:
             # Create context with role
             context = {"role": role}
 
+            table = self.get_permission_table(domain)
+            if table is not None:
+                actions = table.allowed_actions(role, entity_type)
+                if actions is not None:
+                    return actions
+
             # Get allowed actions from OntoGuard
-            actions = self.validator.get_allowed_actions(entity_type, context)
+            actions = self.get_validator(domain).get_allowed_actions(entity_type, context)
             return actions
 
         except Exception as e:
@@ -390,7 +947,7 @@ class OntoGuardAdapter:
             return "OntoGuard not active - all actions are allowed by default."
 
         try:
-            return self.validator.explain_denial(action, entity_type, context)
+            return self.get_validator(context.get('domain')).explain_denial(action, entity_type, context)
         except Exception as e:
             return f"Error generating explanation: {e}"
 
@@ -400,6 +957,61 @@ class OntoGuardAdapter:
         return self._initialized and not self._pass_through_mode and self.validator is not None
 
 
+def _canonical_domain(domain: str) -> str:
+    """Resolve a domain alias to its configured name."""
+    from ai_agent_connector.app.config.domains import get_domain_config
+
+    config = get_domain_config(domain)
+    return config.name if config else domain
+
+
+def _domain_ontology_path(domain: str) -> Optional[str]:
+    """Configured ontology file for a domain, if any."""
+    from ai_agent_connector.app.config.domains import get_ontology_path
+
+    return get_ontology_path(domain)
+
+
+_OWL_NAMESPACES = {
+    'owl': 'http://www.w3.org/2002/07/owl#',
+    'rdf': 'http://www.w3.org/1999/02/22-rdf-syntax-ns#',
+    'rdfs': 'http://www.w3.org/2000/01/rdf-schema#',
+}
+
+
+def _ontology_actions(ontology_path: Optional[str]) -> Optional[List[str]]:
+    """
+    Actions an ontology defines (the subclasses of its Action class, e.g.
+    ReadAction -> read), in declaration order, or None if the file cannot be read or has none.
+    """
+    if not ontology_path:
+        return None
+    try:
+        root = ElementTree.parse(ontology_path).getroot()
+    except (OSError, ElementTree.ParseError) as e:
+        logger.debug(f"Cannot read actions from {ontology_path}: {e}")
+        return None
+
+    rdf = '{%s}' % _OWL_NAMESPACES['rdf']
+    actions: List[str] = []
+    for owl_class in root.iter('{%s}Class' % _OWL_NAMESPACES['owl']):
+        parents = [p.get(rdf + 'resource', '') for p in owl_class.findall('rdfs:subClassOf', _OWL_NAMESPACES)]
+        if not any(parent.rsplit('#', 1)[-1] == 'Action' for parent in parents):
+            continue
+        name = owl_class.get(rdf + 'about', '').rsplit('#', 1)[-1]
+        name = (name[:-len('Action')] if name.endswith('Action') else name).lower()
+        if name and name not in actions:
+            actions.append(name)
+    return actions or None
+
+
+def _detect_domain(ontology_path: str) -> Optional[str]:
+    """Domain an ontology file belongs to, judged by its path."""
+    from ai_agent_connector.app.config.domains import detect_domain_from_ontology
+
+    return detect_domain_from_ontology(ontology_path)
+
+
 # Singleton instance
 _adapter_instance: Optional[OntoGuardAdapter] = None
 
@@ -12,7 +12,7 @@ Key concepts:
 
 Known limitations:
 - No data lineage signals — compares column names and types only.
-- Rename detection uses character overlap ratio, not semantic similarity
+- Rename detection uses character bigram similarity, not semantic similarity
   (e.g., "customer_id" vs "client_id" may be missed).
 - Column order changes are not detected.
 - Constraint drift (CHECK, UNIQUE, FK) is not tracked — only columns.
@@ -24,12 +24,15 @@ import hashlib
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 
 import yaml
 
 logger = logging.getLogger(__name__)
 
+# Tables per IN list when ANY(%s) is not available
+LIVE_FETCH_BATCH = 500
+
 
 @dataclass
 class SchemaBinding:
@@ -142,6 +145,12 @@ class SchemaDriftDetector:
         self._bindings: Dict[str, SchemaBinding] = {}  # entity -> binding
         self._approvals: Dict[str, DriftApproval] = {}  # entity -> approval
         self.similarity_threshold = similarity_threshold
+        # entity -> (signature, {column: normalized type}) of its binding
+        self._signatures: Dict[str, Tuple[str, Dict[str, str]]] = {}
+        # entity -> (binding signature, live signature, report) of the last live check
+        self._live_reports: Dict[str, Tuple[str, str, DriftReport]] = {}
+        # Incremented whenever a binding is added or changed
+        self.bindings_version = 0
 
     def load_bindings(self, config_path: str) -> int:
         """
@@ -166,7 +175,7 @@ class SchemaDriftDetector:
                     columns=entity_data.get("columns", {}),
                     domain=domain_name,
                 )
-                self._bindings[entity_name] = binding
+                self.add_binding(binding)
                 count += 1
 
         logger.info("Loaded %d schema bindings from %s", count, config_path)
@@ -175,6 +184,19 @@ class SchemaDriftDetector:
     def add_binding(self, binding: SchemaBinding) -> None:
         """Add or update a single binding."""
         self._bindings[binding.entity] = binding
+        normalized = {col: _normalize_type(t) for col, t in binding.columns.items()}
+        self._signatures[binding.entity] = (_schema_signature(normalized), normalized)
+        self._live_reports.pop(binding.entity, None)
+        self.bindings_version += 1
+
+    def _binding_signature(self, binding: SchemaBinding) -> Tuple[str, Dict[str, str]]:
+        """Precomputed signature and normalized columns of a binding."""
+        cached = self._signatures.get(binding.entity)
+        if cached is None or cached[1].keys() != binding.columns.keys():
+            # Binding columns were edited in place; recompute
+            self.add_binding(binding)
+            cached = self._signatures[binding.entity]
+        return cached
 
     def get_binding(self, entity: str) -> Optional[SchemaBinding]:
         """Get binding for an entity."""
@@ -206,6 +228,7 @@ class SchemaDriftDetector:
                 message=f"No binding found for entity '{entity}'",
             )
 
+        _, expected_types = self._binding_signature(binding)
         expected_cols = set(binding.columns.keys())
         actual_cols = set(current_schema.keys())
 
@@ -215,25 +238,16 @@ class SchemaDriftDetector:
         # Type changes (for columns that exist in both)
         type_changes = {}
         for col in expected_cols & actual_cols:
-            expected_type = _normalize_type(binding.columns[col])
-            actual_type = _normalize_type(current_schema[col])
-            if expected_type != actual_type:
+            if expected_types[col] != _normalize_type(current_schema[col]):
                 type_changes[col] = f"{binding.columns[col]} -> {current_schema[col]}"
 
-        # Rename detection heuristic
+        # Rename detection: best bigram matches first, one-to-one
         renamed = {}
         if missing and new:
-            remaining_missing = list(missing)
-            remaining_new = list(new)
-            for m_col in list(remaining_missing):
-                for n_col in list(remaining_new):
-                    if _similar_names(m_col, n_col, self.similarity_threshold):
-                        renamed[m_col] = n_col
-                        remaining_missing.remove(m_col)
-                        remaining_new.remove(n_col)
-                        break
-            missing = remaining_missing
-            new = remaining_new
+            renamed = _match_renames(missing, new, self.similarity_threshold)
+            missing = [col for col in missing if col not in renamed]
+            matched = set(renamed.values())
+            new = [col for col in new if col not in matched]
 
         # Determine severity
         if missing:
@@ -298,7 +312,20 @@ class SchemaDriftDetector:
         return fixes
 
     def fetch_live_schema(self, connector, table: str) -> Dict[str, str]:
-        """Query information_schema.columns for actual column names and types."""
+        """
+        Actual column names and types of a table.
+
+        Served from the shared schema catalog when it holds a fresh snapshot
+        of the connector's database; otherwise information_schema.columns is
+        queried directly.
+        """
+        from ai_agent_connector.app.db.schema_catalog import get_schema_catalog
+
+        snapshot = get_schema_catalog().peek(connector)
+        if snapshot is not None:
+            entry = snapshot.get_table(table)
+            return {col['name']: col['type'] for col in entry['columns']} if entry else {}
+
         query = (
             "SELECT column_name, data_type "
             "FROM information_schema.columns "
@@ -308,18 +335,107 @@ class SchemaDriftDetector:
         rows = connector.execute_query(query, params=(table,), fetch=True, as_dict=True)
         return {row['column_name']: row['data_type'] for row in (rows or [])}
 
+    def fetch_live_schemas(self, connector, tables: List[str]) -> Dict[str, Dict[str, str]]:
+        """
+        Actual column names and types of many tables in one round trip.
+
+        Served from the shared schema catalog when it holds a fresh snapshot
+        of the connector's database; otherwise information_schema.columns is
+        queried once for all tables (``table_name = ANY(%s)`` on PostgreSQL,
+        an IN list elsewhere).
+
+        Args:
+            connector: Database connector.
+            tables: Table names ('table' or 'schema.table').
+
+        Returns:
+            {table: {column_name: data_type}} for every requested table
+            ({} for tables that do not exist).
+        """
+        from ai_agent_connector.app.db.schema_catalog import get_schema_catalog
+
+        tables = list(dict.fromkeys(tables))
+        result: Dict[str, Dict[str, str]] = {table: {} for table in tables}
+        if not tables:
+            return result
+
+        snapshot = get_schema_catalog().peek(connector)
+        if snapshot is not None:
+            for table in tables:
+                entry = snapshot.get_table(table)
+                if entry:
+                    result[table] = {col['name']: col['type'] for col in entry['columns']}
+            return result
+
+        wanted: Dict[str, List[str]] = {}  # bare table name -> requested names
+        for table in tables:
+            wanted.setdefault(table.rsplit('.', 1)[-1], []).append(table)
+        names = list(wanted)
+
+        if getattr(connector, 'database_type', None) == 'postgresql':
+            batches = [("= ANY(%s)", (names,))]
+        else:
+            batches = [
+                (f"IN ({', '.join(['%s'] * len(chunk))})", tuple(chunk))
+                for chunk in (names[i:i + LIVE_FETCH_BATCH] for i in range(0, len(names), LIVE_FETCH_BATCH))
+            ]
+
+        for condition, params in batches:
+            query = (
+                "SELECT table_schema, table_name, column_name, data_type "
+                "FROM information_schema.columns "
+                f"WHERE table_name {condition} "
+                "ORDER BY table_schema, table_name, ordinal_position"
+            )
+            rows = connector.execute_query(query, params=params, fetch=True, as_dict=True)
+            for row in rows or []:
+                for table in wanted.get(row['table_name'], ()):
+                    if '.' in table and table != f"{row.get('table_schema')}.{row['table_name']}":
+                        continue
+                    result[table][row['column_name']] = row['data_type']
+        return result
+
     def check_live(self, connector, entities: List[str] = None) -> List[DriftReport]:
-        """Check drift for bindings against live DB schema."""
-        targets = entities or list(self._bindings.keys())
-        reports = []
-        for entity in targets:
-            binding = self._bindings.get(entity)
-            if not binding:
-                continue
-            live_schema = self.fetch_live_schema(connector, binding.table)
-            report = self.detect_drift(entity, live_schema)
-            reports.append(report)
-        return reports
+        """
+        Check drift for bindings against live DB schema.
+
+        All bound tables are fetched with one query. A table whose live
+        signature equals its binding's has no drift, and a table unchanged
+        since the previous check reuses that check's report.
+        """
+        targets = [
+            self._bindings[entity]
+            for entity in (entities or list(self._bindings.keys()))
+            if entity in self._bindings
+        ]
+        if not targets:
+            return []
+
+        live = self.fetch_live_schemas(connector, [binding.table for binding in targets])
+        return [self._check_against(binding, live[binding.table]) for binding in targets]
+
+    def _check_against(self, binding: SchemaBinding, live_schema: Dict[str, str]) -> DriftReport:
+        """Drift report for one binding, skipping the diff when nothing changed."""
+        binding_signature, _ = self._binding_signature(binding)
+        live_signature = _schema_signature(
+            {col: _normalize_type(t) for col, t in live_schema.items()}
+        )
+
+        cached = self._live_reports.get(binding.entity)
+        if cached and cached[0] == binding_signature and cached[1] == live_signature:
+            return cached[2]
+
+        if live_signature == binding_signature:
+            report = DriftReport(
+                entity=binding.entity,
+                table=binding.table,
+                severity="INFO",
+                message=f"No drift detected for '{binding.table}'",
+            )
+        else:
+            report = self.detect_drift(binding.entity, live_schema)
+        self._live_reports[binding.entity] = (binding_signature, live_signature, report)
+        return report
 
     def check_all(self, current_schemas: Dict[str, Dict[str, str]]) -> List[DriftReport]:
         """
@@ -437,6 +553,19 @@ class SchemaDriftDetector:
         return result
 
 
+# Shared detector: the REST endpoints, the drift watchers and the policy
+# engine must see the same bindings and approvals
+_schema_drift_detector: Optional[SchemaDriftDetector] = None
+
+
+def get_schema_drift_detector() -> SchemaDriftDetector:
+    """Get or create the shared schema drift detector."""
+    global _schema_drift_detector
+    if _schema_drift_detector is None:
+        _schema_drift_detector = SchemaDriftDetector()
+    return _schema_drift_detector
+
+
 def _normalize_type(t: str) -> str:
     """Normalize SQL type for comparison."""
     t = t.lower().strip()
@@ -464,34 +593,92 @@ def _normalize_type(t: str) -> str:
     return aliases.get(base, base)
 
 
+def _schema_signature(normalized: Dict[str, str]) -> str:
+    """Order-independent hash of {column: normalized type}."""
+    raw = "\n".join(f"{col}:{t}" for col, t in sorted(normalized.items()))
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+def _clean_name(name: str) -> str:
+    return name.replace("_", "").replace("-", "").lower()
+
+
+def _bigrams(clean: str) -> Set[str]:
+    """Character bigrams of a padded name (so one-letter names still have some)."""
+    padded = f" {clean} "
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+def _name_similarity(a_clean: str, a_grams: Set[str], b_clean: str, b_grams: Set[str]) -> float:
+    """Sorensen-Dice coefficient over bigrams; containment counts as a full match."""
+    if not a_clean or not b_clean:
+        return 0.0
+    if a_clean in b_clean or b_clean in a_clean:
+        return 1.0
+    return 2 * len(a_grams & b_grams) / (len(a_grams) + len(b_grams))
+
+
+def _match_renames(missing: List[str], new: List[str], threshold: float = 0.7) -> Dict[str, str]:
+    """
+    Pair missing columns with new columns that look like their renames.
+
+    New columns are indexed by bigram, so each missing column is only
+    compared with new columns sharing at least one bigram. Pairs are then
+    taken best-first, each column used at most once.
+
+    Args:
+        missing: Columns expected but absent.
+        new: Columns present but not expected.
+        threshold: Minimum similarity (0.0-1.0).
+
+    Returns:
+        {missing column: new column}
+    """
+    index: Dict[str, Set[str]] = {}
+    new_info = {}
+    for col in new:
+        clean = _clean_name(col)
+        grams = _bigrams(clean)
+        new_info[col] = (clean, grams)
+        for gram in grams:
+            index.setdefault(gram, set()).add(col)
+
+    pairs = []
+    for m_col in missing:
+        m_clean = _clean_name(m_col)
+        m_grams = _bigrams(m_clean)
+        candidates = set()
+        for gram in m_grams:
+            candidates |= index.get(gram, set())
+        for n_col in candidates:
+            n_clean, n_grams = new_info[n_col]
+            score = _name_similarity(m_clean, m_grams, n_clean, n_grams)
+            if score > threshold or score == 1.0:
+                pairs.append((-score, m_col, n_col))
+
+    renamed: Dict[str, str] = {}
+    used = set()
+    for _, m_col, n_col in sorted(pairs):
+        if m_col not in renamed and n_col not in used:
+            renamed[m_col] = n_col
+            used.add(n_col)
+    return renamed
+
+
 def _similar_names(a: str, b: str, threshold: float = 0.7) -> bool:
     """
     Heuristic check if two column names are similar (possible rename).
 
     Checks:
     1. One contains the other (ignoring underscores/hyphens)
-    2. Character overlap ratio > threshold
-
-    Note: The ratio formula ``2 * common_chars / (len_a + len_b)``
-    resembles the Sorensen-Dice coefficient but operates on individual
-    characters, not bigrams.
+    2. Sorensen-Dice coefficient of character bigrams > threshold
 
     Args:
         a: First column name.
         b: Second column name.
         threshold: Similarity ratio threshold (0.0-1.0). Default 0.7.
     """
-    a_clean = a.replace("_", "").replace("-", "").lower()
-    b_clean = b.replace("_", "").replace("-", "").lower()
-
-    if not a_clean or not b_clean:
-        return False
-
-    # Containment check
-    if a_clean in b_clean or b_clean in a_clean:
-        return True
-
-    # Character overlap ratio
-    common = sum(1 for c in a_clean if c in b_clean)
-    ratio = (2 * common) / (len(a_clean) + len(b_clean))
-    return ratio > threshold
+    a_clean = _clean_name(a)
+    b_clean = _clean_name(b)
+    score = _name_similarity(a_clean, _bigrams(a_clean), b_clean, _bigrams(b_clean))
+    return score == 1.0 or score > threshold
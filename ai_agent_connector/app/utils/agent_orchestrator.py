@@ -12,6 +12,8 @@ from enum import Enum
 
 from ..agents.registry import AgentRegistry
 from ..db import DatabaseConnector
+from ..db.schema_catalog import get_schema_catalog
+from .schema_retrieval import select_schema_context
 
 
 class AgentRole(Enum):
@@ -321,45 +323,23 @@ class AgentOrchestrator:
         if not connector:
             raise ValueError("Agent does not have database connection")
         
-        try:
-            connector.connect()
-            
-            # Research schema - get relevant tables and columns
-            schema_query = """
-                SELECT 
-                    t.table_name,
-                    c.column_name,
-                    c.data_type
-                FROM information_schema.tables t
-                JOIN information_schema.columns c 
-                    ON t.table_schema = c.table_schema 
-                    AND t.table_name = c.table_name
-                WHERE t.table_type = 'BASE TABLE'
-                    AND t.table_schema NOT IN ('information_schema', 'pg_catalog')
-                ORDER BY t.table_name, c.ordinal_position
-            """
-            
-            result = connector.execute_query(schema_query, fetch=True)
-            
-            # Organize schema info
-            schema_info = {}
-            for row in result:
-                table, column, dtype = row
-                if table not in schema_info:
-                    schema_info[table] = []
-                schema_info[table].append({'name': column, 'type': dtype})
-            
-            return {
-                'schema_info': schema_info,
-                'tables': list(schema_info.keys()),
-                'researcher_agent': agent['agent_id']
-            }
-            
-        finally:
-            try:
-                connector.disconnect()
-            except Exception:
-                pass
+        # Research schema - the cached catalog narrowed to the tables relevant to the query
+        snapshot = get_schema_catalog().get(connector)
+        context = select_schema_context(query, snapshot.to_schema_info())
+        
+        # Organize schema info
+        schema_info = {
+            table: [{'name': col['name'], 'type': col['type']} for col in info['columns']]
+            for table, info in context['schema'].items()
+        }
+        
+        return {
+            'schema_info': schema_info,
+            'tables': list(schema_info.keys()),
+            'total_tables': len(snapshot.tables),
+            'schema_version': snapshot.version,
+            'researcher_agent': agent['agent_id']
+        }
     
     def _handle_sql_generation(
         self,
@@ -387,7 +367,8 @@ class AgentOrchestrator:
         
         schema_dict = {
             'schema': formatted_schema,
-            'tables': list(formatted_schema.keys())
+            'tables': list(formatted_schema.keys()),
+            'version': state.get('schema_version')
         }
         
         # Convert to SQL
@@ -0,0 +1,277 @@
+"""
+Columnar (Apache Arrow / Parquet) encoding of query results
+
+Analytical agents can ask for results as an Arrow IPC stream or a Parquet
+file instead of JSON. Connectors with a native Arrow fetch path (BigQuery,
+Snowflake) hand back Arrow tables directly; other results are converted
+from batched rows.
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# Try to import pyarrow (optional dependency)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    pq = None
+    ARROW_AVAILABLE = False
+
+
+ARROW_STREAM_MIME = 'application/vnd.apache.arrow.stream'
+PARQUET_MIME = 'application/vnd.apache.parquet'
+
+COLUMNAR_FORMATS = {
+    'arrow': ARROW_STREAM_MIME,
+    'parquet': PARQUET_MIME,
+}
+
+
+def negotiate_columnar_format(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick a columnar format from an Accept header.
+    
+    Args:
+        accept: Value of the Accept header
+    
+    Returns:
+        'arrow', 'parquet', or None if the client did not ask for either
+    """
+    if not accept:
+        return None
+    for part in accept.split(','):
+        mime = part.split(';', 1)[0].strip().lower()
+        for fmt, fmt_mime in COLUMNAR_FORMATS.items():
+            if mime == fmt_mime:
+                return fmt
+    return None
+
+
+def _require_arrow() -> None:
+    if not ARROW_AVAILABLE:
+        raise ImportError("pyarrow is required for Arrow/Parquet results. Install with: pip install pyarrow")
+
+
+def rows_to_record_batches(
+    rows: Iterable[Union[Dict[str, Any], tuple]],
+    batch_size: int = 1000,
+    column_names: Optional[List[str]] = None,
+    lookahead: int = 8
+) -> Iterator['pa.RecordBatch']:
+    """
+    Convert rows to Arrow record batches, batch_size rows at a time.
+    
+    Each batch's types are inferred from its own rows. The schema is
+    settled from the first lookahead batches (all-NULL columns take the
+    type of later values, int64 widens to double, incompatible types fall
+    back to string) and those batches are yielded; later batches are cast
+    to it as they are read, so at most lookahead batches are held in
+    memory. A result longer than the lookahead types its still all-NULL
+    columns as strings and its decimals at full precision, so later values
+    fit; a later batch that still does not fit raises ValueError.
+    
+    Args:
+        rows: Row dicts, or tuples together with column_names
+        batch_size: Rows per record batch
+        column_names: Column names for tuple rows (default: col_0, col_1, ...)
+        lookahead: Batches read before the schema is fixed
+    
+    Yields:
+        pa.RecordBatch, all with the same schema
+    
+    Raises:
+        ValueError: If a batch read after the schema was fixed does not fit it
+    """
+    _require_arrow()
+    
+    def convert(chunk: List[Any]) -> 'pa.RecordBatch':
+        if not isinstance(chunk[0], dict):
+            names = column_names or [f'col_{i}' for i in range(len(chunk[0]))]
+            chunk = [dict(zip(names, row)) for row in chunk]
+        return pa.RecordBatch.from_pylist(chunk)
+    
+    def read_batches() -> Iterator['pa.RecordBatch']:
+        chunk: List[Any] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= batch_size:
+                yield convert(chunk)
+                chunk = []
+        if chunk:
+            yield convert(chunk)
+    
+    pending: List['pa.RecordBatch'] = []
+    schema = None
+    for batch in read_batches():
+        if schema is None:
+            pending.append(batch)
+            if len(pending) < max(1, lookahead):
+                continue
+            # More rows may follow: leave room for values not seen yet
+            schema = _open_schema(_unify_schemas([b.schema for b in pending]))
+            for early in pending:
+                yield early if early.schema == schema else _conform_batch(early, schema)
+            pending = []
+            continue
+        if batch.schema != schema:
+            batch = _conform_late_batch(batch, schema)
+        yield batch
+    
+    if pending:
+        schema = _unify_schemas([b.schema for b in pending])
+        for batch in pending:
+            yield batch if batch.schema == schema else _conform_batch(batch, schema)
+
+
+def _open_schema(schema: 'pa.Schema') -> 'pa.Schema':
+    """Widen types that later batches are likely to outgrow"""
+    fields = []
+    for field in schema:
+        if pa.types.is_null(field.type):
+            field = field.with_type(pa.string())
+        elif pa.types.is_decimal(field.type):
+            field = field.with_type(pa.decimal128(38, field.type.scale))
+        fields.append(field)
+    return pa.schema(fields)
+
+
+def _conform_late_batch(batch: 'pa.RecordBatch', schema: 'pa.Schema') -> 'pa.RecordBatch':
+    """Cast a batch read after the schema was fixed, refusing ones that do not fit"""
+    extra = [name for name in batch.schema.names if schema.get_field_index(name) < 0]
+    if extra:
+        raise ValueError(f"Columns {extra} appeared after the Arrow schema was fixed")
+    try:
+        return _conform_batch(batch, schema)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Rows no longer fit the Arrow schema fixed from the first batches: {e}") from e
+
+
+def _unify_schemas(schemas: List['pa.Schema']) -> 'pa.Schema':
+    """Merge batch schemas, promoting types; conflicting columns become strings"""
+    try:
+        return pa.unify_schemas(schemas, promote_options='permissive')
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+    fields: Dict[str, 'pa.Field'] = {}
+    for schema in schemas:
+        for field in schema:
+            current = fields.get(field.name)
+            if current is None:
+                fields[field.name] = field
+                continue
+            try:
+                fields[field.name] = pa.unify_schemas(
+                    [pa.schema([current]), pa.schema([field])], promote_options='permissive'
+                ).field(field.name)
+            except (pa.ArrowTypeError, pa.ArrowInvalid):
+                fields[field.name] = pa.field(field.name, pa.string())
+    return pa.schema(list(fields.values()))
+
+
+def _conform_batch(batch: 'pa.RecordBatch', schema: 'pa.Schema') -> 'pa.RecordBatch':
+    """Cast a batch to the unified schema, adding NULL columns it lacks"""
+    arrays = []
+    for field in schema:
+        index = batch.schema.get_field_index(field.name)
+        if index < 0:
+            arrays.append(pa.nulls(batch.num_rows, field.type))
+            continue
+        column = batch.column(index)
+        if column.type == field.type:
+            arrays.append(column)
+        elif pa.types.is_string(field.type) and not pa.types.is_null(column.type):
+            arrays.append(pa.array([None if v is None else str(v) for v in column.to_pylist()], pa.string()))
+        else:
+            arrays.append(column.cast(field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """File-like sink that hands written bytes back to a generator"""
+    
+    def __init__(self):
+        self.chunks: List[bytes] = []
+        self.closed = False
+    
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def drain(self) -> bytes:
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_arrow_stream(
+    source: Union['pa.Table', Iterable['pa.RecordBatch']],
+    empty_schema: Optional['pa.Schema'] = None
+) -> Iterator[bytes]:
+    """
+    Encode a table or record batches as an Arrow IPC stream, chunk by chunk.
+    
+    Only one record batch is encoded at a time; each piece is yielded as
+    soon as its batch arrives from source.
+    
+    Args:
+        source: Arrow table or iterable of record batches
+        empty_schema: Schema to write when source yields no batches
+    
+    Yields:
+        bytes: Consecutive pieces of the IPC stream
+    """
+    _require_arrow()
+    batches = source.to_batches() if isinstance(source, pa.Table) else source
+    schema = source.schema if isinstance(source, pa.Table) else None
+    sink = _ChunkSink()
+    writer = None
+    
+    for batch in batches:
+        if writer is None:
+            writer = pa.ipc.new_stream(sink, schema or batch.schema)
+        writer.write_batch(batch)
+        yield sink.drain()
+    
+    if writer is None:
+        writer = pa.ipc.new_stream(sink, schema or empty_schema or pa.schema([]))
+    writer.close()
+    yield sink.drain()
+
+
+def to_parquet_bytes(source: Union['pa.Table', Iterable['pa.RecordBatch']]) -> bytes:
+    """
+    Encode a table or record batches as a Parquet file.
+    
+    Each record batch becomes a row group; Parquet needs its footer at the
+    end, so the encoded file is returned as a whole.
+    
+    Args:
+        source: Arrow table or iterable of record batches
+    
+    Returns:
+        bytes: Parquet file contents
+    """
+    _require_arrow()
+    sink = pa.BufferOutputStream()
+    if isinstance(source, pa.Table):
+        pq.write_table(source, sink)
+        return sink.getvalue().to_pybytes()
+    
+    writer = None
+    for batch in source:
+        if writer is None:
+            writer = pq.ParquetWriter(sink, batch.schema)
+        writer.write_batch(batch)
+    if writer is None:
+        pq.write_table(pa.table({}), sink)
+    else:
+        writer.close()
+    return sink.getvalue().to_pybytes()
@@ -5,19 +5,39 @@ Supports multiple backends:
 - Memory (default, limited buffer)
 - File (JSON Lines, append-only)
 - SQLite (structured queries)
+
+File and SQLite writes are handed to a background writer that commits them
+in batches, so request threads do not wait on disk I/O.
 """
 
+import atexit
+import base64
+import binascii
+import heapq
 import json
+import logging
 import os
 import sqlite3
 import threading
+import time
+import weakref
+from array import array
+from collections import deque
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from ..utils.helpers import get_timestamp
 
+# fcntl is POSIX-only; without it FileBackend assumes a single writing process
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
 
 class ActionType(Enum):
     """Types of actions that can be logged"""
@@ -45,12 +65,63 @@ class ActionType(Enum):
     RATE_LIMIT_EXCEEDED = "rate_limit_exceeded"
 
 
+def encode_cursor(entry: Dict[str, Any]) -> str:
+    """
+    Build an opaque keyset cursor pointing just after an entry.
+
+    Args:
+        entry: Last entry of a page
+
+    Returns:
+        URL-safe cursor string
+    """
+    key = json.dumps([entry.get('timestamp') or '', entry.get('id') or 0])
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        (timestamp, id) of the entry the next page starts after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, log_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(timestamp, str) or not isinstance(log_id, int):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return timestamp, log_id
+
+
+def _sort_key(entry: Dict[str, Any]) -> Tuple[str, int]:
+    """Newest-first ordering key shared by the in-process backends"""
+    return entry.get('timestamp') or '', entry.get('id') or 0
+
+
 class AuditBackend:
     """Base class for audit log backends"""
 
     def write(self, entry: Dict[str, Any]) -> None:
         raise NotImplementedError
 
+    def write_batch(self, entries: List[Dict[str, Any]]) -> None:
+        """Write several entries; backends override this to commit them together"""
+        for entry in entries:
+            self.write(entry)
+
+    def assign_id(self, entry: Dict[str, Any]) -> None:
+        """Number an entry before it is queued; backends that number entries override this"""
+        pass
+
     def read(
         self,
         agent_id: Optional[str] = None,
@@ -60,7 +131,8 @@ class AuditBackend:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[str, int]] = None
     ) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
@@ -96,6 +168,17 @@ class MemoryBackend(AuditBackend):
             if len(self.logs) > self.max_logs:
                 self.logs.pop(0)
 
+    def write_batch(self, entries: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for entry in entries:
+                self._id_counter += 1
+                entry['id'] = self._id_counter
+            self.logs.extend(entries)
+
+            # FIFO eviction
+            if len(self.logs) > self.max_logs:
+                del self.logs[:len(self.logs) - self.max_logs]
+
     def read(
         self,
         agent_id: Optional[str] = None,
@@ -105,7 +188,8 @@ class MemoryBackend(AuditBackend):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[str, int]] = None
     ) -> List[Dict[str, Any]]:
         with self._lock:
             filtered = self.logs.copy()
@@ -124,9 +208,11 @@ class MemoryBackend(AuditBackend):
         if end_date:
             end_str = end_date.isoformat()
             filtered = [l for l in filtered if l.get('timestamp', '') <= end_str]
+        if cursor:
+            filtered = [l for l in filtered if _sort_key(l) < tuple(cursor)]
 
-        # Sort by timestamp descending
-        filtered.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+        # Sort by timestamp descending (id breaks ties)
+        filtered.sort(key=_sort_key, reverse=True)
 
         return filtered[offset:offset + limit]
 
@@ -152,8 +238,142 @@ class MemoryBackend(AuditBackend):
         return len(filtered)
 
 
+class _FileIndex:
+    """
+    Sidecar index for one JSON Lines audit file.
+
+    Holds the byte offset, timestamp and id of every entry, the file's
+    timestamp range, and the positions of the entries holding each value
+    of the filterable fields. Appends only extend those position arrays;
+    match turns them into bitmaps (an int with bit i set for entry i).
+    Fields with more than MAX_VALUES distinct values in a file stop being
+    tracked and are filtered by parsing the candidate entries instead.
+    """
+
+    VERSION = 2
+    FIELDS = ('agent_id', 'tenant_id', 'action_type', 'status')
+    MAX_VALUES = 128
+
+    def __init__(self):
+        self.size = 0
+        self.offsets: List[int] = []
+        self.timestamps: List[str] = []
+        self.ids: List[int] = []
+        self.min_ts: Optional[str] = None
+        self.max_ts: Optional[str] = None
+        self.max_id = 0
+        self.positions: Dict[str, Dict[str, array]] = {field: {} for field in self.FIELDS}
+        self.overflow: set = set()
+        self.dirty = False
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+
+    def add(self, offset: int, entry: Dict[str, Any]) -> None:
+        """Index an entry written at a byte offset"""
+        position = len(self.offsets)
+        ts = entry.get('timestamp') or ''
+        log_id = entry.get('id') or 0
+        self.offsets.append(offset)
+        self.timestamps.append(ts)
+        self.ids.append(log_id)
+        self.min_ts = ts if self.min_ts is None else min(self.min_ts, ts)
+        self.max_ts = ts if self.max_ts is None else max(self.max_ts, ts)
+        self.max_id = max(self.max_id, log_id)
+
+        for field in self.FIELDS:
+            value = entry.get(field)
+            if not value or field in self.overflow:
+                continue
+            values = self.positions[field]
+            key = str(value)
+            if key not in values and len(values) >= self.MAX_VALUES:
+                self.overflow.add(field)
+                values.clear()
+                continue
+            if key not in values:
+                values[key] = array('I')
+            values[key].append(position)
+        self.dirty = True
+
+    def match(self, filters: Dict[str, str]) -> Tuple[int, bool]:
+        """
+        Get the entries matching equality filters.
+
+        Args:
+            filters: Field -> required value
+
+        Returns:
+            (bitmap of candidate entries, whether the bitmap is exact)
+        """
+        mask = (1 << self.count) - 1
+        exact = True
+        for field, value in filters.items():
+            if field in self.overflow:
+                exact = False
+                continue
+            mask &= _to_bitmap(self.positions[field].get(str(value), ()), self.count)
+        return mask, exact
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': self.VERSION,
+            'size': self.size,
+            'offsets': self.offsets,
+            'timestamps': self.timestamps,
+            'ids': self.ids,
+            'min_ts': self.min_ts,
+            'max_ts': self.max_ts,
+            'max_id': self.max_id,
+            'positions': {field: {value: positions.tolist() for value, positions in values.items()}
+                          for field, values in self.positions.items()},
+            'overflow': sorted(self.overflow)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> '_FileIndex':
+        if data.get('version') != cls.VERSION:
+            raise ValueError("Unsupported index version")
+        index = cls()
+        index.size = data['size']
+        index.offsets = data['offsets']
+        index.timestamps = data['timestamps']
+        index.ids = data['ids']
+        index.min_ts = data['min_ts']
+        index.max_ts = data['max_ts']
+        index.max_id = data['max_id']
+        for field in cls.FIELDS:
+            index.positions[field] = {value: array('I', positions)
+                                      for value, positions in data['positions'].get(field, {}).items()}
+        index.overflow = set(data.get('overflow', []))
+        if not (len(index.offsets) == len(index.timestamps) == len(index.ids)):
+            raise ValueError("Corrupt index")
+        return index
+
+
+def _to_bitmap(positions, count: int) -> int:
+    """Bitmap with the bits at positions set, for a file of count entries"""
+    bits = bytearray((count + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _set_bits(mask: int) -> List[int]:
+    """Positions of the set bits in a bitmap, lowest first"""
+    bits = bin(mask)[:1:-1]
+    return [i for i, bit in enumerate(bits) if bit == '1']
+
+
 class FileBackend(AuditBackend):
-    """JSON Lines file-based audit log storage with rotation"""
+    """
+    JSON Lines file-based audit log storage with rotation.
+
+    Each audit_*.jsonl file has a sidecar index (audit_*.jsonl.idx), so
+    reads skip files outside the requested time range, pick entries by
+    field bitmaps and parse only the lines they return.
+    """
 
     def __init__(
         self,
@@ -167,7 +387,12 @@ class FileBackend(AuditBackend):
         self.max_files = max_files
         self._lock = threading.Lock()
         self._current_file: Optional[Path] = None
+        self._current_day: Optional[str] = None
+        self._handle = None
+        self._indexes: Dict[Path, _FileIndex] = {}
         self._id_counter = self._load_last_id()
+        # Open the current file up front; writes reuse the handle
+        self._get_handle()
 
     def _get_current_file(self) -> Path:
         """Get or create current log file"""
@@ -182,44 +407,243 @@ class FileBackend(AuditBackend):
 
         return log_file
 
-    def _load_last_id(self) -> int:
-        """Load last ID from existing files"""
-        max_id = 0
-        for log_file in sorted(self.log_dir.glob("audit_*.jsonl"), reverse=True):
+    @staticmethod
+    def _index_path(log_file: Path) -> Path:
+        return log_file.with_name(log_file.name + '.idx')
+
+    def _log_files(self) -> List[Path]:
+        """Log files, newest first"""
+        return sorted(self.log_dir.glob("audit_*.jsonl"), reverse=True)
+
+    def _save_index(self, log_file: Path, index: _FileIndex) -> None:
+        """Write a sidecar index atomically"""
+        index_path = self._index_path(log_file)
+        tmp_path = index_path.with_name(f'{index_path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(index.to_dict(), f, separators=(',', ':'))
+            os.replace(tmp_path, index_path)
+            index.dirty = False
+        except OSError:
+            logger.warning("Could not write audit index %s", index_path, exc_info=True)
+
+    def _catch_up(self, log_file: Path, index: _FileIndex) -> None:
+        """Index complete lines appended to a file since index.size"""
+        with open(log_file, 'rb') as f:
+            f.seek(index.size)
+            offset = index.size
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # partially written line
+                try:
+                    entry = json.loads(line)
+                    if isinstance(entry, dict):
+                        index.add(offset, entry)
+                except ValueError:
+                    pass
+                offset += len(line)
+            index.size = offset
+
+    def _get_index(self, log_file: Path) -> _FileIndex:
+        """
+        Get a file's index, bringing it up to date with the file.
+
+        Caller must hold self._lock.
+        """
+        size = log_file.stat().st_size
+        index = self._indexes.get(log_file)
+        if index is None:
             try:
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-                            max_id = max(max_id, entry.get('id', 0))
-                        except json.JSONDecodeError:
-                            continue
-                if max_id > 0:
-                    break
-            except Exception:
-                continue
-        return max_id
+                with open(self._index_path(log_file), 'r') as f:
+                    index = _FileIndex.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                index = _FileIndex()
+            self._indexes[log_file] = index
+
+        if size < index.size:
+            # File was truncated or replaced
+            index = self._indexes[log_file] = _FileIndex()
+        if size > index.size:
+            self._catch_up(log_file, index)
+        # Files other than the one being written are immutable; persist
+        # what was scanned so the next process starts from the sidecar
+        if index.dirty and log_file != self._current_file:
+            self._save_index(log_file, index)
+        return index
+
+    def _load_last_id(self) -> int:
+        """Load last ID from the newest file's index"""
+        with self._lock:
+            for log_file in self._log_files():
+                try:
+                    index = self._get_index(log_file)
+                except OSError:
+                    continue
+                if index.max_id > 0:
+                    return index.max_id
+        return 0
 
     def _cleanup_old_files(self) -> None:
-        """Remove oldest files if exceeding max_files"""
+        """Remove oldest files (and their indexes) if exceeding max_files"""
         files = sorted(self.log_dir.glob("audit_*.jsonl"))
         while len(files) > self.max_files:
             oldest = files.pop(0)
-            try:
-                oldest.unlink()
-            except Exception:
-                pass
+            self._indexes.pop(oldest, None)
+            for path in (oldest, self._index_path(oldest)):
+                try:
+                    path.unlink()
+                except Exception:
+                    pass
+
+    def _get_handle(self):
+        """Get the open handle for the current file, rotating when needed"""
+        today = datetime.now().strftime("%Y-%m-%d")
+        # Other processes may append to the same file, so ask the file for its size
+        if (self._handle is not None and self._current_day == today
+                and os.fstat(self._handle.fileno()).st_size < self.max_file_size):
+            return self._handle
+
+        if self._handle is not None:
+            self._handle.close()
+            previous = self._current_file
+            if previous in self._indexes and self._indexes[previous].dirty:
+                self._save_index(previous, self._indexes[previous])
+        self._current_file = self._get_current_file()
+        self._current_day = today
+        self._handle = open(self._current_file, 'ab')
+        self._get_index(self._current_file)
+        # The directory only changes when a file is opened
+        self._cleanup_old_files()
+        return self._handle
 
     def write(self, entry: Dict[str, Any]) -> None:
+        self.write_batch([entry])
+
+    def write_batch(self, entries: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            handle = self._get_handle()
+            index = self._indexes[self._current_file]
+            if fcntl is not None:
+                # Serializes appends with other processes sharing log_dir
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                self._append(handle, index, entries)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _append(self, handle, index: _FileIndex, entries: List[Dict[str, Any]]) -> None:
+        """
+        Append entries at the end of the current file and index them.
+
+        Lines other processes appended since the last write are indexed
+        first, so offsets and ids follow on from theirs. Caller must hold
+        self._lock and the file lock.
+        """
+        offset = os.fstat(handle.fileno()).st_size
+        if offset > index.size:
+            self._catch_up(self._current_file, index)
+            self._id_counter = max(self._id_counter, index.max_id)
+
+        lines = []
+        for entry in entries:
+            if not entry.get('id'):
+                self._id_counter += 1
+                entry['id'] = self._id_counter
+            line = (json.dumps(entry, default=str) + '\n').encode()
+            lines.append(line)
+            index.add(offset, entry)
+            offset += len(line)
+
+        handle.write(b''.join(lines))
+        handle.flush()
+        index.size = offset
+
+    def assign_id(self, entry: Dict[str, Any]) -> None:
         with self._lock:
             self._id_counter += 1
             entry['id'] = self._id_counter
 
-            log_file = self._get_current_file()
-            with open(log_file, 'a') as f:
-                f.write(json.dumps(entry, default=str) + '\n')
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            for log_file, index in self._indexes.items():
+                if index.dirty and log_file.exists():
+                    self._save_index(log_file, index)
+
+    @staticmethod
+    def _read_entries(log_file: Path, offsets: List[int]) -> List[Optional[Dict[str, Any]]]:
+        """Parse the entries at the given byte offsets"""
+        entries = []
+        with open(log_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                try:
+                    entries.append(json.loads(f.readline()))
+                except ValueError:
+                    entries.append(None)
+        return entries
 
-            self._cleanup_old_files()
+    def _matches(
+        self,
+        agent_id: Optional[str] = None,
+        action_type: Optional[str] = None,
+        status: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        cursor: Optional[Tuple[str, int]] = None
+    ) -> Iterator[Tuple[str, int, Path, int, Optional[Dict[str, Any]]]]:
+        """
+        Find matching entries using the file indexes.
+
+        Yields:
+            (timestamp, id, file, byte offset, parsed entry or None)
+        """
+        filters = {field: value for field, value in (
+            ('agent_id', agent_id), ('action_type', action_type),
+            ('status', status), ('tenant_id', tenant_id)) if value}
+        start = start_date.isoformat() if start_date else None
+        end = end_date.isoformat() if end_date else None
+
+        for log_file in self._log_files():
+            with self._lock:
+                try:
+                    index = self._get_index(log_file)
+                except OSError:
+                    continue
+                count = index.count
+                min_ts, max_ts = index.min_ts, index.max_ts
+                mask, exact = index.match(filters)
+
+            # Skip whole files outside the time range or past the cursor
+            if not count:
+                continue
+            if (start and max_ts < start) or (end and min_ts > end):
+                continue
+            if cursor and min_ts > cursor[0]:
+                continue
+
+            positions = []
+            for position in (range(count) if not filters else _set_bits(mask)):
+                ts = index.timestamps[position]
+                if (start and ts < start) or (end and ts > end):
+                    continue
+                if cursor and (ts, index.ids[position]) >= tuple(cursor):
+                    continue
+                positions.append(position)
+
+            entries: List[Optional[Dict[str, Any]]] = [None] * len(positions)
+            if not exact:
+                # A field was too diverse to index: check the entries themselves
+                entries = self._read_entries(log_file, [index.offsets[p] for p in positions])
+            for position, entry in zip(positions, entries):
+                if not exact and (entry is None or any(
+                        entry.get(field) != value for field, value in filters.items())):
+                    continue
+                yield index.timestamps[position], index.ids[position], log_file, index.offsets[position], entry
 
     def read(
         self,
@@ -230,48 +654,32 @@ class FileBackend(AuditBackend):
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Tuple[str, int]] = None
     ) -> List[Dict[str, Any]]:
-        results = []
-
-        # Read from all files (newest first)
-        files = sorted(self.log_dir.glob("audit_*.jsonl"), reverse=True)
-
-        for log_file in files:
+        matches = self._matches(agent_id, action_type, status, tenant_id,
+                                start_date, end_date, cursor)
+        # Newest first (id breaks ties); only offset + limit keys are kept
+        top = heapq.nlargest(offset + limit, matches, key=lambda m: (m[0], m[1]))[offset:]
+
+        # Parse the selected lines, one open per file
+        by_file: Dict[Path, List[int]] = {}
+        for _, _, log_file, byte_offset, entry in top:
+            if entry is None:
+                by_file.setdefault(log_file, []).append(byte_offset)
+        parsed: Dict[Tuple[Path, int], Optional[Dict[str, Any]]] = {}
+        for log_file, offsets in by_file.items():
             try:
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-
-                            # Apply filters
-                            if agent_id and entry.get('agent_id') != agent_id:
-                                continue
-                            if action_type and entry.get('action_type') != action_type:
-                                continue
-                            if status and entry.get('status') != status:
-                                continue
-                            if tenant_id and entry.get('tenant_id') != tenant_id:
-                                continue
-                            if start_date:
-                                ts = entry.get('timestamp', '')
-                                if ts < start_date.isoformat():
-                                    continue
-                            if end_date:
-                                ts = entry.get('timestamp', '')
-                                if ts > end_date.isoformat():
-                                    continue
-
-                            results.append(entry)
-                        except json.JSONDecodeError:
-                            continue
-            except Exception:
+                parsed.update(zip(((log_file, o) for o in offsets), self._read_entries(log_file, offsets)))
+            except OSError:
                 continue
 
-        # Sort by timestamp descending
-        results.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-
-        return results[offset:offset + limit]
+        results = []
+        for _, _, log_file, byte_offset, entry in top:
+            entry = entry if entry is not None else parsed.get((log_file, byte_offset))
+            if entry is not None:
+                results.append(entry)
+        return results
 
     def count(
         self,
@@ -280,45 +688,73 @@ class FileBackend(AuditBackend):
         status: Optional[str] = None,
         tenant_id: Optional[str] = None
     ) -> int:
-        count = 0
+        filters = {field: value for field, value in (
+            ('agent_id', agent_id), ('action_type', action_type),
+            ('status', status), ('tenant_id', tenant_id)) if value}
 
-        for log_file in self.log_dir.glob("audit_*.jsonl"):
-            try:
-                with open(log_file, 'r') as f:
-                    for line in f:
-                        try:
-                            entry = json.loads(line.strip())
-
-                            if agent_id and entry.get('agent_id') != agent_id:
-                                continue
-                            if action_type and entry.get('action_type') != action_type:
-                                continue
-                            if status and entry.get('status') != status:
-                                continue
-                            if tenant_id and entry.get('tenant_id') != tenant_id:
-                                continue
-
-                            count += 1
-                        except json.JSONDecodeError:
-                            continue
-            except Exception:
-                continue
-
-        return count
+        total = 0
+        for log_file in self._log_files():
+            with self._lock:
+                try:
+                    index = self._get_index(log_file)
+                except OSError:
+                    continue
+                mask, exact = index.match(filters)
+            if exact:
+                total += mask.bit_count()
+            else:
+                entries = self._read_entries(log_file, [index.offsets[p] for p in _set_bits(mask)])
+                total += sum(1 for entry in entries if entry is not None and all(
+                    entry.get(field) == value for field, value in filters.items()))
+        return total
 
 
 class SQLiteBackend(AuditBackend):
     """SQLite-based audit log storage for structured queries"""
 
+    # Composite indexes serve the filter + newest-first scans; the id
+    # (rowid) tiebreaker is implicit in every SQLite index
+    INDEXES = {
+        'idx_audit_timestamp': ['timestamp'],
+        'idx_audit_status': ['status'],
+        'idx_audit_tenant': ['tenant_id', 'timestamp'],
+        'idx_audit_agent': ['agent_id', 'timestamp'],
+        'idx_audit_action': ['action_type', 'status', 'timestamp'],
+    }
+
     def __init__(self, db_path: str = "logs/audit.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: List[Any] = []
+        self._connections_lock = threading.Lock()
         self._init_db()
 
     def _get_connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+
         conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         conn.row_factory = sqlite3.Row
+        # WAL lets readers run alongside the writer; NORMAL is durable in WAL mode
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn = conn
+
+        with self._connections_lock:
+            # Close connections left behind by threads that have finished
+            alive = []
+            for thread_ref, other in self._connections:
+                thread = thread_ref()
+                if thread is not None and thread.is_alive():
+                    alive.append((thread_ref, other))
+                else:
+                    other.close()
+            alive.append((weakref.ref(threading.current_thread()), conn))
+            self._connections = alive
         return conn
 
     def _init_db(self) -> None:
@@ -337,93 +773,99 @@ class SQLiteBackend(AuditBackend):
                     details TEXT
                 )
             """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_audit_timestamp
-                ON audit_logs(timestamp DESC)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_audit_agent
-                ON audit_logs(agent_id)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_audit_action
-                ON audit_logs(action_type)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_audit_status
-                ON audit_logs(status)
-            """)
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_audit_tenant
-                ON audit_logs(tenant_id)
-            """)
-            conn.commit()
 
             # Add tenant_id column if it doesn't exist (migration for existing DBs)
-            try:
-                conn.execute("SELECT tenant_id FROM audit_logs LIMIT 1")
-            except sqlite3.OperationalError:
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(audit_logs)")}
+            if 'tenant_id' not in columns:
                 conn.execute("ALTER TABLE audit_logs ADD COLUMN tenant_id TEXT")
-                conn.commit()
+
+            for name, index_columns in self.INDEXES.items():
+                existing = [row['name'] for row in conn.execute(f"PRAGMA index_info({name})")]
+                if existing == index_columns:
+                    continue
+                # Rebuild single-column indexes from older databases as composites
+                if existing:
+                    conn.execute(f"DROP INDEX {name}")
+                conn.execute(f"CREATE INDEX {name} ON audit_logs({', '.join(index_columns)})")
+            conn.commit()
 
     def write(self, entry: Dict[str, Any]) -> None:
+        self.write_batch([entry])
+
+    def write_batch(self, entries: List[Dict[str, Any]]) -> None:
+        rows = [(
+            entry.get('timestamp'),
+            entry.get('action_type'),
+            entry.get('agent_id'),
+            entry.get('user_id'),
+            entry.get('tenant_id'),
+            entry.get('status', 'success'),
+            entry.get('error_message'),
+            json.dumps(entry.get('details', {}), default=str)
+        ) for entry in entries]
+
         with self._lock:
+            # One transaction per batch
             with self._get_connection() as conn:
-                conn.execute("""
+                conn.executemany("""
                     INSERT INTO audit_logs
                     (timestamp, action_type, agent_id, user_id, tenant_id, status, error_message, details)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    entry.get('timestamp'),
-                    entry.get('action_type'),
-                    entry.get('agent_id'),
-                    entry.get('user_id'),
-                    entry.get('tenant_id'),
-                    entry.get('status', 'success'),
-                    entry.get('error_message'),
-                    json.dumps(entry.get('details', {}))
-                ))
-                conn.commit()
+                """, rows)
 
-    def read(
-        self,
+    @staticmethod
+    def _where(
         agent_id: Optional[str] = None,
         action_type: Optional[str] = None,
         status: Optional[str] = None,
         tenant_id: Optional[str] = None,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
-        limit: int = 100,
-        offset: int = 0
-    ) -> List[Dict[str, Any]]:
-        query = "SELECT * FROM audit_logs WHERE 1=1"
+        cursor: Optional[Tuple[str, int]] = None
+    ) -> Tuple[str, List[Any]]:
+        """Build the WHERE clause and parameters for a filter set"""
+        clauses: List[str] = []
         params: List[Any] = []
 
-        if agent_id:
-            query += " AND agent_id = ?"
-            params.append(agent_id)
-        if action_type:
-            query += " AND action_type = ?"
-            params.append(action_type)
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        if tenant_id:
-            query += " AND tenant_id = ?"
-            params.append(tenant_id)
+        for column, value in (('agent_id', agent_id), ('action_type', action_type),
+                              ('status', status), ('tenant_id', tenant_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
         if start_date:
-            query += " AND timestamp >= ?"
+            clauses.append("timestamp >= ?")
             params.append(start_date.isoformat())
         if end_date:
-            query += " AND timestamp <= ?"
+            clauses.append("timestamp <= ?")
             params.append(end_date.isoformat())
+        if cursor:
+            # Keyset: continue strictly after the last row of the previous page
+            clauses.append("(timestamp, id) < (?, ?)")
+            params.extend(cursor)
 
-        query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(query, params)
-            rows = cursor.fetchall()
+    def read(
+        self,
+        agent_id: Optional[str] = None,
+        action_type: Optional[str] = None,
+        status: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[Tuple[str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        where, params = self._where(agent_id, action_type, status, tenant_id,
+                                    start_date, end_date, cursor)
+        query = f"SELECT * FROM audit_logs{where} ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+        if offset:
+            query += " OFFSET ?"
+            params.append(offset)
+
+        rows = self._get_connection().execute(query, params).fetchall()
 
         results = []
         for row in rows:
@@ -445,28 +887,269 @@ class SQLiteBackend(AuditBackend):
         status: Optional[str] = None,
         tenant_id: Optional[str] = None
     ) -> int:
-        query = "SELECT COUNT(*) FROM audit_logs WHERE 1=1"
-        params: List[Any] = []
+        where, params = self._where(agent_id, action_type, status, tenant_id)
+        cursor = self._get_connection().execute(f"SELECT COUNT(*) FROM audit_logs{where}", params)
+        return cursor.fetchone()[0]
 
-        if agent_id:
-            query += " AND agent_id = ?"
-            params.append(agent_id)
-        if action_type:
-            query += " AND action_type = ?"
-            params.append(action_type)
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        if tenant_id:
-            query += " AND tenant_id = ?"
-            params.append(tenant_id)
+    def close(self) -> None:
+        with self._connections_lock:
+            for _, conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._local = threading.local()
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(query, params)
-            return cursor.fetchone()[0]
 
-    def close(self) -> None:
-        pass  # SQLite connections are managed per-operation
+# Writers still open at interpreter exit are drained then, and their
+# backends closed (which also saves file indexes)
+_open_writers: 'weakref.WeakSet[AsyncAuditWriter]' = weakref.WeakSet()
+
+
+def _close_open_writers() -> None:
+    for writer in list(_open_writers):
+        writer.close()
+        writer.backend.close()
+
+
+atexit.register(_close_open_writers)
+
+
+class AsyncAuditWriter:
+    """
+    Bounded buffer drained into a backend by a background thread.
+
+    Entries are written in batches (group commit): the writer wakes when
+    batch_size entries are waiting or flush_interval_ms has passed since the
+    oldest one was queued. Entries are never dropped: when the buffer is
+    full, callers wait up to put_timeout seconds for room and then write
+    their entry synchronously, and a batch the backend rejects is retried
+    (max_retries times, with backoff) and then put back at the front of
+    the buffer. Buffered entries are written on flush(), close() and at
+    interpreter exit.
+    """
+
+    def __init__(
+        self,
+        backend: AuditBackend,
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval_ms: int = 50,
+        put_timeout: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            backend: Backend that receives the batches
+            max_queue_size: Maximum buffered entries
+            batch_size: Maximum entries per backend write
+            flush_interval_ms: Maximum time an entry waits before being written
+            put_timeout: Seconds a caller waits for room in a full buffer
+                before writing its entry synchronously
+            max_retries: Immediate retries of a failed batch before it is requeued
+            retry_backoff: Seconds before the first retry, doubled for each
+                further attempt
+        """
+        self.backend = backend
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.put_timeout = put_timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self._buffer: deque = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._flush_requested = 0
+
+        # Sequence numbers: entries accepted into / taken out of the buffer
+        self._enqueued = 0
+        self._processed = 0
+
+        self._written = 0
+        self._batches = 0
+        self._sync_writes = 0
+        self._requeued = 0
+        self._unwritten = 0
+        self._blocked = 0
+        self._blocked_seconds = 0.0
+        self._write_errors = 0
+        self._high_watermark = 0
+        self._last_batch_ms = 0.0
+
+        _open_writers.add(self)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, entry: Dict[str, Any]) -> bool:
+        """
+        Queue an entry for writing.
+
+        The writer thread owns the entry from here on; pass a copy if the
+        caller keeps using the dict.
+
+        Args:
+            entry: Audit log entry
+
+        Returns:
+            True if queued, False if it was written synchronously (the
+            buffer stayed full, or the writer is closed)
+
+        Raises:
+            Exception: If a synchronous write fails
+        """
+        with self._cond:
+            if not self._closed:
+                has_room = len(self._buffer) < self.max_queue_size
+                if not has_room:
+                    self._blocked += 1
+                    started = time.monotonic()
+                    self._cond.notify_all()
+                    has_room = self._cond.wait_for(
+                        lambda: len(self._buffer) < self.max_queue_size or self._closed,
+                        timeout=self.put_timeout
+                    )
+                    self._blocked_seconds += time.monotonic() - started
+
+                if has_room and not self._closed:
+                    self._ensure_thread()
+                    self._buffer.append(entry)
+                    self._enqueued += 1
+                    self._high_watermark = max(self._high_watermark, len(self._buffer))
+                    if len(self._buffer) >= self.batch_size:
+                        self._cond.notify_all()
+                    return True
+                if not has_room:
+                    self._sync_writes += 1
+
+        # Full for too long, or closed: write through rather than lose the entry
+        self.backend.write(entry)
+        return False
+
+    def _write_with_retries(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write a batch, retrying with backoff; True once it is written"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.backend.write_batch(batch)
+                return True
+            except Exception as e:
+                with self._cond:
+                    self._write_errors += 1
+                logger.warning("Failed to write %d audit log entries (attempt %d): %s",
+                               len(batch), attempt + 1, e)
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_backoff * (2 ** attempt))
+        return False
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # Sleep until there is something to write
+                self._cond.wait_for(lambda: self._buffer or self._closed)
+                # Give the batch time to fill unless it is needed now
+                self._cond.wait_for(
+                    lambda: (len(self._buffer) >= self.batch_size or self._closed
+                             or self._flush_requested),
+                    timeout=self.flush_interval
+                )
+                if not self._buffer and self._closed:
+                    return
+                batch = [self._buffer.popleft()
+                         for _ in range(min(self.batch_size, len(self._buffer)))]
+                self._cond.notify_all()
+
+            started = time.monotonic()
+            written = self._write_with_retries(batch)
+
+            with self._cond:
+                self._last_batch_ms = (time.monotonic() - started) * 1000
+                if written:
+                    self._processed += len(batch)
+                    self._written += len(batch)
+                    self._batches += 1
+                elif not self._closed:
+                    # Keep the entries, in order, and try again later
+                    self._buffer.extendleft(reversed(batch))
+                    self._requeued += len(batch)
+                    self._cond.wait(timeout=self.retry_backoff * (2 ** self.max_retries))
+                else:
+                    # Shutting down with the backend still failing: the
+                    # application log is the last place the records can go
+                    self._processed += len(batch)
+                    self._unwritten += len(batch)
+                    for entry in batch:
+                        logger.error("Unwritten audit log entry: %s", json.dumps(entry, default=str))
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every entry queued so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the buffer was drained in time
+        """
+        with self._cond:
+            target = self._enqueued
+            if self._processed >= target:
+                return True
+            self._flush_requested += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: self._processed >= target, timeout=timeout)
+            finally:
+                self._flush_requested -= 1
+
+    def close(self, timeout: Optional[float] = 10.0) -> None:
+        """
+        Write everything still buffered and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the thread to finish
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        _open_writers.discard(self)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer and backpressure statistics.
+
+        Returns:
+            Dict with queue depth, throughput and backpressure counters
+        """
+        with self._cond:
+            return {
+                'queued': len(self._buffer),
+                'max_queue_size': self.max_queue_size,
+                'high_watermark': self._high_watermark,
+                'enqueued': self._enqueued,
+                'written': self._written,
+                'batches': self._batches,
+                'avg_batch_size': round(self._written / self._batches, 2) if self._batches else 0.0,
+                'last_batch_ms': round(self._last_batch_ms, 3),
+                'blocked': self._blocked,
+                'blocked_seconds': round(self._blocked_seconds, 3),
+                'sync_writes': self._sync_writes,
+                'requeued': self._requeued,
+                'write_errors': self._write_errors,
+                'unwritten': self._unwritten,
+                'closed': self._closed
+            }
 
 
 class AuditLogger:
@@ -486,7 +1169,11 @@ class AuditLogger:
         log_dir: str = "logs/audit",
         db_path: str = "logs/audit.db",
         max_file_size_mb: int = 100,
-        max_files: int = 10
+        max_files: int = 10,
+        async_writes: Optional[bool] = None,
+        batch_size: int = 500,
+        flush_interval_ms: int = 50,
+        max_queue_size: int = 10000
     ):
         """
         Initialize audit logger.
@@ -498,6 +1185,11 @@ class AuditLogger:
             db_path: Database path for SQLite backend
             max_file_size_mb: Max file size before rotation (file backend)
             max_files: Max number of log files to keep (file backend)
+            async_writes: Write through a background batching writer
+                (default: on for the file and sqlite backends)
+            batch_size: Max entries per batched write
+            flush_interval_ms: Max time an entry waits before being written
+            max_queue_size: Max entries buffered for the writer
         """
         self.backend_type = backend
 
@@ -512,9 +1204,21 @@ class AuditLogger:
         else:
             self._backend = MemoryBackend(max_logs=max_logs)
 
+        if async_writes is None:
+            async_writes = backend in ("file", "sqlite")
+        self._writer: Optional[AsyncAuditWriter] = None
+        if async_writes:
+            self._writer = AsyncAuditWriter(
+                self._backend,
+                max_queue_size=max_queue_size,
+                batch_size=batch_size,
+                flush_interval_ms=flush_interval_ms
+            )
+
         # Keep memory buffer for quick access
         self.logs: List[Dict[str, Any]] = []
         self.max_logs = max_logs
+        self._logs_lock = threading.Lock()
 
     def log(
         self,
@@ -553,15 +1257,45 @@ class AuditLogger:
         }
 
         # Write to backend
-        self._backend.write(log_entry)
+        if self._writer:
+            # Numbered now so the returned entry has its id; the writer gets
+            # its own copy and never touches the caller's dict
+            self._backend.assign_id(log_entry)
+            self._writer.enqueue(dict(log_entry))
+        else:
+            self._backend.write(log_entry)
 
         # Also keep in memory for quick access
-        self.logs.append(log_entry)
-        if len(self.logs) > self.max_logs:
-            self.logs.pop(0)
+        with self._logs_lock:
+            self.logs.append(log_entry)
+            if len(self.logs) > self.max_logs:
+                self.logs.pop(0)
 
         return log_entry
 
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """
+        Wait until every entry logged so far has reached the backend.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if all entries were written in time
+        """
+        if self._writer:
+            return self._writer.flush(timeout)
+        return True
+
+    def get_writer_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Get background writer statistics.
+
+        Returns:
+            Writer stats, or None when writes are synchronous
+        """
+        return self._writer.get_stats() if self._writer else None
+
     def get_logs(
         self,
         agent_id: Optional[str] = None,
@@ -571,11 +1305,17 @@ class AuditLogger:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         Retrieve audit logs with filtering.
 
+        Pages are newest first. Pass the previous page's next_cursor as
+        cursor to continue from it; unlike offset this costs the same on
+        every page.
+
         Args:
             agent_id: Filter by agent ID
             action_type: Filter by action type
@@ -584,15 +1324,26 @@ class AuditLogger:
             start_date: Filter by start date
             end_date: Filter by end date
             limit: Maximum number of logs to return
-            offset: Number of logs to skip
+            offset: Number of logs to skip (ignored when cursor is given)
+            cursor: Keyset cursor from a previous page's next_cursor
+            include_total: Count all matching logs (a full index scan)
 
         Returns:
             Dict containing filtered logs and metadata
+
+        Raises:
+            ValueError: If cursor is malformed
         """
+        cursor_key = decode_cursor(cursor) if cursor else None
+        if cursor_key:
+            offset = 0
+
+        self.flush()
         action_type_str = None
         if action_type:
             action_type_str = action_type.value if isinstance(action_type, ActionType) else action_type
 
+        # One extra row tells whether another page follows
         logs = self._backend.read(
             agent_id=agent_id,
             action_type=action_type_str,
@@ -600,23 +1351,30 @@ class AuditLogger:
             tenant_id=tenant_id,
             start_date=start_date,
             end_date=end_date,
-            limit=limit,
-            offset=offset
-        )
-
-        total = self._backend.count(
-            agent_id=agent_id,
-            action_type=action_type_str,
-            status=status,
-            tenant_id=tenant_id
+            limit=limit + 1,
+            offset=offset,
+            cursor=cursor_key
         )
+        has_more = len(logs) > limit
+        logs = logs[:limit]
+
+        total = None
+        if include_total:
+            total = self._backend.count(
+                agent_id=agent_id,
+                action_type=action_type_str,
+                status=status,
+                tenant_id=tenant_id
+            )
 
         return {
             'logs': logs,
             'total': total,
             'limit': limit,
             'offset': offset,
-            'has_more': offset + limit < total
+            'cursor': cursor,
+            'next_cursor': encode_cursor(logs[-1]) if has_more and logs else None,
+            'has_more': has_more
         }
 
     def get_log_by_id(self, log_id: int) -> Optional[Dict[str, Any]]:
@@ -629,6 +1387,7 @@ class AuditLogger:
         Returns:
             Log entry or None if not found
         """
+        self.flush()
         # For memory backend, search in-memory
         for log in self.logs:
             if log.get('id') == log_id:
@@ -664,6 +1423,7 @@ class AuditLogger:
         Returns:
             Dict containing statistics
         """
+        self.flush()
         start_date = datetime.now() - timedelta(days=days)
 
         logs = self._backend.read(
@@ -722,6 +1482,7 @@ class AuditLogger:
         Returns:
             Number of logs exported
         """
+        self.flush()
         logs = self._backend.read(
             agent_id=agent_id,
             start_date=start_date,
@@ -739,7 +1500,9 @@ class AuditLogger:
         return len(logs)
 
     def close(self) -> None:
-        """Close backend connections"""
+        """Write buffered entries and close backend connections"""
+        if self._writer:
+            self._writer.close()
         self._backend.close()
 
 
@@ -763,5 +1526,7 @@ def init_audit_logger(
 ) -> AuditLogger:
     """Initialize global audit logger with custom settings"""
     global _audit_logger
+    if _audit_logger is not None:
+        _audit_logger.close()
     _audit_logger = AuditLogger(backend=backend, **kwargs)
     return _audit_logger
@@ -130,6 +130,30 @@ class AutocompleteProvider:
         # Limit to top 20
         return suggestions[:20]
     
+    def get_connector_suggestions(
+        self,
+        query: str,
+        cursor_position: int,
+        connector: Any,
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[AutocompleteSuggestion]:
+        """
+        Get autocomplete suggestions from a connector's cached schema catalog.
+        
+        Args:
+            query: Current query text
+            cursor_position: Cursor position in query
+            connector: Database connector
+            context: Optional context (current table, etc.)
+        
+        Returns:
+            List of AutocompleteSuggestion objects
+        """
+        from ..db.schema_catalog import get_schema_catalog
+        
+        snapshot = get_schema_catalog().get(connector)
+        return self.get_suggestions(query, cursor_position, {'tables': snapshot.tables}, context)
+    
     def _extract_current_word(self, query: str, cursor_position: int) -> str:
         """Extract the current word being typed"""
         if cursor_position < 0 or cursor_position > len(query):
@@ -142,6 +142,7 @@ class CostTracker:
         self._cost_records: List[CostRecord] = []
         self._budget_alerts: Dict[str, BudgetAlert] = {}
         self._custom_pricing: Dict[str, Dict[str, float]] = {}  # provider_model -> pricing
+        self._savings_records: List[CostRecord] = []  # Calls avoided by cache hits
     
     def track_call(
         self,
@@ -214,6 +215,76 @@ class CostTracker:
         
         return record
     
+    def track_cache_hit(
+        self,
+        original: CostRecord,
+        agent_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> CostRecord:
+        """
+        Record a provider call avoided by serving a cached response
+        
+        The saving is the cost of the call that produced the cached response.
+        Savings are kept apart from spend and do not count toward budgets.
+        
+        Args:
+            original: Cost record of the call whose response was reused
+            agent_id: Optional agent identifier
+            metadata: Optional metadata dictionary
+            
+        Returns:
+            CostRecord: Savings record
+        """
+        import uuid
+        record = CostRecord(
+            call_id=str(uuid.uuid4()),
+            timestamp=get_timestamp(),
+            provider=original.provider,
+            model=original.model,
+            agent_id=agent_id,
+            prompt_tokens=original.prompt_tokens,
+            completion_tokens=original.completion_tokens,
+            total_tokens=original.total_tokens,
+            cost_usd=original.cost_usd,
+            operation_type=original.operation_type,
+            metadata={**(metadata or {}), 'source_call_id': original.call_id}
+        )
+        self._savings_records.append(record)
+        return record
+    
+    def get_savings(
+        self,
+        agent_id: Optional[str] = None,
+        period_days: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get costs avoided through cache hits
+        
+        Args:
+            agent_id: Optional filter by agent
+            period_days: Optional number of days to include
+            
+        Returns:
+            Dictionary with cache hit count, saved cost and tokens
+        """
+        records = self._savings_records
+        if agent_id:
+            records = [r for r in records if r.agent_id == agent_id]
+        if period_days is not None:
+            cutoff_str = (datetime.now() - timedelta(days=period_days)).isoformat()
+            records = [r for r in records if r.timestamp >= cutoff_str]
+        
+        saved_by_operation = defaultdict(float)
+        for record in records:
+            saved_by_operation[record.operation_type] += record.cost_usd
+        
+        return {
+            'cache_hits': len(records),
+            'saved_cost_usd': round(sum(r.cost_usd for r in records), 4),
+            'saved_tokens': sum(r.total_tokens for r in records),
+            'saved_by_operation': dict(saved_by_operation)
+        }
+    
     def _check_budget_alerts(self, record: CostRecord) -> None:
         """Check if any budget alerts should be triggered"""
         current_total = self.get_total_cost()
@@ -353,6 +424,7 @@ class CostTracker:
             'cost_by_operation': dict(cost_by_operation),
             'daily_costs': dict(daily_costs),
             'top_agents': dict(sorted(agent_costs.items(), key=lambda x: x[1], reverse=True)[:10]),
+            'cache_savings': self.get_savings(agent_id=agent_id, period_days=period_days),
             'period_days': period_days
         }
     
@@ -4,8 +4,12 @@ Uses Fernet symmetric encryption from cryptography library
 """
 
 import os
+import json
+import time
 import base64
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
@@ -260,6 +264,114 @@ class CredentialEncryptor:
         return decrypted_config
 
 
+class DecryptedConfigCache:
+    """
+    Short-lived, memory-only cache of decrypted database configurations.
+    
+    Avoids running Fernet decryption on every query. Entries expire after
+    ``ttl`` seconds and the cache holds at most ``max_entries`` configs (LRU).
+    Sensitive fields are kept in mutable buffers that are overwritten with
+    zeros when an entry is evicted, expires or is invalidated.
+    """
+    
+    SENSITIVE_FIELDS = ('password', 'connection_string', 'credentials_json')
+    
+    def __init__(self, ttl: float = 300.0, max_entries: int = 1024):
+        """
+        Initialize the cache.
+        
+        Args:
+            ttl: Seconds a decrypted config may be reused
+            max_entries: Maximum number of cached configs
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # key -> (expires_at, public fields, {field: (buffer, is_json)})
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any], Dict[str, Tuple[bytearray, bool]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a decrypted config.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            A fresh copy of the decrypted config, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, public, secrets = entry
+            if time.monotonic() >= expires_at:
+                self._wipe(self._entries.pop(key))
+                return None
+            self._entries.move_to_end(key)
+            config = dict(public)
+            for field, (buffer, is_json) in secrets.items():
+                value = buffer.decode('utf-8')
+                config[field] = json.loads(value) if is_json else value
+            return config
+    
+    def put(self, key: Hashable, config: Dict[str, Any]) -> None:
+        """
+        Store a decrypted config.
+        
+        Args:
+            key: Cache key
+            config: Decrypted database configuration
+        """
+        public = {}
+        secrets = {}
+        for field, value in config.items():
+            if field in self.SENSITIVE_FIELDS and value:
+                if isinstance(value, str):
+                    secrets[field] = (bytearray(value.encode('utf-8')), False)
+                else:
+                    secrets[field] = (bytearray(json.dumps(value).encode('utf-8')), True)
+            else:
+                public[field] = value
+        
+        with self._lock:
+            if key in self._entries:
+                self._wipe(self._entries.pop(key))
+            self._entries[key] = (time.monotonic() + self.ttl, public, secrets)
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._wipe(evicted)
+    
+    def invalidate(self, predicate=None) -> int:
+        """
+        Wipe and remove entries.
+        
+        Args:
+            predicate: Optional callable taking a key; only matching keys are
+                removed. Removes everything when omitted.
+            
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            keys = [k for k in self._entries if predicate is None or predicate(k)]
+            for key in keys:
+                self._wipe(self._entries.pop(key))
+            return len(keys)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def _wipe(entry: Tuple[float, Dict[str, Any], Dict[str, Tuple[bytearray, bool]]]) -> None:
+        """Overwrite secret buffers with zeros and drop references"""
+        _, public, secrets = entry
+        for buffer, _ in secrets.values():
+            buffer[:] = bytes(len(buffer))
+        secrets.clear()
+        public.clear()
+
+
 # Global encryptor instance (lazy initialization)
 _encryptor: Optional[CredentialEncryptor] = None
 
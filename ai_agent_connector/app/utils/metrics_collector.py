@@ -5,10 +5,11 @@ Tracks query volume, latency, and error rates per agent
 
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
 from collections import defaultdict, deque
 from ..utils.helpers import get_timestamp
+import math
 import threading
+import time
 
 
 @dataclass
@@ -71,24 +72,167 @@ class AgentMetrics:
         }
 
 
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram with bounded relative error (HDR-style).
+    
+    A value v lands in bucket ceil(log(v) / log(gamma)), where
+    gamma = (1 + precision) / (1 - precision), so recording is O(1) and the
+    number of buckets grows with the logarithm of the value range rather than
+    the number of samples. Each bucket also keeps the sum of its values and
+    reports their mean, which is exact when the values in a bucket are equal.
+    Histograms with the same precision merge by adding buckets.
+    """
+    
+    __slots__ = ('precision', '_inv_log_gamma', 'bins', 'count', 'total', 'min', 'max')
+    
+    # Bucket for zero and negative values, below every log bucket
+    _NON_POSITIVE = -(1 << 62)
+    
+    def __init__(self, precision: float = 0.01):
+        """
+        Initialize an empty histogram.
+        
+        Args:
+            precision: Relative error of reported quantiles (0.01 = 1%)
+        """
+        self.precision = precision
+        self._inv_log_gamma = 1.0 / math.log((1 + precision) / (1 - precision))
+        # bucket index -> [count, sum of values]
+        self.bins: Dict[int, List[float]] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+    
+    def record(self, value: float) -> None:
+        """Add one value."""
+        index = math.ceil(math.log(value) * self._inv_log_gamma) if value > 0 else self._NON_POSITIVE
+        bucket = self.bins.get(index)
+        if bucket is None:
+            self.bins[index] = [1, value]
+        else:
+            bucket[0] += 1
+            bucket[1] += value
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def merge(self, other: 'LatencyHistogram') -> None:
+        """Add every value recorded in another histogram of the same precision."""
+        bins = self.bins
+        for index, (count, total) in other.bins.items():
+            bucket = bins.get(index)
+            if bucket is None:
+                bins[index] = [count, total]
+            else:
+                bucket[0] += count
+                bucket[1] += total
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+        
+        Args:
+            q: Quantile between 0 and 1 (0.95 for p95)
+        
+        Returns:
+            Estimated value at rank ceil(q * count), or 0.0 if empty
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.bins):
+            count, total = self.bins[index]
+            seen += count
+            if seen >= rank:
+                return min(max(total / count, self.min), self.max)
+        return self.max
+
+
+class _TimeBucket:
+    """Everything recorded for an agent during one bucket_seconds interval"""
+    
+    __slots__ = ('start', 'latencies', 'successes', 'errors')
+    
+    def __init__(self, start: float, precision: float):
+        self.start = start
+        self.latencies = LatencyHistogram(precision)
+        self.successes = 0
+        self.errors: Dict[str, int] = {}
+
+
+class _AgentSeries:
+    """Rolling time buckets (and optional raw samples) for one agent"""
+    
+    __slots__ = ('lock', 'buckets', 'samples')
+    
+    def __init__(self, sample_buffer_size: int):
+        self.lock = threading.Lock()
+        self.buckets: deque = deque()
+        self.samples: Optional[deque] = deque(maxlen=sample_buffer_size) if sample_buffer_size > 0 else None
+
+
 class MetricsCollector:
     """
     Collects and aggregates real-time metrics for query monitoring.
     Thread-safe for concurrent access.
+    
+    Each agent's queries are folded into rolling time buckets of
+    bucket_seconds, each holding a LatencyHistogram, success and error
+    counts. Recording updates the current bucket in O(1); windowed metrics
+    merge the buckets overlapping the window, so their cost depends on the
+    window length, not the query volume. Windows are therefore aligned to
+    bucket boundaries and may include up to bucket_seconds of older data.
+    
+    Every agent has its own lock, so aggregating one agent's metrics for a
+    dashboard never blocks queries recording metrics for another.
     """
     
-    def __init__(self, max_metrics_per_agent: int = 10000, default_window_seconds: int = 60):
+    def __init__(
+        self,
+        max_metrics_per_agent: int = 0,
+        default_window_seconds: int = 60,
+        bucket_seconds: float = 5.0,
+        retention_seconds: float = 3600.0,
+        precision: float = 0.01
+    ):
         """
         Initialize metrics collector.
         
         Args:
-            max_metrics_per_agent: Maximum number of metrics to keep per agent
+            max_metrics_per_agent: Raw QueryMetric samples kept per agent in a
+                ring buffer (0 keeps none; aggregates never need them)
             default_window_seconds: Default time window for aggregations
+            bucket_seconds: Width of each time bucket
+            retention_seconds: How far back buckets are kept (longest window)
+            precision: Relative error of latency percentiles
         """
-        # agent_id -> deque of QueryMetric
-        self._metrics: Dict[str, deque] = defaultdict(lambda: deque(maxlen=max_metrics_per_agent))
-        self._lock = threading.Lock()
+        self.max_metrics_per_agent = max_metrics_per_agent
         self.default_window_seconds = default_window_seconds
+        self.bucket_seconds = bucket_seconds
+        self.retention_seconds = retention_seconds
+        self.precision = precision
+        # agent_id -> _AgentSeries; the lock only guards this dict
+        self._series: Dict[str, _AgentSeries] = {}
+        self._lock = threading.Lock()
+    
+    def _get_series(self, agent_id: str) -> _AgentSeries:
+        series = self._series.get(agent_id)
+        if series is None:
+            with self._lock:
+                series = self._series.get(agent_id)
+                if series is None:
+                    series = self._series[agent_id] = _AgentSeries(self.max_metrics_per_agent)
+        return series
     
     def record_query(
         self,
@@ -96,7 +240,8 @@ class MetricsCollector:
         query_type: str,
         execution_time_ms: float,
         success: bool,
-        error_type: Optional[str] = None
+        error_type: Optional[str] = None,
+        now: Optional[float] = None
     ) -> None:
         """
         Record a query metric.
@@ -107,22 +252,40 @@ class MetricsCollector:
             execution_time_ms: Execution time in milliseconds
             success: Whether query succeeded
             error_type: Type of error if failed
+            now: Current time in seconds (default: time.monotonic())
         """
-        metric = QueryMetric(
-            agent_id=agent_id,
-            query_type=query_type,
-            execution_time_ms=execution_time_ms,
-            success=success,
-            error_type=error_type
-        )
+        now = time.monotonic() if now is None else now
+        start = now - now % self.bucket_seconds
+        series = self._get_series(agent_id)
         
-        with self._lock:
-            self._metrics[agent_id].append(metric)
+        with series.lock:
+            buckets = series.buckets
+            if not buckets or buckets[-1].start < start:
+                buckets.append(_TimeBucket(start, self.precision))
+                horizon = now - self.retention_seconds - self.bucket_seconds
+                while buckets[0].start < horizon:
+                    buckets.popleft()
+            bucket = buckets[-1]
+            bucket.latencies.record(execution_time_ms)
+            if success:
+                bucket.successes += 1
+            elif error_type:
+                bucket.errors[error_type] = bucket.errors.get(error_type, 0) + 1
+            
+            if series.samples is not None:
+                series.samples.append(QueryMetric(
+                    agent_id=agent_id,
+                    query_type=query_type,
+                    execution_time_ms=execution_time_ms,
+                    success=success,
+                    error_type=error_type
+                ))
     
     def get_agent_metrics(
         self,
         agent_id: str,
-        window_seconds: Optional[int] = None
+        window_seconds: Optional[int] = None,
+        now: Optional[float] = None
     ) -> Optional[AgentMetrics]:
         """
         Get aggregated metrics for an agent.
@@ -130,67 +293,71 @@ class MetricsCollector:
         Args:
             agent_id: Agent ID
             window_seconds: Time window in seconds (default: self.default_window_seconds)
+            now: Current time in seconds (default: time.monotonic())
             
         Returns:
             AgentMetrics or None if no metrics available
         """
         window_seconds = window_seconds or self.default_window_seconds
-        cutoff_time = datetime.now() - timedelta(seconds=window_seconds)
+        now = time.monotonic() if now is None else now
+        # Buckets that end after the cutoff overlap the window
+        cutoff = now - window_seconds - self.bucket_seconds
         
-        with self._lock:
-            if agent_id not in self._metrics:
-                return None
-            
-            # Filter metrics within time window
-            recent_metrics = [
-                m for m in self._metrics[agent_id]
-                if datetime.fromisoformat(m.timestamp.replace('Z', '+00:00').split('.')[0]) >= cutoff_time
-            ]
-            
-            if not recent_metrics:
-                return None
-            
-            # Calculate statistics
-            latencies = [m.execution_time_ms for m in recent_metrics]
-            latencies.sort()
-            
-            total = len(recent_metrics)
-            successful = sum(1 for m in recent_metrics if m.success)
-            failed = total - successful
-            
-            # Percentiles
-            def percentile(data: List[float], p: float) -> float:
-                if not data:
-                    return 0.0
-                k = (len(data) - 1) * p
-                f = int(k)
-                c = k - f
-                if f + 1 < len(data):
-                    return data[f] + c * (data[f + 1] - data[f])
-                return data[f]
-            
-            # Error breakdown
-            error_breakdown = defaultdict(int)
-            for m in recent_metrics:
-                if not m.success and m.error_type:
-                    error_breakdown[m.error_type] += 1
+        series = self._series.get(agent_id)
+        if series is None:
+            return None
+        
+        latencies = LatencyHistogram(self.precision)
+        successful = 0
+        error_breakdown: Dict[str, int] = defaultdict(int)
+        with series.lock:
+            for bucket in reversed(series.buckets):
+                if bucket.start <= cutoff:
+                    break
+                latencies.merge(bucket.latencies)
+                successful += bucket.successes
+                for error_type, count in bucket.errors.items():
+                    error_breakdown[error_type] += count
+        
+        total = latencies.count
+        if not total:
+            return None
+        failed = total - successful
+        
+        return AgentMetrics(
+            agent_id=agent_id,
+            time_window_seconds=window_seconds,
+            total_queries=total,
+            successful_queries=successful,
+            failed_queries=failed,
+            avg_latency_ms=latencies.total / total,
+            p50_latency_ms=latencies.quantile(0.50),
+            p95_latency_ms=latencies.quantile(0.95),
+            p99_latency_ms=latencies.quantile(0.99),
+            max_latency_ms=latencies.max,
+            min_latency_ms=latencies.min,
+            error_rate=failed / total,
+            queries_per_second=total / window_seconds if window_seconds > 0 else 0.0,
+            error_breakdown=dict(error_breakdown)
+        )
+    
+    def get_recent_samples(self, agent_id: str, limit: Optional[int] = None) -> List[QueryMetric]:
+        """
+        Get the raw samples kept for an agent, oldest first.
+        
+        Args:
+            agent_id: Agent ID
+            limit: Return only the newest limit samples
             
-            return AgentMetrics(
-                agent_id=agent_id,
-                time_window_seconds=window_seconds,
-                total_queries=total,
-                successful_queries=successful,
-                failed_queries=failed,
-                avg_latency_ms=sum(latencies) / len(latencies) if latencies else 0.0,
-                p50_latency_ms=percentile(latencies, 0.50),
-                p95_latency_ms=percentile(latencies, 0.95),
-                p99_latency_ms=percentile(latencies, 0.99),
-                max_latency_ms=max(latencies) if latencies else 0.0,
-                min_latency_ms=min(latencies) if latencies else 0.0,
-                error_rate=failed / total if total > 0 else 0.0,
-                queries_per_second=total / window_seconds if window_seconds > 0 else 0.0,
-                error_breakdown=dict(error_breakdown)
-            )
+        Returns:
+            List of QueryMetric (empty if raw samples are not kept)
+        """
+        series = self._series.get(agent_id)
+        if series is None or series.samples is None:
+            return []
+        with series.lock:
+            samples = list(series.samples)
+        return samples[-limit:] if limit else samples
     
     def get_all_agents_metrics(
         self,
@@ -206,12 +373,13 @@ class MetricsCollector:
             Dictionary of agent_id -> AgentMetrics
         """
         with self._lock:
-            agent_ids = list(self._metrics.keys())
+            agent_ids = list(self._series.keys())
+        now = time.monotonic()
         
         return {
             agent_id: metrics
             for agent_id in agent_ids
-            if (metrics := self.get_agent_metrics(agent_id, window_seconds)) is not None
+            if (metrics := self.get_agent_metrics(agent_id, window_seconds, now)) is not None
         }
     
     def get_dashboard_data(
@@ -263,11 +431,10 @@ class MetricsCollector:
     def clear_agent_metrics(self, agent_id: str) -> None:
         """Clear all metrics for an agent"""
         with self._lock:
-            if agent_id in self._metrics:
-                del self._metrics[agent_id]
+            self._series.pop(agent_id, None)
     
     def clear_all_metrics(self) -> None:
         """Clear all metrics"""
         with self._lock:
-            self._metrics.clear()
+            self._series.clear()
 
@@ -3,9 +3,13 @@ Natural Language to SQL conversion using LLM
 """
 
 import os
+import copy
 import json
 from typing import Optional, Dict, List, Any
 from ..db import DatabaseConnector
+from ..db.schema_catalog import get_schema_catalog
+from .schema_retrieval import select_schema_context
+from .translation_cache import TranslationCache, get_translation_cache
 from .air_gapped import is_air_gapped_mode, get_local_ai_config, AirGappedModeError
 
 # Global cost tracker instance (will be initialized in routes.py)
@@ -20,7 +24,13 @@ def set_cost_tracker(tracker):
 class NLToSQLConverter:
     """Converts natural language queries to SQL using LLM"""
     
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None, api_base: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        api_base: Optional[str] = None,
+        translation_cache: Optional[TranslationCache] = None
+    ):
         """
         Initialize the NL to SQL converter
         
@@ -28,6 +38,7 @@ class NLToSQLConverter:
             api_key: API key (defaults to OPENAI_API_KEY env var, or LOCAL_AI_API_KEY for local)
             model: Model to use for conversion (default: gpt-4o-mini or LOCAL_AI_MODEL)
             api_base: API base URL (for local models, defaults to LOCAL_AI_BASE_URL)
+            translation_cache: Cache of generated SQL (defaults to the shared cache)
         """
         # Check air-gapped mode
         if is_air_gapped_mode():
@@ -42,6 +53,7 @@ class NLToSQLConverter:
             self.model = model or os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
             self.api_base = api_base or os.getenv('OPENAI_BASE_URL')  # Optional, defaults to OpenAI
         
+        self.translation_cache = translation_cache or get_translation_cache()
         self._client = None
     
     def _get_client(self):
@@ -82,64 +94,22 @@ class NLToSQLConverter:
                 )
         return self._client
     
-    def get_schema_info(self, connector: DatabaseConnector) -> Dict[str, Any]:
+    def get_schema_info(self, connector: DatabaseConnector, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get database schema information to help with SQL generation
         
+        Served from the shared schema catalog cache, which only contacts the
+        database when its tables may have changed.
+        
         Args:
             connector: Database connector instance
+            force_refresh: Check the catalog for changes even if it was checked recently
             
         Returns:
-            Dict containing schema information
+            Dict containing schema information (tables, schema, catalog version)
         """
         try:
-            connector.connect()
-            
-            # Get tables and their columns
-            schema_query = """
-                SELECT 
-                    t.table_schema,
-                    t.table_name,
-                    c.column_name,
-                    c.data_type,
-                    c.is_nullable,
-                    c.column_default
-                FROM information_schema.tables t
-                JOIN information_schema.columns c 
-                    ON t.table_schema = c.table_schema 
-                    AND t.table_name = c.table_name
-                WHERE t.table_type = 'BASE TABLE'
-                    AND t.table_schema NOT IN ('information_schema', 'pg_catalog')
-                ORDER BY t.table_schema, t.table_name, c.ordinal_position
-            """
-            
-            results = connector.execute_query(schema_query, fetch=True, as_dict=False)
-            
-            # Organize by table
-            schema = {}
-            for row in results:
-                schema_name, table_name, col_name, data_type, nullable, default = row
-                full_table = f"{schema_name}.{table_name}" if schema_name != 'public' else table_name
-                
-                if full_table not in schema:
-                    schema[full_table] = {
-                        'schema': schema_name,
-                        'table': table_name,
-                        'columns': []
-                    }
-                
-                schema[full_table]['columns'].append({
-                    'name': col_name,
-                    'type': data_type,
-                    'nullable': nullable == 'YES',
-                    'default': default
-                })
-            
-            return {
-                'tables': list(schema.keys()),
-                'schema': schema
-            }
-            
+            return get_schema_catalog().get(connector, force=force_refresh).to_schema_info()
         except Exception as e:
             # Return minimal schema info on error
             return {
@@ -147,11 +117,6 @@ class NLToSQLConverter:
                 'schema': {},
                 'error': str(e)
             }
-        finally:
-            try:
-                connector.disconnect()
-            except Exception:
-                pass
     
     def convert_to_sql(
         self,
@@ -163,6 +128,10 @@ class NLToSQLConverter:
         """
         Convert natural language query to SQL
         
+        When schema_info carries a catalog version, the result is cached per
+        normalized question, database type, model and schema version, and
+        repeat questions are answered without calling the LLM.
+        
         Args:
             natural_language_query: Natural language question
             schema_info: Optional schema information
@@ -178,6 +147,22 @@ class NLToSQLConverter:
                 'sql': None
             }
         
+        schema_version = (schema_info or {}).get('version') if not custom_prompt else None
+        if schema_version:
+            cached = self.translation_cache.get(natural_language_query, database_type, self.model, schema_version)
+            if cached is not None:
+                if _cost_tracker and cached.cost_record:
+                    try:
+                        _cost_tracker.track_cache_hit(
+                            cached.cost_record,
+                            metadata={'query': natural_language_query}
+                        )
+                    except Exception:
+                        pass  # Don't fail if cost tracking fails
+                result = copy.deepcopy(cached.result)
+                result.update({'natural_language': natural_language_query, 'cached': True})
+                return result
+        
         try:
             client = self._get_client()
             
@@ -228,6 +213,7 @@ Schema Information:"""
             sql_query = response.choices[0].message.content.strip()
             
             # Track cost
+            cost_record = None
             if _cost_tracker and hasattr(response, 'usage'):
                 try:
                     usage_data = {
@@ -235,7 +221,7 @@ Schema Information:"""
                         'completion_tokens': response.usage.completion_tokens,
                         'total_tokens': response.usage.total_tokens
                     }
-                    _cost_tracker.track_call(
+                    cost_record = _cost_tracker.track_call(
                         provider='openai',
                         model=self.model,
                         usage=usage_data,
@@ -255,11 +241,17 @@ Schema Information:"""
                 sql_query = sql_query[:-3]
             sql_query = sql_query.strip()
             
-            return {
+            result = {
                 'sql': sql_query,
                 'natural_language': natural_language_query,
                 'model': self.model
             }
+            if schema_version and sql_query:
+                self.translation_cache.set(
+                    natural_language_query, database_type, self.model, schema_version,
+                    result, cost_record=cost_record
+                )
+            return result
             
         except Exception as e:
             return {
@@ -272,19 +264,27 @@ Schema Information:"""
         self,
         natural_language_query: str,
         connector: DatabaseConnector,
-        database_type: str = "PostgreSQL"
+        database_type: str = "PostgreSQL",
+        concepts: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Convert natural language to SQL with automatic schema detection
         
+        Only the tables relevant to the question (and their foreign-key
+        neighbors) are put in the prompt.
+        
         Args:
             natural_language_query: Natural language question
             connector: Database connector to get schema from
             database_type: Type of database
+            concepts: Optional lowercase table name -> ontology entity type map
             
         Returns:
             Dict containing SQL query and metadata
         """
-        schema_info = self.get_schema_info(connector)
+        schema_info = select_schema_context(
+            natural_language_query,
+            self.get_schema_info(connector),
+            concepts=concepts
+        )
         return self.convert_to_sql(natural_language_query, schema_info, database_type)
-
@@ -1,12 +1,26 @@
 """
 Query result caching system with configurable TTL
+
+Entries are bounded by count and by estimated result size. Admission is
+guarded by a TinyLFU frequency sketch so a burst of one-off queries cannot
+flush frequently read results, and expired entries are reaped by a
+background expiry wheel instead of on read.
 """
 
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import hashlib
+import heapq
 import json
+import math
+import sys
+import threading
+import time
+import weakref
+
+from .sql_parser import parse_query
 
 
 @dataclass
@@ -19,10 +33,18 @@ class CacheEntry:
     expires_at: datetime
     hit_count: int = 0
     metadata: Dict[str, Any] = field(default_factory=dict)
+    fingerprint: str = ''
+    tables: Tuple[str, ...] = ()
+    size_bytes: int = 0
+    expires_ts: float = 0.0
+    
+    def __post_init__(self):
+        if not self.expires_ts:
+            self.expires_ts = self.expires_at.timestamp()
     
     def is_expired(self) -> bool:
         """Check if cache entry is expired"""
-        return datetime.now() > self.expires_at
+        return time.time() >= self.expires_ts
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -32,51 +54,302 @@ class CacheEntry:
             'cached_at': self.cached_at.isoformat(),
             'expires_at': self.expires_at.isoformat(),
             'hit_count': self.hit_count,
-            'metadata': self.metadata
+            'metadata': self.metadata,
+            'fingerprint': self.fingerprint,
+            'tables': list(self.tables),
+            'size_bytes': self.size_bytes
         }
 
 
+class FrequencySketch:
+    """
+    Count-min sketch of recent access frequencies (TinyLFU).
+    
+    Counters saturate at 15 and are halved once ``sample_size`` accesses
+    have been recorded, so the estimate tracks recent popularity.
+    """
+    
+    DEPTH = 4
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+    _MASK64 = (1 << 64) - 1
+    
+    def __init__(self, capacity: int):
+        """
+        Initialize the sketch.
+        
+        Args:
+            capacity: Expected number of distinct hot keys (cache max entries)
+        """
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self._shift = 64 - (width.bit_length() - 1)
+        self._rows = [bytearray(width) for _ in range(self.DEPTH)]
+        self._sample_size = 10 * width
+        self._additions = 0
+    
+    def _indexes(self, key: str):
+        # Multiplicative hashing: the top bits of the product are well mixed
+        h = hash(key) & self._MASK64
+        return [((h * seed) & self._MASK64) >> self._shift for seed in self._SEEDS]
+    
+    def increment(self, key: str) -> None:
+        """Record one access to a key"""
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+    
+    def frequency(self, key: str) -> int:
+        """Estimate how often a key was accessed recently"""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+    
+    def _age(self) -> None:
+        """Halve all counters"""
+        self._rows = [bytearray(count >> 1 for count in row) for row in self._rows]
+        self._additions //= 2
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estimate the in-memory size of a result set in bytes.
+    
+    Large sequences are sampled (up to 16 evenly spaced items) and
+    extrapolated, so the cost does not grow with the number of rows.
+    
+    Args:
+        value: Result value (typically a list of row dicts)
+    
+    Returns:
+        int: Estimated size in bytes
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 4:
+        return size
+    
+    if isinstance(value, dict):
+        return size + sum(
+            estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+            for k, v in value.items()
+        )
+    
+    if isinstance(value, (list, tuple, set, frozenset)):
+        count = len(value)
+        if not count:
+            return size
+        items = value if isinstance(value, (list, tuple)) else list(value)
+        step = max(1, count // 16)
+        sample = items[::step][:16]
+        sampled = sum(estimate_size(item, _depth + 1) for item in sample)
+        return size + int(sampled * count / len(sample))
+    
+    return size
+
+
 class QueryCache:
     """
     Query result cache with configurable TTL.
     Caches query results to avoid repeated database hits.
+    
+    The cache holds at most ``max_entries`` entries and ``max_bytes`` of
+    estimated result data, evicting least recently used entries. A new
+    entry is only admitted over the victims it would displace if it has
+    been requested at least as often (TinyLFU).
     """
     
-    def __init__(self, default_ttl_seconds: int = 300):
+    def __init__(
+        self,
+        default_ttl_seconds: int = 300,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        expiry_interval: float = 1.0
+    ):
         """
         Initialize query cache.
         
         Args:
             default_ttl_seconds: Default TTL in seconds (default: 5 minutes)
+            max_entries: Maximum number of cached entries
+            max_bytes: Maximum estimated size of cached results in bytes
+            expiry_interval: Expiry wheel tick in seconds; the background
+                reaper thread is not started when this is 0
         """
-        # query_hash -> CacheEntry
-        self._cache: Dict[str, CacheEntry] = {}
+        # query_hash -> CacheEntry, least recently used first
+        self._cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
         self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
         # Agent-specific TTL overrides
         self._agent_ttls: Dict[str, int] = {}
+        # Reverse indexes: base table name / fingerprint hash -> query hashes
+        self._table_index: Dict[str, Set[str]] = {}
+        self._fingerprint_index: Dict[str, Set[str]] = {}
+        self._sketch = FrequencySketch(max_entries)
+        self._lock = threading.RLock()
+        
+        # Expiry wheel: tick -> query hashes expiring at or before that tick
+        self.expiry_interval = expiry_interval
+        self._tick_seconds = expiry_interval or 1.0
+        self._wheel: Dict[int, Set[str]] = {}
+        self._wheel_ticks: List[int] = []
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+        
+        # Incrementally maintained statistics
+        self._total_bytes = 0
+        self._total_ttl = 0.0
+        self._entry_hits = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._rejections = 0
+        self._expirations = 0
     
     def _hash_query(self, query: str, params: Optional[Any] = None) -> str:
         """
         Generate hash for a query.
         
+        The hash has two parts: a statement fingerprint (the query with
+        literals replaced by '?') and a key for the literal values plus
+        parameters, so ``WHERE id = 1`` and ``WHERE id = 2`` share a
+        fingerprint but remain separate entries.
+        
         Args:
             query: SQL query
             params: Query parameters
             
         Returns:
-            str: Query hash
+            str: Query hash ("<fingerprint hash>:<values hash>")
+        """
+        parsed = parse_query(query)
+        fingerprint_hash = self._hash_fingerprint(parsed.fingerprint)
+        
+        # Include literal values and parameters in the values key
+        values_input = json.dumps(
+            [parsed.literals, params] if params else [parsed.literals],
+            sort_keys=True,
+            default=str
+        )
+        values_hash = hashlib.sha256(values_input.encode()).hexdigest()
+        
+        return f"{fingerprint_hash}:{values_hash}"
+    
+    @staticmethod
+    def _hash_fingerprint(fingerprint: str) -> str:
+        """Hash a statement fingerprint"""
+        return hashlib.sha256(fingerprint.encode()).hexdigest()
+    
+    @staticmethod
+    def _base_table(table: str) -> str:
+        """Strip the schema qualifier so schema.table and table share an index key"""
+        return table.rsplit('.', 1)[-1].lower()
+    
+    def _remove(self, query_hash: str) -> Optional[CacheEntry]:
+        """Remove an entry, its reverse-index references and its accounting"""
+        entry = self._cache.pop(query_hash, None)
+        if entry is None:
+            return None
+        for table in entry.tables:
+            hashes = self._table_index.get(table)
+            if hashes is not None:
+                hashes.discard(query_hash)
+                if not hashes:
+                    del self._table_index[table]
+        if entry.fingerprint:
+            fingerprint_hash = query_hash.split(':', 1)[0]
+            hashes = self._fingerprint_index.get(fingerprint_hash)
+            if hashes is not None:
+                hashes.discard(query_hash)
+                if not hashes:
+                    del self._fingerprint_index[fingerprint_hash]
+        
+        # Entries inserted directly into _cache (size_bytes == 0) were never
+        # added to the running totals
+        self._entry_hits = max(0, self._entry_hits - entry.hit_count)
+        if entry.size_bytes:
+            self._total_bytes -= entry.size_bytes
+            self._total_ttl -= (entry.expires_at - entry.cached_at).total_seconds()
+        return entry
+    
+    def _tick(self, timestamp: float) -> int:
+        """Wheel tick at or after a timestamp"""
+        return math.ceil(timestamp / self._tick_seconds)
+    
+    def _schedule(self, entry: CacheEntry) -> None:
+        """Register an entry on the expiry wheel"""
+        tick = self._tick(entry.expires_ts)
+        bucket = self._wheel.get(tick)
+        if bucket is None:
+            bucket = self._wheel[tick] = set()
+            heapq.heappush(self._wheel_ticks, tick)
+        bucket.add(entry.query_hash)
+    
+    def _advance_wheel(self, now: Optional[float] = None) -> int:
         """
-        # Normalize query (remove extra whitespace)
-        normalized_query = ' '.join(query.split())
+        Reap every entry whose wheel tick has passed.
         
-        # Include parameters in hash
-        if params:
-            params_str = json.dumps(params, sort_keys=True)
-            hash_input = f"{normalized_query}:{params_str}"
-        else:
-            hash_input = normalized_query
+        Args:
+            now: Current timestamp (default: time.time())
         
-        return hashlib.sha256(hash_input.encode()).hexdigest()
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            while self._wheel_ticks and self._wheel_ticks[0] * self._tick_seconds <= now:
+                tick = heapq.heappop(self._wheel_ticks)
+                for query_hash in self._wheel.pop(tick, ()):
+                    removed += self._expire(query_hash, now)
+            
+            # The current tick's bucket is only partly due
+            if self._wheel_ticks and (self._wheel_ticks[0] - 1) * self._tick_seconds <= now:
+                bucket = self._wheel[self._wheel_ticks[0]]
+                for query_hash in list(bucket):
+                    if self._expire(query_hash, now):
+                        bucket.discard(query_hash)
+                        removed += 1
+        return removed
+    
+    def _expire(self, query_hash: str, now: float) -> int:
+        """Remove an entry if it has expired (it may have been re-set since)"""
+        entry = self._cache.get(query_hash)
+        if entry is None or entry.expires_ts > now:
+            return 0
+        self._remove(query_hash)
+        self._expirations += 1
+        return 1
+    
+    def _ensure_reaper(self) -> None:
+        """Start the background expiry thread on first use"""
+        if not self.expiry_interval or self._reaper is not None:
+            return
+        
+        cache_ref = weakref.ref(self)
+        stop = self._reaper_stop
+        interval = self.expiry_interval
+        
+        def run():
+            while not stop.wait(interval):
+                cache = cache_ref()
+                if cache is None:
+                    return
+                cache._advance_wheel()
+                del cache
+        
+        self._reaper = threading.Thread(target=run, name='query-cache-expiry', daemon=True)
+        self._reaper.start()
+    
+    def stop(self) -> None:
+        """Stop the background expiry thread"""
+        self._reaper_stop.set()
+        if self._reaper is not None:
+            self._reaper.join(timeout=self.expiry_interval * 2)
+            self._reaper = None
+        self._reaper_stop = threading.Event()
     
     def set_agent_ttl(self, agent_id: str, ttl_seconds: int) -> None:
         """
@@ -118,20 +391,20 @@ class QueryCache:
             Cached results or None if not found/expired
         """
         query_hash = self._hash_query(query, params)
-        entry = self._cache.get(query_hash)
-        
-        if not entry:
-            return None
-        
-        # Check if expired
-        if entry.is_expired():
-            del self._cache[query_hash]
-            return None
-        
-        # Update hit count
-        entry.hit_count += 1
-        
-        return entry.results
+        with self._lock:
+            self._sketch.increment(query_hash)
+            entry = self._cache.get(query_hash)
+        
+            # Expired entries may still be waiting for the next wheel tick
+            if entry is None or entry.is_expired():
+                self._misses += 1
+                return None
+        
+            self._cache.move_to_end(query_hash)
+            entry.hit_count += 1
+            self._entry_hits += 1
+            self._hits += 1
+            return entry.results
     
     def set(
         self,
@@ -141,7 +414,7 @@ class QueryCache:
         agent_id: Optional[str] = None,
         ttl_seconds: Optional[int] = None,
         metadata: Optional[Dict[str, Any]] = None
-    ) -> None:
+    ) -> bool:
         """
         Cache query results.
         
@@ -152,7 +425,12 @@ class QueryCache:
             agent_id: Optional agent ID
             ttl_seconds: Optional TTL override
             metadata: Optional metadata to store
+        
+        Returns:
+            bool: True if the results were cached, False if the entry was
+                too large or lost admission to hotter entries
         """
+        parsed = parse_query(query)
         query_hash = self._hash_query(query, params)
         
         # Determine TTL
@@ -164,17 +442,67 @@ class QueryCache:
         
         now = datetime.now()
         expires_at = now + timedelta(seconds=ttl_seconds)
+        size_bytes = estimate_size(results)
         
+        tables = tuple(sorted({self._base_table(t) for t in parsed.tables}))
         entry = CacheEntry(
             query_hash=query_hash,
             query=query,
             results=results,
             cached_at=now,
             expires_at=expires_at,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            fingerprint=parsed.fingerprint,
+            tables=tables,
+            size_bytes=size_bytes
         )
         
-        self._cache[query_hash] = entry
+        with self._lock:
+            self._remove(query_hash)
+            if not self._admit(query_hash, size_bytes):
+                self._rejections += 1
+                return False
+            
+            self._cache[query_hash] = entry
+            for table in tables:
+                self._table_index.setdefault(table, set()).add(query_hash)
+            self._fingerprint_index.setdefault(query_hash.split(':', 1)[0], set()).add(query_hash)
+            self._total_bytes += size_bytes
+            self._total_ttl += ttl_seconds
+            self._schedule(entry)
+        
+        self._ensure_reaper()
+        return True
+    
+    def _admit(self, query_hash: str, size_bytes: int) -> bool:
+        """
+        Make room for a candidate entry, evicting LRU victims if it wins.
+        
+        The candidate is rejected without evicting anything if it exceeds
+        max_bytes on its own or if any victim it would displace has a
+        higher recent access frequency.
+        """
+        if size_bytes > self.max_bytes:
+            return False
+        
+        victims = []
+        entries = len(self._cache)
+        total_bytes = self._total_bytes
+        for victim_hash, victim in self._cache.items():
+            if entries < self.max_entries and total_bytes + size_bytes <= self.max_bytes:
+                break
+            victims.append(victim_hash)
+            entries -= 1
+            total_bytes -= victim.size_bytes
+        
+        if victims:
+            candidate_frequency = self._sketch.frequency(query_hash)
+            if any(self._sketch.frequency(v) > candidate_frequency for v in victims):
+                return False
+            for victim_hash in victims:
+                self._remove(victim_hash)
+                self._evictions += 1
+        return True
     
     def invalidate(
         self,
@@ -195,29 +523,93 @@ class QueryCache:
         """
         if query:
             query_hash = self._hash_query(query, params)
-            if query_hash in self._cache:
-                del self._cache[query_hash]
-                return 1
+            with self._lock:
+                if self._remove(query_hash) is not None:
+                    return 1
             return 0
         
-        if pattern:
-            # Invalidate all queries matching pattern
-            count = 0
-            to_remove = []
-            for entry in self._cache.values():
-                if pattern.lower() in entry.query.lower():
-                    to_remove.append(entry.query_hash)
+        with self._lock:
+            if pattern:
+                # Invalidate all queries matching pattern (linear scan; prefer
+                # invalidate_tables() for table-scoped invalidation)
+                pattern_lower = pattern.lower()
+                to_remove = [
+                    query_hash for query_hash, entry in self._cache.items()
+                    if pattern_lower in entry.query.lower()
+                ]
             
-            for query_hash in to_remove:
-                del self._cache[query_hash]
-                count += 1
+                for query_hash in to_remove:
+                    self._remove(query_hash)
             
+                return len(to_remove)
+        
+            # Invalidate all
+            count = len(self._cache)
+            self._cache.clear()
+            self._table_index.clear()
+            self._fingerprint_index.clear()
+            self._wheel.clear()
+            self._wheel_ticks.clear()
+            self._total_bytes = 0
+            self._total_ttl = 0.0
+            self._entry_hits = 0
             return count
+    
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        Invalidate entries whose queries read any of the given tables.
         
-        # Invalidate all
-        count = len(self._cache)
-        self._cache.clear()
-        return count
+        Uses the table reverse index, so the cost is proportional to the
+        number of dependent entries rather than the cache size. Schema
+        qualifiers are ignored (``public.users`` also matches ``users``).
+        
+        Args:
+            tables: Table names
+            
+        Returns:
+            int: Number of entries invalidated
+        """
+        with self._lock:
+            to_remove: Set[str] = set()
+            for table in tables:
+                to_remove.update(self._table_index.get(self._base_table(table), ()))
+        
+            for query_hash in to_remove:
+                self._remove(query_hash)
+        
+            return len(to_remove)
+    
+    def invalidate_for_write(self, query: str) -> int:
+        """
+        Invalidate entries affected by a write statement.
+        
+        Args:
+            query: SQL statement that was executed
+            
+        Returns:
+            int: Number of entries invalidated (0 for read-only statements)
+        """
+        parsed = parse_query(query)
+        if not parsed.requires_write:
+            return 0
+        return self.invalidate_tables(parsed.tables)
+    
+    def invalidate_fingerprint(self, query: str) -> int:
+        """
+        Invalidate every cached variant of a statement, whatever its literals.
+        
+        Args:
+            query: Any query with the statement shape to invalidate
+            
+        Returns:
+            int: Number of entries invalidated
+        """
+        fingerprint_hash = self._hash_fingerprint(parse_query(query).fingerprint)
+        with self._lock:
+            to_remove = list(self._fingerprint_index.get(fingerprint_hash, ()))
+            for query_hash in to_remove:
+                self._remove(query_hash)
+            return len(to_remove)
     
     def clear_expired(self) -> int:
         """
@@ -226,52 +618,52 @@ class QueryCache:
         Returns:
             int: Number of entries cleared
         """
-        now = datetime.now()
-        to_remove = [
-            query_hash for query_hash, entry in self._cache.items()
-            if entry.expires_at < now
-        ]
-        
-        for query_hash in to_remove:
-            del self._cache[query_hash]
-        
-        return len(to_remove)
+        return self._advance_wheel()
     
     def get_stats(self, agent_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get cache statistics.
         
+        Statistics are maintained incrementally, so this does not walk
+        the cached entries.
+        
         Args:
             agent_id: Optional agent ID to filter by
             
         Returns:
             Dict containing cache statistics
         """
-        now = datetime.now()
-        
-        total_entries = len(self._cache)
-        expired_entries = sum(1 for e in self._cache.values() if e.is_expired())
-        active_entries = total_entries - expired_entries
-        
-        total_hits = sum(e.hit_count for e in self._cache.values())
-        
-        # Calculate average TTL
-        if self._cache:
-            avg_ttl = sum(
-                (e.expires_at - e.cached_at).total_seconds()
-                for e in self._cache.values()
-            ) / len(self._cache)
-        else:
-            avg_ttl = 0
-        
-        return {
-            'total_entries': total_entries,
-            'active_entries': active_entries,
-            'expired_entries': expired_entries,
-            'total_hits': total_hits,
-            'average_ttl_seconds': avg_ttl,
-            'default_ttl_seconds': self.default_ttl_seconds
-        }
+        now = time.time()
+        
+        with self._lock:
+            total_entries = len(self._cache)
+            # Entries past expiry whose wheel tick has not been processed yet
+            expired_entries = 0
+            for tick in self._wheel_ticks:
+                if tick * self._tick_seconds - self._tick_seconds <= now:
+                    expired_entries += sum(
+                        1 for h in self._wheel.get(tick, ())
+                        if h in self._cache and self._cache[h].expires_ts <= now
+                    )
+        
+            lookups = self._hits + self._misses
+            return {
+                'total_entries': total_entries,
+                'active_entries': total_entries - expired_entries,
+                'expired_entries': expired_entries,
+                'total_hits': self._entry_hits,
+                'average_ttl_seconds': self._total_ttl / total_entries if total_entries else 0,
+                'default_ttl_seconds': self.default_ttl_seconds,
+                'total_bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups * 100, 2) if lookups else 0.0,
+                'evictions': self._evictions,
+                'rejections': self._rejections,
+                'expirations': self._expirations
+            }
     
     def list_entries(
         self,
@@ -290,12 +682,13 @@ class QueryCache:
         """
         entries = []
         
-        for entry in self._cache.values():
-            # Filter by agent if specified (would need agent_id in metadata)
-            if agent_id and entry.metadata.get('agent_id') != agent_id:
-                continue
+        with self._lock:
+            for entry in self._cache.values():
+                # Filter by agent if specified (would need agent_id in metadata)
+                if agent_id and entry.metadata.get('agent_id') != agent_id:
+                    continue
             
-            entries.append(entry.to_dict())
+                entries.append(entry.to_dict())
         
         # Sort by cached_at (newest first)
         entries.sort(key=lambda x: x['cached_at'], reverse=True)
@@ -313,15 +706,16 @@ class QueryCache:
             int: Number of entries removed
         """
         count = 0
-        to_remove = []
         
-        for query_hash, entry in self._cache.items():
-            if entry.metadata.get('agent_id') == agent_id:
-                to_remove.append(query_hash)
+        with self._lock:
+            to_remove = [
+                query_hash for query_hash, entry in self._cache.items()
+                if entry.metadata.get('agent_id') == agent_id
+            ]
         
-        for query_hash in to_remove:
-            del self._cache[query_hash]
-            count += 1
+            for query_hash in to_remove:
+                self._remove(query_hash)
+                count += 1
         
         return count
 
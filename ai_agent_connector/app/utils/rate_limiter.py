@@ -1,14 +1,38 @@
 """
 Rate limiting system for AI agent queries
-Supports per-agent rate limits (queries per minute/hour)
+Supports per-agent rate limits (queries per minute/hour/day)
+
+Limits are enforced by LimiterEngine, a GCRA (generic cell rate algorithm)
+limiter that keeps one timestamp per key and window, so memory and check
+cost are constant no matter how many queries an agent has made. The same
+engine backs the per-user call limit in PolicyEngine.
+
+Limits are per process unless RateLimiter is given a shared
+RateLimitStore (SQLite or Redis). Workers then lease tokens from the store
+in small blocks and spend them locally, so most queries never leave the
+process while the limit still holds across every worker.
 """
 
+import logging
+import math
+from abc import ABC, abstractmethod
+import os
+import sqlite3
 import time
-from typing import Dict, Optional, Tuple, Any
-from collections import defaultdict, deque
+from typing import Dict, List, Optional, Sequence, Tuple, Any
 from dataclasses import dataclass, field
 from threading import Lock
 
+logger = logging.getLogger(__name__)
+
+# Try to import Redis (optional dependency)
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
 
 @dataclass
 class RateLimitConfig:
@@ -33,22 +57,576 @@ class RateLimitConfig:
             queries_per_hour=data.get('queries_per_hour'),
             queries_per_day=data.get('queries_per_day')
         )
+    
+    def windows(self) -> List[Tuple[int, float, str]]:
+        """
+        Get the configured limits.
+        
+        Returns:
+            List of (limit, window_seconds, unit) for each limit that is set
+        """
+        return [
+            (limit, window, unit)
+            for limit, window, unit in (
+                (self.queries_per_minute, 60.0, 'minute'),
+                (self.queries_per_hour, 3600.0, 'hour'),
+                (self.queries_per_day, 86400.0, 'day')
+            )
+            if limit
+        ]
+
+
+@dataclass
+class LimitDecision:
+    """Outcome of a LimiterEngine.acquire call"""
+    allowed: bool
+    exceeded: Optional[int] = None  # Index of the first limit that denied the request
+    retry_after: float = 0.0  # Seconds until the request would be allowed
+    used: List[int] = field(default_factory=list)  # Usage per limit before this request
+    granted: int = 0  # Requests taken (may be fewer than asked for when leasing)
+
+
+def _gcra_used(tat: float, now: float, interval: float) -> int:
+    # Requests still "in flight" in the window; the epsilon keeps float
+    # noise from rounding e.g. 2.0000000001 up to 3
+    return max(0, math.ceil((tat - now) / interval - 1e-9))
+
+
+def gcra_take(
+    state: Dict[float, float],
+    limits: Sequence[Tuple[int, float]],
+    tokens: int,
+    now: float,
+    partial: bool = False,
+    refund: int = 0
+) -> LimitDecision:
+    """
+    Apply a GCRA request to one key's state, in place.
+    
+    Every limit has to allow the request; state is only advanced when it
+    is granted. Refunded tokens (unused leases) are given back first. A
+    limit of 0 or less denies every request.
+    
+    Args:
+        state: Theoretical arrival time per window in seconds
+        limits: (limit, window_seconds) pairs
+        tokens: Requests to take
+        now: Current time in seconds
+        partial: Grant as many of tokens as are available instead of all or nothing
+        refund: Previously taken requests to give back
+        
+    Returns:
+        LimitDecision
+    """
+    for index, (limit, window) in enumerate(limits):
+        if limit <= 0:
+            used = [
+                min(other, _gcra_used(state.get(other_window, now), now, other_window / other)) if other > 0 else 0
+                for other, other_window in limits
+            ]
+            return LimitDecision(allowed=False, exceeded=index, retry_after=window, used=used)
+    
+    if refund:
+        for limit, window in limits:
+            if window in state:
+                state[window] = max(now, state[window] - refund * window / limit)
+    
+    tats = []
+    used = []
+    available = []
+    for limit, window in limits:
+        interval = window / limit
+        tat = max(state.get(window, now), now)
+        tats.append(tat)
+        used.append(min(limit, _gcra_used(tat, now, interval)))
+        available.append(max(0, math.floor((now + window - tat) / interval + 1e-9)))
+    
+    granted = min([tokens] + available)
+    if not partial and granted < tokens:
+        granted = 0
+    if granted <= 0:
+        needed = 1 if partial else tokens
+        exceeded = None
+        retry_after = 0.0
+        for index, (limit, window) in enumerate(limits):
+            if available[index] < needed:
+                if exceeded is None:
+                    exceeded = index
+                retry_after = max(retry_after, tats[index] + needed * window / limit - window - now)
+        return LimitDecision(allowed=False, exceeded=exceeded, retry_after=retry_after, used=used)
+    
+    for (limit, window), tat in zip(limits, tats):
+        state[window] = tat + granted * window / limit
+    return LimitDecision(allowed=True, used=used, granted=granted)
+
+
+class _Shard:
+    """A lock and the limiter state for the keys hashed to it"""
+    
+    __slots__ = ('lock', 'state')
+    
+    def __init__(self):
+        self.lock = Lock()
+        # key -> {window_seconds: theoretical arrival time}
+        self.state: Dict[str, Dict[float, float]] = {}
+
+
+class LimiterEngine:
+    """
+    Sharded GCRA rate limiter.
+    
+    A limit of N requests per window W admits a burst of N and then one
+    request every W/N seconds. Each key stores a single theoretical arrival
+    time (TAT) per window, so checks are O(1) and memory per key is fixed.
+    Keys are spread over independently locked shards so unrelated keys do
+    not contend.
+    """
+    
+    def __init__(self, shards: int = 64):
+        """
+        Initialize the engine.
+        
+        Args:
+            shards: Number of lock shards
+        """
+        self._shards = [_Shard() for _ in range(max(1, shards))]
+    
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+    
+    def acquire(
+        self,
+        key: str,
+        limits: Sequence[Tuple[int, float]],
+        cost: int = 1,
+        now: Optional[float] = None
+    ) -> LimitDecision:
+        """
+        Take cost requests from every limit, or from none of them.
+        
+        Args:
+            key: Limited identity (agent or user id)
+            limits: (limit, window_seconds) pairs that all have to allow the request
+            cost: Number of requests to take
+            now: Current time in seconds (default: time.time())
+            
+        Returns:
+            LimitDecision
+        """
+        return self.lease(key, limits, cost, partial=False, now=now)
+    
+    def lease(
+        self,
+        key: str,
+        limits: Sequence[Tuple[int, float]],
+        tokens: int,
+        refund: int = 0,
+        partial: bool = True,
+        now: Optional[float] = None
+    ) -> LimitDecision:
+        """
+        Take up to tokens requests, giving back refund unused ones first.
+        
+        Args:
+            key: Limited identity
+            limits: (limit, window_seconds) pairs
+            tokens: Requests wanted
+            refund: Unused requests from an earlier lease
+            partial: Grant fewer than tokens if that is all that is left
+            now: Current time in seconds (default: time.time())
+            
+        Returns:
+            LimitDecision with the number of requests granted
+        """
+        if now is None:
+            now = time.time()
+        shard = self._shard(key)
+        with shard.lock:
+            state = shard.state.get(key)
+            if state is None:
+                state = shard.state[key] = {}
+            return gcra_take(state, limits, tokens, now, partial=partial, refund=refund)
+    
+    def usage(
+        self,
+        key: str,
+        limits: Sequence[Tuple[int, float]],
+        now: Optional[float] = None
+    ) -> List[int]:
+        """
+        Get the current usage of each limit without taking a request.
+        
+        Args:
+            key: Limited identity
+            limits: (limit, window_seconds) pairs
+            now: Current time in seconds (default: time.time())
+            
+        Returns:
+            Requests counted against each limit
+        """
+        if now is None:
+            now = time.time()
+        shard = self._shard(key)
+        with shard.lock:
+            state = shard.state.get(key, {})
+            return [
+                min(limit, _gcra_used(state.get(window, now), now, window / limit))
+                for limit, window in limits
+            ]
+    
+    def reset(self, key: Optional[str] = None) -> None:
+        """
+        Forget usage for a key, or for all keys.
+        
+        Args:
+            key: Limited identity (None resets everything)
+        """
+        shards = self._shards if key is None else [self._shard(key)]
+        for shard in shards:
+            with shard.lock:
+                if key is None:
+                    shard.state.clear()
+                else:
+                    shard.state.pop(key, None)
+    
+    def __len__(self) -> int:
+        return sum(len(shard.state) for shard in self._shards)
+
+
+class RateLimitStore(ABC):
+    """
+    Limiter state shared by several processes.
+    
+    Workers lease blocks of requests from the store (see RateLimiter) rather
+    than calling it for every query. All stores apply the same GCRA update
+    as LimiterEngine.
+    """
+    
+    @abstractmethod
+    def lease(
+        self,
+        key: str,
+        limits: Sequence[Tuple[int, float]],
+        tokens: int,
+        refund: int = 0,
+        now: Optional[float] = None
+    ) -> LimitDecision:
+        """
+        Atomically give back refund requests and take up to tokens requests.
+        
+        Args:
+            key: Limited identity
+            limits: (limit, window_seconds) pairs
+            tokens: Requests wanted
+            refund: Unused requests from an earlier lease
+            now: Current time in seconds (default: time.time())
+            
+        Returns:
+            LimitDecision with the number of requests granted
+        """
+        pass
+    
+    @abstractmethod
+    def usage(
+        self,
+        key: str,
+        limits: Sequence[Tuple[int, float]],
+        now: Optional[float] = None
+    ) -> List[int]:
+        """Requests counted against each limit, including leased ones"""
+        pass
+    
+    @abstractmethod
+    def reset(self, key: Optional[str] = None) -> None:
+        """Forget usage for a key, or for all keys"""
+        pass
+    
+    def close(self) -> None:
+        """Release connections"""
+        pass
+
+
+class MemoryRateLimitStore(RateLimitStore):
+    """In-process store; shares limits between RateLimiter instances in one process"""
+    
+    def __init__(self, engine: Optional[LimiterEngine] = None):
+        """
+        Initialize the store.
+        
+        Args:
+            engine: Engine holding the state (default: a new LimiterEngine)
+        """
+        self._engine = engine or LimiterEngine()
+    
+    def lease(self, key, limits, tokens, refund=0, now=None) -> LimitDecision:
+        return self._engine.lease(key, limits, tokens, refund=refund, now=now)
+    
+    def usage(self, key, limits, now=None) -> List[int]:
+        return self._engine.usage(key, limits, now=now)
+    
+    def reset(self, key: Optional[str] = None) -> None:
+        self._engine.reset(key)
+
+
+class SQLiteRateLimitStore(RateLimitStore):
+    """
+    SQLite store for workers on one host.
+    
+    Each lease is a single IMMEDIATE transaction, so concurrent processes
+    serialize on the database lock.
+    """
+    
+    def __init__(self, db_path: str = "rate_limits.db", timeout: float = 5.0):
+        """
+        Initialize the store.
+        
+        Args:
+            db_path: Path to SQLite database file
+            timeout: Seconds to wait for the database lock
+        """
+        self.db_path = db_path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(db_path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        if db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limit_state (
+                key TEXT NOT NULL,
+                window REAL NOT NULL,
+                tat REAL NOT NULL,
+                PRIMARY KEY (key, window)
+            )
+        ''')
+    
+    def _load(self, key: str) -> Dict[float, float]:
+        rows = self._conn.execute(
+            'SELECT window, tat FROM rate_limit_state WHERE key = ?', (key,)
+        ).fetchall()
+        return {window: tat for window, tat in rows}
+    
+    def lease(self, key, limits, tokens, refund=0, now=None) -> LimitDecision:
+        if now is None:
+            now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                state = self._load(key)
+                before = dict(state)
+                decision = gcra_take(state, limits, tokens, now, partial=True, refund=refund)
+                changed = [(key, window, tat) for window, tat in state.items() if before.get(window) != tat]
+                if changed:
+                    self._conn.executemany(
+                        'INSERT OR REPLACE INTO rate_limit_state (key, window, tat) VALUES (?, ?, ?)',
+                        changed
+                    )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return decision
+    
+    def usage(self, key, limits, now=None) -> List[int]:
+        if now is None:
+            now = time.time()
+        with self._lock:
+            state = self._load(key)
+        return [
+            min(limit, _gcra_used(state.get(window, now), now, window / limit))
+            for limit, window in limits
+        ]
+    
+    def reset(self, key: Optional[str] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._conn.execute('DELETE FROM rate_limit_state')
+            else:
+                self._conn.execute('DELETE FROM rate_limit_state WHERE key = ?', (key,))
+    
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _is_watch_error(exc: Exception) -> bool:
+    # Matched by name so clients other than redis-py (and test stand-ins)
+    # can signal a lost optimistic transaction too
+    return type(exc).__name__ == 'WatchError'
+
+
+class RedisRateLimitStore(RateLimitStore):
+    """
+    Store on any server speaking the Redis protocol, for workers across hosts.
+    
+    Each key is a hash of window -> TAT updated with WATCH/MULTI/EXEC and
+    retried when another worker changes it first. Keys expire once the
+    longest window has passed.
+    """
+    
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Optional[Any] = None,
+        prefix: str = "uac:ratelimit:",
+        max_retries: int = 10
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            url: Redis URL (e.g. redis://localhost:6379/0)
+            client: Existing client with the redis-py interface (instead of url)
+            prefix: Prefix for keys
+            max_retries: Attempts per lease when other workers race on the same key
+            
+        Raises:
+            ImportError: If url is given and the redis package is not installed
+        """
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise ImportError("redis is required for the Redis rate limit store. Install with: pip install redis")
+            client = redis.from_url(url or 'redis://localhost:6379/0')
+        self._client = client
+        self.prefix = prefix
+        self.max_retries = max_retries
+    
+    @staticmethod
+    def _decode(data: Dict[Any, Any]) -> Dict[float, float]:
+        return {float(window): float(tat) for window, tat in data.items()}
+    
+    def lease(self, key, limits, tokens, refund=0, now=None) -> LimitDecision:
+        if now is None:
+            now = time.time()
+        redis_key = f"{self.prefix}{key}"
+        ttl_ms = int(max(window for _, window in limits) * 1000)
+        
+        for _ in range(self.max_retries):
+            with self._client.pipeline() as pipe:
+                try:
+                    pipe.watch(redis_key)
+                    state = self._decode(pipe.hgetall(redis_key))
+                    decision = gcra_take(state, limits, tokens, now, partial=True, refund=refund)
+                    pipe.multi()
+                    if state:
+                        pipe.hset(redis_key, mapping={repr(window): repr(tat) for window, tat in state.items()})
+                        pipe.pexpire(redis_key, ttl_ms)
+                    pipe.execute()
+                    return decision
+                except Exception as e:
+                    if not _is_watch_error(e):
+                        raise
+        raise RuntimeError(f"Rate limit lease for {key} kept conflicting after {self.max_retries} attempts")
+    
+    def usage(self, key, limits, now=None) -> List[int]:
+        if now is None:
+            now = time.time()
+        state = self._decode(self._client.hgetall(f"{self.prefix}{key}"))
+        return [
+            min(limit, _gcra_used(state.get(window, now), now, window / limit))
+            for limit, window in limits
+        ]
+    
+    def reset(self, key: Optional[str] = None) -> None:
+        if key is not None:
+            self._client.delete(f"{self.prefix}{key}")
+            return
+        keys = list(self._client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self._client.delete(*keys)
+    
+    def close(self) -> None:
+        close = getattr(self._client, 'close', None)
+        if close:
+            close()
+
+
+def create_rate_limit_store(url: Optional[str]) -> Optional[RateLimitStore]:
+    """
+    Create a store from a URL.
+    
+    Args:
+        url: memory://, sqlite:///path/to/file.db or redis://host:port/db
+            (None or empty for process-local limits)
+            
+    Returns:
+        RateLimitStore or None
+        
+    Raises:
+        ValueError: If the URL scheme is not supported or a sqlite URL
+            does not have the sqlite:///path form
+    """
+    if not url:
+        return None
+    if url.startswith('memory://'):
+        return MemoryRateLimitStore()
+    if url.startswith('sqlite:///'):
+        return SQLiteRateLimitStore(url[len('sqlite:///'):] or 'rate_limits.db')
+    if url.startswith('sqlite:'):
+        raise ValueError(f"Invalid SQLite rate limit store URL (expected sqlite:///path): {url}")
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisRateLimitStore(url=url)
+    raise ValueError(f"Unsupported rate limit store: {url}")
+
+
+class _Lease:
+    """Requests a worker has taken from the store and not yet spent"""
+    
+    __slots__ = ('lock', 'tokens', 'limits', 'expires_at')
+    
+    def __init__(self):
+        self.lock = Lock()
+        self.tokens = 0
+        self.limits: Optional[List[Tuple[int, float]]] = None
+        self.expires_at = 0.0
 
 
 class RateLimiter:
     """
     Rate limiter for tracking and enforcing query limits per agent.
-    Uses sliding window algorithm for accurate rate limiting.
+    Uses LimiterEngine, so each agent costs a few floats regardless of volume.
+    
+    With a store, limits are shared by every worker using that store: each
+    worker leases up to lease_size requests at a time (never more than a
+    tenth of the agent's smallest limit) and only goes back to the store
+    when its lease is spent or expired. Unused requests are handed back with
+    the next lease.
     """
     
-    def __init__(self):
-        """Initialize rate limiter"""
-        # agent_id -> deque of timestamps
-        self._minute_queries: Dict[str, deque] = defaultdict(lambda: deque())
-        self._hour_queries: Dict[str, deque] = defaultdict(lambda: deque())
-        self._day_queries: Dict[str, deque] = defaultdict(lambda: deque())
-        self._locks: Dict[str, Lock] = defaultdict(Lock)
+    FALLBACKS = ('local', 'allow', 'deny')
+    
+    def __init__(
+        self,
+        engine: Optional[LimiterEngine] = None,
+        store: Optional[RateLimitStore] = None,
+        lease_size: int = 10,
+        lease_ttl: float = 1.0,
+        fallback: str = 'local',
+        namespace: str = ''
+    ):
+        """
+        Initialize rate limiter
+        
+        Args:
+            engine: Limiter engine for process-local limits (default: a new LimiterEngine)
+            store: Shared store to lease requests from (default: process-local limits only)
+            lease_size: Maximum requests leased from the store at a time
+            lease_ttl: Seconds a lease may be spent before going back to the store
+            fallback: What to do when the store fails: 'local' enforces the
+                limits per process, 'allow' admits, 'deny' rejects
+            namespace: Prefix for store keys, so limiters sharing a store
+                do not count each other's agents
+        """
+        if fallback not in self.FALLBACKS:
+            raise ValueError(f"fallback must be one of {self.FALLBACKS}")
+        self._engine = engine or LimiterEngine()
+        self._store = store
+        self.lease_size = max(1, lease_size)
+        self.lease_ttl = lease_ttl
+        self.fallback = fallback
+        self.namespace = namespace
         self._configs: Dict[str, RateLimitConfig] = {}
+        self._leases: Dict[str, _Lease] = {}
+        self._stats_lock = Lock()
+        self._stats = {'store_leases': 0, 'local_hits': 0, 'store_errors': 0, 'fallbacks': 0}
     
     def set_rate_limit(self, agent_id: str, config: RateLimitConfig) -> None:
         """
@@ -72,12 +650,13 @@ class RateLimiter:
         """
         return self._configs.get(agent_id)
     
-    def check_rate_limit(self, agent_id: str) -> Tuple[bool, Optional[str]]:
+    def check_rate_limit(self, agent_id: str, cost: int = 1) -> Tuple[bool, Optional[str]]:
         """
         Check if agent is within rate limits.
         
         Args:
             agent_id: Agent identifier
+            cost: Queries to charge; all of them are taken or none
             
         Returns:
             tuple: (allowed, error_message)
@@ -89,58 +668,77 @@ class RateLimiter:
             # No rate limit configured, allow
             return True, None
         
-        lock = self._locks[agent_id]
-        with lock:
-            current_time = time.time()
-            
-            # Clean old entries
-            self._clean_old_entries(agent_id, current_time)
-            
-            # Check minute limit
-            if config.queries_per_minute:
-                minute_queries = self._minute_queries[agent_id]
-                if len(minute_queries) >= config.queries_per_minute:
-                    return False, f"Rate limit exceeded: {config.queries_per_minute} queries per minute"
-            
-            # Check hour limit
-            if config.queries_per_hour:
-                hour_queries = self._hour_queries[agent_id]
-                if len(hour_queries) >= config.queries_per_hour:
-                    return False, f"Rate limit exceeded: {config.queries_per_hour} queries per hour"
-            
-            # Check day limit
-            if config.queries_per_day:
-                day_queries = self._day_queries[agent_id]
-                if len(day_queries) >= config.queries_per_day:
-                    return False, f"Rate limit exceeded: {config.queries_per_day} queries per day"
-            
-            # Record query
-            self._record_query(agent_id, current_time)
-            
+        windows = config.windows()
+        limits = [(limit, window) for limit, window, _ in windows]
+        if not limits:
+            # Configured, but with every limit unset
             return True, None
+        now = time.time()
+        if self._store is None:
+            decision = self._engine.acquire(agent_id, limits, cost=cost, now=now)
+        else:
+            decision = self._acquire_leased(agent_id, limits, now, cost)
+        
+        if not decision.allowed:
+            if decision.exceeded is None:
+                return False, "Rate limit store unavailable"
+            limit, _, unit = windows[decision.exceeded]
+            return False, f"Rate limit exceeded: {limit} queries per {unit}"
+        return True, None
     
-    def _clean_old_entries(self, agent_id: str, current_time: float) -> None:
-        """Remove old entries outside the time windows"""
-        # Clean minute window (last 60 seconds)
-        minute_queries = self._minute_queries[agent_id]
-        while minute_queries and current_time - minute_queries[0] > 60:
-            minute_queries.popleft()
-        
-        # Clean hour window (last 3600 seconds)
-        hour_queries = self._hour_queries[agent_id]
-        while hour_queries and current_time - hour_queries[0] > 3600:
-            hour_queries.popleft()
-        
-        # Clean day window (last 86400 seconds)
-        day_queries = self._day_queries[agent_id]
-        while day_queries and current_time - day_queries[0] > 86400:
-            day_queries.popleft()
-    
-    def _record_query(self, agent_id: str, timestamp: float) -> None:
-        """Record a query timestamp"""
-        self._minute_queries[agent_id].append(timestamp)
-        self._hour_queries[agent_id].append(timestamp)
-        self._day_queries[agent_id].append(timestamp)
+    def _count(self, stat: str) -> None:
+        with self._stats_lock:
+            self._stats[stat] += 1
+    
+    def _acquire_leased(
+        self,
+        agent_id: str,
+        limits: List[Tuple[int, float]],
+        now: float,
+        cost: int = 1
+    ) -> LimitDecision:
+        """Spend cost requests from the local lease, renewing it from the store when needed"""
+        lease = self._leases.get(agent_id)
+        if lease is None:
+            lease = self._leases.setdefault(agent_id, _Lease())
+        
+        with lease.lock:
+            same_limits = lease.limits == limits
+            if lease.tokens >= cost and same_limits and now < lease.expires_at:
+                lease.tokens -= cost
+                self._count('local_hits')
+                return LimitDecision(allowed=True, granted=cost)
+            
+            refund = lease.tokens if same_limits else 0
+            size = max(cost, min(self.lease_size, min(limit for limit, _ in limits) // 10))
+            try:
+                decision = self._store.lease(self.namespace + agent_id, limits, size, refund=refund, now=now)
+            except Exception as e:
+                self._count('store_errors')
+                self._count('fallbacks')
+                logger.warning(f"Rate limit store failed for {agent_id}, falling back to '{self.fallback}': {e}")
+                if self.fallback == 'allow':
+                    return LimitDecision(allowed=True, granted=cost)
+                if self.fallback == 'deny':
+                    return LimitDecision(allowed=False)
+                return self._engine.acquire(agent_id, limits, cost=cost, now=now)
+            
+            self._count('store_leases')
+            lease.limits = limits
+            lease.expires_at = now + self.lease_ttl
+            if decision.granted < cost:
+                # Not enough left for the whole cost: keep what was granted for
+                # later requests and deny this one
+                lease.tokens = decision.granted
+                if decision.exceeded is not None:
+                    return decision
+                exceeded = next(
+                    (index for index, (limit, _) in enumerate(limits) if limit - decision.used[index] < cost),
+                    0
+                )
+                return LimitDecision(allowed=False, exceeded=exceeded, used=decision.used)
+            lease.tokens = decision.granted - cost
+            return decision
     
     def get_usage_stats(self, agent_id: str) -> Dict[str, Any]:
         """
@@ -159,36 +757,104 @@ class RateLimiter:
                 'current_usage': {}
             }
         
-        current_time = time.time()
-        self._clean_old_entries(agent_id, current_time)
+        # Only configured windows are tracked; the others report no usage
+        windows = config.windows()
+        limits = [(limit, window) for limit, window, _ in windows]
+        now = time.time()
+        counts = None
+        if self._store is not None:
+            try:
+                # Requests this worker leased but has not spent are not usage yet
+                lease = self._leases.get(agent_id)
+                unspent = lease.tokens if lease and lease.limits == limits and now < lease.expires_at else 0
+                counts = [max(0, used - unspent) for used in self._store.usage(self.namespace + agent_id, limits, now=now)]
+            except Exception as e:
+                logger.warning(f"Rate limit store failed for {agent_id}: {e}")
+        if counts is None:
+            counts = self._engine.usage(agent_id, limits, now=now)
+        used = dict(zip([unit for _, _, unit in windows], counts))
+        limits = {
+            'minute': config.queries_per_minute,
+            'hour': config.queries_per_hour,
+            'day': config.queries_per_day
+        }
         
         return {
             'rate_limits_configured': True,
             'limits': config.to_dict(),
             'current_usage': {
-                'queries_last_minute': len(self._minute_queries[agent_id]),
-                'queries_last_hour': len(self._hour_queries[agent_id]),
-                'queries_last_day': len(self._day_queries[agent_id])
+                f'queries_last_{unit}': used.get(unit, 0) for unit in limits
             },
             'remaining': {
-                'queries_this_minute': max(0, (config.queries_per_minute or float('inf')) - len(self._minute_queries[agent_id])),
-                'queries_this_hour': max(0, (config.queries_per_hour or float('inf')) - len(self._hour_queries[agent_id])),
-                'queries_this_day': max(0, (config.queries_per_day or float('inf')) - len(self._day_queries[agent_id]))
+                f'queries_this_{unit}': max(0, (limit or float('inf')) - used.get(unit, 0))
+                for unit, limit in limits.items()
             }
         }
     
+    def get_store_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics about the shared store and local leasing.
+        
+        Returns:
+            Dict with store type, fallback mode and lease/error counters
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update({
+            'store': type(self._store).__name__ if self._store else None,
+            'fallback': self.fallback,
+            'lease_size': self.lease_size,
+            'lease_ttl': self.lease_ttl,
+            'active_leases': len(self._leases)
+        })
+        return stats
+    
+    def _forget(self, agent_id: str) -> None:
+        self._leases.pop(agent_id, None)
+        self._engine.reset(agent_id)
+        if self._store is not None:
+            try:
+                self._store.reset(self.namespace + agent_id)
+            except Exception as e:
+                logger.warning(f"Rate limit store failed to reset {agent_id}: {e}")
+    
     def reset_agent_limits(self, agent_id: str) -> None:
         """Reset rate limit tracking for an agent"""
-        with self._locks[agent_id]:
-            self._minute_queries[agent_id].clear()
-            self._hour_queries[agent_id].clear()
-            self._day_queries[agent_id].clear()
+        self._forget(agent_id)
     
     def remove_agent(self, agent_id: str) -> None:
         """Remove all rate limit data for an agent"""
-        self._minute_queries.pop(agent_id, None)
-        self._hour_queries.pop(agent_id, None)
-        self._day_queries.pop(agent_id, None)
+        self._forget(agent_id)
         self._configs.pop(agent_id, None)
-        self._locks.pop(agent_id, None)
 
+
+def create_rate_limiter(namespace: str = '') -> RateLimiter:
+    """
+    Create a rate limiter configured from the environment.
+    
+    RATE_LIMIT_STORE selects a shared store (see create_rate_limit_store);
+    RATE_LIMIT_LEASE_SIZE, RATE_LIMIT_LEASE_TTL and RATE_LIMIT_FALLBACK tune
+    leasing. Without RATE_LIMIT_STORE limits are per process.
+    
+    Args:
+        namespace: Prefix for store keys
+    
+    Returns:
+        RateLimiter
+    """
+    store_url = os.environ.get('RATE_LIMIT_STORE')
+    fallback = os.environ.get('RATE_LIMIT_FALLBACK', 'local')
+    try:
+        store = create_rate_limit_store(store_url)
+    except Exception as e:
+        if fallback == 'deny':
+            raise
+        logger.warning(f"Rate limit store {store_url} unavailable, using per-process limits: {e}")
+        store = None
+    return RateLimiter(
+        store=store,
+        lease_size=int(os.environ.get('RATE_LIMIT_LEASE_SIZE', 10)),
+        lease_ttl=float(os.environ.get('RATE_LIMIT_LEASE_TTL', 1.0)),
+        fallback=fallback,
+        namespace=namespace
+    )
@@ -5,7 +5,8 @@ Row-Level Security (RLS) system for filtering data based on conditions
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field
 from enum import Enum
-import re
+
+from .sql_parser import parse_query
 
 
 class RLSRuleType(Enum):
@@ -199,7 +200,7 @@ class RowLevelSecurity:
             tables = self._extract_tables_from_query(query)
             if not tables:
                 return query  # No tables found, return as-is
-            table_name = list(tables)[0]  # Use first table
+            table_name = tables[0]  # Use first table
         
         # Get applicable rules
         rules = self.get_rules(agent_id, table_name)
@@ -221,22 +222,9 @@ class RowLevelSecurity:
         
         return modified_query
     
-    def _extract_tables_from_query(self, query: str) -> set:
-        """Extract table names from SQL query"""
-        # Simple extraction - can be enhanced with proper SQL parser
-        tables = set()
-        
-        # FROM clause
-        from_match = re.search(r'\bFROM\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)', query, re.IGNORECASE)
-        if from_match:
-            tables.add(from_match.group(1).lower())
-        
-        # JOIN clauses
-        join_matches = re.finditer(r'\bJOIN\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)', query, re.IGNORECASE)
-        for match in join_matches:
-            tables.add(match.group(1).lower())
-        
-        return tables
+    def _extract_tables_from_query(self, query: str) -> List[str]:
+        """Extract table names from SQL query, in order of appearance"""
+        return list(parse_query(query).tables)
     
     def _inject_where_clause(self, query: str, condition: str) -> str:
         """
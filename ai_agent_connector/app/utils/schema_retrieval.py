@@ -0,0 +1,391 @@
+"""
+Relevance-pruned schema context for NL-to-SQL prompts
+Instead of sending every table of the warehouse to the LLM, each question is
+matched against an inverted index of table names, column names and ontology
+concepts (optionally blended with local embedding similarity). Only the
+top-k tables and their foreign-key neighbors go into the prompt, so prompt
+size stays bounded however large the schema grows.
+"""
+
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, Union
+
+# Try to import sentence-transformers (optional dependency)
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SentenceTransformer = None
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+
+# Texts -> one vector per text
+Embedder = Callable[[List[str]], Sequence[Sequence[float]]]
+
+DEFAULT_TOP_K = 8
+DEFAULT_MAX_NEIGHBORS = 4
+DEFAULT_MAX_COLUMNS = 40
+
+# Per-field weights of a token match
+TABLE_WEIGHT = 3.0
+CONCEPT_WEIGHT = 2.5
+COLUMN_WEIGHT = 1.0
+
+# Weight of cosine similarity relative to the lexical score
+EMBEDDING_WEIGHT = 2.0
+
+# Schema indexes kept, keyed by catalog version
+INDEX_CACHE_SIZE = 32
+
+STOPWORDS = frozenset({
+    'a', 'all', 'an', 'and', 'are', 'as', 'at', 'by', 'do', 'each', 'for', 'from', 'get', 'give',
+    'has', 'have', 'how', 'i', 'in', 'is', 'it', 'list', 'many', 'me', 'much', 'my', 'of', 'on',
+    'or', 'our', 'per', 'show', 'that', 'the', 'their', 'them', 'there', 'these', 'this', 'to',
+    'was', 'we', 'were', 'what', 'when', 'where', 'which', 'who', 'with', 'whose',
+})
+
+_CAMEL_RE = re.compile(r'([a-z0-9])([A-Z])')
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _stem(token: str) -> str:
+    """
+    Strip plural endings so 'orders'/'order' and 'categories'/'category' meet.
+    
+    '-ses' loses only its 's' ('warehouses' -> 'warehouse'), except
+    '-sses' and consonant + '-uses' ('addresses' -> 'address', 'statuses'
+    -> 'status'); singulars ending in '-ss', '-us' or '-is' are kept, so
+    plural and singular forms of a word stem the same.
+    """
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 4 and token.endswith(('sses', 'xes', 'ches', 'shes')):
+        return token[:-2]
+    if len(token) > 4 and token.endswith('uses') and token[-5] not in 'aeiou':
+        return token[:-2]
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text or an identifier into stemmed lowercase terms.
+    
+    Args:
+        text: Question, table name, column name or concept (snake_case and
+            CamelCase identifiers are split into words)
+    
+    Returns:
+        List of terms with stopwords removed
+    """
+    words = _WORD_RE.findall(_CAMEL_RE.sub(r'\1 \2', text or '').lower())
+    return [_stem(word) for word in words if word not in STOPWORDS]
+
+
+def _concept_names(value: Union[str, Sequence[str], None]) -> List[str]:
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine of the angle between two vectors (0.0 if either is zero)."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SchemaIndex:
+    """
+    Inverted index over one schema version.
+    
+    Each table is indexed by the terms of its name, its ontology concepts
+    and its column names, weighted per field. Foreign-key neighbors are
+    inferred from '<table>_id' style columns.
+    """
+    
+    def __init__(
+        self,
+        tables: Dict[str, Dict[str, Any]],
+        concepts: Optional[Dict[str, Union[str, Sequence[str]]]] = None,
+        embedder: Optional[Embedder] = None
+    ):
+        """
+        Build the index.
+        
+        Args:
+            tables: Table name -> {'columns': [{'name', 'type'}, ...]}, as in
+                schema_info['schema']
+            concepts: Lowercase table name -> ontology entity type(s)
+            embedder: Optional function embedding texts, enabling semantic matching
+        """
+        self.tables = tables
+        self.embedder = embedder
+        self.neighbors: Dict[str, Set[str]] = {name: set() for name in tables}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._column_terms: Dict[str, Dict[str, Set[str]]] = {}
+        self._vectors: Optional[Dict[str, Sequence[float]]] = None
+        concepts = concepts or {}
+        
+        # Stemmed bare table name -> table, for foreign-key inference
+        by_stem: Dict[str, str] = {}
+        for name, info in tables.items():
+            bare = info.get('table') or name.rsplit('.', 1)[-1]
+            by_stem.setdefault('_'.join(tokenize(bare)), name)
+        
+        documents: Dict[str, str] = {}
+        for name, info in tables.items():
+            bare = info.get('table') or name.rsplit('.', 1)[-1]
+            table_concepts = _concept_names(concepts.get(bare.lower()) or concepts.get(name.lower()))
+            self._add(name, tokenize(name), TABLE_WEIGHT)
+            for concept in table_concepts:
+                self._add(name, tokenize(concept), CONCEPT_WEIGHT)
+            
+            columns = self._column_terms[name] = {}
+            for col in info.get('columns', []):
+                col_name = col.get('name', '')
+                terms = tokenize(col_name)
+                columns[col_name] = set(terms)
+                self._add(name, terms, COLUMN_WEIGHT)
+                
+                lowered = col_name.lower()
+                if lowered.endswith('_id') or (col_name.endswith('Id') and len(col_name) > 2):
+                    target = by_stem.get('_'.join(tokenize(col_name[:-3] if lowered.endswith('_id') else col_name[:-2])))
+                    if target and target != name:
+                        self.neighbors[name].add(target)
+                        self.neighbors[target].add(name)
+            
+            documents[name] = ' '.join(
+                [bare.replace('_', ' ')] + table_concepts
+                + [col.get('name', '').replace('_', ' ') for col in info.get('columns', [])]
+            )
+        
+        count = len(tables) or 1
+        self._idf = {
+            term: math.log(1 + count / len(postings))
+            for term, postings in self._postings.items()
+        }
+        
+        if embedder and documents:
+            names = list(documents)
+            self._vectors = dict(zip(names, embedder([documents[name] for name in names])))
+    
+    def _add(self, table: str, terms: List[str], weight: float) -> None:
+        for term in set(terms):
+            postings = self._postings.setdefault(term, {})
+            postings[table] = max(postings.get(table, 0.0), weight)
+    
+    def search(self, question: str, top_k: int = DEFAULT_TOP_K) -> List[Tuple[str, float]]:
+        """
+        Rank tables by relevance to a question.
+        
+        Args:
+            question: Natural language question
+            top_k: Maximum tables returned
+        
+        Returns:
+            List of (table name, score), best first; tables scoring 0 are left out
+        """
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(question)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for table, weight in self._postings[term].items():
+                scores[table] = scores.get(table, 0.0) + weight * idf
+        
+        if self._vectors:
+            query_vector = self.embedder([question])[0]
+            for table, vector in self._vectors.items():
+                similarity = cosine_similarity(query_vector, vector)
+                if similarity > 0:
+                    scores[table] = scores.get(table, 0.0) + EMBEDDING_WEIGHT * similarity
+        
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [(table, round(score, 4)) for table, score in ranked[:top_k] if score > 0]
+    
+    def select(
+        self,
+        question: str,
+        top_k: int = DEFAULT_TOP_K,
+        max_neighbors: int = DEFAULT_MAX_NEIGHBORS,
+        max_columns: int = DEFAULT_MAX_COLUMNS
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Pick the tables (and columns) to put in the prompt for a question.
+        
+        Args:
+            question: Natural language question
+            top_k: Most relevant tables kept
+            max_neighbors: Foreign-key neighbors of those tables added on top
+            max_columns: Columns kept per table (key columns and columns
+                matching the question first)
+        
+        Returns:
+            Table name -> table info, in relevance order
+        """
+        selected = [table for table, _ in self.search(question, top_k)]
+        if not selected:
+            # Nothing matched: fall back to the best connected tables
+            selected = sorted(self.tables, key=lambda name: (-len(self.neighbors[name]), name))[:top_k]
+        
+        chosen = set(selected)
+        added = 0
+        for table in list(selected):
+            for neighbor in sorted(self.neighbors[table] - chosen):
+                if added >= max_neighbors:
+                    break
+                selected.append(neighbor)
+                chosen.add(neighbor)
+                added += 1
+        
+        question_terms = set(tokenize(question))
+        return {table: self._prune_columns(table, question_terms, max_columns) for table in selected}
+    
+    def _prune_columns(self, table: str, question_terms: Set[str], max_columns: int) -> Dict[str, Any]:
+        info = self.tables[table]
+        columns = info.get('columns', [])
+        if len(columns) <= max_columns:
+            return info
+        
+        terms = self._column_terms[table]
+        
+        def priority(position: int) -> Tuple[int, int]:
+            name = columns[position].get('name', '')
+            if name.lower() == 'id' or name.lower().endswith('_id'):
+                return (0, position)
+            if terms.get(name, set()) & question_terms:
+                return (1, position)
+            return (2, position)
+        
+        keep = sorted(sorted(range(len(columns)), key=priority)[:max_columns])
+        return {**info, 'columns': [columns[position] for position in keep]}
+
+
+class _IndexCache:
+    """Recently built SchemaIndexes keyed by schema version and concepts"""
+    
+    def __init__(self, size: int = INDEX_CACHE_SIZE):
+        self.size = size
+        self._indexes: 'OrderedDict[Tuple, SchemaIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(
+        self,
+        schema_info: Dict[str, Any],
+        concepts: Optional[Dict[str, Union[str, Sequence[str]]]],
+        embedder: Optional[Embedder]
+    ) -> SchemaIndex:
+        version = schema_info.get('version')
+        if version is None:
+            return SchemaIndex(schema_info.get('schema') or {}, concepts, embedder)
+        
+        concept_key = frozenset(
+            (table, value if isinstance(value, str) else tuple(value))
+            for table, value in (concepts or {}).items()
+        )
+        key = (version, concept_key, id(embedder) if embedder else None)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        
+        index = SchemaIndex(schema_info.get('schema') or {}, concepts, embedder)
+        with self._lock:
+            self._indexes[key] = index
+            while len(self._indexes) > self.size:
+                self._indexes.popitem(last=False)
+        return index
+
+
+_index_cache = _IndexCache()
+
+
+def select_schema_context(
+    question: str,
+    schema_info: Dict[str, Any],
+    top_k: int = DEFAULT_TOP_K,
+    max_neighbors: int = DEFAULT_MAX_NEIGHBORS,
+    max_columns: int = DEFAULT_MAX_COLUMNS,
+    concepts: Optional[Dict[str, Union[str, Sequence[str]]]] = None,
+    embedder: Optional[Embedder] = None
+) -> Dict[str, Any]:
+    """
+    Reduce schema info to the part relevant to a question.
+    
+    The index of a catalog version is built once and reused; schemas that
+    already fit the limits are returned unchanged.
+    
+    Args:
+        question: Natural language question
+        schema_info: Schema info as returned by NLToSQLConverter.get_schema_info
+        top_k: Most relevant tables kept
+        max_neighbors: Foreign-key neighbors added on top of them
+        max_columns: Columns kept per table
+        concepts: Lowercase table name -> ontology entity type(s)
+        embedder: Optional embedding function (default: the local model named
+            by SCHEMA_EMBEDDING_MODEL, if set and installed)
+    
+    Returns:
+        Schema info with 'schema' and 'tables' limited to the selected tables
+        and 'total_tables' set to the full table count
+    """
+    schema = schema_info.get('schema') or {}
+    if len(schema) <= top_k and all(len(info.get('columns', [])) <= max_columns for info in schema.values()):
+        return schema_info
+    
+    index = _index_cache.get(schema_info, concepts, embedder or get_default_embedder())
+    tables = index.select(question, top_k=top_k, max_neighbors=max_neighbors, max_columns=max_columns)
+    return {
+        **schema_info,
+        'tables': list(tables),
+        'schema': tables,
+        'total_tables': len(schema)
+    }
+
+
+def local_embedder(model_name: str) -> Embedder:
+    """
+    Create an embedding function backed by a local sentence-transformers model.
+    
+    Args:
+        model_name: sentence-transformers model name or path
+    
+    Returns:
+        Function embedding a list of texts
+    
+    Raises:
+        ImportError: If sentence-transformers is not installed
+    """
+    if not SENTENCE_TRANSFORMERS_AVAILABLE:
+        raise ImportError(
+            "sentence-transformers is required for embedding-based schema retrieval. "
+            "Install with: pip install sentence-transformers"
+        )
+    model = SentenceTransformer(model_name)
+    
+    def embed(texts: List[str]) -> List[List[float]]:
+        return [list(map(float, vector)) for vector in model.encode(texts)]
+    
+    return embed
+
+
+_default_embedder: Optional[Embedder] = None
+_default_embedder_loaded = False
+
+
+def get_default_embedder() -> Optional[Embedder]:
+    """Local embedder named by SCHEMA_EMBEDDING_MODEL, or None if unset or not installed."""
+    global _default_embedder, _default_embedder_loaded
+    if not _default_embedder_loaded:
+        model_name = os.getenv('SCHEMA_EMBEDDING_MODEL')
+        if model_name and SENTENCE_TRANSFORMERS_AVAILABLE:
+            _default_embedder = local_embedder(model_name)
+        _default_embedder_loaded = True
+    return _default_embedder
@@ -0,0 +1,127 @@
+"""
+Single-flight request coalescing
+Concurrent callers asking for the same key share one in-flight execution
+instead of each running it, e.g. identical dashboard queries arriving at once.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    """An in-flight execution and its outcome"""
+    
+    __slots__ = ('done', 'result', 'error')
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+    
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait and receive the same result or exception.
+    Nothing is cached once the call completes.
+    """
+    
+    def __init__(self, wait_timeout: Optional[float] = None):
+        """
+        Initialize the coalescer.
+        
+        Args:
+            wait_timeout: Maximum seconds a follower waits for the leader
+                before running the function itself (None waits indefinitely)
+        """
+        self.wait_timeout = wait_timeout
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+        self._timeouts = 0
+        self._errors = 0
+        self._waiting = 0
+    
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+        
+        Args:
+            key: Coalescing key
+            fn: Zero-argument function to execute
+        
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another caller's execution
+        
+        Raises:
+            Exception: Whatever fn raised (re-raised in every waiting caller)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+                self._executions += 1
+            else:
+                leader = False
+                self._waiting += 1
+        
+        if not leader:
+            completed = call.done.wait(self.wait_timeout)
+            with self._lock:
+                self._waiting -= 1
+                if completed:
+                    self._coalesced += 1
+                else:
+                    self._timeouts += 1
+                    self._executions += 1
+            if not completed:
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing statistics.
+        
+        Returns:
+            Dict with execution, coalesced, in-flight and waiting counts
+        """
+        with self._lock:
+            calls = self._executions + self._coalesced
+            return {
+                'calls': calls,
+                'executions': self._executions,
+                'coalesced': self._coalesced,
+                'coalesce_rate': round(self._coalesced / calls * 100, 2) if calls else 0.0,
+                'in_flight': len(self._calls),
+                'waiting': self._waiting,
+                'timeouts': self._timeouts,
+                'errors': self._errors
+            }
+    
+    def reset_stats(self) -> None:
+        """Reset counters (in-flight calls are unaffected)"""
+        with self._lock:
+            self._executions = 0
+            self._coalesced = 0
+            self._timeouts = 0
+            self._errors = 0
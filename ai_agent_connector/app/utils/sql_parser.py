@@ -3,7 +3,9 @@ SQL query parser utilities for extracting table and dataset names
 """
 
 import re
-from typing import List, Set, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Set, Optional, Tuple, Union
 from enum import Enum
 
 
@@ -16,7 +18,228 @@ class QueryType(Enum):
     UNKNOWN = "UNKNOWN"
 
 
-def extract_tables_from_query(query: str) -> Set[str]:
+# Number of distinct query texts kept in the parse cache
+PARSE_CACHE_SIZE = 4096
+
+_IDENTIFIER = r'[a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?'
+
+_QUERY_TYPE_RE = re.compile(r'^\s*(SELECT|INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+_WITH_RE = re.compile(r'^\s*WITH\b', re.IGNORECASE)
+
+# Single scan over the normalized query: table references, CTE names and subqueries
+_SCAN_RE = re.compile(
+    rf'(?P<table>\b(?P<verb>INSERT\s+INTO|DELETE\s+FROM|FROM|JOIN|UPDATE)\s+(?P<table_name>{_IDENTIFIER}))'
+    rf'|(?P<cte>(?:\bWITH(?:\s+RECURSIVE)?|,)\s*(?P<cte_name>{_IDENTIFIER})\s+AS\s*\()'
+    r'|(?P<subquery>\(\s*SELECT\b)',
+    re.IGNORECASE
+)
+
+# String and numeric literals, replaced by '?' in statement fingerprints
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# One pass over the raw query: literals and quoted identifiers are kept
+# verbatim, so comment markers and whitespace inside them are not touched
+_TOKEN_RE = re.compile(
+    rf'(?P<literal>{_LITERAL_RE.pattern})'
+    r'|(?P<quoted>"[^"]*")'
+    r'|(?P<comment>--[^\n]*|/\*.*?\*/)'
+    r'|(?P<space>\s+)',
+    re.DOTALL
+)
+
+
+@dataclass(frozen=True)
+class ParsedQuery:
+    """
+    Result of a single parsing pass over a SQL query.
+    
+    Instances are immutable and memoized per query text by parse_query(),
+    so one object can be shared by routing, permission checks and OntoGuard
+    validation for a request.
+    
+    Attributes:
+        text: Original query text
+        normalized: Query with comments removed and whitespace collapsed
+            (outside string literals)
+        query_type: Operation type of the leading statement
+        tables: Referenced tables in order of first appearance (lowercase),
+            excluding references to a CTE made outside that CTE's own body
+        ctes: Names defined in WITH clauses (lowercase)
+        subquery_count: Number of parenthesized SELECT subqueries
+        fingerprint: Normalized query with literals replaced by '?'
+        literals: (offset in fingerprint, literal text exactly as written)
+            for each replaced literal; together with the fingerprint it
+            identifies the query
+    """
+    text: str
+    normalized: str
+    query_type: QueryType
+    tables: Tuple[str, ...]
+    ctes: Tuple[str, ...] = ()
+    subquery_count: int = 0
+    fingerprint: str = ''
+    literals: Tuple[Tuple[int, str], ...] = ()
+    
+    @property
+    def table_set(self) -> Set[str]:
+        """Referenced tables as a new set"""
+        return set(self.tables)
+    
+    @property
+    def requires_write(self) -> bool:
+        """True if the query modifies data"""
+        return self.query_type in (QueryType.INSERT, QueryType.UPDATE, QueryType.DELETE)
+    
+    @property
+    def requires_read(self) -> bool:
+        """True if the query only reads data"""
+        return self.query_type == QueryType.SELECT
+
+
+_EMPTY_QUERY = ParsedQuery(text='', normalized='', query_type=QueryType.UNKNOWN, tables=())
+
+
+def parse_query(query: Union[str, ParsedQuery, None]) -> ParsedQuery:
+    """
+    Parse a SQL query once, returning a memoized ParsedQuery.
+    
+    Args:
+        query: SQL query string (an existing ParsedQuery is returned as-is)
+        
+    Returns:
+        ParsedQuery: Parsed query (an empty UNKNOWN query for invalid input)
+    """
+    if isinstance(query, ParsedQuery):
+        return query
+    if not query or not isinstance(query, str):
+        return _EMPTY_QUERY
+    return _parse_cached(query)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_cached(query: str) -> ParsedQuery:
+    """Parse a query string (memoized by text)"""
+    normalized, fingerprint, literals = _scan_text(query)
+    
+    type_match = _QUERY_TYPE_RE.match(normalized)
+    query_type = QueryType(type_match.group(1).upper()) if type_match else QueryType.UNKNOWN
+    
+    references: List[Tuple[int, str]] = []
+    write_verbs: List[str] = []
+    cte_bodies: Dict[str, Tuple[int, int]] = {}
+    last_body_end = None
+    subquery_count = 0
+    for match in _SCAN_RE.finditer(normalized):
+        if match.group('table_name'):
+            references.append((match.start(), match.group('table_name').lower()))
+            verb = match.group('verb').split()[0].upper()
+            if verb != 'FROM' and verb != 'JOIN':
+                write_verbs.append(verb)
+        elif match.group('cte_name'):
+            # ', name AS (' only continues a WITH list right after the previous body
+            if not match.group('cte').lstrip().upper().startswith('WITH') and (
+                last_body_end is None or normalized[last_body_end + 1:match.start()].strip()
+            ):
+                continue
+            cte = match.group('cte_name').lower()
+            last_body_end = _closing_paren(normalized, match.end())
+            if cte not in cte_bodies:
+                cte_bodies[cte] = (match.end(), last_body_end)
+        else:
+            subquery_count += 1
+    
+    # A CTE name only shadows a table outside the CTE's own body; inside it
+    # (e.g. WITH payroll AS (SELECT * FROM payroll)) it is the real table
+    tables: List[str] = []
+    for position, table in references:
+        body = cte_bodies.get(table)
+        if body is not None and not body[0] <= position < body[1]:
+            continue
+        if table not in tables:
+            tables.append(table)
+    
+    # Data-modifying CTEs make the whole statement a write
+    if query_type == QueryType.UNKNOWN and write_verbs and _WITH_RE.match(normalized):
+        query_type = QueryType(write_verbs[0])
+    
+    return ParsedQuery(
+        text=query,
+        normalized=normalized,
+        query_type=query_type,
+        tables=tuple(tables),
+        ctes=tuple(cte_bodies),
+        subquery_count=subquery_count,
+        fingerprint=fingerprint,
+        literals=literals
+    )
+
+
+def _closing_paren(text: str, start: int) -> int:
+    """Offset of the parenthesis closing the one opened just before start"""
+    depth = 1
+    in_string = False
+    for position in range(start, len(text)):
+        char = text[position]
+        if char == "'":
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return position
+    return len(text)
+
+
+def _scan_text(query: str) -> Tuple[str, str, Tuple[Tuple[int, str], ...]]:
+    """
+    Normalize a raw query and fingerprint it in the same pass.
+    
+    Args:
+        query: Raw SQL query
+        
+    Returns:
+        (normalized query, fingerprint, literals), where literals are taken
+        from the raw text before comments or whitespace are touched
+    """
+    normalized: List[str] = []
+    fingerprint: List[str] = []
+    literals: List[Tuple[int, str]] = []
+    length = 0
+    last = 0
+    
+    def append(text: str, placeholder: Optional[str] = None) -> None:
+        nonlocal length
+        normalized.append(text)
+        fingerprint.append(text if placeholder is None else placeholder)
+        length += len(fingerprint[-1])
+    
+    for match in _TOKEN_RE.finditer(query):
+        if match.start() > last:
+            append(query[last:match.start()])
+        last = match.end()
+        kind = match.lastgroup
+        if kind == 'literal':
+            literals.append((length, match.group(0)))
+            append(match.group(0), '?')
+        elif kind == 'quoted':
+            append(match.group(0))
+        elif kind == 'space' and fingerprint and not fingerprint[-1].endswith(' '):
+            append(' ')
+    if last < len(query):
+        append(query[last:])
+    
+    return ''.join(normalized).strip(), ''.join(fingerprint).strip(), tuple(literals)
+
+
+def clear_parse_cache() -> None:
+    """Clear the memoized parse results (useful for testing)"""
+    _parse_cached.cache_clear()
+
+
+def extract_tables_from_query(query: Union[str, ParsedQuery]) -> Set[str]:
     """
     Extract table/dataset names from a SQL query.
     
@@ -28,140 +251,67 @@ def extract_tables_from_query(query: str) -> Set[str]:
     - DELETE FROM table
     - JOIN operations
     
+    Names defined by CTEs (WITH name AS (...)) are not reported as tables,
+    except where they appear inside the CTE's own body.
+    
     Args:
-        query: SQL query string
+        query: SQL query string or ParsedQuery
         
     Returns:
         Set[str]: Set of table identifiers (e.g., 'table', 'schema.table')
     """
-    if not query or not isinstance(query, str):
-        return set()
-    
-    # Normalize query - remove comments and extra whitespace
-    normalized = _normalize_query(query)
-    
-    tables = set()
-    
-    # Extract FROM clauses
-    from_pattern = r'\bFROM\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-    from_matches = re.finditer(from_pattern, normalized, re.IGNORECASE)
-    for match in from_matches:
-        table = match.group(1).strip()
-        if table:
-            tables.add(table.lower())
-    
-    # Extract JOIN clauses
-    join_pattern = r'\bJOIN\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-    join_matches = re.finditer(join_pattern, normalized, re.IGNORECASE)
-    for match in join_matches:
-        table = match.group(1).strip()
-        if table:
-            tables.add(table.lower())
-    
-    # Extract INSERT INTO
-    insert_pattern = r'\bINSERT\s+INTO\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-    insert_matches = re.finditer(insert_pattern, normalized, re.IGNORECASE)
-    for match in insert_matches:
-        table = match.group(1).strip()
-        if table:
-            tables.add(table.lower())
-    
-    # Extract UPDATE
-    update_pattern = r'\bUPDATE\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-    update_matches = re.finditer(update_pattern, normalized, re.IGNORECASE)
-    for match in update_matches:
-        table = match.group(1).strip()
-        if table:
-            tables.add(table.lower())
-    
-    # Extract DELETE FROM
-    delete_pattern = r'\bDELETE\s+FROM\s+([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)?)'
-    delete_matches = re.finditer(delete_pattern, normalized, re.IGNORECASE)
-    for match in delete_matches:
-        table = match.group(1).strip()
-        if table:
-            tables.add(table.lower())
-    
-    return tables
-
-
-def get_query_type(query: str) -> QueryType:
+    return parse_query(query).table_set
+
+
+def get_query_type(query: Union[str, ParsedQuery]) -> QueryType:
     """
     Determine the type of SQL query.
     
     Args:
-        query: SQL query string
+        query: SQL query string or ParsedQuery
         
     Returns:
         QueryType: Type of query operation
     """
-    if not query or not isinstance(query, str):
-        return QueryType.UNKNOWN
-    
-    normalized = _normalize_query(query)
-    
-    if re.match(r'^\s*SELECT\b', normalized, re.IGNORECASE):
-        return QueryType.SELECT
-    elif re.match(r'^\s*INSERT\b', normalized, re.IGNORECASE):
-        return QueryType.INSERT
-    elif re.match(r'^\s*UPDATE\b', normalized, re.IGNORECASE):
-        return QueryType.UPDATE
-    elif re.match(r'^\s*DELETE\b', normalized, re.IGNORECASE):
-        return QueryType.DELETE
-    
-    return QueryType.UNKNOWN
+    return parse_query(query).query_type
 
 
 def _normalize_query(query: str) -> str:
     """
     Normalize SQL query by removing comments and extra whitespace.
     
+    String literals and quoted identifiers are left as written.
+    
     Args:
         query: Raw SQL query
         
     Returns:
         str: Normalized query
     """
-    # Remove single-line comments
-    query = re.sub(r'--.*$', '', query, flags=re.MULTILINE)
-    
-    # Remove multi-line comments
-    query = re.sub(r'/\*.*?\*/', '', query, flags=re.DOTALL)
-    
-    # Normalize whitespace
-    query = re.sub(r'\s+', ' ', query)
-    
-    return query.strip()
+    return _scan_text(query)[0]
 
 
-def requires_write_permission(query: str) -> bool:
+def requires_write_permission(query: Union[str, ParsedQuery]) -> bool:
     """
     Check if a query requires write permission.
     
     Args:
-        query: SQL query string
+        query: SQL query string or ParsedQuery
         
     Returns:
         bool: True if query requires write permission
     """
-    query_type = get_query_type(query)
-    return query_type in (QueryType.INSERT, QueryType.UPDATE, QueryType.DELETE)
+    return parse_query(query).requires_write
 
 
-def requires_read_permission(query: str) -> bool:
+def requires_read_permission(query: Union[str, ParsedQuery]) -> bool:
     """
     Check if a query requires read permission.
     
     Args:
-        query: SQL query string
+        query: SQL query string or ParsedQuery
         
     Returns:
         bool: True if query requires read permission
     """
-    return get_query_type(query) == QueryType.SELECT
-
-
-
-
-
-
+    return parse_query(query).requires_read
@@ -0,0 +1,266 @@
+"""
+Natural language to SQL translation cache
+Repeat questions against the same database reuse the SQL generated the first
+time instead of paying for another LLM round trip. Entries are keyed by the
+normalized question, database type, model and schema catalog version, so a
+schema change never serves SQL written for the old schema. Near-identical
+questions can optionally match through sentence-vector similarity.
+"""
+
+import copy
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from .cost_tracker import CostRecord
+from .schema_retrieval import STOPWORDS, Embedder, cosine_similarity, get_default_embedder
+
+
+# Quoted literals usually end up in the SQL verbatim
+_QUOTED_RE = re.compile(r"('[^']*'|\"[^\"]*\")")
+_NUMBER_RE = re.compile(r'\d+(?:\.\d+)?')
+# Words with a capital letter (names such as John Doe end up in the SQL too)
+_CAPITALIZED_RE = re.compile(r"\b\w*[A-Z][\w'-]*")
+
+
+def normalize_question(question: str) -> str:
+    """
+    Normalize a question for cache lookup.
+    
+    Whitespace is folded and trailing punctuation dropped. Case is kept,
+    since unquoted names ("patients named John Doe") are compared
+    case-sensitively in the generated SQL; only a leading command or
+    question word ("Show", "List", "How") is lowercased.
+    
+    Args:
+        question: Natural language question
+    
+    Returns:
+        Normalized question
+    """
+    text = ' '.join(question.split()).rstrip('?!. ')
+    first, _, rest = text.partition(' ')
+    if first.lower() in STOPWORDS:
+        text = f"{first.lower()} {rest}" if rest else first.lower()
+    return text
+
+
+def _literals(question: str) -> Tuple[str, ...]:
+    """
+    Quoted strings, numbers and capitalized words of a question, which a
+    similar question must repeat.
+    """
+    unquoted = _QUOTED_RE.sub(' ', normalize_question(question))
+    return (
+        tuple(_QUOTED_RE.findall(question))
+        + tuple(_NUMBER_RE.findall(unquoted))
+        + tuple(_CAPITALIZED_RE.findall(unquoted))
+    )
+
+
+@dataclass
+class TranslationEntry:
+    """A cached NL-to-SQL translation"""
+    question: str
+    result: Dict[str, Any]
+    cost_record: Optional[CostRecord]
+    created_at: float
+    literals: Tuple[str, ...] = ()
+    vector: Optional[Sequence[float]] = None
+    hit_count: int = 0
+
+
+class TranslationCache:
+    """
+    LRU cache of NL-to-SQL translations.
+    
+    Exact lookups match on the normalized question. When a similarity
+    threshold and an embedder are configured, a miss falls back to the
+    most similar cached question of the same database type, model and
+    schema version, provided both questions contain the same literals
+    (quoted strings, numbers and capitalized words).
+    """
+    
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 86400.0,
+        similarity_threshold: Optional[float] = None,
+        embedder: Optional[Embedder] = None
+    ):
+        """
+        Initialize the translation cache.
+        
+        Args:
+            max_entries: Maximum cached translations
+            ttl_seconds: Seconds a translation is served
+            similarity_threshold: Minimum cosine similarity for a near-identical
+                match (None disables similarity matching)
+            embedder: Sentence embedding function (default: the local model named
+                by SCHEMA_EMBEDDING_MODEL, if set and installed)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.embedder = embedder
+        self._entries: 'OrderedDict[Tuple[str, str, str, str], TranslationEntry]' = OrderedDict()
+        self._scopes: Dict[Tuple[str, str, str], Dict[str, TranslationEntry]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._similar_hits = 0
+        self._misses = 0
+    
+    def _embedder(self) -> Optional[Embedder]:
+        if self.similarity_threshold is None:
+            return None
+        return self.embedder or get_default_embedder()
+    
+    def _remove(self, key: Tuple[str, str, str, str]) -> None:
+        self._entries.pop(key, None)
+        scope = self._scopes.get(key[:3])
+        if scope is not None:
+            scope.pop(key[3], None)
+            if not scope:
+                del self._scopes[key[:3]]
+    
+    def get(
+        self,
+        question: str,
+        database_type: str,
+        model: str,
+        schema_version: str
+    ) -> Optional[TranslationEntry]:
+        """
+        Look up a cached translation.
+        
+        Args:
+            question: Natural language question
+            database_type: Database type the SQL was generated for
+            model: LLM model that generated it
+            schema_version: Schema catalog version
+        
+        Returns:
+            TranslationEntry or None
+        """
+        normalized = normalize_question(question)
+        scope_key = (database_type.lower(), model, schema_version)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(scope_key + (normalized,))
+            if entry is not None and now - entry.created_at >= self.ttl_seconds:
+                self._remove(scope_key + (normalized,))
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(scope_key + (normalized,))
+                entry.hit_count += 1
+                self._hits += 1
+                return entry
+            candidates = list(self._scopes.get(scope_key, {}).values())
+        
+        embedder = self._embedder()
+        if embedder is not None and candidates:
+            literals = _literals(question)
+            candidates = [
+                c for c in candidates
+                if c.vector is not None and c.literals == literals and now - c.created_at < self.ttl_seconds
+            ]
+            if candidates:
+                vector = embedder([normalized])[0]
+                similarity, best = max(
+                    ((cosine_similarity(vector, c.vector), c) for c in candidates),
+                    key=lambda pair: pair[0]
+                )
+                if similarity >= self.similarity_threshold:
+                    with self._lock:
+                        best.hit_count += 1
+                        self._hits += 1
+                        self._similar_hits += 1
+                    return best
+        
+        with self._lock:
+            self._misses += 1
+        return None
+    
+    def set(
+        self,
+        question: str,
+        database_type: str,
+        model: str,
+        schema_version: str,
+        result: Dict[str, Any],
+        cost_record: Optional[CostRecord] = None
+    ) -> None:
+        """
+        Cache a translation.
+        
+        Args:
+            question: Natural language question
+            database_type: Database type the SQL was generated for
+            model: LLM model that generated it
+            schema_version: Schema catalog version
+            result: convert_to_sql result
+            cost_record: Cost record of the LLM call that produced it
+        """
+        normalized = normalize_question(question)
+        embedder = self._embedder()
+        entry = TranslationEntry(
+            question=normalized,
+            result=copy.deepcopy(result),
+            cost_record=cost_record,
+            created_at=time.time(),
+            literals=_literals(question),
+            vector=embedder([normalized])[0] if embedder is not None else None
+        )
+        scope_key = (database_type.lower(), model, schema_version)
+        key = scope_key + (normalized,)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._scopes.setdefault(scope_key, {})[normalized] = entry
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+    
+    def clear(self) -> None:
+        """Remove all cached translations."""
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get translation cache statistics.
+        
+        Returns:
+            Dict with entry count, hits (and similarity hits), misses and hit rate
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'similar_hits': self._similar_hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups * 100, 2) if lookups else 0.0
+            }
+
+
+# Global translation cache instance
+_translation_cache: Optional[TranslationCache] = None
+
+
+def get_translation_cache() -> TranslationCache:
+    """
+    Get or create the global translation cache.
+    
+    Similarity matching is enabled by setting NL_SQL_SIMILARITY_THRESHOLD
+    (e.g. 0.95) together with SCHEMA_EMBEDDING_MODEL.
+    """
+    global _translation_cache
+    if _translation_cache is None:
+        threshold = os.getenv('NL_SQL_SIMILARITY_THRESHOLD')
+        _translation_cache = TranslationCache(similarity_threshold=float(threshold) if threshold else None)
+    return _translation_cache
@@ -40,15 +40,13 @@ from flask_socketio import SocketIO, emit, join_room, leave_room
 from ..config.domains import (
     get_domain_config,
     get_entity_from_table,
-    get_ontology_path,
     is_valid_role,
-    detect_domain_from_ontology,
     DEFAULT_DOMAIN,
 )
 
 logger = logging.getLogger(__name__)
 
-# Current domain for WebSocket session
+# Domain for requests that do not name one
 _current_domain: str = DEFAULT_DOMAIN
 
 # Global SocketIO instance
@@ -106,45 +104,34 @@ def _validate_role_for_domain(role: str, domain: str) -> Optional[str]:
     return None
 
 
-def _switch_ontology_if_needed(domain: str) -> bool:
+def _load_domain(domain: str) -> bool:
     """
-    Switch OntoGuard ontology if domain changed.
+    Make sure the adapter has a validator for a domain.
+
+    Validators are loaded once per domain and picked per request, so this
+    never re-initializes the shared adapter.
 
     Args:
         domain: Target domain
 
     Returns:
-        True if switch was successful or not needed
+        True if requests for the domain can be validated
     """
-    global _current_domain
-
-    if domain == _current_domain:
-        return True
-
-    ontology_path = get_ontology_path(domain)
-    if not ontology_path:
-        logger.warning(f"No ontology path found for domain '{domain}'")
-        return False
-
     try:
         from ..security import get_ontoguard_adapter
 
-        adapter = get_ontoguard_adapter()
-        if adapter.initialize([ontology_path]):
-            _current_domain = domain
-            logger.info(f"Switched OntoGuard to domain '{domain}' with ontology: {ontology_path}")
+        if get_ontoguard_adapter().load_domain(domain):
             return True
-        else:
-            logger.error(f"Failed to switch to domain '{domain}'")
-            return False
+        logger.error(f"Failed to load ontology for domain '{domain}'")
+        return False
 
     except Exception as e:
-        logger.error(f"Error switching ontology: {e}")
+        logger.error(f"Error loading ontology for domain '{domain}': {e}")
         return False
 
 
 def get_current_domain() -> str:
-    """Get current active domain."""
+    """Get the domain used for requests that do not name one."""
     return _current_domain
 
 
@@ -299,14 +286,14 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
             context = data.get('context', {})
             request_id = data.get('request_id')
 
-            # Get domain from context or use current
+            # Get domain from context or use the default
             domain = context.get('domain') or data.get('domain') or _current_domain
+            context = {**context, 'domain': domain}
 
-            # Switch ontology if domain changed
-            if not _switch_ontology_if_needed(domain):
+            if not _load_domain(domain):
                 emit('error', {
                     'code': 'DOMAIN_SWITCH_FAILED',
-                    'message': f"Failed to switch to domain '{domain}'",
+                    'message': f"Failed to load domain '{domain}'",
                     'request_id': request_id
                 })
                 return
@@ -397,8 +384,8 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
             request_id = data.get('request_id')
             domain = data.get('domain') or _current_domain
 
-            # Switch ontology if needed
-            _switch_ontology_if_needed(domain)
+            # Warm the domain's validator if needed
+            _load_domain(domain)
 
             # Resolve entity type
             entity_type = _resolve_entity_type(data)
@@ -423,7 +410,7 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
                 return
 
             adapter = get_ontoguard_adapter()
-            allowed = adapter.check_permissions(role, action, entity_type)
+            allowed = adapter.check_permissions(role, action, entity_type, domain=domain)
 
             response = {
                 'allowed': allowed,
@@ -467,8 +454,8 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
             request_id = data.get('request_id')
             domain = data.get('domain') or _current_domain
 
-            # Switch ontology if needed
-            _switch_ontology_if_needed(domain)
+            # Warm the domain's validator if needed
+            _load_domain(domain)
 
             # Resolve entity type
             entity_type = _resolve_entity_type(data)
@@ -482,7 +469,7 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
                 return
 
             adapter = get_ontoguard_adapter()
-            actions = adapter.get_allowed_actions(role, entity_type)
+            actions = adapter.get_allowed_actions(role, entity_type, domain=domain)
 
             response = {
                 'role': role,
@@ -528,12 +515,12 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
             context = data.get('context', {})
             request_id = data.get('request_id')
             domain = context.get('domain') or data.get('domain') or _current_domain
+            context = {**context, 'domain': domain}
 
-            # Switch ontology if needed
-            if not _switch_ontology_if_needed(domain):
+            if not _load_domain(domain):
                 emit('error', {
                     'code': 'DOMAIN_SWITCH_FAILED',
-                    'message': f"Failed to switch to domain '{domain}'",
+                    'message': f"Failed to load domain '{domain}'",
                     'request_id': request_id
                 })
                 return
@@ -617,7 +604,8 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
 
             adapter = get_ontoguard_adapter()
             results = []
-            current_batch_domain = default_domain
+            batch = []
+            loaded_domains: Dict[str, bool] = {}
 
             for i, validation in enumerate(validations):
                 action = validation.get('action')
@@ -625,16 +613,16 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
 
                 # Get domain for this validation (context overrides default)
                 item_domain = context.get('domain') or validation.get('domain') or default_domain
+                context = {**context, 'domain': item_domain}
 
-                # Switch ontology if domain changed
-                if item_domain != current_batch_domain:
-                    if not _switch_ontology_if_needed(item_domain):
-                        results.append({
-                            'index': i,
-                            'error': f"Failed to switch to domain '{item_domain}'"
-                        })
-                        continue
-                    current_batch_domain = item_domain
+                if item_domain not in loaded_domains:
+                    loaded_domains[item_domain] = _load_domain(item_domain)
+                if not loaded_domains[item_domain]:
+                    results.append({
+                        'index': i,
+                        'error': f"Failed to load domain '{item_domain}'"
+                    })
+                    continue
 
                 # Resolve entity type (supports table-to-entity mapping)
                 entity_type = _resolve_entity_type(validation)
@@ -657,13 +645,19 @@ def register_websocket_handlers(socketio: SocketIO) -> None:
                     })
                     continue
 
-                result = adapter.validate_action(action, entity_type, context)
                 results.append({
                     'index': i,
                     'action': action,
                     'entity_type': entity_type,
                     'domain': item_domain,
-                    'role': role,
+                    'role': role
+                })
+                batch.append({'action': action, 'entity_type': entity_type, 'context': context})
+
+            # Every well-formed item is answered by one adapter call
+            entries = [r for r in results if 'error' not in r]
+            for entry, result in zip(entries, adapter.validate_actions(batch)):
+                entry.update({
                     'allowed': result.allowed,
                     'reason': result.reason,
                     'constraints': result.constraints,
@@ -11,10 +11,12 @@ import asyncio
 import hashlib
 import json
 import logging
+import time
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from collections import defaultdict
+
+from ai_agent_connector.app.utils.rate_limiter import LimiterEngine
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -55,8 +57,8 @@ class PolicyEngine:
         self.max_calls_per_hour = max_calls_per_hour
         self.max_complexity_score = max_complexity_score
         
-        # Rate limiting: user_id -> list of timestamps
-        self._rate_limit_timestamps: Dict[str, List[datetime]] = defaultdict(list)
+        # Rate limiting: per-user GCRA state, shared engine with RateLimiter
+        self._rate_limiter = LimiterEngine()
         
         # RLS mapping: user_id -> list of allowed tenant_ids
         self._user_tenants: Dict[str, List[str]] = {
@@ -155,30 +157,24 @@ class PolicyEngine:
         Returns:
             ValidationResult
         """
-        now = datetime.utcnow()
-        hour_ago = now - timedelta(hours=1)
-        
-        # Clean old timestamps
-        user_timestamps = self._rate_limit_timestamps[user_id]
-        user_timestamps[:] = [ts for ts in user_timestamps if ts > hour_ago]
+        now = time.time()
+        decision = self._rate_limiter.acquire(user_id, [(self.max_calls_per_hour, 3600.0)], now=now)
+        call_count = decision.used[0]
         
         # Check limit
-        call_count = len(user_timestamps)
-        if call_count >= self.max_calls_per_hour:
+        if not decision.allowed:
+            retry_at = datetime.utcfromtimestamp(now + decision.retry_after)
             return ValidationResult(
                 is_allowed=False,
                 reason=f"Rate limit exceeded: {call_count}/{self.max_calls_per_hour} calls per hour",
                 suggestions=[
-                    f"Wait until {(user_timestamps[0] + timedelta(hours=1)).isoformat()} to retry",
+                    f"Wait until {retry_at.isoformat()} to retry",
                     "Contact administrator to request higher rate limit"
                 ],
                 failed_policy="rate_limit",
                 metadata={"call_count": call_count, "limit": self.max_calls_per_hour}
             )
         
-        # Record this call
-        user_timestamps.append(now)
-        
         return ValidationResult(
             is_allowed=True,
             reason="Rate limit check passed",
@@ -540,6 +536,7 @@ class ExtendedPolicyEngine(PolicyEngine):
         self._ontoguard_validator = OntoGuardValidator() if enable_ontoguard else None
         self._schema_drift_detector = None
         self._schema_bindings_path = schema_bindings_path
+        self._drift_status_table = None
 
         if schema_bindings_path:
             self._init_schema_drift(schema_bindings_path)
@@ -571,7 +568,7 @@ class ExtendedPolicyEngine(PolicyEngine):
 
         # Schema drift check (if detector configured and query has schema info)
         if self._schema_drift_detector:
-            drift_result = self._check_schema_drift(arguments)
+            drift_result = self._check_schema_drift(arguments, user_id)
             if drift_result and not drift_result.is_allowed:
                 return drift_result
 
@@ -601,30 +598,47 @@ class ExtendedPolicyEngine(PolicyEngine):
         return base_result
 
     def _init_schema_drift(self, config_path: str) -> None:
-        """Initialize schema drift detector from config."""
+        """
+        Load bindings into the shared schema drift detector, so approvals made
+        through the REST endpoints apply to this engine's checks.
+        """
         try:
-            from ai_agent_connector.app.security.schema_drift import SchemaDriftDetector
-            self._schema_drift_detector = SchemaDriftDetector()
+            from ai_agent_connector.app.security.drift_watcher import get_drift_status_table
+            from ai_agent_connector.app.security.schema_drift import get_schema_drift_detector
+            self._schema_drift_detector = get_schema_drift_detector()
+            self._drift_status_table = get_drift_status_table()
             count = self._schema_drift_detector.load_bindings(config_path)
             logger.info("Schema drift detector initialized with %d bindings", count)
         except Exception as e:
             logger.warning("Failed to initialize schema drift detector: %s", e)
             self._schema_drift_detector = None
 
-    def _check_schema_drift(self, arguments: Dict[str, Any]) -> Optional[ValidationResult]:
+    def _check_schema_drift(
+        self,
+        arguments: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> Optional[ValidationResult]:
         """
         Check schema drift for entities referenced in the query.
 
         Only blocks on CRITICAL severity (missing columns).
         WARNING severity is logged but allowed.
         CRITICAL severity triggers an alert via the alerting system.
+
+        Without ``current_schema`` in the arguments, the status the
+        background drift watcher recorded for the caller's database (the
+        ``agent_id`` argument, else the user ID) is used instead (a dict
+        lookup).
         """
         entity_type = self._extract_entity_type(arguments)
         current_schema = arguments.get("current_schema")
 
-        if not current_schema or not entity_type:
+        if not entity_type:
             return None
 
+        if not current_schema:
+            return self._check_watched_drift(entity_type, arguments.get("agent_id") or user_id)
+
         report = self._schema_drift_detector.detect_drift(entity_type, current_schema)
 
         if report.severity == "CRITICAL":
@@ -646,6 +660,24 @@ class ExtendedPolicyEngine(PolicyEngine):
 
         return None
 
+    def _check_watched_drift(self, entity_type: str, scope: Optional[str]) -> Optional[ValidationResult]:
+        """Block on CRITICAL drift the background watcher has recorded for an entity in a database."""
+        if not self._drift_status_table or not scope:
+            return None
+        status = self._drift_status_table.get(scope, entity_type)
+        if status is None or status.severity != "CRITICAL":
+            return None
+        if self._schema_drift_detector.is_approved(entity_type):
+            return None
+
+        return ValidationResult(
+            is_allowed=False,
+            reason=f"Schema drift detected: {status.report.message}",
+            suggestions=[f.description for f in status.fixes],
+            failed_policy="schema_drift",
+            metadata=status.report.to_dict(),
+        )
+
     def _send_schema_drift_alert(self, report, fixes: List) -> None:
         """Send alert via alerting system and WebSocket for CRITICAL schema drift."""
         # Send WebSocket real-time event
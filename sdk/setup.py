@@ -41,6 +41,9 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "arrow": [
+            "pyarrow>=14.0.0",
+        ],
     },
     include_package_data=True,
     zip_safe=False,
@@ -295,6 +295,62 @@ class TestQueryExecution:
             assert "data" in result
             assert len(result["data"]) == 1
     
+    def test_execute_query_arrow_format(self, client):
+        """Test Arrow IPC results decode to a pyarrow.Table"""
+        pa = pytest.importorskip("pyarrow")
+        table = pa.table({"id": [1, 2], "name": ["a", "b"]})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "application/vnd.apache.arrow.stream"}
+        mock_response.content = sink.getvalue().to_pybytes()
+        
+        with patch.object(client.session, 'post', return_value=mock_response) as post:
+            result = client.execute_query("test-agent", "SELECT * FROM users", format="arrow")
+            assert result.equals(table)
+            assert post.call_args.kwargs["headers"]["Accept"] == "application/vnd.apache.arrow.stream"
+    
+    def test_execute_query_parquet_format(self, client):
+        """Test Parquet results decode to a pyarrow.Table"""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        table = pa.table({"id": [1, 2]})
+        sink = pa.BufferOutputStream()
+        pq.write_table(table, sink)
+        
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "application/vnd.apache.parquet"}
+        mock_response.content = sink.getvalue().to_pybytes()
+        
+        with patch.object(client.session, 'post', return_value=mock_response):
+            result = client.execute_query("test-agent", "SELECT * FROM users", format="parquet")
+            assert result.equals(table)
+    
+    def test_execute_query_arrow_format_write_returns_json(self, client):
+        """Test that non-SELECT statements asked for as Arrow return the JSON result"""
+        pytest.importorskip("pyarrow")
+        mock_response = Mock()
+        mock_response.ok = True
+        mock_response.status_code = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.json.return_value = {"success": True, "data": None}
+        mock_response.content = b'{"success": true, "data": null}'
+        
+        with patch.object(client.session, 'post', return_value=mock_response):
+            result = client.execute_query("test-agent", "UPDATE users SET name = 'x'", format="arrow")
+            assert result == {"success": True, "data": None}
+    
+    def test_execute_query_invalid_format(self, client):
+        """Test unknown result formats are rejected"""
+        with pytest.raises(ValueError):
+            client.execute_query("test-agent", "SELECT 1", format="xml")
+    
     def test_execute_natural_language_query(self, client):
         """Test natural language query"""
         mock_response = Mock()
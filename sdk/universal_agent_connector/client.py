@@ -16,6 +16,12 @@ from .exceptions import (
 )
 
 
+COLUMNAR_MIME_TYPES = {
+    'arrow': 'application/vnd.apache.arrow.stream',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
 class UniversalAgentConnector:
     """
     Python SDK client for Universal Agent Connector API.
@@ -98,38 +104,7 @@ class UniversalAgentConnector:
                 **kwargs
             )
             
-            # Handle errors
-            if response.status_code == 401:
-                raise AuthenticationError(
-                    "Authentication failed. Check your API key.",
-                    status_code=401,
-                    response=response.json() if response.content else {}
-                )
-            elif response.status_code == 404:
-                raise NotFoundError(
-                    response.json().get('message', 'Resource not found'),
-                    status_code=404,
-                    response=response.json() if response.content else {}
-                )
-            elif response.status_code == 400:
-                raise ValidationError(
-                    response.json().get('message', 'Validation error'),
-                    status_code=400,
-                    response=response.json() if response.content else {}
-                )
-            elif response.status_code == 429:
-                raise RateLimitError(
-                    "Rate limit exceeded",
-                    status_code=429,
-                    response=response.json() if response.content else {}
-                )
-            elif not response.ok:
-                error_data = response.json() if response.content else {}
-                raise APIError(
-                    error_data.get('message', f'API error: {response.status_code}'),
-                    status_code=response.status_code,
-                    response=error_data
-                )
+            self._raise_for_status(response)
             
             # Return JSON response
             if response.content:
@@ -139,6 +114,48 @@ class UniversalAgentConnector:
         except requests.exceptions.RequestException as e:
             raise ConnectionError(f"Connection failed: {str(e)}") from e
     
+    def _raise_for_status(self, response: requests.Response) -> None:
+        """
+        Raise the SDK exception matching an error response.
+        
+        Args:
+            response: HTTP response from the API
+            
+        Raises:
+            APIError: If the response status is not successful
+        """
+        if response.status_code == 401:
+            raise AuthenticationError(
+                "Authentication failed. Check your API key.",
+                status_code=401,
+                response=response.json() if response.content else {}
+            )
+        elif response.status_code == 404:
+            raise NotFoundError(
+                response.json().get('message', 'Resource not found'),
+                status_code=404,
+                response=response.json() if response.content else {}
+            )
+        elif response.status_code == 400:
+            raise ValidationError(
+                response.json().get('message', 'Validation error'),
+                status_code=400,
+                response=response.json() if response.content else {}
+            )
+        elif response.status_code == 429:
+            raise RateLimitError(
+                "Rate limit exceeded",
+                status_code=429,
+                response=response.json() if response.content else {}
+            )
+        elif not response.ok:
+            error_data = response.json() if response.content else {}
+            raise APIError(
+                error_data.get('message', f'API error: {response.status_code}'),
+                status_code=response.status_code,
+                response=error_data
+            )
+    
     # ============================================================================
     # Health & Info
     # ============================================================================
@@ -263,8 +280,9 @@ class UniversalAgentConnector:
         agent_id: str,
         query: str,
         params: Optional[Dict] = None,
-        fetch: bool = True
-    ) -> Dict[str, Any]:
+        fetch: bool = True,
+        format: str = 'json'
+    ) -> Union[Dict[str, Any], Any]:
         """
         Execute a SQL query.
         
@@ -273,15 +291,80 @@ class UniversalAgentConnector:
             query: SQL query string
             params: Optional query parameters
             fetch: Whether to fetch results (default: True)
+            format: 'json' (default), or 'arrow' / 'parquet' to receive a
+                SELECT result as a pyarrow.Table (requires pyarrow)
             
         Returns:
-            Query results
+            Query results, or a pyarrow.Table for SELECT statements in the
+            columnar formats (other statements still return the JSON result)
         """
         data = {'query': query, 'fetch': fetch}
         if params:
             data['params'] = params
         
-        return self._request('POST', f'/agents/{agent_id}/query', json_data=data)
+        if format == 'json':
+            return self._request('POST', f'/agents/{agent_id}/query', json_data=data)
+        if format not in COLUMNAR_MIME_TYPES:
+            raise ValueError(f"format must be one of: json, {', '.join(COLUMNAR_MIME_TYPES)}")
+        
+        return self._request_arrow(
+            f'/agents/{agent_id}/query',
+            json_data=data,
+            format=format
+        )
+    
+    def _request_arrow(self, endpoint: str, json_data: Dict, format: str) -> Any:
+        """
+        POST a request that returns an Arrow IPC stream or Parquet file.
+        
+        The body is decoded in place: pyarrow reads the column buffers
+        directly from the response bytes instead of copying them. The
+        server only encodes SELECT results this way; any other response
+        is returned as parsed JSON.
+        
+        Args:
+            endpoint: API endpoint path
+            json_data: JSON request body
+            format: 'arrow' or 'parquet'
+            
+        Returns:
+            pyarrow.Table, or the JSON result if the server did not send
+            the requested format
+            
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "pyarrow is required for Arrow/Parquet results. "
+                "Install with: pip install universal-agent-connector[arrow]"
+            ) from e
+        
+        url = urljoin(self.api_url + '/', endpoint.lstrip('/'))
+        try:
+            response = self.session.post(
+                url,
+                json=json_data,
+                headers={'Accept': COLUMNAR_MIME_TYPES[format]},
+                timeout=self.timeout,
+                verify=self.verify_ssl
+            )
+        except requests.exceptions.RequestException as e:
+            raise ConnectionError(f"Connection failed: {str(e)}") from e
+        
+        self._raise_for_status(response)
+        
+        content_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        if content_type != COLUMNAR_MIME_TYPES[format]:
+            return response.json()
+        
+        buffer = pa.py_buffer(response.content)
+        if format == 'parquet':
+            return pq.read_table(pa.BufferReader(buffer))
+        return pa.ipc.open_stream(buffer).read_all()
     
     def execute_natural_language_query(
         self,
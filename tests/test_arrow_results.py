@@ -0,0 +1,197 @@
+"""Tests for Arrow IPC / Parquet query results."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from ai_agent_connector.app.api import api_bp, routes
+from ai_agent_connector.app.permissions.access_control import Permission
+from ai_agent_connector.app.utils.arrow_format import (
+    ARROW_STREAM_MIME,
+    PARQUET_MIME,
+    iter_arrow_stream,
+    negotiate_columnar_format,
+    rows_to_record_batches,
+    to_parquet_bytes,
+)
+
+
+def _read_stream(data: bytes):
+    return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+
+
+class TestArrowFormat:
+    def test_negotiate(self):
+        assert negotiate_columnar_format(None) is None
+        assert negotiate_columnar_format('application/json') is None
+        assert negotiate_columnar_format(f'{ARROW_STREAM_MIME}; q=1.0') == 'arrow'
+        assert negotiate_columnar_format(f'application/json, {PARQUET_MIME}') == 'parquet'
+
+    def test_rows_to_batches_uses_first_batch_schema(self):
+        rows = [{'id': i, 'score': float(i)} for i in range(5)]
+        batches = list(rows_to_record_batches(rows, batch_size=2))
+        assert [b.num_rows for b in batches] == [2, 2, 1]
+        assert all(b.schema == batches[0].schema for b in batches)
+
+    def test_all_null_first_batch_takes_later_type(self):
+        rows = [{'id': 1, 'note': None}, {'id': 2, 'note': None}, {'id': 3, 'note': 'late'}]
+        batches = list(rows_to_record_batches(rows, batch_size=2))
+        assert all(b.schema.field('note').type == pa.string() for b in batches)
+        data = b''.join(iter_arrow_stream(batches))
+        assert _read_stream(data).to_pylist() == rows
+
+    def test_int_batch_widens_to_later_floats(self):
+        rows = [{'score': 1}, {'score': 2}, {'score': 2.5}]
+        batches = list(rows_to_record_batches(rows, batch_size=2))
+        assert all(b.schema.field('score').type == pa.float64() for b in batches)
+        table = pa.Table.from_batches(batches)
+        assert table.column('score').to_pylist() == [1.0, 2.0, 2.5]
+
+    def test_incompatible_types_fall_back_to_string(self):
+        batches = list(rows_to_record_batches([{'v': 1}, {'v': 'x'}], batch_size=1))
+        assert pa.Table.from_batches(batches).column('v').to_pylist() == ['1', 'x']
+
+    def test_batches_stream_after_lookahead(self):
+        consumed = []
+
+        def rows():
+            for i in range(10):
+                consumed.append(i)
+                yield {'id': i}
+
+        batches = rows_to_record_batches(rows(), batch_size=2, lookahead=2)
+        assert next(batches).num_rows == 2
+        assert len(consumed) == 4
+        assert sum(b.num_rows for b in batches) == 8
+
+    def test_late_batches_are_cast_to_fixed_schema(self):
+        rows = [{'id': 1, 'note': None}, {'id': 2, 'note': None}, {'id': 3, 'note': 'late'},
+                {'id': 4, 'note': 5}]
+        batches = list(rows_to_record_batches(rows, batch_size=1, lookahead=2))
+        assert all(b.schema == batches[0].schema for b in batches)
+        assert pa.Table.from_batches(batches).column('note').to_pylist() == [None, None, 'late', '5']
+
+    def test_late_batch_that_does_not_fit_raises(self):
+        rows = [{'v': 1}, {'v': 2}, {'v': 2.5}]
+        batches = rows_to_record_batches(rows, batch_size=1, lookahead=2)
+        with pytest.raises(ValueError):
+            list(batches)
+
+    def test_tuple_rows_with_column_names(self):
+        batch = next(rows_to_record_batches([(1, 'a')], column_names=['id', 'name']))
+        assert batch.schema.names == ['id', 'name']
+
+    def test_ipc_stream_roundtrip(self):
+        rows = [{'id': i, 'name': str(i)} for i in range(7)]
+        data = b''.join(iter_arrow_stream(rows_to_record_batches(rows, batch_size=3)))
+        assert _read_stream(data).to_pylist() == rows
+
+    def test_empty_stream_is_readable(self):
+        schema = pa.schema([('id', pa.int64())])
+        table = _read_stream(b''.join(iter_arrow_stream(iter([]), empty_schema=schema)))
+        assert table.num_rows == 0
+        assert table.schema == schema
+
+    def test_parquet_roundtrip(self):
+        rows = [{'id': i} for i in range(5)]
+        data = to_parquet_bytes(rows_to_record_batches(rows, batch_size=2))
+        assert pq.read_table(pa.BufferReader(data)).to_pylist() == rows
+
+
+@pytest.fixture
+def connector():
+    return MagicMock()
+
+
+@pytest.fixture
+def client(connector):
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+    routes.rate_limiter.reset_agent_limits('agent-1')
+
+    with patch('ai_agent_connector.app.agents.registry.DatabaseConnector', return_value=connector):
+        routes.agent_registry.register_agent(
+            'agent-1', {'name': 'Agent'},
+            credentials={'api_key': 'key-1', 'api_secret': 's'},
+            database_config={'type': 'postgresql', 'host': 'db', 'user': 'u',
+                             'password': 'p', 'database': 'app'},
+        )
+        routes.access_control.grant_permission('agent-1', Permission.READ)
+        connector.reset_mock()
+
+        app = Flask(__name__)
+        app.register_blueprint(api_bp, url_prefix='/api')
+        with patch.object(routes, 'authenticate_agent', return_value='agent-1'), \
+                patch.object(routes, 'get_ontoguard_adapter', return_value=MagicMock(is_active=False)):
+            with app.test_client() as client:
+                yield client
+
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+
+
+class TestColumnarRoute:
+    def _post(self, client, accept, query='SELECT * FROM users'):
+        return client.post('/api/agents/agent-1/query', json={'query': query},
+                           headers={'Accept': accept})
+
+    def test_arrow_from_row_fallback(self, client, connector):
+        rows = [{'id': i, 'name': f'u{i}'} for i in range(routes.STREAM_BATCH_SIZE + 3)]
+        connector.fetch_arrow.return_value = None
+        connector.stream_query.return_value = iter(rows)
+
+        response = self._post(client, ARROW_STREAM_MIME)
+
+        assert response.status_code == 200
+        assert response.mimetype == ARROW_STREAM_MIME
+        assert _read_stream(response.get_data()).to_pylist() == rows
+        assert connector.stream_query.call_args.kwargs['as_dict'] is True
+        connector.execute_query.assert_not_called()
+        connector.disconnect.assert_called_once()
+
+    def test_native_arrow_path(self, client, connector):
+        table = pa.table({'id': [1, 2, 3]})
+        connector.fetch_arrow.return_value = table
+
+        response = self._post(client, ARROW_STREAM_MIME)
+
+        assert _read_stream(response.get_data()).equals(table)
+        connector.stream_query.assert_not_called()
+
+    def test_parquet(self, client, connector):
+        connector.fetch_arrow.return_value = None
+        connector.stream_query.return_value = iter([{'id': 1}, {'id': 2}])
+
+        response = self._post(client, PARQUET_MIME)
+
+        assert response.mimetype == PARQUET_MIME
+        assert pq.read_table(pa.BufferReader(response.get_data())).to_pylist() == [{'id': 1}, {'id': 2}]
+        connector.disconnect.assert_called_once()
+
+    def test_query_error_is_500(self, client, connector):
+        connector.fetch_arrow.side_effect = RuntimeError('bad sql')
+
+        response = self._post(client, ARROW_STREAM_MIME)
+
+        assert response.status_code == 500
+        assert response.get_json()['message'] == 'bad sql'
+        connector.disconnect.assert_called_once()
+
+    def test_writes_still_return_json(self, client, connector):
+        routes.access_control.grant_permission('agent-1', Permission.WRITE)
+        connector.execute_query.return_value = None
+
+        response = self._post(client, ARROW_STREAM_MIME, "UPDATE users SET name = 'x'")
+
+        assert response.is_json
+        connector.fetch_arrow.assert_not_called()
+
+    def test_not_acceptable_without_pyarrow(self, client, connector):
+        with patch.object(routes, 'ARROW_AVAILABLE', False):
+            response = self._post(client, ARROW_STREAM_MIME)
+        assert response.status_code == 406
+        connector.connect.assert_not_called()
@@ -11,15 +11,18 @@ import sqlite3
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
 from ai_agent_connector.app.utils.audit_logger import (
     ActionType,
+    AsyncAuditWriter,
     AuditLogger,
     FileBackend,
     MemoryBackend,
     SQLiteBackend,
+    _FileIndex,
     get_audit_logger,
     init_audit_logger,
 )
@@ -197,6 +200,108 @@ class TestFileBackend:
         assert logs[0]['agent_id'] == 'a2'
 
 
+class TestFileBackendIndex:
+    """Test the FileBackend sidecar index."""
+
+    @pytest.fixture
+    def log_dir(self, tmp_path):
+        return tmp_path
+
+    def _entries(self, day, n, **fields):
+        return [dict({'timestamp': f'{day}T10:00:{i:02d}', 'action_type': 'test',
+                      'agent_id': f'agent-{i % 2}', 'status': 'success'}, **fields)
+                for i in range(n)]
+
+    def test_close_writes_sidecar_and_restart_reads_last_id(self, log_dir):
+        """Test that startup takes the last id from the index."""
+        backend = FileBackend(log_dir=str(log_dir))
+        backend.write_batch(self._entries('2026-02-03', 5))
+        backend.close()
+
+        assert list(log_dir.glob('audit_*.jsonl.idx'))
+        with patch.object(FileBackend, '_catch_up', side_effect=AssertionError('rescanned')):
+            reopened = FileBackend(log_dir=str(log_dir))
+        assert reopened._id_counter == 5
+        reopened.close()
+
+    def test_time_range_skips_files(self, log_dir):
+        """Test that files outside the date range are not read."""
+        for day in ('2026-02-01', '2026-02-02'):
+            with open(log_dir / f'audit_{day}.jsonl', 'w') as f:
+                for i, entry in enumerate(self._entries(day, 3)):
+                    f.write(json.dumps(dict(entry, id=i + 1)) + '\n')
+        backend = FileBackend(log_dir=str(log_dir))
+
+        with patch.object(FileBackend, '_read_entries', wraps=FileBackend._read_entries) as read:
+            logs = backend.read(start_date=datetime(2026, 2, 2), end_date=datetime(2026, 2, 2, 23, 59))
+
+        assert [log['timestamp'][:10] for log in logs] == ['2026-02-02'] * 3
+        assert [call.args[0].name for call in read.call_args_list] == ['audit_2026-02-02.jsonl']
+        backend.close()
+
+    def test_bitmap_filters_and_counts(self, log_dir):
+        """Test filtering and counting from the field bitmaps."""
+        backend = FileBackend(log_dir=str(log_dir))
+        backend.write_batch(self._entries('2026-02-03', 10))
+        backend.write_batch(self._entries('2026-02-03', 2, status='error', tenant_id='t1'))
+
+        with patch.object(FileBackend, '_read_entries', side_effect=AssertionError('parsed')):
+            assert backend.count(agent_id='agent-0') == 6
+            assert backend.count(status='error', tenant_id='t1') == 2
+        logs = backend.read(agent_id='agent-1', limit=3)
+        assert [log['agent_id'] for log in logs] == ['agent-1'] * 3
+        assert [log['timestamp'] for log in logs] == sorted((log['timestamp'] for log in logs), reverse=True)
+        backend.close()
+
+    def test_high_cardinality_field_falls_back_to_parsing(self, log_dir):
+        """Test filters on fields with too many values to index."""
+        with patch.object(_FileIndex, 'MAX_VALUES', 3):
+            backend = FileBackend(log_dir=str(log_dir))
+            backend.write_batch([{'timestamp': f'2026-02-03T10:00:{i:02d}', 'action_type': 'test',
+                                  'agent_id': f'agent-{i}'} for i in range(10)])
+
+            assert backend.count(agent_id='agent-7') == 1
+            assert [log['agent_id'] for log in backend.read(agent_id='agent-7')] == ['agent-7']
+        backend.close()
+
+    def test_cursor_pages(self, log_dir):
+        """Test keyset pages over the file backend."""
+        backend = FileBackend(log_dir=str(log_dir))
+        backend.write_batch(self._entries('2026-02-03', 7))
+
+        first = backend.read(limit=4)
+        second = backend.read(limit=4, cursor=(first[-1]['timestamp'], first[-1]['id']))
+
+        assert [log['id'] for log in first + second] == [7, 6, 5, 4, 3, 2, 1]
+        backend.close()
+
+    def test_two_writers_share_a_directory(self, log_dir):
+        """Test that each writer indexes the other's entries."""
+        a = FileBackend(log_dir=str(log_dir))
+        b = FileBackend(log_dir=str(log_dir))
+        a.write_batch([{'timestamp': '2026-02-03T10:00:00', 'action_type': 'test', 'agent_id': 'A'}])
+        b.write_batch([{'timestamp': '2026-02-03T10:00:01', 'action_type': 'test', 'agent_id': 'B'}])
+        a.write_batch([{'timestamp': '2026-02-03T10:00:02', 'action_type': 'test', 'agent_id': 'A'}])
+
+        assert [log['timestamp'] for log in a.read(agent_id='A')] == ['2026-02-03T10:00:02', '2026-02-03T10:00:00']
+        assert a.count(agent_id='B') == 1
+        assert [log['agent_id'] for log in a.read()] == ['A', 'B', 'A']
+        assert [log['id'] for log in b.read()] == [3, 2, 1]
+        a.close()
+        b.close()
+
+    def test_appended_lines_are_indexed(self, log_dir):
+        """Test that lines written by another writer are picked up."""
+        backend = FileBackend(log_dir=str(log_dir))
+        backend.write_batch(self._entries('2026-02-03', 2))
+        with open(backend._current_file, 'a') as f:
+            f.write(json.dumps({'id': 99, 'timestamp': '2026-02-03T11:00:00',
+                                'action_type': 'test', 'agent_id': 'external'}) + '\n')
+
+        assert backend.read(agent_id='external')[0]['id'] == 99
+        backend.close()
+
+
 class TestSQLiteBackend:
     """Test SQLiteBackend."""
 
@@ -261,6 +366,197 @@ class TestSQLiteBackend:
         ids2 = {l['id'] for l in page2}
         assert ids1.isdisjoint(ids2)
 
+    def test_keyset_pagination_walks_every_row_once(self, temp_db):
+        """Test cursor pages with timestamp ties."""
+        logger = AuditLogger(backend='sqlite', db_path=temp_db)
+        logger._backend.write_batch([
+            {'timestamp': f'2026-02-03T10:0{i // 3}:00', 'action_type': 'test', 'agent_id': 'a'}
+            for i in range(10)
+        ])
+
+        seen, cursor = [], None
+        while True:
+            page = logger.get_logs(limit=4, cursor=cursor, include_total=False)
+            seen.extend(log['id'] for log in page['logs'])
+            cursor = page['next_cursor']
+            if not page['has_more']:
+                break
+
+        assert seen == list(range(10, 0, -1))
+        assert page['total'] is None
+
+    def test_composite_indexes_and_wal(self, temp_db):
+        """Test WAL mode and the composite filter indexes."""
+        backend = SQLiteBackend(db_path=temp_db)
+        conn = backend._get_connection()
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        columns = [row[2] for row in conn.execute("PRAGMA index_info(idx_audit_action)")]
+        assert columns == ['action_type', 'status', 'timestamp']
+        plan = ' '.join(row[3] for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM audit_logs WHERE tenant_id = ? "
+            "ORDER BY timestamp DESC, id DESC LIMIT 10", ('t',)))
+        assert 'idx_audit_tenant' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_legacy_single_column_indexes_are_rebuilt(self, temp_db):
+        """Test migration of databases created with single-column indexes."""
+        conn = sqlite3.connect(temp_db)
+        conn.execute("""CREATE TABLE audit_logs (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        timestamp TEXT NOT NULL, action_type TEXT NOT NULL, agent_id TEXT,
+                        user_id TEXT, status TEXT DEFAULT 'success', error_message TEXT, details TEXT)""")
+        conn.execute("CREATE INDEX idx_audit_agent ON audit_logs(agent_id)")
+        conn.commit()
+        conn.close()
+
+        backend = SQLiteBackend(db_path=temp_db)
+        conn = backend._get_connection()
+        columns = [row[2] for row in conn.execute("PRAGMA index_info(idx_audit_agent)")]
+        assert columns == ['agent_id', 'timestamp']
+        backend.write({'timestamp': '2026-02-03T10:00:00', 'action_type': 'test', 'tenant_id': 't1'})
+        assert backend.count(tenant_id='t1') == 1
+
+    def test_connection_is_reused_per_thread(self, temp_db):
+        """Test that each thread keeps one connection."""
+        import threading
+
+        backend = SQLiteBackend(db_path=temp_db)
+        assert backend._get_connection() is backend._get_connection()
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(backend._get_connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not backend._get_connection()
+        backend.close()
+
+
+class TestAsyncAuditWriter:
+    """Test the batching background writer."""
+
+    class RecordingBackend(MemoryBackend):
+        def __init__(self):
+            super().__init__()
+            self.batches = []
+
+        def write_batch(self, entries):
+            self.batches.append(len(entries))
+            super().write_batch(entries)
+
+    def test_entries_are_written_in_batches(self):
+        """Test that queued entries are committed together."""
+        backend = self.RecordingBackend()
+        writer = AsyncAuditWriter(backend, batch_size=50, flush_interval_ms=1000)
+
+        for i in range(120):
+            writer.enqueue({'timestamp': str(i), 'action_type': 'test'})
+        assert writer.flush()
+
+        assert backend.count() == 120
+        assert sum(backend.batches) == 120
+        assert max(backend.batches) <= 50
+        assert len(backend.batches) < 120
+        writer.close()
+
+    def test_close_drains_buffer(self):
+        """Test that close() writes everything still buffered."""
+        backend = self.RecordingBackend()
+        writer = AsyncAuditWriter(backend, batch_size=1000, flush_interval_ms=60000)
+        for i in range(10):
+            writer.enqueue({'timestamp': str(i), 'action_type': 'test'})
+
+        writer.close()
+
+        assert backend.count() == 10
+        assert writer.get_stats()['queued'] == 0
+
+    def test_full_buffer_writes_synchronously_after_timeout(self):
+        """Test backpressure when the backend cannot keep up."""
+        backend = MemoryBackend()
+        writer = AsyncAuditWriter(backend, max_queue_size=2, batch_size=10, put_timeout=0.01)
+        writer._ensure_thread = lambda: None  # no writer thread: nothing drains
+
+        results = [writer.enqueue({'action_type': 'test'}) for _ in range(3)]
+
+        stats = writer.get_stats()
+        assert results == [True, True, False]
+        assert backend.count() == 1
+        assert stats['sync_writes'] == 1
+        assert stats['blocked'] == 1
+        assert stats['high_watermark'] == 2
+
+    def test_failed_batch_is_retried(self):
+        """Test that a batch the backend rejects is written on a later attempt."""
+        backend = MemoryBackend()
+        writer = AsyncAuditWriter(backend, flush_interval_ms=1, retry_backoff=0.001)
+        write_batch = backend.write_batch
+        failures = [IOError('disk full'), IOError('disk full')]
+
+        def flaky(entries):
+            if failures:
+                raise failures.pop()
+            write_batch(entries)
+
+        backend.write_batch = flaky
+        writer.enqueue({'action_type': 'test'})
+        assert writer.flush()
+
+        assert backend.count() == 1
+        assert writer.get_stats()['write_errors'] == 2
+        writer.close()
+
+    def test_failing_backend_keeps_entries_queued(self):
+        """Test that entries survive a backend outage longer than the retries."""
+        backend = MemoryBackend()
+        writer = AsyncAuditWriter(backend, flush_interval_ms=1, max_retries=1, retry_backoff=0.001)
+        write_batch = backend.write_batch
+        backend.write_batch = lambda entries: (_ for _ in ()).throw(IOError('disk full'))
+
+        for i in range(3):
+            writer.enqueue({'timestamp': str(i), 'action_type': 'test'})
+        assert not writer.flush(timeout=0.2)
+        assert writer.get_stats()['requeued'] >= 3
+
+        backend.write_batch = write_batch
+        assert writer.flush()
+        assert [log['timestamp'] for log in backend.read(limit=10)] == ['2', '1', '0']
+        assert writer.get_stats()['unwritten'] == 0
+        writer.close()
+
+    def test_file_logger_returns_id_without_sharing_entry(self, tmp_path):
+        """Test that log() numbers file entries up front and the writer copies them."""
+        logger = AuditLogger(backend='file', log_dir=str(tmp_path))
+        first = logger.log(ActionType.QUERY_EXECUTION, agent_id='a')
+        second = logger.log(ActionType.QUERY_EXECUTION, agent_id='b')
+        snapshot = dict(first)
+        assert logger.flush()
+
+        assert (first['id'], second['id']) == (1, 2)
+        assert first == snapshot
+        assert sorted(log['id'] for log in logger._backend.read()) == [1, 2]
+        logger.close()
+
+    def test_sqlite_logger_reads_its_own_writes(self, tmp_path):
+        """Test that reads see entries still queued for the writer."""
+        logger = AuditLogger(backend='sqlite', db_path=str(tmp_path / 'audit.db'))
+        for i in range(5):
+            logger.log(ActionType.QUERY_EXECUTION, agent_id=f'agent-{i}')
+
+        assert logger.get_logs()['total'] == 5
+        assert logger.get_writer_stats()['written'] == 5
+        logger.close()
+
+    def test_file_backend_reuses_handle(self, tmp_path):
+        """Test that the file backend keeps one handle open."""
+        backend = FileBackend(log_dir=str(tmp_path))
+        handle = backend._handle
+        backend.write_batch([{'timestamp': '1', 'action_type': 'test'} for _ in range(3)])
+        backend.write({'timestamp': '2', 'action_type': 'test'})
+
+        assert backend._handle is handle
+        assert sorted(log['id'] for log in backend.read()) == [1, 2, 3, 4]
+        backend.close()
+
 
 class TestAuditLogger:
     """Test AuditLogger class."""
@@ -452,6 +748,27 @@ class TestAuditAPIEndpoints:
         assert data['limit'] == 50
         assert 'backend' in data
 
+    def test_get_audit_logs_with_cursor(self):
+        """Test keyset pagination through GET /api/audit/logs."""
+        from unittest.mock import patch
+        from ai_agent_connector.app.api import routes
+
+        logger = AuditLogger(backend='memory')
+        for i in range(5):
+            logger.log(ActionType.QUERY_EXECUTION, agent_id=f'agent-{i}')
+
+        with patch.object(routes, 'audit_logger', logger):
+            first = self.client.get('/api/audit/logs?limit=3').get_json()
+            second = self.client.get(f"/api/audit/logs?limit=3&cursor={first['next_cursor']}").get_json()
+            invalid = self.client.get('/api/audit/logs?cursor=not-a-cursor')
+
+        assert first['total'] == 5
+        assert first['has_more'] is True
+        assert second['total'] is None
+        assert second['has_more'] is False
+        assert [l['id'] for l in first['logs'] + second['logs']] == [5, 4, 3, 2, 1]
+        assert invalid.status_code == 400
+
     def test_get_audit_statistics(self):
         """Test GET /api/audit/statistics."""
         logger = get_audit_logger()
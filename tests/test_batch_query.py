@@ -0,0 +1,211 @@
+"""Tests for the batch query endpoint."""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from ai_agent_connector.app.api import api_bp, routes
+from ai_agent_connector.app.permissions.access_control import Permission
+from ai_agent_connector.app.utils.rate_limiter import RateLimitConfig
+
+
+@pytest.fixture
+def connector():
+    connector = MagicMock()
+    connector.execute_query.side_effect = lambda query, **kwargs: (
+        [(query,)] if kwargs.get('fetch') else None
+    )
+    return connector
+
+
+@pytest.fixture
+def client(connector):
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+    routes.access_control.resource_permissions.clear()
+    routes.rate_limiter.reset_agent_limits('agent-1')
+
+    with patch('ai_agent_connector.app.agents.registry.DatabaseConnector', return_value=connector):
+        routes.agent_registry.register_agent(
+            'agent-1', {'name': 'Agent'},
+            credentials={'api_key': 'key-1', 'api_secret': 's'},
+            database_config={'type': 'postgresql', 'host': 'db', 'user': 'u',
+                             'password': 'p', 'database': 'app'},
+        )
+        routes.access_control.grant_permission('agent-1', Permission.READ)
+        connector.reset_mock()
+
+        app = Flask(__name__)
+        app.register_blueprint(api_bp, url_prefix='/api')
+        with patch.object(routes, 'authenticate_agent', return_value='agent-1'), \
+                patch.object(routes, 'get_ontoguard_adapter', return_value=MagicMock(is_active=False)):
+            with app.test_client() as client:
+                yield client
+
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+    routes.access_control.resource_permissions.clear()
+
+
+def test_batch_runs_statements_on_one_connection(client, connector):
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['SELECT * FROM users', {'query': 'SELECT * FROM orders WHERE id = %s', 'params': [1]}]
+    })
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data['success'] is True
+    assert [r['index'] for r in data['results']] == [0, 1]
+    assert data['results'][1]['tables_accessed'] == ['orders']
+    assert connector.connect.call_count == 1
+
+
+def test_batch_rejected_before_execution_when_any_statement_denied(client, connector):
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['SELECT * FROM users', 'DELETE FROM users']
+    })
+    assert response.status_code == 403
+    assert response.get_json()['statement_index'] == 1
+    connector.execute_query.assert_not_called()
+
+
+def test_batch_denies_write_cte_and_unresolved_write(client, connector):
+    routes.access_control.set_resource_permissions('agent-1', 'payroll', [Permission.READ])
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['WITH payroll AS (DELETE FROM payroll RETURNING *) SELECT 1']
+    })
+    assert response.status_code == 403
+    assert response.get_json()['denied_resources'][0]['resource'] == 'payroll'
+
+    routes.access_control.grant_permission('agent-1', Permission.WRITE)
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['DELETE FROM "payroll"']
+    })
+    assert response.status_code == 403
+    assert response.get_json()['denied_resources'][0]['resource'] == '*'
+    connector.execute_query.assert_not_called()
+
+
+def test_batch_permission_checked_once_per_table(client):
+    with patch.object(routes, 'has_table_permission', return_value=True) as check:
+        response = client.post('/api/agents/agent-1/query/batch', json={
+            'queries': ['SELECT * FROM users WHERE id = 1', 'SELECT * FROM users WHERE id = 2']
+        })
+    assert response.status_code == 200
+    assert check.call_count == 1
+
+
+def test_batch_write_uses_execute_many(client, connector):
+    routes.access_control.grant_permission('agent-1', Permission.WRITE)
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': [{'query': 'INSERT INTO events (name) VALUES (%s)', 'params_list': [['a'], ['b']]}]
+    })
+    assert response.status_code == 200
+    assert response.get_json()['results'][0]['row_count'] == 2
+    connector.execute_many.assert_called_once_with(
+        'INSERT INTO events (name) VALUES (%s)', [['a'], ['b']]
+    )
+
+
+def test_batch_reports_per_statement_errors(client, connector):
+    connector.execute_query.side_effect = [[(1,)], RuntimeError('boom'), [(3,)]]
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['SELECT * FROM a', 'SELECT * FROM b', 'SELECT * FROM c'],
+        'stop_on_error': True
+    })
+    data = response.get_json()
+    assert data['success'] is False
+    assert data['executed_count'] == 2
+    assert data['results'][1]['message'] == 'boom'
+
+
+def test_parallel_read_batch(client, connector):
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['SELECT * FROM a', 'SELECT * FROM b', 'SELECT * FROM c'],
+        'parallel': True
+    })
+    data = response.get_json()
+    assert data['parallel'] is True
+    assert [r['result'] for r in data['results']] == [
+        [['SELECT * FROM a']], [['SELECT * FROM b']], [['SELECT * FROM c']]
+    ]
+
+
+def test_parallel_batch_borrows_one_connector_per_statement(client, connector):
+    with patch.object(routes.agent_registry, 'get_database_connector',
+                      wraps=routes.agent_registry.get_database_connector) as get_connector:
+        response = client.post('/api/agents/agent-1/query/batch', json={
+            'queries': ['SELECT * FROM a', 'SELECT * FROM b'],
+            'parallel': True
+        })
+    assert response.get_json()['success'] is True
+    assert get_connector.call_count == 2
+
+
+def test_parallel_batch_stops_on_error(client, connector):
+    def execute(query, **kwargs):
+        if query.endswith(' a'):
+            raise RuntimeError('boom')
+        time.sleep(0.05)
+        return [(query,)]
+
+    connector.execute_query.side_effect = execute
+    with patch.object(routes, 'MAX_BATCH_WORKERS', 1):
+        response = client.post('/api/agents/agent-1/query/batch', json={
+            'queries': ['SELECT * FROM a', 'SELECT * FROM b', 'SELECT * FROM c', 'SELECT * FROM d'],
+            'parallel': True,
+            'stop_on_error': True
+        })
+    data = response.get_json()
+    assert data['success'] is False
+    assert data['results'][0]['message'] == 'boom'
+    assert [r.get('skipped') for r in data['results'][2:]] == [True, True]
+    assert data['executed_count'] <= 2
+
+
+def test_batch_size_limit(client):
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['SELECT 1'] * (routes.MAX_BATCH_STATEMENTS + 1)
+    })
+    assert response.status_code == 400
+
+
+def test_batch_charges_rate_limit_per_execution(client, connector):
+    routes.access_control.grant_permission('agent-1', Permission.WRITE)
+    routes.rate_limiter.set_rate_limit('agent-1', RateLimitConfig(queries_per_minute=5))
+    try:
+        response = client.post('/api/agents/agent-1/query/batch', json={
+            'queries': ['SELECT * FROM a', 'SELECT * FROM b',
+                        {'query': 'INSERT INTO events (name) VALUES (%s)', 'params_list': [['x'], ['y']]}]
+        })
+        assert response.status_code == 200
+        usage = routes.rate_limiter.get_usage_stats('agent-1')['current_usage']
+        assert usage['queries_last_minute'] == 4
+
+        response = client.post('/api/agents/agent-1/query/batch', json={
+            'queries': ['SELECT * FROM a', 'SELECT * FROM b']
+        })
+        assert response.status_code == 429
+        assert connector.execute_query.call_count == 2
+    finally:
+        routes.rate_limiter.remove_agent('agent-1')
+
+
+def test_batch_execution_limit_counts_params_list(client, connector):
+    routes.access_control.grant_permission('agent-1', Permission.WRITE)
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': [{'query': 'INSERT INTO events (name) VALUES (%s)',
+                     'params_list': [['x']] * (routes.MAX_BATCH_EXECUTIONS + 1)}]
+    })
+    assert response.status_code == 400
+    connector.execute_many.assert_not_called()
+
+
+def test_batch_rejects_params_list_on_reads(client, connector):
+    response = client.post('/api/agents/agent-1/query/batch', json={
+        'queries': ['SELECT 1', {'query': 'SELECT * FROM users WHERE id = %s', 'params_list': [[1], [2]]}]
+    })
+    assert response.status_code == 400
+    assert 'Statement 1' in response.get_json()['error']
+    connector.execute_query.assert_not_called()
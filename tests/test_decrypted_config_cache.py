@@ -0,0 +1,136 @@
+"""Unit tests for the decrypted database config cache and one-shot rotation checks."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_agent_connector.app.agents.registry import AgentRegistry
+from ai_agent_connector.app.utils.encryption import DecryptedConfigCache, reset_encryptor
+
+
+class TestDecryptedConfigCache:
+    def test_put_get_returns_copy(self):
+        cache = DecryptedConfigCache()
+        cache.put("a", {"host": "h", "password": "secret"})
+        first = cache.get("a")
+        first["password"] = "changed"
+        assert cache.get("a") == {"host": "h", "password": "secret"}
+
+    def test_json_credentials_roundtrip(self):
+        cache = DecryptedConfigCache()
+        cache.put("a", {"credentials_json": {"type": "service_account"}})
+        assert cache.get("a")["credentials_json"] == {"type": "service_account"}
+
+    def test_expired_entry_is_wiped(self):
+        cache = DecryptedConfigCache(ttl=10)
+        with patch("ai_agent_connector.app.utils.encryption.time.monotonic", return_value=0):
+            cache.put("a", {"password": "secret"})
+        buffer = cache._entries["a"][2]["password"][0]
+        with patch("ai_agent_connector.app.utils.encryption.time.monotonic", return_value=11):
+            assert cache.get("a") is None
+        assert buffer == bytearray(len("secret"))
+        assert len(cache) == 0
+
+    def test_lru_eviction_wipes_oldest(self):
+        cache = DecryptedConfigCache(max_entries=2)
+        cache.put("a", {"password": "one"})
+        buffer = cache._entries["a"][2]["password"][0]
+        cache.put("b", {"password": "two"})
+        cache.put("c", {"password": "three"})
+        assert cache.get("a") is None
+        assert buffer == bytearray(3)
+
+    def test_recently_read_entry_survives_eviction(self):
+        cache = DecryptedConfigCache(max_entries=2)
+        cache.put("a", {"password": "one"})
+        cache.put("b", {"password": "two"})
+        cache.get("a")
+        cache.put("c", {"password": "three"})
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+
+    def test_invalidate_with_predicate(self):
+        cache = DecryptedConfigCache()
+        cache.put(("x", "active"), {"password": "p"})
+        cache.put(("y", "active"), {"password": "p"})
+        assert cache.invalidate(lambda key: key[0] == "x") == 1
+        assert cache.get(("x", "active")) is None
+        assert cache.get(("y", "active")) is not None
+
+
+class TestRegistryDecryptionCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        reset_encryptor()
+        yield
+        reset_encryptor()
+
+    @pytest.fixture
+    def connector_cls(self):
+        with patch("ai_agent_connector.app.agents.registry.DatabaseConnector") as cls:
+            cls.return_value = MagicMock()
+            yield cls
+
+    @pytest.fixture
+    def registry(self, connector_cls):
+        registry = AgentRegistry()
+        registry.register_agent(
+            "agent-1",
+            {"name": "Agent"},
+            credentials={"api_key": "k", "api_secret": "s"},
+            database_config={"type": "postgresql", "host": "localhost", "user": "u",
+                             "password": "old", "database": "db"},
+        )
+        return registry
+
+    def test_decrypts_once_per_ttl(self, registry, connector_cls):
+        with patch.object(registry, "_decrypt_database_config",
+                          wraps=registry._decrypt_database_config) as decrypt:
+            registry.get_database_connector("agent-1")
+            registry.get_database_connector("agent-1")
+        assert decrypt.call_count == 1
+        assert connector_cls.call_args.kwargs["password"] == "old"
+
+    def test_staged_credentials_not_retested_per_call(self, registry, connector_cls):
+        registry.rotate_database_credentials(
+            "agent-1",
+            {"type": "postgresql", "host": "localhost", "user": "u", "password": "new",
+             "database": "db"},
+            validate_before_activate=False,
+        )
+        connector = connector_cls.return_value
+        connector.connect.reset_mock()
+
+        registry.get_database_connector("agent-1")
+        registry.get_database_connector("agent-1")
+
+        assert connector.connect.call_count == 1
+        status = registry.get_credential_rotation_status("agent-1")
+        assert status["pending_validated"] is True
+        assert connector_cls.call_args.kwargs["password"] == "new"
+
+    def test_failed_staged_credentials_fall_back_to_active(self, registry, connector_cls):
+        registry.rotate_database_credentials(
+            "agent-1",
+            {"type": "postgresql", "host": "localhost", "user": "u", "password": "bad",
+             "database": "db"},
+            validate_before_activate=False,
+        )
+        connector_cls.return_value.connect.side_effect = ConnectionError("auth failed")
+
+        registry.get_database_connector("agent-1")
+
+        status = registry.get_credential_rotation_status("agent-1")
+        assert status["pending_validated"] is False
+        assert "auth failed" in status["pending_validation_error"]
+        assert connector_cls.call_args.kwargs["password"] == "old"
+
+    def test_update_database_wipes_cached_config(self, registry, connector_cls):
+        registry.get_database_connector("agent-1")
+        registry.update_agent_database(
+            "agent-1",
+            {"type": "postgresql", "host": "localhost", "user": "u", "password": "fresh",
+             "database": "db"},
+        )
+        registry.get_database_connector("agent-1")
+        assert connector_cls.call_args.kwargs["password"] == "fresh"
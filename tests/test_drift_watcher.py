@@ -0,0 +1,245 @@
+"""Tests for the background schema drift watcher and its status table."""
+
+import os
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import yaml
+
+from ai_agent_connector.app.db import schema_catalog
+from ai_agent_connector.app.security import schema_drift
+from ai_agent_connector.app.db.schema_catalog import SchemaCatalogCache
+from ai_agent_connector.app.security.drift_watcher import DriftStatusTable, SchemaDriftWatcher
+from ai_agent_connector.app.security.schema_drift import SchemaBinding, SchemaDriftDetector
+
+
+class FakeConnector:
+    """In-memory catalog answering the PostgreSQL version probe and columns query."""
+
+    database_type = 'postgresql'
+
+    def __init__(self):
+        self.config = {'host': 'db', 'database': 'hospital'}
+        self.is_connected = False
+        self.versions = {('public', 'patients'): '1', ('public', 'staff'): '1'}
+        self.columns = {
+            ('public', 'patients'): [('id', 'integer'), ('name', 'text')],
+            ('public', 'staff'): [('id', 'integer'), ('role', 'text')],
+        }
+        self.queries = []
+
+    def connect(self):
+        self.is_connected = True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def execute_query(self, query, params=None, fetch=True, as_dict=False):
+        if 'pg_class' in query:
+            self.queries.append('probe')
+            return [(schema, table, version) for (schema, table), version in self.versions.items()]
+        wanted = set(zip(params[::2], params[1::2])) if params else None
+        self.queries.append('columns')
+        return [
+            (schema, table, name, data_type, 'YES', None, position)
+            for (schema, table), cols in self.columns.items()
+            if wanted is None or (schema, table) in wanted
+            for position, (name, data_type) in enumerate(cols, 1)
+        ]
+
+    def change(self, table, columns):
+        key = ('public', table)
+        self.versions[key] = str(int(self.versions[key]) + 1)
+        self.columns[key] = columns
+
+
+@pytest.fixture(autouse=True)
+def catalog():
+    catalog = SchemaCatalogCache(check_interval=60)
+    with patch.object(schema_catalog, '_schema_catalog', catalog):
+        yield catalog
+
+
+@pytest.fixture
+def connector():
+    return FakeConnector()
+
+
+@pytest.fixture
+def detector():
+    detector = SchemaDriftDetector()
+    detector.add_binding(SchemaBinding(entity='PatientRecord', table='patients',
+                                       columns={'id': 'integer', 'name': 'text'}))
+    detector.add_binding(SchemaBinding(entity='Staff', table='staff',
+                                       columns={'id': 'integer', 'role': 'text'}))
+    return detector
+
+
+@pytest.fixture
+def watcher(detector, connector):
+    return SchemaDriftWatcher(detector, lambda: connector, 'doctor-1',
+                              status_table=DriftStatusTable(), on_drift=MagicMock())
+
+
+class TestSchemaDriftWatcher:
+    def test_first_poll_records_every_binding(self, watcher):
+        assert watcher.poll_once() == []
+        assert {s.entity for s in watcher.status_table.all()} == {'PatientRecord', 'Staff'}
+        assert watcher.status_table.get('doctor-1', 'Staff').severity == 'INFO'
+        watcher.on_drift.assert_not_called()
+
+    def test_unchanged_schema_only_probes(self, watcher, connector):
+        watcher.poll_once()
+        connector.queries.clear()
+
+        watcher.poll_once()
+
+        assert connector.queries == ['probe']
+        assert watcher.checks == 2
+
+    def test_changed_table_rechecked_and_pushed_once(self, watcher, connector):
+        watcher.poll_once()
+        connector.change('staff', [('id', 'integer')])
+
+        drifted = watcher.poll_once()
+
+        assert [r.entity for r in drifted] == ['Staff']
+        assert watcher.checks == 3  # only Staff re-checked
+        status = watcher.status_table.get('doctor-1', 'Staff')
+        assert status.severity == 'CRITICAL'
+        assert status.fixes
+        watcher.on_drift.assert_called_once()
+
+        connector.change('patients', [('id', 'integer'), ('name', 'text'), ('dob', 'date')])
+        assert watcher.poll_once() == []
+        watcher.on_drift.assert_called_once()
+
+    def test_statuses_are_scoped_per_database(self, watcher, detector, connector):
+        other_connector = FakeConnector()
+        other_connector.config = {'host': 'db', 'database': 'clinic'}
+        other_connector.change('staff', [('id', 'integer')])
+        other = SchemaDriftWatcher(detector, lambda: other_connector, 'nurse-1',
+                                   status_table=watcher.status_table, on_drift=MagicMock())
+
+        watcher.poll_once()
+        assert [r.entity for r in other.poll_once()] == ['Staff']
+
+        assert watcher.status_table.get('doctor-1', 'Staff').severity == 'INFO'
+        assert watcher.status_table.get('nurse-1', 'Staff').severity == 'CRITICAL'
+        assert {s.entity for s in watcher.status_table.all('nurse-1')} == {'PatientRecord', 'Staff'}
+        assert len(watcher.status_table.all()) == 4
+
+    def test_binding_change_rechecks_all(self, watcher, detector):
+        watcher.poll_once()
+        detector.add_binding(SchemaBinding(entity='Staff', table='staff',
+                                           columns={'id': 'integer', 'title': 'text'}))
+
+        drifted = watcher.poll_once()
+
+        assert [r.entity for r in drifted] == ['Staff']
+        assert watcher.checks == 4
+
+    def test_background_thread_backs_off(self, watcher):
+        watcher.min_interval = 0.01
+        watcher.max_interval = 0.04
+        watcher.start()
+        try:
+            for _ in range(200):
+                if watcher.polls >= 4:
+                    break
+                watcher._stop.wait(0.01)
+        finally:
+            watcher.stop()
+        assert watcher.polls >= 4
+        assert watcher.interval == 0.04
+        assert not watcher.is_running
+
+
+    def test_notify_wakes_watcher(self, watcher, connector):
+        read_fd, write_fd = os.pipe()
+
+        class Listener:
+            notifies = []
+            closed = False
+
+            def fileno(self):
+                return read_fd
+
+            def poll(self):
+                os.read(read_fd, 1)
+                self.notifies.append('ALTER TABLE')
+
+            def close(self):
+                self.closed = True
+
+        listener = Listener()
+        connector.open_listen_connection = MagicMock(return_value=listener)
+        watcher.listen_channel = 'schema_change'
+        try:
+            os.write(write_fd, b'x')
+            started = time.monotonic()
+            watcher._wait(30)
+            assert time.monotonic() - started < 5
+            connector.open_listen_connection.assert_called_once_with('schema_change')
+            assert listener.notifies == []
+        finally:
+            watcher.stop()
+            os.close(read_fd)
+            os.close(write_fd)
+        assert listener.closed
+
+
+class TestPolicyEngineLookup:
+    @pytest.fixture(autouse=True)
+    def shared_detector(self):
+        detector = SchemaDriftDetector()
+        with patch.object(schema_drift, '_schema_drift_detector', detector):
+            yield detector
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        from policy_engine import ExtendedPolicyEngine
+
+        path = tmp_path / 'schema_bindings.yaml'
+        path.write_text(yaml.safe_dump({'domains': {'hospital': {'entities': {
+            'Staff': {'table': 'staff', 'columns': {'id': 'integer', 'role': 'text'}},
+        }}}}))
+        engine = ExtendedPolicyEngine(enable_ontoguard=False, schema_bindings_path=str(path))
+        engine._drift_status_table = DriftStatusTable()
+        return engine
+
+    def test_blocks_on_watched_critical_drift(self, engine, connector):
+        watcher = SchemaDriftWatcher(engine.schema_drift_detector, lambda: connector, 'doctor-1',
+                                     status_table=engine._drift_status_table, on_drift=MagicMock())
+        watcher.poll_once()
+        assert engine._check_schema_drift({'entity_type': 'Staff'}, 'doctor-1') is None
+
+        connector.change('staff', [('id', 'integer')])
+        watcher.poll_once()
+
+        result = engine._check_schema_drift({'entity_type': 'Staff'}, 'doctor-1')
+        assert result.is_allowed is False
+        assert result.failed_policy == 'schema_drift'
+        assert engine._check_schema_drift({'entity_type': 'Staff', 'agent_id': 'doctor-1'}, 'user') is not None
+
+        # Drift in doctor-1's database does not block other agents
+        assert engine._check_schema_drift({'entity_type': 'Staff'}, 'nurse-1') is None
+
+        engine.schema_drift_detector.approve_drift('Staff', 'admin', 'migration in progress')
+        assert engine._check_schema_drift({'entity_type': 'Staff'}, 'doctor-1') is None
+
+    def test_approvals_from_rest_endpoints_apply(self, engine, shared_detector):
+        from ai_agent_connector.app.api import routes
+        from ai_agent_connector.app.api.routes import get_schema_drift_detector
+
+        assert engine.schema_drift_detector is shared_detector
+        with patch.object(routes, '_schema_bindings_loaded', True):
+            assert get_schema_drift_detector() is shared_detector
+
+        report = shared_detector.detect_drift('Staff', {'id': 'integer'})
+        engine._drift_status_table.update('doctor-1', report)
+        assert engine._check_schema_drift({'entity_type': 'Staff'}, 'doctor-1') is not None
+
+        get_schema_drift_detector().approve_drift('Staff', 'admin', 'planned migration')
+        assert engine._check_schema_drift({'entity_type': 'Staff'}, 'doctor-1') is None
@@ -31,7 +31,7 @@ def reset_state():
     audit_logger.clear_logs()
     
     # Reset policy engine state
-    policy_engine._rate_limit_timestamps.clear()
+    policy_engine._rate_limiter.reset()
     policy_engine._user_tenants.clear()
     policy_engine._pii_permissions.clear()
     policy_engine._cache.clear()
@@ -55,14 +55,9 @@ class TestBlockedCall:
         policy_engine.grant_tenant_access(user_id, tenant_id)
         policy_engine.grant_pii_permission(user_id)
         
-        # Exceed rate limit by making many validation calls
-        # Note: We need to actually call the tool to increment rate limit
-        # For this test, we'll simulate by directly adding timestamps
-        from datetime import datetime, timedelta
-        now = datetime.utcnow()
-        policy_engine._rate_limit_timestamps[user_id] = [
-            now - timedelta(minutes=i) for i in range(101)
-        ]
+        # Exhaust the hourly limit
+        for _ in range(policy_engine.max_calls_per_hour):
+            assert policy_engine._check_rate_limit(user_id).is_allowed
         
         # Next call should be blocked
         with pytest.raises(MCPSecurityError) as exc_info:
@@ -99,6 +99,7 @@ class TestOntoGuardGraphQLQueries:
         # Check query fields exist
         assert hasattr(Query, 'ontoguard_status')
         assert hasattr(Query, 'ontoguard_validate')
+        assert hasattr(Query, 'ontoguard_validate_batch')
         assert hasattr(Query, 'ontoguard_allowed_actions')
         assert hasattr(Query, 'ontoguard_explain_rule')
 
@@ -107,5 +108,26 @@ class TestOntoGuardGraphQLQueries:
         from ai_agent_connector.app.graphql.schema import Query
         assert hasattr(Query, 'resolve_ontoguard_status')
         assert hasattr(Query, 'resolve_ontoguard_validate')
+        assert hasattr(Query, 'resolve_ontoguard_validate_batch')
         assert hasattr(Query, 'resolve_ontoguard_allowed_actions')
         assert hasattr(Query, 'resolve_ontoguard_explain_rule')
+
+    def test_validate_batch_uses_one_adapter_call(self):
+        """Test that batch validation answers every input with one adapter call"""
+        from ai_agent_connector.app.graphql.schema import Query
+        adapter = MagicMock()
+        adapter.validate_actions.return_value = [
+            MagicMock(allowed=True, reason='ok', constraints=[], suggestions=[]),
+            MagicMock(allowed=False, reason='denied', constraints=[], suggestions=[]),
+        ]
+        inputs = [
+            {'action': 'read', 'entity_type': 'PatientRecord', 'role': 'Doctor', 'domain': 'hospital'},
+            {'action': 'delete', 'entity_type': 'PatientRecord', 'role': 'Nurse'},
+        ]
+
+        with patch('ai_agent_connector.app.security.get_ontoguard_adapter', return_value=adapter):
+            results = Query().resolve_ontoguard_validate_batch(None, inputs)
+
+        assert [r['allowed'] for r in results] == [True, False]
+        batch = adapter.validate_actions.call_args.args[0]
+        assert batch[0]['context'] == {'role': 'Doctor', 'domain': 'hospital'}
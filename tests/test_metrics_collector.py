@@ -0,0 +1,120 @@
+"""Tests for rolling, histogram-backed query metrics."""
+
+import threading
+
+import pytest
+
+from ai_agent_connector.app.utils.metrics_collector import LatencyHistogram, MetricsCollector
+
+
+class TestLatencyHistogram:
+    def test_quantiles_within_precision(self):
+        hist = LatencyHistogram(precision=0.01)
+        values = [float(v) for v in range(1, 10001)]
+        for value in values:
+            hist.record(value)
+
+        for q in (0.5, 0.9, 0.95, 0.99):
+            exact = values[int(q * len(values)) - 1]
+            assert hist.quantile(q) == pytest.approx(exact, rel=0.02)
+        assert hist.min == 1.0
+        assert hist.max == 10000.0
+        assert len(hist.bins) < 1000
+
+    def test_equal_values_are_exact(self):
+        hist = LatencyHistogram()
+        for value in (100.0, 200.0, 300.0, 400.0, 500.0):
+            hist.record(value)
+        assert hist.quantile(0.5) == 300.0
+        assert hist.quantile(0.99) == 500.0
+
+    def test_merge_matches_single_histogram(self):
+        left, right, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 200):
+            (left if value % 2 else right).record(value)
+            both.record(value)
+        left.merge(right)
+        assert left.bins == both.bins
+        assert left.quantile(0.95) == both.quantile(0.95)
+
+    def test_zero_and_empty(self):
+        hist = LatencyHistogram()
+        assert hist.quantile(0.5) == 0.0
+        hist.record(0.0)
+        hist.record(5.0)
+        assert hist.quantile(0.5) == 0.0
+
+
+class TestMetricsCollector:
+    def test_aggregates(self):
+        collector = MetricsCollector()
+        for latency in (100.0, 200.0, 300.0, 400.0, 500.0):
+            collector.record_query('a', 'SELECT', latency, True, now=10.0)
+        collector.record_query('a', 'SELECT', 100.0, False, 'TimeoutError', now=11.0)
+
+        metrics = collector.get_agent_metrics('a', now=12.0)
+        assert metrics.total_queries == 6
+        assert metrics.failed_queries == 1
+        assert metrics.p50_latency_ms == 200.0
+        assert metrics.max_latency_ms == 500.0
+        assert metrics.min_latency_ms == 100.0
+        assert metrics.avg_latency_ms == pytest.approx(1600.0 / 6)
+        assert metrics.error_breakdown == {'TimeoutError': 1}
+        assert metrics.queries_per_second == pytest.approx(6 / 60)
+
+    def test_window_merges_buckets(self):
+        collector = MetricsCollector(bucket_seconds=5)
+        collector.record_query('a', 'SELECT', 900.0, True, now=0.0)
+        collector.record_query('a', 'SELECT', 10.0, True, now=100.0)
+
+        assert collector.get_agent_metrics('a', window_seconds=60, now=101.0).total_queries == 1
+        assert collector.get_agent_metrics('a', window_seconds=300, now=101.0).p99_latency_ms == 900.0
+        assert collector.get_agent_metrics('a', window_seconds=60, now=500.0) is None
+        assert collector.get_agent_metrics('missing') is None
+
+    def test_old_buckets_are_dropped(self):
+        collector = MetricsCollector(bucket_seconds=1, retention_seconds=10)
+        for second in range(100):
+            collector.record_query('a', 'SELECT', 1.0, True, now=float(second))
+        assert len(collector._series['a'].buckets) <= 12
+
+    def test_raw_samples_are_optional(self):
+        collector = MetricsCollector()
+        collector.record_query('a', 'SELECT', 1.0, True)
+        assert collector.get_recent_samples('a') == []
+
+        collector = MetricsCollector(max_metrics_per_agent=2)
+        for latency in (1.0, 2.0, 3.0):
+            collector.record_query('a', 'SELECT', latency, True)
+        assert [m.execution_time_ms for m in collector.get_recent_samples('a')] == [2.0, 3.0]
+        assert [m.execution_time_ms for m in collector.get_recent_samples('a', limit=1)] == [3.0]
+
+    def test_dashboard_and_clear(self):
+        collector = MetricsCollector()
+        collector.record_query('a', 'SELECT', 100.0, True)
+        collector.record_query('b', 'INSERT', 300.0, False)
+
+        data = collector.get_dashboard_data()
+        assert data['system_metrics']['total_queries'] == 2
+        assert data['system_metrics']['weighted_avg_latency_ms'] == 200.0
+        assert set(data['agent_metrics']) == {'a', 'b'}
+
+        collector.clear_agent_metrics('a')
+        assert collector.get_agent_metrics('a') is None
+        collector.clear_all_metrics()
+        assert collector.get_all_agents_metrics() == {}
+
+    def test_concurrent_recording(self):
+        collector = MetricsCollector()
+
+        def record(agent_id):
+            for i in range(500):
+                collector.record_query(agent_id, 'SELECT', float(i), True)
+
+        threads = [threading.Thread(target=record, args=(f'agent-{i % 2}',)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sum(m.total_queries for m in collector.get_all_agents_metrics().values()) == 2000
@@ -6,6 +6,7 @@ import pytest
 from ai_agent_connector.app.security.ontoguard_adapter import (
     ValidationResult,
     OntoGuardAdapter,
+    PermissionTable,
     get_ontoguard_adapter,
     reset_ontoguard_adapter,
 )
@@ -18,6 +19,7 @@ from ai_agent_connector.app.security.exceptions import (
     PermissionDeniedError,
     ApprovalRequiredError,
 )
+from ai_agent_connector.app.cache import get_cached_validations
 
 
 class TestValidationResult:
@@ -127,6 +129,262 @@ class TestOntoGuardAdapter:
         assert adapter.check_permissions("Admin", "delete", "User") is True
 
 
+class TestDomainValidatorPool:
+    @pytest.fixture
+    def ontoguard(self):
+        """Stand-in OntoGuard module; each validator remembers its ontology file."""
+        module = MagicMock()
+        module.OntologyValidator.side_effect = lambda path: MagicMock(path=path)
+        with patch.dict("sys.modules", {"ontoguard": module, "ontoguard.validator": module}):
+            yield module.OntologyValidator
+
+    @pytest.fixture
+    def adapter(self, ontoguard):
+        from ai_agent_connector.app.config.domains import get_ontology_path
+
+        adapter = OntoGuardAdapter(compile_permissions=False)
+        assert adapter.initialize([get_ontology_path("hospital")]) is True
+        return adapter
+
+    def test_default_domain_detected(self, adapter):
+        assert adapter.default_domain == "hospital"
+        assert adapter.get_validator("hospital") is adapter.validator
+        assert adapter.get_validator(None) is adapter.validator
+
+    def test_other_domain_loaded_once(self, adapter, ontoguard):
+        finance = adapter.get_validator("finance")
+        assert finance is not adapter.validator
+        assert finance.path.endswith("finance.owl")
+        assert adapter.get_validator("Finance (Финансы)") is finance
+        assert ontoguard.call_count == 2
+        assert adapter.get_loaded_domains() == ["finance", "hospital"]
+
+    def test_validate_action_uses_domain_validator(self, adapter):
+        adapter.validate_action("read", "Account", {"role": "Analyst", "domain": "finance"}, use_cache=False)
+        adapter.validator.validate.assert_not_called()
+        adapter.get_validator("finance").validate.assert_called_once()
+
+    def test_unknown_domain_falls_back_to_default(self, adapter):
+        assert adapter.load_domain("retail") is False
+        assert adapter.get_validator("retail") is adapter.validator
+
+    def test_reload_domain_swaps_validator(self, adapter, ontoguard):
+        old = adapter.get_validator("finance")
+        assert adapter.reload_domain("finance") is True
+        assert adapter.get_validator("finance") is not old
+        assert adapter.validator.path.endswith("hospital.owl")
+
+    def test_failed_reload_keeps_old_validator(self, adapter, ontoguard):
+        old = adapter.get_validator("finance")
+        assert adapter.reload_domain("finance", "/missing/finance.owl") is False
+        assert adapter.get_validator("finance") is old
+
+    def test_reinitialize_keeps_other_domains_warm(self, adapter, ontoguard):
+        from ai_agent_connector.app.config.domains import get_ontology_path
+
+        finance = adapter.get_validator("finance")
+        adapter.initialize([get_ontology_path("hospital")])
+        assert adapter.get_validator("finance") is finance
+        assert ontoguard.call_count == 3
+
+    def test_concurrent_first_use_loads_once(self, adapter, ontoguard):
+        import threading
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(adapter.get_validator("finance")))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len({id(v) for v in results}) == 1
+        assert ontoguard.call_count == 2
+
+
+def _rbac_result(allowed, constraint_type="role_based"):
+    result = MagicMock()
+    result.allowed = allowed
+    result.reason = "allowed" if allowed else "role not permitted"
+    result.suggested_actions = [] if allowed else ["read"]
+    result.metadata = {"constraint_type": constraint_type}
+    return result
+
+
+class TestPermissionTable:
+    @pytest.fixture
+    def validator(self):
+        """Anyone may read and Doctors prescribe; updates on Billing depend on context."""
+        def validate(action, entity, entity_id, context):
+            if entity == "Billing" and action == "update":
+                return _rbac_result(False, constraint_type="approval_required")
+            return _rbac_result(context["role"] == "Admin" or action == "read"
+                                or (context["role"] == "Doctor" and action == "prescribe"))
+
+        validator = MagicMock()
+        validator.validate.side_effect = validate
+        return validator
+
+    @pytest.fixture
+    def adapter(self, validator):
+        from ai_agent_connector.app.config.domains import get_ontology_path
+
+        module = MagicMock()
+        module.OntologyValidator.return_value = validator
+        with patch.dict("sys.modules", {"ontoguard": module, "ontoguard.validator": module}):
+            adapter = OntoGuardAdapter()
+            adapter.initialize([get_ontology_path("hospital")])
+        validator.validate.reset_mock()
+        return adapter
+
+    def test_compile_covers_domain_matrix(self, adapter):
+        stats = adapter.get_permission_table("hospital").get_stats()
+        assert stats["roles"] == 7
+        # Every action hospital.owl defines, not just CRUD
+        assert stats["actions"] == 12
+        # Billing:update depends on approval, so it is left to the validator
+        assert stats["compiled"] == stats["cells"] - stats["roles"]
+
+    def test_lookup_skips_validator(self, adapter, validator):
+        denied = adapter.validate_action("delete", "PatientRecord", {"role": "Nurse", "user_id": "u1"})
+        allowed = adapter.validate_action("read", "PatientRecord", {"role": "Nurse"})
+        assert denied.allowed is False
+        assert denied.suggestions == ["read"]
+        assert denied.metadata["compiled"] is True
+        assert allowed.allowed is True
+        validator.validate.assert_not_called()
+
+    def test_context_dependent_falls_through(self, adapter, validator):
+        adapter.validate_action("update", "Billing", {"role": "Admin"}, use_cache=False)
+        adapter.validate_action("read", "PatientRecord", {"role": "Nurse", "approved_by": "Admin"}, use_cache=False)
+        assert validator.validate.call_count == 2
+
+    def test_unknown_names_fall_through(self, adapter):
+        table = adapter.get_permission_table()
+        assert table.lookup("read", "Spaceship", "Nurse") is None
+        assert table.lookup("read", "PatientRecord", "Pilot") is None
+        assert table.lookup("launch", "PatientRecord", "Nurse") is None
+
+    def test_allowed_actions_from_table(self, adapter, validator):
+        assert adapter.get_allowed_actions("Nurse", "PatientRecord") == ["read"]
+        assert adapter.get_allowed_actions("Doctor", "PatientRecord") == ["read", "prescribe"]
+        assert adapter.get_allowed_actions("Admin", "PatientRecord") == [
+            "create", "read", "update", "delete", "approve", "prescribe",
+            "dispense", "schedule", "cancel", "transfer", "discharge", "export",
+        ]
+        validator.get_allowed_actions.assert_not_called()
+        # Billing has a context-dependent cell, so the validator answers
+        adapter.get_allowed_actions("Admin", "Billing")
+        validator.get_allowed_actions.assert_called_once()
+
+    def test_table_without_ontology_actions_defers_allowed_actions(self, validator):
+        table = PermissionTable.compile(validator, ["PatientRecord"], ["Admin"])
+        assert table.lookup("read", "PatientRecord", "Admin").allowed is True
+        assert table.allowed_actions("Admin", "PatientRecord") is None
+
+    def test_finance_non_crud_actions_compiled(self, adapter, validator):
+        module = MagicMock()
+        module.OntologyValidator.return_value = validator
+        with patch.dict("sys.modules", {"ontoguard": module, "ontoguard.validator": module}):
+            table = adapter.get_permission_table("finance")
+        assert table.lookup("block", "Account", "Admin").allowed is True
+        assert adapter.get_allowed_actions("Admin", "Account", "finance") == [
+            "read", "create", "update", "delete", "approve", "transfer", "block", "export",
+        ]
+
+    def test_replaced_validator_ignores_table(self, adapter):
+        adapter.validator = MagicMock()
+        assert adapter.get_permission_table() is None
+
+    def test_compile_disabled(self, validator):
+        table_adapter = OntoGuardAdapter(compile_permissions=False)
+        table_adapter._initialized = True
+        table_adapter.validator = validator
+        assert table_adapter.get_permission_table() is None
+
+
+class TestValidateActions:
+    @pytest.fixture
+    def validator(self):
+        validator = MagicMock()
+        validator.validate.side_effect = lambda action, entity, entity_id, context: _rbac_result(
+            action == "read", constraint_type="approval_required")
+        return validator
+
+    @pytest.fixture
+    def adapter(self, validator):
+        from ai_agent_connector.app.cache import init_validation_cache
+        from ai_agent_connector.app.config.domains import get_ontology_path
+
+        init_validation_cache(max_size=100, default_ttl=60.0)
+        module = MagicMock()
+        module.OntologyValidator.return_value = validator
+        with patch.dict("sys.modules", {"ontoguard": module, "ontoguard.validator": module}):
+            adapter = OntoGuardAdapter(compile_permissions=False)
+            adapter.initialize([get_ontology_path("hospital")])
+        yield adapter
+        init_validation_cache()
+
+    def test_tables_resolved_from_domain_map(self, adapter):
+        assert adapter.resolve_entity_type("Patients") == "PatientRecord"
+        assert adapter.resolve_entity_type("accounts", "finance") == "Account"
+        assert adapter.resolve_entity_type("shipping_labels") == "ShippingLabels"
+        assert adapter.get_table_entity_map() is adapter.get_table_entity_map("hospital")
+
+    def test_results_in_batch_order(self, adapter, validator):
+        results = adapter.validate_actions(
+            [{"action": "read", "table": "patients"},
+             {"action": "delete", "entity_type": "Billing"},
+             {"action": "read", "table": "patients", "context": {"role": "Nurse"}}],
+            {"role": "Doctor"},
+        )
+        assert [r.allowed for r in results] == [True, False, True]
+        entities = [c.kwargs["entity"] for c in validator.validate.call_args_list]
+        assert entities == ["PatientRecord", "Billing", "PatientRecord"]
+
+    def test_one_cache_lookup_per_batch(self, adapter, validator):
+        batch = [{"action": "read", "table": table} for table in ("patients", "billing", "patients")]
+        adapter.validate_actions(batch, {"role": "Doctor"})
+        assert validator.validate.call_count == 2
+
+        validator.validate.reset_mock()
+        with patch("ai_agent_connector.app.security.ontoguard_adapter.get_cached_validations",
+                   wraps=get_cached_validations) as lookup:
+            results = adapter.validate_actions(batch, {"role": "Doctor"})
+        lookup.assert_called_once()
+        assert all(r.metadata["cached"] for r in results)
+        validator.validate.assert_not_called()
+
+    def test_reload_default_domain_drops_cached_decisions(self, adapter, validator):
+        contexts = [{"role": "Doctor"}, {"role": "Doctor", "domain": "hospital"},
+                    {"role": "Doctor", "domain": "Hospital (Госпиталь)"}]
+        for context in contexts:
+            adapter.validate_action("read", "PatientRecord", context)
+        adapter.validate_actions([{"action": "read", "table": "patients"}], {"role": "Doctor"})
+        assert validator.validate.call_count == 1
+
+        module = MagicMock()
+        module.OntologyValidator.return_value = validator
+        with patch.dict("sys.modules", {"ontoguard": module, "ontoguard.validator": module}):
+            assert adapter.reload_domain("hospital") is True
+
+        # Domain-less and alias requests share the refreshed decision
+        for context in contexts:
+            adapter.validate_action("read", "PatientRecord", context)
+        assert validator.validate.call_count == 2
+
+    def test_validator_error_denies_item(self, adapter, validator):
+        validator.validate.side_effect = RuntimeError("broken ontology")
+        [result] = adapter.validate_actions([{"action": "read", "table": "patients"}], {"role": "Doctor"})
+        assert result.allowed is False
+        assert "broken ontology" in result.reason
+
+    def test_pass_through(self):
+        results = OntoGuardAdapter().validate_actions([{"action": "read", "table": "t"}] * 2)
+        assert [r.allowed for r in results] == [True, True]
+
+
 class TestSingleton:
     def setup_method(self):
         reset_ontoguard_adapter()
@@ -0,0 +1,138 @@
+"""Unit tests for the shared connection pool cache."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_agent_connector.app.agents.registry import AgentRegistry
+from ai_agent_connector.app.db.pool_cache import ConnectionPoolCache
+from ai_agent_connector.app.db.pooling import PoolingConfig
+from ai_agent_connector.app.utils.encryption import reset_encryptor
+
+
+def _pooled_connector(enabled=True):
+    """Build a DatabaseConnector stand-in whose inner connector creates a new pool."""
+    connector = MagicMock()
+    inner = connector._connector
+    inner.pooling_config = PoolingConfig(enabled=enabled)
+    inner.pool = None
+
+    def create_pool():
+        inner.pool = MagicMock(name="pool")
+
+    inner._create_pool.side_effect = create_pool
+    return connector
+
+
+class TestConnectionPoolCache:
+    def test_unpooled_connector_untouched(self):
+        cache = ConnectionPoolCache()
+        connector = _pooled_connector(enabled=False)
+        assert cache.attach("a", "h1", connector) is connector
+        connector._connector._create_pool.assert_not_called()
+        assert cache.get_stats()["pools"] == 0
+
+    def test_pool_shared_between_connectors(self):
+        cache = ConnectionPoolCache()
+        first = cache.attach("a", "h1", _pooled_connector())
+        second = cache.attach("a", "h1", _pooled_connector())
+        assert second._connector.pool is first._connector.pool
+        second._connector._create_pool.assert_not_called()
+        stats = cache.get_stats()
+        assert stats["pools"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_new_config_hash_retires_old_pool(self):
+        cache = ConnectionPoolCache()
+        old = cache.attach("a", "h1", _pooled_connector())
+        new = cache.attach("a", "h2", _pooled_connector())
+        old._connector.pool.closeall.assert_called_once()
+        assert new._connector.pool is not old._connector.pool
+        assert cache.get_stats()["pools"] == 1
+
+    def test_invalidate_closes_only_owner_pools(self):
+        cache = ConnectionPoolCache()
+        a = cache.attach("a", "h1", _pooled_connector())
+        b = cache.attach("b", "h1", _pooled_connector())
+        assert cache.invalidate("a") == 1
+        a._connector.pool.closeall.assert_called_once()
+        b._connector.pool.closeall.assert_not_called()
+        assert cache.invalidate("a") == 0
+
+    def test_invalidate_waits_for_borrowed_connections(self):
+        cache = ConnectionPoolCache()
+        pool = cache.attach("a", "h1", _pooled_connector())._connector.pool
+        first, second = pool.getconn(), pool.getconn()
+
+        assert cache.invalidate("a") == 1
+        assert cache.get_stats()["pools"] == 0
+        pool.closeall.assert_not_called()
+
+        pool.putconn(first)
+        pool.closeall.assert_not_called()
+        pool.putconn(second)
+        pool.closeall.assert_called_once()
+
+    def test_failed_return_still_releases_retired_pool(self):
+        cache = ConnectionPoolCache()
+        pool = cache.attach("a", "h1", _pooled_connector())._connector.pool
+        conn = pool.connection()
+        pool._pool.put_connection.side_effect = RuntimeError("pool closed")
+        cache.invalidate("a")
+
+        with pytest.raises(RuntimeError):
+            pool.put_connection(conn)
+        pool.closeall.assert_called_once()
+        assert pool.borrowed == 0
+
+
+class TestRegistryPoolReuse:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        reset_encryptor()
+        yield
+        reset_encryptor()
+
+    @pytest.fixture
+    def registry(self):
+        with patch("ai_agent_connector.app.agents.registry.DatabaseConnector") as cls:
+            cls.side_effect = lambda **kwargs: _pooled_connector()
+            registry = AgentRegistry()
+            registry.register_agent(
+                "agent-1",
+                {"name": "Agent"},
+                credentials={"api_key": "k", "api_secret": "s"},
+                database_config={
+                    "type": "postgresql",
+                    "host": "localhost",
+                    "user": "u",
+                    "password": "p",
+                    "database": "db",
+                    "pooling": {"enabled": True},
+                },
+            )
+            yield registry
+
+    def test_connectors_share_pool(self, registry):
+        first = registry.get_database_connector("agent-1")
+        second = registry.get_database_connector("agent-1")
+        assert first is not second
+        assert first._connector.pool is second._connector.pool
+        assert registry.get_connection_pool_stats()["hits"] == 1
+
+    def test_update_database_invalidates_pool(self, registry):
+        old_pool = registry.get_database_connector("agent-1")._connector.pool
+        registry.update_agent_database(
+            "agent-1",
+            {"type": "postgresql", "host": "other", "user": "u", "password": "p2",
+             "database": "db", "pooling": {"enabled": True}},
+        )
+        old_pool.closeall.assert_called_once()
+        assert registry.get_database_connector("agent-1")._connector.pool is not old_pool
+
+    def test_revoke_invalidates_pool(self, registry):
+        pool = registry.get_database_connector("agent-1")._connector.pool
+        registry.revoke_agent("agent-1")
+        pool.closeall.assert_called_once()
+        assert registry.get_connection_pool_stats()["pools"] == 0
@@ -0,0 +1,165 @@
+"""Unit tests for the fingerprint-keyed query result cache."""
+
+import time
+
+from ai_agent_connector.app.utils.query_cache import QueryCache
+
+
+class TestQueryCacheFingerprints:
+    def test_literals_keep_entries_separate(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users WHERE id = 1", [{"id": 1}])
+        cache.set("SELECT * FROM users WHERE id = 2", [{"id": 2}])
+        assert cache.get("SELECT * FROM users WHERE id = 1") == [{"id": 1}]
+        assert cache.get("SELECT * FROM users WHERE id = 2") == [{"id": 2}]
+        assert cache.get("SELECT * FROM users WHERE id = 3") is None
+
+    def test_variants_share_fingerprint(self):
+        cache = QueryCache()
+        first = cache._hash_query("SELECT * FROM users WHERE name = 'a'")
+        second = cache._hash_query("SELECT   * FROM users WHERE name = 'b'")
+        assert first != second
+        assert first.split(":")[0] == second.split(":")[0]
+
+    def test_comment_markers_inside_literals_are_values(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users WHERE s = 'a--b'", ["dashes"])
+        cache.set("SELECT * FROM users WHERE s = 'a/*b*/c'", ["block"])
+        assert cache.get("SELECT * FROM users WHERE s = 'a--zzz'") is None
+        assert cache.get("SELECT * FROM users WHERE s = 'a/*zzz*/c'") is None
+        assert cache.get("SELECT * FROM users WHERE s = 'a--b'") == ["dashes"]
+        assert cache.get("SELECT * FROM users WHERE s = 'a/*b*/c'") == ["block"]
+
+    def test_whitespace_inside_literals_is_significant(self):
+        cache = QueryCache()
+        spaced = cache._hash_query("SELECT * FROM users WHERE name = 'a  b'")
+        single = cache._hash_query("SELECT * FROM users WHERE name = 'a b'")
+        assert spaced != single
+        assert spaced.split(":")[0] == single.split(":")[0]
+        assert spaced == cache._hash_query("SELECT *  FROM users -- note\n WHERE name = 'a  b'")
+
+    def test_params_are_part_of_key(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users WHERE id = %s", ["a"], params=[1])
+        assert cache.get("SELECT * FROM users WHERE id = %s", params=[2]) is None
+        assert cache.get("SELECT * FROM users WHERE id = %s", params=[1]) == ["a"]
+
+    def test_invalidate_fingerprint_drops_all_variants(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users WHERE id = 1", [1])
+        cache.set("SELECT * FROM users WHERE id = 2", [2])
+        cache.set("SELECT * FROM orders WHERE id = 1", [3])
+        assert cache.invalidate_fingerprint("SELECT * FROM users WHERE id = 99") == 2
+        assert cache.get("SELECT * FROM orders WHERE id = 1") == [3]
+
+
+class TestQueryCacheTableIndex:
+    def test_write_invalidates_only_dependent_entries(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM public.users WHERE id = 1", [1])
+        cache.set("SELECT * FROM users u JOIN orders o ON u.id = o.user_id", [2])
+        cache.set("SELECT * FROM products", [3])
+
+        assert cache.invalidate_for_write("UPDATE users SET name = 'x' WHERE id = 1") == 2
+        assert cache.get("SELECT * FROM products") == [3]
+        assert "users" not in cache._table_index
+        assert set(cache._table_index) == {"products"}
+
+    def test_read_does_not_invalidate(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users", [1])
+        assert cache.invalidate_for_write("SELECT * FROM users") == 0
+        assert cache.get("SELECT * FROM users") == [1]
+
+    def test_index_cleaned_on_remove_paths(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users", [1], metadata={"agent_id": "a"})
+        cache.set("SELECT * FROM orders", [2])
+        cache.invalidate(query="SELECT * FROM orders")
+        cache.remove_agent_cache("a")
+        assert cache._cache == {}
+        assert cache._table_index == {}
+        assert cache._fingerprint_index == {}
+
+    def test_pattern_invalidation_still_supported(self):
+        cache = QueryCache()
+        cache.set("SELECT * FROM users", [1])
+        cache.set("SELECT * FROM orders", [2])
+        assert cache.invalidate(pattern="USERS") == 1
+        assert cache.get("SELECT * FROM orders") == [2]
+
+
+class TestQueryCacheBounds:
+    def test_max_entries_evicts_lru(self):
+        cache = QueryCache(max_entries=2, expiry_interval=0)
+        cache.set("SELECT * FROM a", [1])
+        cache.set("SELECT * FROM b", [2])
+        cache.get("SELECT * FROM a")
+        cache.get("SELECT * FROM c")
+        assert cache.set("SELECT * FROM c", [3]) is True
+        assert cache.get("SELECT * FROM b") is None
+        assert cache.get("SELECT * FROM a") == [1]
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_cold_candidate_cannot_evict_hot_entries(self):
+        cache = QueryCache(max_entries=2, expiry_interval=0)
+        for table in ("a", "b"):
+            cache.set(f"SELECT * FROM {table}", [table])
+            for _ in range(3):
+                cache.get(f"SELECT * FROM {table}")
+        assert cache.set("SELECT * FROM scan", list(range(1000))) is False
+        assert cache.get("SELECT * FROM a") == ["a"]
+        assert cache.get("SELECT * FROM b") == ["b"]
+        assert cache.get_stats()["rejections"] == 1
+
+    def test_max_bytes_is_enforced(self):
+        cache = QueryCache(max_bytes=20000, expiry_interval=0)
+        assert cache.set("SELECT * FROM big", [{"v": "x" * 100}] * 1000) is False
+        cache.set("SELECT * FROM small", [{"v": 1}])
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 1
+        assert 0 < stats["total_bytes"] <= 20000
+
+    def test_stats_are_incremental(self):
+        cache = QueryCache(expiry_interval=0)
+        cache.set("SELECT * FROM a", [1], ttl_seconds=60)
+        cache.set("SELECT * FROM b", [2], ttl_seconds=120)
+        cache.get("SELECT * FROM a")
+        cache.get("SELECT * FROM missing")
+        stats = cache.get_stats()
+        assert stats["total_hits"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["average_ttl_seconds"] == 90
+        cache.invalidate(query="SELECT * FROM b")
+        assert cache.get_stats()["average_ttl_seconds"] == 60
+        assert cache.get_stats()["total_bytes"] > 0
+        cache.invalidate()
+        assert cache.get_stats()["total_bytes"] == 0
+
+
+class TestQueryCacheExpiryWheel:
+    def test_wheel_reaps_expired_entries(self):
+        cache = QueryCache(expiry_interval=0)
+        cache.set("SELECT * FROM a", [1], ttl_seconds=0)
+        cache.set("SELECT * FROM b", [2], ttl_seconds=3600)
+        assert cache.clear_expired() == 1
+        assert list(cache._cache) == [cache._hash_query("SELECT * FROM b")]
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_expired_entry_not_served_before_tick(self):
+        cache = QueryCache(expiry_interval=0)
+        cache.set("SELECT * FROM a", [1], ttl_seconds=0)
+        assert cache.get("SELECT * FROM a") is None
+        assert cache.get_stats()["expired_entries"] == 1
+
+    def test_background_reaper(self):
+        cache = QueryCache(expiry_interval=0.01)
+        try:
+            cache.set("SELECT * FROM a", [1], ttl_seconds=0)
+            deadline = time.time() + 2
+            while cache._cache and time.time() < deadline:
+                time.sleep(0.01)
+            assert not cache._cache
+        finally:
+            cache.stop()
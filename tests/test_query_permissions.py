@@ -0,0 +1,80 @@
+"""Route-level permission checks of the query endpoint for CTEs and unresolved writes."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from ai_agent_connector.app.api import api_bp, routes
+from ai_agent_connector.app.permissions.access_control import Permission
+
+
+@pytest.fixture
+def connector():
+    connector = MagicMock()
+    connector.execute_query.return_value = []
+    return connector
+
+
+@pytest.fixture
+def client(connector):
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+    routes.access_control.resource_permissions.clear()
+    routes.rate_limiter.reset_agent_limits('agent-1')
+
+    with patch('ai_agent_connector.app.agents.registry.DatabaseConnector', return_value=connector):
+        routes.agent_registry.register_agent(
+            'agent-1', {'name': 'Agent'},
+            credentials={'api_key': 'key-1', 'api_secret': 's'},
+            database_config={'type': 'postgresql', 'host': 'db', 'user': 'u',
+                             'password': 'p', 'database': 'app'},
+        )
+        routes.access_control.set_resource_permissions('agent-1', 'users', [Permission.READ])
+        connector.reset_mock()
+
+        app = Flask(__name__)
+        app.register_blueprint(api_bp, url_prefix='/api')
+        with patch.object(routes, 'authenticate_agent', return_value='agent-1'), \
+                patch.object(routes, 'get_ontoguard_adapter', return_value=MagicMock(is_active=False)):
+            with app.test_client() as client:
+                yield client
+
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+    routes.access_control.resource_permissions.clear()
+
+
+def _query(client, sql):
+    return client.post('/api/agents/agent-1/query', json={'query': sql})
+
+
+def test_cte_named_after_its_table_still_checked(client, connector):
+    response = _query(client, 'WITH payroll AS (SELECT * FROM payroll) SELECT * FROM payroll')
+    assert response.status_code == 403
+    assert [r['resource'] for r in response.get_json()['denied_resources']] == ['payroll']
+    connector.execute_query.assert_not_called()
+
+
+def test_data_modifying_cte_requires_write_permission(client, connector):
+    routes.access_control.set_resource_permissions('agent-1', 'payroll', [Permission.READ])
+    response = _query(client, 'WITH payroll AS (DELETE FROM payroll RETURNING *) SELECT 1')
+    assert response.status_code == 403
+    denied = response.get_json()['denied_resources']
+    assert denied[0]['resource'] == 'payroll'
+    assert denied[0]['required_permission'] == 'write'
+    connector.execute_query.assert_not_called()
+
+
+def test_write_without_resolvable_table_denied(client, connector):
+    routes.access_control.grant_permission('agent-1', Permission.WRITE)
+    response = _query(client, 'DELETE FROM "payroll"')
+    assert response.status_code == 403
+    assert response.get_json()['denied_resources'][0]['resource'] == '*'
+    connector.execute_query.assert_not_called()
+
+
+def test_permitted_read_runs(client, connector):
+    response = _query(client, 'SELECT * FROM users')
+    assert response.status_code == 200
+    connector.execute_query.assert_called_once()
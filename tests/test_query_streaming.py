@@ -0,0 +1,150 @@
+"""Tests for server-side cursor streaming of query results."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+from flask import Flask
+
+from ai_agent_connector.app.api import api_bp, routes
+from ai_agent_connector.app.db.connectors import MongoDBConnector, MySQLConnector, PostgreSQLConnector
+from ai_agent_connector.app.permissions.access_control import Permission
+
+
+def _connected(connector, conn):
+    connector.conn = conn
+    connector._is_connected = True
+    return connector
+
+
+class TestConnectorStreaming:
+    def test_postgresql_uses_named_cursor_batches(self):
+        conn = MagicMock(closed=False)
+        named = conn.cursor.return_value.__enter__.return_value
+        named.fetchmany.side_effect = [[(1,), (2,)], [(3,)], []]
+        connector = _connected(PostgreSQLConnector({'host': 'h', 'user': 'u', 'database': 'd'}), conn)
+
+        rows = list(connector.stream_query('SELECT * FROM t', batch_size=2))
+
+        assert rows == [(1,), (2,), (3,)]
+        assert conn.cursor.call_args.kwargs['name'].startswith('stream_')
+        named.fetchmany.assert_called_with(2)
+        named.fetchall.assert_not_called()
+        conn.rollback.assert_called_once()
+
+    def test_mysql_uses_unbuffered_cursor(self):
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchmany.side_effect = [[{'id': 1, 'name': 'a'}], []]
+        connector = _connected(MySQLConnector({'host': 'h', 'user': 'u', 'database': 'd'}), conn)
+
+        assert list(connector.stream_query('SELECT * FROM t')) == [(1, 'a')]
+        assert conn.cursor.call_args.args[0] is connector.pymysql.cursors.SSDictCursor
+
+    def test_mongodb_iterates_cursor(self):
+        with patch.dict('sys.modules', {'pymongo': MagicMock()}):
+            connector = MongoDBConnector({'host': 'h', 'database': 'd'})
+        connector._is_connected = True
+        connector.db = MagicMock()
+        cursor = connector.db.__getitem__.return_value.find.return_value
+        cursor.__iter__.return_value = iter([{'_id': 1}, {'_id': 2}])
+
+        rows = list(connector.stream_query('{"collection": "users"}', as_dict=True, batch_size=50))
+
+        assert rows == [{'_id': 1}, {'_id': 2}]
+        assert connector.db.__getitem__.return_value.find.call_args.kwargs['batch_size'] == 50
+        cursor.close.assert_called_once()
+
+
+@pytest.fixture
+def connector():
+    return MagicMock()
+
+
+@pytest.fixture
+def client(connector):
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+    routes.rate_limiter.reset_agent_limits('agent-1')
+
+    with patch('ai_agent_connector.app.agents.registry.DatabaseConnector', return_value=connector):
+        routes.agent_registry.register_agent(
+            'agent-1', {'name': 'Agent'},
+            credentials={'api_key': 'key-1', 'api_secret': 's'},
+            database_config={'type': 'postgresql', 'host': 'db', 'user': 'u',
+                             'password': 'p', 'database': 'app'},
+        )
+        routes.access_control.grant_permission('agent-1', Permission.READ)
+        connector.reset_mock()
+
+        app = Flask(__name__)
+        app.register_blueprint(api_bp, url_prefix='/api')
+        with patch.object(routes, 'authenticate_agent', return_value='agent-1'), \
+                patch.object(routes, 'get_ontoguard_adapter', return_value=MagicMock(is_active=False)):
+            with app.test_client() as client:
+                yield client
+
+    routes.agent_registry.reset()
+    routes.access_control.permissions.clear()
+
+
+class TestStreamingRoute:
+    def test_ndjson_stream(self, client, connector):
+        connector.stream_query.return_value = iter([(1, 'a'), (2, 'b')])
+        response = client.post('/api/agents/agent-1/query', json={
+            'query': 'SELECT * FROM users', 'stream': 'ndjson'
+        })
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line) for line in lines] == [[1, 'a'], [2, 'b']]
+        connector.execute_query.assert_not_called()
+        connector.disconnect.assert_called_once()
+
+    def test_json_array_stream_matches_regular_shape(self, client, connector):
+        connector.stream_query.return_value = iter([{'id': i} for i in range(routes.STREAM_BATCH_SIZE + 1)])
+        response = client.post('/api/agents/agent-1/query', json={
+            'query': 'SELECT * FROM users', 'stream': 'json', 'as_dict': True
+        })
+        data = json.loads(response.get_data(as_text=True))
+        assert data['success'] is True
+        assert data['tables_accessed'] == ['users']
+        assert data['row_count'] == routes.STREAM_BATCH_SIZE + 1
+        assert data['result'][-1] == {'id': routes.STREAM_BATCH_SIZE}
+
+    def test_empty_result(self, client, connector):
+        connector.stream_query.return_value = iter([])
+        response = client.post('/api/agents/agent-1/query', json={
+            'query': 'SELECT * FROM users', 'stream': 'json'
+        })
+        data = json.loads(response.get_data(as_text=True))
+        assert data['result'] == []
+        assert data['row_count'] == 0
+
+    def test_error_before_first_row_is_500(self, client, connector):
+        connector.stream_query.return_value = MagicMock(__next__=MagicMock(side_effect=RuntimeError('bad sql')))
+        response = client.post('/api/agents/agent-1/query', json={
+            'query': 'SELECT * FROM users', 'stream': True
+        })
+        assert response.status_code == 500
+        assert response.get_json()['message'] == 'bad sql'
+        connector.disconnect.assert_called_once()
+
+    def test_error_mid_stream_ends_with_error_line(self, client, connector):
+        def rows():
+            yield (1,)
+            raise RuntimeError('connection lost')
+
+        connector.stream_query.return_value = rows()
+        response = client.post('/api/agents/agent-1/query', json={
+            'query': 'SELECT * FROM users', 'stream': 'ndjson'
+        })
+        lines = response.get_data(as_text=True).splitlines()
+        assert json.loads(lines[0]) == [1]
+        assert json.loads(lines[-1])['message'] == 'connection lost'
+
+    def test_invalid_stream_format(self, client):
+        response = client.post('/api/agents/agent-1/query', json={
+            'query': 'SELECT * FROM users', 'stream': 'xml'
+        })
+        assert response.status_code == 400
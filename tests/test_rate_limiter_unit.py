@@ -1,10 +1,21 @@
 """Unit tests for rate limiter."""
 
+import fnmatch
 import time
-from unittest.mock import patch
+from datetime import datetime
+from unittest.mock import MagicMock, patch
 
 import pytest
-from ai_agent_connector.app.utils.rate_limiter import RateLimitConfig, RateLimiter
+from ai_agent_connector.app.utils.rate_limiter import (
+    LimiterEngine,
+    MemoryRateLimitStore,
+    RateLimitConfig,
+    RateLimiter,
+    RedisRateLimitStore,
+    SQLiteRateLimitStore,
+    create_rate_limit_store,
+    create_rate_limiter,
+)
 
 
 class TestRateLimitConfig:
@@ -63,6 +74,16 @@ class TestRateLimiter:
         assert allowed is False
         assert "per minute" in msg
 
+    def test_cost_is_all_or_nothing(self):
+        rl = RateLimiter()
+        rl.set_rate_limit("a", RateLimitConfig(queries_per_minute=5))
+        assert rl.check_rate_limit("a", cost=4)[0] is True
+        allowed, msg = rl.check_rate_limit("a", cost=2)
+        assert allowed is False
+        assert "per minute" in msg
+        assert rl.check_rate_limit("a", cost=1)[0] is True
+        assert rl.get_usage_stats("a")["current_usage"]["queries_last_minute"] == 5
+
     def test_usage_stats_no_config(self):
         rl = RateLimiter()
         stats = rl.get_usage_stats("x")
@@ -114,3 +135,338 @@ class TestRateLimiter:
             mock_time.time.return_value = 1061.0
             allowed, _ = rl.check_rate_limit("a")
             assert allowed is True
+
+    def test_day_limit_message(self):
+        rl = RateLimiter()
+        rl.set_rate_limit("a", RateLimitConfig(queries_per_minute=10, queries_per_day=1))
+        rl.check_rate_limit("a")
+        allowed, msg = rl.check_rate_limit("a")
+        assert allowed is False
+        assert msg == "Rate limit exceeded: 1 queries per day"
+
+    def test_denied_query_is_not_counted(self):
+        rl = RateLimiter()
+        rl.set_rate_limit("a", RateLimitConfig(queries_per_minute=5, queries_per_hour=1))
+        rl.check_rate_limit("a")
+        rl.check_rate_limit("a")
+        usage = rl.get_usage_stats("a")["current_usage"]
+        assert usage["queries_last_minute"] == 1
+        assert usage["queries_last_hour"] == 1
+
+
+class TestLimiterEngine:
+    def test_burst_then_steady_rate(self):
+        engine = LimiterEngine()
+        limits = [(4, 60.0)]
+        assert all(engine.acquire("k", limits, now=0.0).allowed for _ in range(4))
+
+        denied = engine.acquire("k", limits, now=0.0)
+        assert denied.allowed is False
+        assert denied.exceeded == 0
+        assert denied.retry_after == pytest.approx(15.0)
+        assert denied.used == [4]
+
+        # One request frees up every window / limit seconds
+        assert engine.acquire("k", limits, now=15.0).allowed is True
+        assert engine.acquire("k", limits, now=15.0).allowed is False
+        assert engine.usage("k", limits, now=45.0) == [2]
+        assert engine.usage("k", limits, now=75.0) == [0]
+
+    def test_all_or_nothing_across_limits(self):
+        engine = LimiterEngine()
+        limits = [(10, 60.0), (1, 3600.0)]
+        assert engine.acquire("k", limits, now=0.0).allowed is True
+        assert engine.acquire("k", limits, now=1.0).exceeded == 1
+        assert engine.usage("k", limits, now=1.0) == [1, 1]
+
+    def test_zero_limit_denies(self):
+        engine = LimiterEngine()
+        decision = engine.acquire("k", [(10, 60.0), (0, 3600.0)], now=0.0)
+        assert decision.allowed is False
+        assert decision.exceeded == 1
+        assert decision.used == [0, 0]
+
+    def test_state_is_fixed_per_key(self):
+        engine = LimiterEngine(shards=4)
+        for i in range(10000):
+            engine.acquire("k", [(100000, 86400.0)], now=float(i))
+        assert len(engine) == 1
+        assert engine._shard("k").state["k"].keys() == {86400.0}
+
+    def test_reset(self):
+        engine = LimiterEngine()
+        engine.acquire("a", [(1, 60.0)], now=0.0)
+        engine.acquire("b", [(1, 60.0)], now=0.0)
+        engine.reset("a")
+        assert engine.acquire("a", [(1, 60.0)], now=0.0).allowed is True
+        engine.reset()
+        assert len(engine) == 0
+
+    def test_concurrent_acquire_never_over_admits(self):
+        import threading
+
+        engine = LimiterEngine()
+        admitted = []
+
+        def worker():
+            for _ in range(200):
+                if engine.acquire("k", [(500, 3600.0)]).allowed:
+                    admitted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(admitted) == 500
+
+
+class TestPolicyEngineRateLimit:
+    def test_allows_limit_then_denies(self):
+        from policy_engine import PolicyEngine
+
+        engine = PolicyEngine(max_calls_per_hour=3)
+        with patch("policy_engine.time.time", return_value=1000.0):
+            counts = [engine._check_rate_limit("u").metadata["call_count"] for _ in range(3)]
+            denied = engine._check_rate_limit("u")
+
+        assert counts == [1, 2, 3]
+        assert denied.is_allowed is False
+        assert denied.failed_policy == "rate_limit"
+        assert denied.metadata == {"call_count": 3, "limit": 3}
+        # One call frees up every hour / 3
+        assert denied.suggestions[0] == f"Wait until {datetime.utcfromtimestamp(2200.0).isoformat()} to retry"
+
+    def test_zero_limit_denies(self):
+        from policy_engine import PolicyEngine
+
+        result = PolicyEngine(max_calls_per_hour=0)._check_rate_limit("u")
+        assert result.is_allowed is False
+        assert result.failed_policy == "rate_limit"
+
+
+class WatchError(Exception):
+    pass
+
+
+class _FakePipeline:
+    """Just enough of a redis-py pipeline for WATCH/MULTI/EXEC"""
+
+    def __init__(self, server):
+        self.server = server
+        self.watched = {}
+        self.queued = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def watch(self, key):
+        self.watched[key] = self.server.versions.get(key, 0)
+
+    def hgetall(self, key):
+        return self.server.hgetall(key)
+
+    def multi(self):
+        if self.server.interfere:
+            # Another worker writes between our read and EXEC
+            self.server.interfere -= 1
+            for key in self.watched:
+                self.server.versions[key] = self.server.versions.get(key, 0) + 1
+
+    def hset(self, key, mapping):
+        self.queued.append(('hset', key, mapping))
+
+    def pexpire(self, key, ms):
+        self.queued.append(('pexpire', key, ms))
+
+    def execute(self):
+        if any(self.server.versions.get(k, 0) != v for k, v in self.watched.items()):
+            raise WatchError()
+        for op, key, arg in self.queued:
+            if op == 'hset':
+                self.server.data.setdefault(key, {}).update(
+                    {f.encode(): v.encode() for f, v in arg.items()}
+                )
+                self.server.versions[key] = self.server.versions.get(key, 0) + 1
+            else:
+                self.server.ttls[key] = arg
+
+
+class FakeRedis:
+    """In-process stand-in for a Redis server"""
+
+    def __init__(self):
+        self.data = {}
+        self.versions = {}
+        self.ttls = {}
+        self.interfere = 0
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        return [k for k in self.data if fnmatch.fnmatch(k, match)]
+
+
+def _workers(store, count=3, **kwargs):
+    workers = [RateLimiter(store=store, **kwargs) for _ in range(count)]
+    for worker in workers:
+        worker.set_rate_limit("a", RateLimitConfig(queries_per_minute=100))
+    return workers
+
+
+def _admitted(workers, rounds):
+    return sum(
+        worker.check_rate_limit("a")[0]
+        for _ in range(rounds)
+        for worker in workers
+    )
+
+
+class TestSharedStore:
+    @pytest.fixture(params=["memory", "sqlite", "redis"])
+    def store(self, request, tmp_path):
+        if request.param == "memory":
+            store = MemoryRateLimitStore()
+        elif request.param == "sqlite":
+            store = SQLiteRateLimitStore(str(tmp_path / "limits.db"))
+        else:
+            store = RedisRateLimitStore(client=FakeRedis())
+        yield store
+        store.close()
+
+    def test_limit_holds_across_workers(self, store):
+        workers = _workers(store)
+        assert _admitted(workers, 50) == 100
+        allowed, msg = workers[0].check_rate_limit("a")
+        assert allowed is False
+        assert msg == "Rate limit exceeded: 100 queries per minute"
+
+    def test_requests_are_leased_in_blocks(self, store):
+        worker = _workers(store, count=1)[0]
+        for _ in range(30):
+            worker.check_rate_limit("a")
+        stats = worker.get_store_stats()
+        assert stats["store_leases"] == 3
+        assert stats["local_hits"] == 27
+        # Leased but unspent requests are not reported as usage
+        assert worker.get_usage_stats("a")["current_usage"]["queries_last_minute"] == 30
+
+    def test_unspent_lease_is_refunded(self, store):
+        worker = _workers(store, count=1, lease_ttl=0.0)[0]
+        worker.check_rate_limit("a")
+        worker.check_rate_limit("a")
+        assert store.usage("a", [(100, 60.0)]) == [11]
+
+    def test_cost_is_charged_against_the_store(self, store):
+        worker = _workers(store, count=1)[0]
+        assert worker.check_rate_limit("a", cost=95)[0] is True
+        allowed, msg = worker.check_rate_limit("a", cost=10)
+        assert allowed is False
+        assert msg == "Rate limit exceeded: 100 queries per minute"
+        # The partial grant is kept for smaller requests
+        assert worker.check_rate_limit("a", cost=5)[0] is True
+        assert worker.check_rate_limit("a")[0] is False
+
+    def test_config_without_limits_allows(self, store):
+        worker = RateLimiter(store=store)
+        worker.set_rate_limit("a", RateLimitConfig())
+        assert worker.check_rate_limit("a") == (True, None)
+        assert worker.get_store_stats()["store_leases"] == 0
+
+    def test_reset_clears_store(self, store):
+        workers = _workers(store, count=2)
+        _admitted(workers, 50)
+        workers[0].reset_agent_limits("a")
+        assert store.usage("a", [(100, 60.0)]) == [0]
+
+    def test_namespaces_are_separate(self, store):
+        first = RateLimiter(store=store, namespace="api:")
+        second = RateLimiter(store=store, namespace="ai_agent:")
+        for limiter in (first, second):
+            limiter.set_rate_limit("a", RateLimitConfig(queries_per_minute=1))
+            assert limiter.check_rate_limit("a")[0] is True
+
+
+class TestStoreFallback:
+    def _limiter(self, fallback):
+        store = MagicMock()
+        store.lease.side_effect = ConnectionError("store down")
+        limiter = RateLimiter(store=store, fallback=fallback)
+        limiter.set_rate_limit("a", RateLimitConfig(queries_per_minute=1))
+        return limiter
+
+    def test_local_fallback_enforces_per_process(self):
+        limiter = self._limiter("local")
+        assert limiter.check_rate_limit("a")[0] is True
+        assert limiter.check_rate_limit("a")[0] is False
+        assert limiter.get_store_stats()["fallbacks"] == 2
+
+    def test_allow_fallback(self):
+        limiter = self._limiter("allow")
+        assert all(limiter.check_rate_limit("a")[0] for _ in range(3))
+
+    def test_deny_fallback(self):
+        allowed, msg = self._limiter("deny").check_rate_limit("a")
+        assert allowed is False
+        assert msg == "Rate limit store unavailable"
+
+    def test_invalid_fallback(self):
+        with pytest.raises(ValueError):
+            RateLimiter(fallback="maybe")
+
+
+class TestRedisStore:
+    def test_retries_on_conflict(self):
+        server = FakeRedis()
+        server.interfere = 2
+        store = RedisRateLimitStore(client=server)
+        decision = store.lease("a", [(10, 60.0)], 5)
+        assert decision.granted == 5
+        assert server.ttls["uac:ratelimit:a"] == 60000
+
+    def test_gives_up_after_max_retries(self):
+        server = FakeRedis()
+        server.interfere = 5
+        store = RedisRateLimitStore(client=server, max_retries=3)
+        with pytest.raises(RuntimeError):
+            store.lease("a", [(10, 60.0)], 5)
+
+
+class TestStoreConfig:
+    def test_create_store_from_url(self, tmp_path):
+        assert create_rate_limit_store(None) is None
+        assert isinstance(create_rate_limit_store("memory://"), MemoryRateLimitStore)
+        store = create_rate_limit_store(f"sqlite:///{tmp_path}/limits.db")
+        assert isinstance(store, SQLiteRateLimitStore)
+        store.close()
+        with pytest.raises(ValueError):
+            create_rate_limit_store("ftp://nowhere")
+
+    def test_sqlite_url_needs_three_slashes(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        with pytest.raises(ValueError):
+            create_rate_limit_store("sqlite://rl.db")
+        assert not (tmp_path / "l.db").exists()
+        store = create_rate_limit_store("sqlite:///rl.db")
+        store.close()
+        assert (tmp_path / "rl.db").exists()
+
+    def test_create_rate_limiter_from_env(self, monkeypatch):
+        monkeypatch.setenv("RATE_LIMIT_STORE", "memory://")
+        monkeypatch.setenv("RATE_LIMIT_FALLBACK", "deny")
+        monkeypatch.setenv("RATE_LIMIT_LEASE_SIZE", "5")
+        stats = create_rate_limiter().get_store_stats()
+        assert stats["store"] == "MemoryRateLimitStore"
+        assert stats["fallback"] == "deny"
+        assert stats["lease_size"] == 5
@@ -0,0 +1,195 @@
+"""Tests for the versioned per-connection schema catalog cache."""
+
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from ai_agent_connector.app.db import schema_catalog
+from ai_agent_connector.app.db.schema_catalog import SchemaCatalogCache, connection_key
+from ai_agent_connector.app.security.schema_drift import SchemaDriftDetector
+from ai_agent_connector.app.utils.autocomplete import AutocompleteProvider
+from ai_agent_connector.app.utils.nl_to_sql import NLToSQLConverter
+
+
+class FakeConnector:
+    """Serves a mutable in-memory catalog through the probe and columns queries."""
+
+    database_type = 'postgresql'
+
+    def __init__(self, database='app'):
+        self.config = {'host': 'db', 'database': database}
+        self.is_connected = False
+        self.versions = {('public', 'users'): '1', ('public', 'orders'): '1', ('sales', 'deals'): '1'}
+        self.columns = {
+            ('public', 'users'): [('id', 'integer'), ('email', 'text')],
+            ('public', 'orders'): [('id', 'integer'), ('total', 'numeric')],
+            ('sales', 'deals'): [('id', 'integer')],
+        }
+        self.queries = []
+
+    def connect(self):
+        self.is_connected = True
+
+    def disconnect(self):
+        self.is_connected = False
+
+    def execute_query(self, query, params=None, fetch=True, as_dict=False):
+        if 'pg_class' in query:
+            self.queries.append('probe')
+            return [(schema, table, version) for (schema, table), version in self.versions.items()]
+        wanted = None
+        if params:
+            wanted = set(zip(params[::2], params[1::2]))
+        self.queries.append(('columns', frozenset(wanted) if wanted else None))
+        return [
+            (schema, table, name, data_type, 'YES', None, position)
+            for (schema, table), cols in self.columns.items()
+            if wanted is None or (schema, table) in wanted
+            for position, (name, data_type) in enumerate(cols, 1)
+        ]
+
+
+class MySQLViewConnector(FakeConnector):
+    """MySQL catalog with one view, whose CREATE/UPDATE_TIME are NULL."""
+
+    database_type = 'mysql'
+
+    def __init__(self):
+        super().__init__()
+        self.versions = {}
+        self.columns = {('app', 'active_users'): [('id', 'int')]}
+        self.definition = 'select id from users'
+
+    def execute_query(self, query, params=None, fetch=True, as_dict=False):
+        if 'information_schema.VIEWS' in query:
+            self.queries.append('probe')
+            return [('app', 'active_users', '||' + hashlib.md5(self.definition.encode()).hexdigest())]
+        return super().execute_query(query, params, fetch, as_dict)
+
+
+@pytest.fixture
+def connector():
+    return FakeConnector()
+
+
+@pytest.fixture
+def catalog():
+    return SchemaCatalogCache(check_interval=60)
+
+
+class TestSchemaCatalogCache:
+    def test_first_load_reads_everything(self, catalog, connector):
+        snapshot = catalog.get(connector)
+
+        assert set(snapshot.tables) == {'users', 'orders', 'sales.deals'}
+        assert [c['name'] for c in snapshot.tables['users']['columns']] == ['id', 'email']
+        assert connector.queries == ['probe', ('columns', None)]
+        assert not connector.is_connected
+
+    def test_served_from_cache_within_interval(self, catalog, connector):
+        first = catalog.get(connector)
+        second = catalog.get(connector)
+
+        assert second is first
+        assert len(connector.queries) == 2
+        assert catalog.get_stats()['hits'] == 1
+
+    def test_unchanged_versions_only_probe(self, catalog, connector):
+        first = catalog.get(connector)
+        connector.queries.clear()
+
+        second = catalog.get(connector, force=True)
+
+        assert connector.queries == ['probe']
+        assert second.version == first.version
+        assert second.tables['users'] is first.tables['users']
+
+    def test_changed_table_is_reread_alone(self, catalog, connector):
+        first = catalog.get(connector)
+        connector.queries.clear()
+        connector.versions[('public', 'users')] = '2'
+        connector.columns[('public', 'users')].append(('name', 'text'))
+
+        second = catalog.get(connector, force=True)
+
+        assert connector.queries == ['probe', ('columns', frozenset({('public', 'users')}))]
+        assert [c['name'] for c in second.tables['users']['columns']] == ['id', 'email', 'name']
+        assert second.tables['orders'] is first.tables['orders']
+        assert second.version != first.version
+
+    def test_dropped_table_is_removed(self, catalog, connector):
+        catalog.get(connector)
+        del connector.versions[('public', 'orders')]
+
+        assert 'orders' not in catalog.get(connector, force=True).tables
+
+    def test_refresh_failure_serves_cached_snapshot(self, catalog, connector):
+        first = catalog.get(connector)
+        with patch.object(connector, 'execute_query', side_effect=RuntimeError('down')):
+            assert catalog.get(connector, force=True) is first
+
+    def test_connections_are_cached_separately(self, catalog, connector):
+        other = FakeConnector(database='other')
+        assert connection_key(connector) != connection_key(other)
+        catalog.get(connector)
+        catalog.get(other)
+        assert catalog.get_stats()['connections'] == 2
+
+        catalog.invalidate(connector)
+        assert catalog.peek(connector) is None
+        assert catalog.peek(other) is not None
+
+    def test_views_and_foreign_tables_are_catalogued(self):
+        assert "relkind IN ('r', 'p', 'v', 'm', 'f')" in schema_catalog.VERSION_PROBES['postgresql']
+        assert "'VIEW'" in schema_catalog.VERSION_PROBES['mysql']
+        assert "'VIEW'" in schema_catalog.VERSION_PROBES['snowflake']
+        assert 'BASE TABLE' not in schema_catalog.TABLES_QUERY
+
+    def test_redefined_mysql_view_is_reread(self, catalog):
+        connector = MySQLViewConnector()
+        first = catalog.get(connector)
+        connector.queries.clear()
+        connector.definition = 'select id, email from users'
+        connector.columns[('app', 'active_users')].append(('email', 'varchar'))
+
+        second = catalog.get(connector, force=True)
+
+        assert connector.queries == ['probe', ('columns', frozenset({('app', 'active_users')}))]
+        assert [c['name'] for c in second.tables['app.active_users']['columns']] == ['id', 'email']
+        assert second.version != first.version
+
+    def test_get_table_by_bare_name(self, catalog, connector):
+        snapshot = catalog.get(connector)
+        assert snapshot.get_table('deals')['schema'] == 'sales'
+        assert snapshot.get_table('missing') is None
+
+
+class TestCatalogConsumers:
+    @pytest.fixture(autouse=True)
+    def global_catalog(self, catalog):
+        with patch.object(schema_catalog, '_schema_catalog', catalog):
+            yield catalog
+
+    def test_nl_to_sql_schema_info(self, connector):
+        converter = NLToSQLConverter.__new__(NLToSQLConverter)
+
+        info = converter.get_schema_info(connector)
+        converter.get_schema_info(connector)
+
+        assert set(info['tables']) == {'users', 'orders', 'sales.deals'}
+        assert info['version']
+        assert connector.queries.count('probe') == 1
+
+    def test_autocomplete_from_connector(self, connector):
+        suggestions = AutocompleteProvider().get_connector_suggestions('SELECT * FROM ord', 17, connector)
+        assert suggestions[0].text == 'orders'
+
+    def test_drift_check_reads_warm_catalog(self, connector):
+        schema_catalog.get_schema_catalog().get(connector)
+        connector.queries.clear()
+
+        columns = SchemaDriftDetector().fetch_live_schema(connector, 'users')
+
+        assert columns == {'id': 'integer', 'email': 'text'}
+        assert connector.queries == []
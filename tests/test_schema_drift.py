@@ -18,6 +18,7 @@ from ai_agent_connector.app.security.schema_drift import (
     SchemaDriftDetector,
     _normalize_type,
     _similar_names,
+    _match_renames,
 )
 
 
@@ -129,6 +130,19 @@ class TestSimilarNames:
     def test_empty_string(self):
         assert _similar_names("", "name") is False
 
+    def test_bigram_similarity(self):
+        assert _similar_names("created_at", "createdat_ts") is True
+        assert _similar_names("customer_id", "client_id") is False
+
+
+class TestMatchRenames:
+    def test_best_match_wins(self):
+        renamed = _match_renames(["user_name", "email"], ["username", "user_email"])
+        assert renamed == {"user_name": "username", "email": "user_email"}
+
+    def test_no_shared_bigrams(self):
+        assert _match_renames(["id"], ["balance"]) == {}
+
 
 # ============================================================
 # Tests: SchemaDriftDetector.detect_drift
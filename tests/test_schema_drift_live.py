@@ -1,7 +1,7 @@
 """Tests for live schema drift detection (fetch_live_schema, check_live)."""
 
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from ai_agent_connector.app.security.schema_drift import (
     SchemaDriftDetector,
@@ -56,9 +56,9 @@ class TestFetchLiveSchema:
 class TestCheckLive:
     def test_no_drift(self, detector, mock_connector):
         mock_connector.execute_query.return_value = [
-            {"column_name": "id", "data_type": "integer"},
-            {"column_name": "name", "data_type": "text"},
-            {"column_name": "dob", "data_type": "date"},
+            {"table_name": "patients", "column_name": "id", "data_type": "integer"},
+            {"table_name": "patients", "column_name": "name", "data_type": "text"},
+            {"table_name": "patients", "column_name": "dob", "data_type": "date"},
         ]
         reports = detector.check_live(mock_connector, ["PatientRecord"])
         assert len(reports) == 1
@@ -67,7 +67,7 @@ class TestCheckLive:
 
     def test_missing_column_detected(self, detector, mock_connector):
         mock_connector.execute_query.return_value = [
-            {"column_name": "id", "data_type": "integer"},
+            {"table_name": "patients", "column_name": "id", "data_type": "integer"},
             # "name" and "dob" missing
         ]
         reports = detector.check_live(mock_connector, ["PatientRecord"])
@@ -78,9 +78,9 @@ class TestCheckLive:
 
     def test_type_change_detected(self, detector, mock_connector):
         mock_connector.execute_query.return_value = [
-            {"column_name": "id", "data_type": "bigint"},
-            {"column_name": "name", "data_type": "text"},
-            {"column_name": "dob", "data_type": "date"},
+            {"table_name": "patients", "column_name": "id", "data_type": "bigint"},
+            {"table_name": "patients", "column_name": "name", "data_type": "text"},
+            {"table_name": "patients", "column_name": "dob", "data_type": "date"},
         ]
         reports = detector.check_live(mock_connector, ["PatientRecord"])
         assert len(reports) == 1
@@ -96,27 +96,85 @@ class TestCheckLive:
         assert len(reports[0].missing_columns) == 3  # all columns missing
 
     def test_multiple_entities(self, detector, mock_connector):
-        def side_effect(query, **kwargs):
-            table = kwargs.get("params", (None,))[0]
-            if table == "patients":
-                return [
-                    {"column_name": "id", "data_type": "integer"},
-                    {"column_name": "name", "data_type": "text"},
-                    {"column_name": "dob", "data_type": "date"},
-                ]
-            elif table == "staff":
-                return [
-                    {"column_name": "id", "data_type": "integer"},
-                    {"column_name": "role", "data_type": "text"},
-                ]
-            return []
-
-        mock_connector.execute_query.side_effect = side_effect
+        mock_connector.execute_query.return_value = [
+            {"table_name": "patients", "column_name": "id", "data_type": "integer"},
+            {"table_name": "patients", "column_name": "name", "data_type": "text"},
+            {"table_name": "patients", "column_name": "dob", "data_type": "date"},
+            {"table_name": "staff", "column_name": "id", "data_type": "integer"},
+            {"table_name": "staff", "column_name": "role", "data_type": "text"},
+        ]
         reports = detector.check_live(mock_connector)
         assert len(reports) == 2
         assert all(not r.has_drift for r in reports)
+        mock_connector.execute_query.assert_called_once()
+        assert set(mock_connector.execute_query.call_args.kwargs["params"]) == {"patients", "staff"}
 
     def test_unknown_entity_skipped(self, detector, mock_connector):
         reports = detector.check_live(mock_connector, ["NonExistent"])
         assert len(reports) == 0
         mock_connector.execute_query.assert_not_called()
+
+
+class TestBulkLiveCheck:
+    def test_postgresql_uses_any(self, detector, mock_connector):
+        mock_connector.database_type = "postgresql"
+        mock_connector.execute_query.return_value = []
+        detector.fetch_live_schemas(mock_connector, ["patients", "staff", "patients"])
+        query = mock_connector.execute_query.call_args.args[0]
+        assert "table_name = ANY(%s)" in query
+        assert mock_connector.execute_query.call_args.kwargs["params"] == (["patients", "staff"],)
+
+    def test_schema_qualified_table(self, detector, mock_connector):
+        mock_connector.execute_query.return_value = [
+            {"table_schema": "public", "table_name": "staff", "column_name": "id", "data_type": "integer"},
+            {"table_schema": "hr", "table_name": "staff", "column_name": "role", "data_type": "text"},
+        ]
+        live = detector.fetch_live_schemas(mock_connector, ["hr.staff", "staff"])
+        assert live == {"hr.staff": {"role": "text"}, "staff": {"id": "integer", "role": "text"}}
+
+    def test_unchanged_table_reuses_report(self, detector, mock_connector):
+        mock_connector.execute_query.return_value = [
+            {"table_name": "patients", "column_name": "id", "data_type": "integer"},
+        ]
+        first = detector.check_live(mock_connector, ["PatientRecord"])[0]
+        with patch.object(detector, "detect_drift") as detect:
+            second = detector.check_live(mock_connector, ["PatientRecord"])[0]
+        assert second is first
+        detect.assert_not_called()
+
+    def test_matching_signature_skips_diff(self, detector, mock_connector):
+        mock_connector.execute_query.return_value = [
+            {"table_name": "staff", "column_name": "role", "data_type": "character varying"},
+            {"table_name": "staff", "column_name": "id", "data_type": "int4"},
+        ]
+        with patch.object(detector, "detect_drift") as detect:
+            report = detector.check_live(mock_connector, ["Staff"])[0]
+        detect.assert_not_called()
+        assert report.severity == "INFO" and not report.has_drift
+
+    def test_binding_change_invalidates_cached_report(self, detector, mock_connector):
+        mock_connector.execute_query.return_value = [
+            {"table_name": "staff", "column_name": "id", "data_type": "integer"},
+            {"table_name": "staff", "column_name": "role", "data_type": "text"},
+        ]
+        assert not detector.check_live(mock_connector, ["Staff"])[0].has_drift
+        detector.add_binding(SchemaBinding(entity="Staff", table="staff",
+                                           columns={"id": "integer", "title": "text"}))
+        assert "title" in detector.check_live(mock_connector, ["Staff"])[0].missing_columns
+
+    def test_many_bindings_one_query(self, mock_connector):
+        detector = SchemaDriftDetector()
+        rows = []
+        for i in range(500):
+            detector.add_binding(SchemaBinding(entity=f"E{i}", table=f"t{i}",
+                                               columns={"id": "integer", "name": "text"}))
+            rows += [{"table_name": f"t{i}", "column_name": "id", "data_type": "integer"},
+                     {"table_name": f"t{i}", "column_name": "full_name", "data_type": "text"}]
+        mock_connector.database_type = "postgresql"
+        mock_connector.execute_query.return_value = rows
+
+        reports = detector.check_live(mock_connector)
+
+        assert len(reports) == 500
+        assert all(r.renamed_columns == {"name": "full_name"} for r in reports)
+        mock_connector.execute_query.assert_called_once()
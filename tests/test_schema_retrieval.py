@@ -0,0 +1,124 @@
+"""Tests for relevance-pruned schema context selection."""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_agent_connector.app.utils.schema_retrieval import (
+    SchemaIndex,
+    select_schema_context,
+    tokenize,
+)
+
+
+def _table(*columns, table=None):
+    info = {'columns': [{'name': name, 'type': 'text'} for name in columns]}
+    if table:
+        info['table'] = table
+    return info
+
+
+@pytest.fixture
+def schema_info():
+    schema = {
+        'customers': _table('id', 'name', 'email'),
+        'orders': _table('id', 'customer_id', 'total', 'created_at'),
+        'order_items': _table('id', 'order_id', 'product_id', 'quantity'),
+        'products': _table('id', 'title', 'price', 'category_id'),
+        'categories': _table('id', 'label'),
+        'patients': _table('id', 'dob'),
+    }
+    for i in range(40):
+        schema[f'audit_log_{i}'] = _table('id', 'event', 'payload')
+    return {'tables': list(schema), 'schema': schema, 'version': 'v1'}
+
+
+class TestTokenize:
+    def test_identifiers_and_plurals(self):
+        assert tokenize('OrderItems') == ['order', 'item']
+        assert tokenize('product_categories') == ['product', 'category']
+        assert tokenize('Show me all the orders') == ['order']
+
+
+    @pytest.mark.parametrize('plural,singular', [
+        ('warehouses', 'warehouse'), ('purchases', 'purchase'), ('cases', 'case'),
+        ('addresses', 'address'), ('statuses', 'status'), ('boxes', 'box'),
+        ('batches', 'batch'), ('categories', 'category'), ('orders', 'order'),
+        ('buses', 'bus'), ('houses', 'house'),
+    ])
+    def test_plural_and_singular_stem_alike(self, plural, singular):
+        assert tokenize(plural) == tokenize(singular)
+
+
+class TestSchemaIndex:
+    def test_ranks_by_name_then_columns(self, schema_info):
+        index = SchemaIndex(schema_info['schema'])
+        ranked = [table for table, _ in index.search('total of orders per customer email')]
+        assert ranked[:2] == ['orders', 'customers']
+
+    def test_foreign_key_neighbors_from_id_columns(self, schema_info):
+        index = SchemaIndex(schema_info['schema'])
+        assert index.neighbors['order_items'] == {'orders', 'products'}
+        assert 'order_items' in index.neighbors['orders']
+
+    def test_es_plural_table_found_from_singular(self):
+        index = SchemaIndex({
+            'warehouses': _table('id', 'city'),
+            'shipments': _table('id', 'warehouse_id', 'shipped_at'),
+            'carriers': _table('id', 'name'),
+        })
+        assert index.search('which warehouse shipped the most')[0][0] == 'warehouses'
+        assert index.neighbors['shipments'] == {'warehouses'}
+
+    def test_ontology_concepts_are_indexed(self, schema_info):
+        index = SchemaIndex(schema_info['schema'], concepts={'patients': 'MedicalRecord'})
+        assert index.search('medical records')[0][0] == 'patients'
+
+    def test_embedder_adds_semantic_matches(self, schema_info):
+        def embedder(texts):
+            return [[1.0, 0.0] if 'dob' in text or 'birthday' in text else [0.0, 1.0] for text in texts]
+
+        index = SchemaIndex(schema_info['schema'], embedder=embedder)
+        assert index.search('birthday list')[0][0] == 'patients'
+
+    def test_select_adds_neighbors_and_prunes_columns(self):
+        wide = _table('id', 'order_id', *[f'col_{i}' for i in range(20)], 'shipped_at')
+        index = SchemaIndex({'orders': _table('id'), 'shipments': wide})
+
+        selected = index.select('when were shipments shipped', top_k=1, max_columns=4)
+
+        assert list(selected) == ['shipments', 'orders']
+        assert [c['name'] for c in selected['shipments']['columns']] == ['id', 'order_id', 'col_0', 'shipped_at']
+
+
+class TestSelectSchemaContext:
+    def test_small_schema_unchanged(self):
+        info = {'tables': ['users'], 'schema': {'users': _table('id')}}
+        assert select_schema_context('users', info) is info
+
+    def test_prompt_bounded(self, schema_info):
+        context = select_schema_context('products in each category', schema_info, top_k=2, max_neighbors=1)
+
+        assert context['tables'] == ['products', 'categories', 'order_items']
+        assert context['total_tables'] == len(schema_info['schema'])
+        assert context['version'] == 'v1'
+
+    def test_index_reused_per_version(self, schema_info):
+        with patch('ai_agent_connector.app.utils.schema_retrieval.SchemaIndex',
+                   wraps=SchemaIndex) as index_class:
+            select_schema_context('orders', {**schema_info, 'version': 'reuse-1'})
+            select_schema_context('customers', {**schema_info, 'version': 'reuse-1'})
+            select_schema_context('orders', {**schema_info, 'version': 'reuse-2'})
+        assert index_class.call_count == 2
+
+    def test_convert_with_schema_sends_pruned_schema(self, schema_info):
+        from ai_agent_connector.app.utils.nl_to_sql import NLToSQLConverter
+
+        converter = NLToSQLConverter.__new__(NLToSQLConverter)
+        with patch.object(converter, 'get_schema_info', return_value=schema_info), \
+                patch.object(converter, 'convert_to_sql', return_value={'sql': 'SELECT 1'}) as convert:
+            converter.convert_with_schema('revenue by customer', MagicMock())
+
+        sent = convert.call_args.args[1]
+        assert 'customers' in sent['tables']
+        assert len(sent['tables']) < len(schema_info['tables'])
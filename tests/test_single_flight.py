@@ -0,0 +1,113 @@
+"""Unit tests for single-flight request coalescing."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_agent_connector.app.api import routes
+from ai_agent_connector.app.permissions.access_control import Permission
+from ai_agent_connector.app.utils.single_flight import SingleFlight
+from ai_agent_connector.app.utils.sql_parser import parse_query
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return ["row"]
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(flight.do("k", slow)))
+            for _ in range(3)
+        ]
+        for thread in followers:
+            thread.start()
+        while flight.get_stats()["waiting"] < 3:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True]
+        assert all(result == ["row"] for result, _ in results)
+        stats = flight.get_stats()
+        assert stats["executions"] == 1
+        assert stats["coalesced"] == 3
+        assert stats["in_flight"] == 0
+
+    def test_sequential_calls_are_not_cached(self):
+        flight = SingleFlight()
+        assert flight.do("k", lambda: 1) == (1, False)
+        assert flight.do("k", lambda: 2) == (2, False)
+
+    def test_error_propagates_and_clears_key(self):
+        flight = SingleFlight()
+        with pytest.raises(ValueError):
+            flight.do("k", MagicMock(side_effect=ValueError("boom")))
+        assert flight.get_stats()["errors"] == 1
+        assert flight.do("k", lambda: "ok") == ("ok", False)
+
+
+class TestCoalescingKey:
+    @pytest.fixture(autouse=True)
+    def agents(self):
+        routes.agent_registry.reset()
+        routes.access_control.permissions.clear()
+        routes.access_control.resource_permissions.clear()
+        config = {"type": "postgresql", "host": "db", "user": "u", "password": "p",
+                  "database": "app"}
+        with patch("ai_agent_connector.app.agents.registry.DatabaseConnector"):
+            for agent_id in ("a", "b", "c"):
+                routes.agent_registry.register_agent(
+                    agent_id, {"name": agent_id},
+                    credentials={"api_key": agent_id, "api_secret": "s"},
+                    database_config=dict(config, user="other") if agent_id == "c" else config,
+                )
+        for agent_id in ("a", "b", "c"):
+            routes.access_control.grant_permission(agent_id, Permission.READ)
+        yield
+        routes.agent_registry.reset()
+        routes.access_control.permissions.clear()
+        routes.access_control.resource_permissions.clear()
+
+    def test_same_database_and_permissions_share_key(self):
+        parsed = parse_query("SELECT * FROM users WHERE id = 1")
+        assert routes.get_coalescing_key("a", parsed) == routes.get_coalescing_key("b", parsed)
+
+    def test_different_database_user_does_not_share(self):
+        parsed = parse_query("SELECT * FROM users")
+        assert routes.get_coalescing_key("a", parsed) != routes.get_coalescing_key("c", parsed)
+
+    def test_different_permissions_do_not_share(self):
+        parsed = parse_query("SELECT * FROM users")
+        routes.access_control.set_resource_permissions("b", "users", [Permission.READ])
+        assert routes.get_coalescing_key("a", parsed) != routes.get_coalescing_key("b", parsed)
+
+    def test_literals_and_writes(self):
+        assert (routes.get_coalescing_key("a", parse_query("SELECT * FROM users WHERE id = 1"))
+                != routes.get_coalescing_key("a", parse_query("SELECT * FROM users WHERE id = 2")))
+        assert routes.get_coalescing_key("a", parse_query("DELETE FROM users")) is None
+
+    def test_keyed_on_exact_text_and_params(self):
+        key = routes.get_coalescing_key
+        assert (key("a", parse_query("SELECT * FROM users WHERE s = 'a--b'"))
+                != key("a", parse_query("SELECT * FROM users WHERE s = 'a--zzz'")))
+        assert (key("a", parse_query("SELECT * FROM users WHERE s = 'a  b'"))
+                != key("a", parse_query("SELECT * FROM users WHERE s = 'a b'")))
+        parsed = parse_query("SELECT * FROM users WHERE id = %s")
+        assert key("a", parsed, params=[1]) != key("a", parsed, params=[2])
+        assert key("a", parsed, params=[1]) == key("b", parsed, params=[1])
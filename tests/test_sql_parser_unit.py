@@ -6,6 +6,8 @@ from ai_agent_connector.app.utils.sql_parser import (
     get_query_type,
     requires_write_permission,
     requires_read_permission,
+    parse_query,
+    ParsedQuery,
     QueryType,
 )
 
@@ -99,3 +101,81 @@ class TestPermissions:
 
     def test_read_insert(self):
         assert requires_read_permission("INSERT INTO t VALUES (1)") is False
+
+
+class TestParsedQuery:
+    def test_memoized_by_text(self):
+        assert parse_query("SELECT * FROM users") is parse_query("SELECT * FROM users")
+
+    def test_passthrough(self):
+        parsed = parse_query("SELECT * FROM users")
+        assert parse_query(parsed) is parsed
+        assert get_query_type(parsed) == QueryType.SELECT
+        assert extract_tables_from_query(parsed) == {"users"}
+
+    def test_invalid_input(self):
+        parsed = parse_query(None)
+        assert parsed.query_type == QueryType.UNKNOWN
+        assert parsed.tables == ()
+
+    def test_tables_in_order_of_appearance(self):
+        parsed = parse_query("SELECT * FROM b JOIN a ON 1=1 JOIN b ON 1=1")
+        assert parsed.tables == ("b", "a")
+
+    def test_ctes_excluded_from_tables(self):
+        parsed = parse_query(
+            "WITH recent AS (SELECT * FROM orders), top AS (SELECT 1) "
+            "SELECT * FROM recent JOIN users ON 1=1"
+        )
+        assert parsed.ctes == ("recent", "top")
+        assert parsed.tables == ("orders", "users")
+
+    def test_cte_shadowing_its_own_table_keeps_the_table(self):
+        parsed = parse_query("WITH payroll AS (SELECT * FROM payroll) SELECT * FROM payroll")
+        assert parsed.ctes == ("payroll",)
+        assert parsed.tables == ("payroll",)
+
+    def test_data_modifying_cte_is_a_write(self):
+        parsed = parse_query("WITH payroll AS (DELETE FROM payroll RETURNING *) SELECT 1")
+        assert parsed.tables == ("payroll",)
+        assert parsed.query_type == QueryType.DELETE
+        assert parsed.requires_write
+
+    def test_chained_ctes_excluded_from_tables(self):
+        parsed = parse_query("WITH a AS (SELECT * FROM t), b AS (SELECT * FROM a) SELECT * FROM b")
+        assert parsed.ctes == ("a", "b")
+        assert parsed.tables == ("t",)
+
+    def test_select_list_alias_is_not_a_cte(self):
+        parsed = parse_query("SELECT x, y AS (z) FROM y")
+        assert parsed.ctes == ()
+        assert parsed.tables == ("y",)
+
+    def test_literals_taken_from_raw_text(self):
+        parsed = parse_query("SELECT * FROM t  WHERE s = 'a--b  /*c*/' -- trailing\n AND n = 1")
+        assert parsed.normalized == "SELECT * FROM t WHERE s = 'a--b  /*c*/' AND n = 1"
+        assert parsed.fingerprint == "SELECT * FROM t WHERE s = ? AND n = ?"
+        assert [literal for _, literal in parsed.literals] == ["'a--b  /*c*/'", "1"]
+
+    def test_subquery_count(self):
+        parsed = parse_query(
+            "SELECT * FROM a WHERE id IN (SELECT id FROM b) AND x IN ( select x FROM c)"
+        )
+        assert parsed.subquery_count == 2
+        assert parsed.tables == ("a", "b", "c")
+
+    def test_extracted_set_is_mutable_copy(self):
+        tables = extract_tables_from_query("SELECT * FROM users")
+        tables.add("other")
+        assert extract_tables_from_query("SELECT * FROM users") == {"users"}
+
+    def test_permission_properties(self):
+        assert parse_query("DELETE FROM t").requires_write is True
+        assert parse_query("SELECT 1").requires_read is True
+        assert isinstance(parse_query("SELECT 1"), ParsedQuery)
+
+    def test_fingerprint_strips_literals(self):
+        parsed = parse_query("SELECT * FROM t1 WHERE id = 12 AND name = 'o''x'")
+        assert parsed.fingerprint == "SELECT * FROM t1 WHERE id = ? AND name = ?"
+        assert [literal for _, literal in parsed.literals] == ["12", "'o''x'"]
+        assert parse_query("SELECT * FROM t1 WHERE id = 7 AND name = 'y'").fingerprint == parsed.fingerprint
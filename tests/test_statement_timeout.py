@@ -0,0 +1,93 @@
+"""
+Unit tests for applying statement timeouts once per connection
+"""
+
+from unittest.mock import MagicMock, patch
+
+from ai_agent_connector.app.db.connectors import PostgreSQLConnector, MySQLConnector
+
+
+class TestSessionStatementTimeout:
+    """Statement timeouts are applied once per connection, not per query"""
+    
+    @staticmethod
+    def _executed(conn):
+        cursor = conn.cursor.return_value.__enter__.return_value
+        return [c.args[0] for c in cursor.execute.call_args_list]
+    
+    def test_postgresql_sets_timeout_as_startup_option(self):
+        connector = PostgreSQLConnector({
+            'host': 'localhost', 'user': 'user', 'database': 'db',
+            'timeouts': {'query_timeout': 5}
+        })
+        conn = MagicMock(closed=False)
+        with patch.object(connector, 'psycopg2') as psycopg2:
+            psycopg2.connect.return_value = conn
+            connector.connect()
+        
+        assert psycopg2.connect.call_args.kwargs['options'] == '-c statement_timeout=5000'
+        connector.execute_query('SELECT 1')
+        connector.execute_query('SELECT 2')
+        assert self._executed(conn) == ['SELECT 1', 'SELECT 2']
+    
+    def test_postgresql_reissues_only_when_timeout_differs(self):
+        conn = MagicMock(closed=False)
+        pool = MagicMock()
+        pool.getconn.return_value = conn
+        config = {'host': 'localhost', 'user': 'user', 'database': 'db',
+                  'pooling': {'enabled': True}, 'timeouts': {'query_timeout': 5}}
+        
+        first = PostgreSQLConnector(config)
+        first.pool = pool
+        first.connect()
+        first.disconnect()
+        assert self._executed(conn) == []
+        
+        second = PostgreSQLConnector(config)
+        second.timeout_config.query_timeout = 10
+        second.pool = pool
+        second.connect()
+        second.disconnect()
+        third = PostgreSQLConnector(config)
+        third.timeout_config.query_timeout = 10
+        third.pool = pool
+        third.connect()
+        
+        assert self._executed(conn) == ['SET statement_timeout = 10000']
+        conn.commit.assert_called_once()
+    
+    def test_mysql_sets_timeout_once_per_connection(self):
+        conn = MagicMock()
+        pool = MagicMock()
+        pool.connection.return_value = conn
+        config = {'host': 'localhost', 'user': 'user', 'database': 'db',
+                  'pooling': {'enabled': True}, 'timeouts': {'query_timeout': 5}}
+        
+        for _ in range(2):
+            connector = MySQLConnector(config)
+            connector.pool = pool
+            connector.connect()
+            connector.execute_query('SELECT 1')
+            connector.disconnect()
+        
+        assert self._executed(conn) == [
+            'SET SESSION max_execution_time = 5000', 'SELECT 1', 'SELECT 1'
+        ]
+    
+    def test_mysql_unsupported_timeout_is_not_retried(self):
+        conn = MagicMock()
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = [Exception('Unknown system variable'), None, None]
+        pool = MagicMock()
+        pool.connection.return_value = conn
+        config = {'host': 'localhost', 'user': 'user', 'database': 'db',
+                  'pooling': {'enabled': True}, 'timeouts': {'query_timeout': 5}}
+        
+        for _ in range(2):
+            connector = MySQLConnector(config)
+            connector.pool = pool
+            connector.connect()
+            connector.execute_query('SELECT 1')
+            connector.disconnect()
+        
+        assert cursor.execute.call_count == 3
@@ -0,0 +1,115 @@
+"""Tests for the NL-to-SQL translation cache."""
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai_agent_connector.app.utils import nl_to_sql
+from ai_agent_connector.app.utils.cost_tracker import CostTracker
+from ai_agent_connector.app.utils.nl_to_sql import NLToSQLConverter
+from ai_agent_connector.app.utils.translation_cache import TranslationCache, normalize_question
+
+
+class TestNormalizeQuestion:
+    def test_folds_whitespace_punctuation_and_leading_command_word(self):
+        assert normalize_question('  How many   orders?  ') == 'how many orders'
+        assert normalize_question('Show all users') == normalize_question('show all users.')
+
+    def test_names_keep_case(self):
+        assert normalize_question("Users named 'John Doe'") == "Users named 'John Doe'"
+        assert (normalize_question('patients named John Doe')
+                != normalize_question('patients named john doe'))
+
+
+class TestTranslationCache:
+    def test_exact_hit_per_scope(self):
+        cache = TranslationCache()
+        cache.set('How many orders?', 'PostgreSQL', 'gpt', 'v1', {'sql': 'SELECT count(*) FROM orders'})
+
+        assert cache.get('how many orders', 'postgresql', 'gpt', 'v1').result['sql'] == 'SELECT count(*) FROM orders'
+        assert cache.get('how many orders', 'PostgreSQL', 'gpt', 'v2') is None
+        assert cache.get('how many orders', 'MySQL', 'gpt', 'v1') is None
+        assert cache.get_stats()['hits'] == 1
+
+    def test_ttl_and_lru(self):
+        cache = TranslationCache(max_entries=2, ttl_seconds=10)
+        with patch('ai_agent_connector.app.utils.translation_cache.time.time', return_value=100.0):
+            for question in ('a', 'b', 'c'):
+                cache.set(question, 'pg', 'gpt', 'v1', {'sql': question})
+            assert cache.get('a', 'pg', 'gpt', 'v1') is None
+            assert cache.get('c', 'pg', 'gpt', 'v1') is not None
+        with patch('ai_agent_connector.app.utils.translation_cache.time.time', return_value=111.0):
+            assert cache.get('c', 'pg', 'gpt', 'v1') is None
+
+    def test_similarity_match_requires_same_literals(self):
+        def embedder(texts):
+            return [[1.0, 0.1 if 'top' in text else 0.0] for text in texts]
+
+        cache = TranslationCache(similarity_threshold=0.95, embedder=embedder)
+        cache.set('top 5 customers by revenue', 'pg', 'gpt', 'v1', {'sql': 'SELECT 5'})
+
+        assert cache.get('best 5 customers by revenue', 'pg', 'gpt', 'v1').result['sql'] == 'SELECT 5'
+        assert cache.get('best 10 customers by revenue', 'pg', 'gpt', 'v1') is None
+        assert cache.get_stats()['similar_hits'] == 1
+
+    def test_names_are_not_shared_across_case(self):
+        cache = TranslationCache(similarity_threshold=0.5, embedder=lambda texts: [[1.0] for _ in texts])
+        cache.set('patients named John Doe', 'pg', 'gpt', 'v1', {'sql': "... = 'John Doe'"})
+
+        assert cache.get('patients named john doe', 'pg', 'gpt', 'v1') is None
+        assert cache.get('patients called Jane Doe', 'pg', 'gpt', 'v1') is None
+        assert cache.get('patients called John Doe', 'pg', 'gpt', 'v1').result['sql'] == "... = 'John Doe'"
+
+
+@pytest.fixture
+def tracker():
+    tracker = CostTracker()
+    with patch.object(nl_to_sql, '_cost_tracker', tracker):
+        yield tracker
+
+
+@pytest.fixture
+def converter():
+    converter = NLToSQLConverter(api_key='key', model='gpt-4o-mini', translation_cache=TranslationCache())
+    client = MagicMock()
+    client.chat.completions.create.return_value = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content='SELECT * FROM users'))],
+        usage=SimpleNamespace(prompt_tokens=1000, completion_tokens=50, total_tokens=1050)
+    )
+    converter._client = client
+    return converter
+
+
+SCHEMA = {'tables': ['users'], 'schema': {'users': {'columns': [{'name': 'id', 'type': 'integer'}]}}, 'version': 'v1'}
+
+
+class TestConverterCaching:
+    def test_repeat_question_skips_llm_and_reports_savings(self, converter, tracker):
+        first = converter.convert_to_sql('Show all users', SCHEMA)
+        second = converter.convert_to_sql('show all users?', SCHEMA)
+
+        assert converter._client.chat.completions.create.call_count == 1
+        assert second['sql'] == first['sql']
+        assert second['cached'] is True
+        assert second['natural_language'] == 'show all users?'
+
+        savings = tracker.get_savings()
+        assert savings['cache_hits'] == 1
+        assert savings['saved_tokens'] == 1050
+        assert savings['saved_cost_usd'] == round(tracker._cost_records[0].cost_usd, 4)
+        assert tracker.get_dashboard_data()['cache_savings']['cache_hits'] == 1
+        assert tracker.get_total_cost() == tracker._cost_records[0].cost_usd
+
+    def test_schema_change_misses(self, converter, tracker):
+        converter.convert_to_sql('Show all users', SCHEMA)
+        converter.convert_to_sql('Show all users', {**SCHEMA, 'version': 'v2'})
+        assert converter._client.chat.completions.create.call_count == 2
+
+    def test_unversioned_schema_and_custom_prompts_not_cached(self, converter, tracker):
+        unversioned = {key: value for key, value in SCHEMA.items() if key != 'version'}
+        converter.convert_to_sql('Show all users', unversioned)
+        converter.convert_to_sql('Show all users', unversioned)
+        converter.convert_to_sql('Show all users', SCHEMA, custom_prompt={'system_prompt': 's'})
+        assert converter._client.chat.completions.create.call_count == 3
+        assert converter.translation_cache.get_stats()['entries'] == 0
@@ -324,3 +324,143 @@ class TestCacheWithDomains:
 
         assert admin_result['allowed'] is True
         assert nurse_result['allowed'] is False
+
+
+class FakeRedis:
+    """In-process stand-in for the Redis commands the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+        self.calls = []
+
+    def get(self, key):
+        self.calls.append('get')
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value.encode()
+
+    def mget(self, keys):
+        self.calls.append('mget')
+        return [self.data.get(key) for key in keys]
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1).encode()
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match=None, count=None):
+        import fnmatch
+        return [k for k in list(self.data) if fnmatch.fnmatch(k, match)]
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS must not be used")
+
+
+class TestRedisTier:
+    """Test versioned Redis namespaces, generation bumps and the L1 tier."""
+
+    @pytest.fixture
+    def redis_client(self):
+        return FakeRedis()
+
+    def _cache(self, client, **kwargs):
+        from ai_agent_connector.app.cache import ValidationCache
+
+        kwargs.setdefault('background_sweep', False)
+        return ValidationCache(max_size=100, default_ttl=60.0, redis_client=client, **kwargs)
+
+    def _entries(self, client):
+        return [k for k in client.data if k.startswith('uac:validation:v')]
+
+    def test_memory_keys_are_tuples(self):
+        from ai_agent_connector.app.cache import ValidationCache
+
+        cache = ValidationCache()
+        assert cache._make_key('READ', 'User', 'Admin') == ('read', 'user', 'admin', 'default')
+
+    def test_shared_between_workers(self, redis_client):
+        writer = self._cache(redis_client)
+        reader = self._cache(redis_client)
+
+        writer.set('read', 'User', {'allowed': True}, role='Admin', domain='hr')
+
+        assert reader.get('read', 'User', role='Admin', domain='hr') == {'allowed': True}
+        assert reader.get_stats()['redis_hits'] == 1
+
+    def test_l1_avoids_redis_round_trip(self, redis_client):
+        cache = self._cache(redis_client)
+        cache.set('read', 'User', {'allowed': True}, role='Admin')
+        redis_client.calls.clear()
+
+        for _ in range(5):
+            assert cache.get('read', 'User', role='Admin') is not None
+        assert redis_client.calls == []
+
+    def test_l1_entries_are_short_lived(self, redis_client):
+        cache = self._cache(redis_client, l1_ttl=0.05)
+        cache.set('read', 'User', {'allowed': True}, role='Admin')
+        time.sleep(0.1)
+        redis_client.calls.clear()
+
+        assert cache.get('read', 'User', role='Admin') is not None
+        assert 'get' in redis_client.calls
+
+    def test_domain_invalidation_bumps_generation(self, redis_client):
+        cache = self._cache(redis_client)
+        other = self._cache(redis_client, l1_ttl=0.0)
+        cache.set('read', 'User', {'allowed': True}, role='Admin', domain='hr')
+        cache.set('read', 'Account', {'allowed': True}, role='Admin', domain='finance')
+        before = set(self._entries(redis_client))
+
+        cache.invalidate(domain='hr')
+
+        assert set(self._entries(redis_client)) == before
+        assert other.get('read', 'User', role='Admin', domain='hr') is None
+        assert other.get('read', 'Account', role='Admin', domain='finance') is not None
+
+    def test_role_invalidation_spans_domains(self, redis_client):
+        cache = self._cache(redis_client)
+        other = self._cache(redis_client, l1_ttl=0.0)
+        cache.set('read', 'User', {'allowed': True}, role='Nurse', domain='hr')
+        cache.set('read', 'User', {'allowed': True}, role='Nurse', domain='finance')
+        cache.set('read', 'User', {'allowed': True}, role='Doctor', domain='hr')
+
+        assert cache.invalidate(role='Nurse') == 2
+
+        assert other.get('read', 'User', role='Nurse', domain='hr') is None
+        assert other.get('read', 'User', role='Nurse', domain='finance') is None
+        assert other.get('read', 'User', role='Doctor', domain='hr') is not None
+
+    def test_invalidate_all_without_keys_command(self, redis_client):
+        cache = self._cache(redis_client)
+        other = self._cache(redis_client, l1_ttl=0.0)
+        cache.set('read', 'User', {'allowed': True}, role='Admin')
+
+        assert cache.invalidate() == 1
+        assert other.get('read', 'User', role='Admin') is None
+
+    def test_sweep_removes_superseded_entries(self, redis_client):
+        cache = self._cache(redis_client)
+        cache.set('read', 'User', {'allowed': True}, role='Admin', domain='hr')
+        cache.set('read', 'Account', {'allowed': True}, role='Admin', domain='a:b')
+
+        cache.invalidate(domain='hr')
+
+        assert cache.sweep_stale_keys() == 1
+        assert len(self._entries(redis_client)) == 1
+        assert cache.sweep_stale_keys() == 0
+
+    def test_background_sweep(self, redis_client):
+        cache = self._cache(redis_client, background_sweep=True)
+        cache.set('read', 'User', {'allowed': True}, role='Admin')
+
+        cache.invalidate()
+
+        deadline = time.time() + 2.0
+        while self._entries(redis_client) and time.time() < deadline:
+            time.sleep(0.01)
+        cache.close()
+        assert self._entries(redis_client) == []
@@ -47,6 +47,7 @@ def mock_ontoguard_adapter():
             'metadata': {}
         }
         adapter.validate_action.return_value = validation_result
+        adapter.validate_actions.side_effect = lambda batch, *args, **kwargs: [validation_result] * len(batch)
 
         # Mock check_permissions
         adapter.check_permissions.return_value = True
@@ -441,6 +442,7 @@ class TestWebSocketDomainSupport:
                 'metadata': {}
             }
             adapter.validate_action.return_value = validation_result
+            adapter.validate_actions.side_effect = lambda batch, *args, **kwargs: [validation_result] * len(batch)
             adapter.check_permissions.return_value = True
             adapter.get_allowed_actions.return_value = ['read', 'create', 'update']
             adapter.explain_rule.return_value = "Doctor can perform read action on PatientRecord"
@@ -688,6 +690,34 @@ class TestWebSocketDomainSupport:
 
             client.disconnect()
 
+    def test_mixed_domains_pick_validator_per_item(self, app_with_socketio_domain, mock_ontoguard_adapter_domain):
+        """Test mixed-domain batches never re-initialize the shared adapter."""
+        app, socketio = app_with_socketio_domain
+
+        with app.test_client() as _:
+            client = socketio.test_client(app)
+            client.get_received()
+
+            client.emit('validate_batch', {
+                'domain': 'hospital',
+                'validations': [
+                    {'action': 'read', 'table': 'patients', 'context': {'role': 'Doctor'}},
+                    {'action': 'read', 'entity_type': 'Account', 'context': {'role': 'Analyst', 'domain': 'finance'}},
+                    {'action': 'read', 'table': 'patients', 'context': {'role': 'Nurse'}}
+                ]
+            })
+            client.get_received()
+
+            mock_ontoguard_adapter_domain.initialize.assert_not_called()
+            loaded = [c.args[0] for c in mock_ontoguard_adapter_domain.load_domain.call_args_list]
+            assert loaded == ['hospital', 'finance']
+            assert mock_ontoguard_adapter_domain.validate_actions.call_count == 1
+            batch = mock_ontoguard_adapter_domain.validate_actions.call_args.args[0]
+            assert [item['context']['domain'] for item in batch] == ['hospital', 'finance', 'hospital']
+            mock_ontoguard_adapter_domain.validate_action.assert_not_called()
+
+            client.disconnect()
+
 
 @pytest.mark.skipif(not SOCKETIO_AVAILABLE, reason="flask-socketio not installed")
 class TestDomainHelperFunctions: